@@ -5,7 +5,7 @@ from energy_demand.technologies import tech_related
 from energy_demand.basic import testing_functions, date_prop
 from energy_demand.assumptions import assumptions_fuel_shares
 from energy_demand.initalisations import helpers
-from energy_demand.profiles import hdd_cdd
+from energy_demand.profiles import hdd_cdd, representative_days
 
 class Assumptions(object):
     """Assumptions of energy demand model
@@ -104,8 +104,13 @@ class Assumptions(object):
         #        model_yeardays_date : dict
         #           Contains for the base year for each days
         #           the information wheter this is a working or holiday
+        #       yearday_weights : array
+        #           Number of days represented by every modelled day
+        #           (None: every modelled day only represents itself,
+        #           see `update_model_yeardays`)
         # ------------------------------------------------------------
         self.model_yeardays = list(range(365))
+        self.yearday_weights = None
 
         # Calculate dates
         self.model_yeardays_date = []
@@ -628,6 +633,50 @@ class Assumptions(object):
         testing_functions.testing_tech_defined(
             self.technologies, self.is_specified_tech_enduse_by)
 
+    def update_model_yeardays(self, model_yeardays, yearday_weights=None):
+        """Update modelled yeardays (e.g. representative days,
+        see `representative_days.select_representative_days`)
+
+        Arguments
+        ---------
+        model_yeardays : list
+            Modelled yeardays
+        yearday_weights : array, default=None
+            Number of days represented by every modelled day
+        """
+        self.model_yeardays = list(model_yeardays)
+        self.yearday_weights = yearday_weights
+
+        self.model_yeardays_date = []
+        for yearday in self.model_yeardays:
+            self.model_yeardays_date.append(
+                date_prop.yearday_to_date(self.base_yr, yearday))
+
+        self.model_yeardays_nrs = len(self.model_yeardays)
+        self.model_yearhours_nrs = len(self.model_yeardays) * 24
+
+        # Seasons with positions of modelled days
+        self.seasons = representative_days.get_seasons_model_yeardays(
+            date_prop.get_season(year_to_model=self.base_yr),
+            self.model_yeardays)
+
+        # Daytype and weekend correction factors of modelled days
+        yeardays_daytype, _, _ = date_prop.get_model_yeardays_daytype(
+            year_to_model=self.base_yr)
+        self.model_yeardays_daytype = yeardays_daytype[self.model_yeardays]
+
+        self.cdd_weekend_cfactors = hdd_cdd.calc_weekend_corr_f(
+            self.model_yeardays_daytype,
+            self.f_ss_cooling_weekend)
+
+        self.ss_weekend_f = hdd_cdd.calc_weekend_corr_f(
+            self.model_yeardays_daytype,
+            self.f_ss_weekend)
+
+        self.is_weekend_f = hdd_cdd.calc_weekend_corr_f(
+            self.model_yeardays_daytype,
+            self.f_is_weekend)
+
     def update(self, name, value):
         """Update assumptions
 
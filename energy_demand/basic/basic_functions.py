@@ -241,3 +241,36 @@ def get_month_from_int(month_int):
         month_str = 'Dec'
 
     return str(month_str)
+
+def update_hash(hash_obj, value):
+    """Add content of a (nested) value to a hash. Dicts
+    and sets are added in sorted order
+
+    Arguments
+    ----------
+    hash_obj : hashlib hash
+        Hash
+    value : any
+        Value to add
+    """
+    if isinstance(value, np.ndarray):
+        hash_obj.update(str((value.dtype, value.shape)).encode())
+        hash_obj.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        hash_obj.update(b'dict')
+        for key in sorted(value, key=repr):
+            hash_obj.update(repr(key).encode())
+            update_hash(hash_obj, value[key])
+    elif isinstance(value, (set, frozenset)):
+        hash_obj.update(b'set')
+        for item in sorted(value, key=repr):
+            update_hash(hash_obj, item)
+    elif isinstance(value, (list, tuple)):
+        hash_obj.update(type(value).__name__.encode())
+        for item in value:
+            update_hash(hash_obj, item)
+    elif hasattr(value, '__dict__'):
+        hash_obj.update(type(value).__name__.encode())
+        update_hash(hash_obj, vars(value))
+    else:
+        hash_obj.update(repr(value).encode())
@@ -5,6 +5,16 @@ import numpy as np
 
 from energy_demand.technologies import diffusion_technologies
 
+#: Columns of a dwelling stock (a row for every dwelling or group of dwellings)
+DWELLING_DTYPE = np.dtype([
+    ('dwtype', 'U32'),
+    ('sector_type', 'U32'),
+    ('age', float),
+    ('floorarea', float),
+    ('population', float),
+    ('hlc', float),
+    ('gva', float)])
+
 def createNEWCASTLE_dwelling_stock(curr_yr, region, data, parameter_list):
     """Create dwelling stock based on input from
     building model from Newcastle
@@ -188,40 +198,57 @@ class Dwelling(object):
 
 class DwellingStock(object):
     """Class of the building stock in a region
+
+    The dwellings are stored as a structured array
+    (see `DWELLING_DTYPE`) with a row for every dwelling
+    or aggregated group of dwellings. The summed scenario driver
+    of every enduse can be accessed as attribute, e.g.
+    ``dwelling_stock.rs_space_heating``.
     """
-    def __init__(self, region, dwellings, enduses):
+    def __init__(self, region, dwellings, enduses, driver_assumptions=None):
         """Returns a new building stock object for every `region`.
 
         Arguments
         ----------
         region : float
             Region of the dwelling
-        dwellings : list
-            List containing all dwelling objects
+        dwellings : array or list
+            Dwellings (see `DWELLING_DTYPE`) or list
+            containing `Dwelling` objects
         enduses : list
             Enduses
+        driver_assumptions : dict, default=None
+            Scenario drivers for every enduse (only
+            needed if `dwellings` is an array)
         """
         #self.region = region
-        self.dwellings = dwellings
+        if isinstance(dwellings, np.ndarray):
+            self.dwellings = dwellings
+            scenario_drivers = calc_scenario_drivers(
+                dwellings, enduses, driver_assumptions)
+        else:
+            # Scenario drivers are already calculated for every `Dwelling`
+            self.dwellings = dwellings_to_array(dwellings)
+            scenario_drivers = np.array(
+                [[getattr(dwelling, enduse) for dwelling in dwellings] for enduse in enduses],
+                dtype=float).reshape(len(enduses), len(dwellings))
 
         # Calculate pop of dwelling stock
-        self.population = get_tot_pop(dwellings)
+        self.population = get_tot_pop(self.dwellings)
 
         # Calculate enduse specific scenario driver
-        for enduse in enduses:
+        self.enduse_nrs = {enduse: enduse_nr for enduse_nr, enduse in enumerate(enduses)}
+        self.scenario_drivers = np.sum(scenario_drivers, axis=1)
 
-            enduse_scenario_driver = self.get_scenario_driver(
-                enduse)
+    def __getattr__(self, name):
+        """Get the scenario driver of an enduse
+        """
+        enduse_nrs = self.__dict__.get('enduse_nrs')
 
-            '''DwellingStock.__setattr__(
-                self,
-                enduse,
-                enduse_scenario_driver)'''
+        if enduse_nrs is None or name not in enduse_nrs:
+            raise AttributeError(name)
 
-            DwellingStock.add_new_attribute(
-                self,
-                enduse,
-                enduse_scenario_driver)
+        return self.get_scenario_driver(name)
 
     def get_scenario_driver(self, enduse):
         """Sum all scenario driver for an enduse
@@ -231,35 +258,193 @@ class DwellingStock(object):
         enduse: string
             Enduse to calculate scenario drivers
         """
-        sum_driver = 0
-        for dwelling in self.dwellings:
-            sum_driver += getattr(dwelling, enduse)
-
-        return sum_driver
+        return float(self.scenario_drivers[self.enduse_nrs[enduse]])
 
     def add_new_attribute(self, name, value):
         """Add a new self asttribute to DwellingStock
         """
         setattr(self, name, value)
 
+def create_dwellings(
+        floorarea,
+        population=None,
+        age=None,
+        dwtype=None,
+        sector_type=None,
+        gva=None
+    ):
+    """Create an array with dwellings or aggregated
+    groups of dwellings (see `DWELLING_DTYPE`)
+
+    Arguments
+    ----------
+    floorarea : array
+        Floor area of every dwelling
+    population : array or float, default=None
+        Population of every dwelling
+    age : array or float, default=None
+        Age of every dwelling (year the building was built)
+    dwtype : array or str, default=None
+        Dwelling type of every dwelling
+    sector_type : array or str, default=None
+        Sector of every dwelling
+    gva : array or float, default=None
+        GVA of every dwelling
+
+    Returns
+    -------
+    dwellings : array
+        Dwellings
+
+    Note
+    ----
+    Not provided numerical attributes are set to `np.nan`
+    and not provided dwelling types or sectors to an empty string.
+    The heat loss coefficient is calculated with age and dwelling type.
+    """
+    floorarea = np.atleast_1d(np.asarray(floorarea, dtype=float))
+
+    dwellings = np.zeros((len(floorarea)), dtype=DWELLING_DTYPE)
+    dwellings['floorarea'] = floorarea
+
+    for attribute, values in (('population', population), ('age', age), ('gva', gva)):
+        if values is None:
+            dwellings[attribute] = np.nan
+        else:
+            dwellings[attribute] = values
+
+    if dwtype is not None:
+        dwellings['dwtype'] = dwtype
+    if sector_type is not None:
+        dwellings['sector_type'] = sector_type
+
+    dwellings['hlc'] = get_hlc_dwellings(dwellings['dwtype'], dwellings['age'])
+
+    return dwellings
+
+def dwellings_to_array(dwellings):
+    """Convert `Dwelling` objects to an array of dwellings
+
+    Arguments
+    ----------
+    dwellings : list
+        List containing all dwelling objects
+
+    Returns
+    -------
+    dwellings_array : array
+        Dwellings (see `DWELLING_DTYPE`)
+    """
+    def get_values(attribute, default):
+        values = []
+        for dwelling in dwellings:
+            value = getattr(dwelling, attribute)
+            values.append(default if value is None else value)
+        return values
+
+    return create_dwellings(
+        floorarea=get_values('floorarea', np.nan),
+        population=get_values('population', np.nan),
+        age=get_values('age', np.nan),
+        dwtype=get_values('dwtype', ''),
+        sector_type=get_values('sector_type', ''),
+        gva=get_values('gva', np.nan))
+
+def calc_scenario_drivers(dwellings, enduses, driver_assumptions):
+    """Calculate the scenario driver of every
+    enduse and dwelling (see `Dwelling.calc_scenario_driver`)
+
+    Arguments
+    ----------
+    dwellings : array
+        Dwellings (see `DWELLING_DTYPE`)
+    enduses : list
+        Enduses
+    driver_assumptions : dict
+        Scenario drivers for every enduse
+
+    Returns
+    -------
+    scenario_drivers : array
+        Scenario driver of every enduse and dwelling (enduses, dwellings)
+
+    Note
+    ----
+    If a scenario driver of a dwelling is not defined (`np.nan`),
+    this and all following scenario drivers of the enduse are
+    not multiplied (as in `Dwelling.calc_scenario_driver`).
+    """
+    scenario_drivers = np.ones((len(enduses), len(dwellings)), dtype=float)
+
+    for enduse_nr, enduse in enumerate(enduses):
+        if enduse in driver_assumptions:
+            defined = np.ones((len(dwellings)), dtype=bool)
+
+            for scenario_driver in driver_assumptions[enduse]:
+                driver_values = dwellings[scenario_driver]
+                defined &= ~np.isnan(driver_values)
+
+                scenario_drivers[enduse_nr] *= np.where(defined, driver_values, 1)
+
+    assert np.all(scenario_drivers != 0)
+
+    return scenario_drivers
+
+def calc_reg_scenario_drivers(
+        dwellings,
+        reg_array_nrs,
+        nr_of_regions,
+        enduses,
+        driver_assumptions
+    ):
+    """Calculate the summed scenario driver of every
+    region and enduse with the dwellings of all regions
+
+    Arguments
+    ----------
+    dwellings : array
+        Dwellings of all regions (see `DWELLING_DTYPE`)
+    reg_array_nrs : array
+        Region position of every dwelling
+    nr_of_regions : int
+        Number of regions
+    enduses : list
+        Enduses
+    driver_assumptions : dict
+        Scenario drivers for every enduse
+
+    Returns
+    -------
+    reg_scenario_drivers : array
+        Scenario driver of every region and enduse (regions, enduses)
+    """
+    scenario_drivers = calc_scenario_drivers(dwellings, enduses, driver_assumptions)
+
+    reg_scenario_drivers = np.zeros((nr_of_regions, len(enduses)), dtype=float)
+    np.add.at(reg_scenario_drivers, reg_array_nrs, scenario_drivers.T)
+
+    return reg_scenario_drivers
+
 def get_tot_pop(dwellings):
     """Get total population of all dwellings
 
+    Arguments
+    ----------
+    dwellings : array
+        Dwellings (see `DWELLING_DTYPE`)
+
     Return
     ------
     tot_pop : float or bool
         If population is not provided, return `None`,
         otherwise summed population of all dwellings
     """
-    tot_pop = 0
-
-    for dwelling in dwellings:
-        if dwelling.population is None:
-            return None
-        else:
-            tot_pop += dwelling.population
+    population = dwellings['population']
 
-    return tot_pop
+    if np.any(np.isnan(population)):
+        return None
+    else:
+        return float(np.sum(population))
 
 def get_floorare_pp(
         floorarea,
@@ -456,15 +641,15 @@ def ss_dw_stock(
 
     Returns
     -------
-    dwelling_stock : list
-        List with objects
+    dwelling_stock : object
+        Dwelling stock of the service sector
 
     Note
     ----
     - Iterate years and change floor area depending on assumption on
       linear change up to ey
     """
-    dw_stock = []
+    floorarea_sectors_cy = []
     for sector in sectors:
 
         # If virtual building stock, change floor area proportionally to population
@@ -507,24 +692,20 @@ def ss_dw_stock(
                 yr_until_changed)
 
         floorarea_sector_by = scenario_data['floor_area']['ss_floorarea'][base_yr][region][sector]
-        floorarea_sector_cy = floorarea_sector_by * lin_diff_factor
+        floorarea_sectors_cy.append(floorarea_sector_by * lin_diff_factor)
 
-        # create dwelling objects
-        dw_stock.append(
-            Dwelling(
-                curr_yr=curr_yr,
-                coordinates=reg_coord[region],
-                floorarea=floorarea_sector_cy,
-                enduses=enduses,
-                driver_assumptions=assumptions.scenario_drivers['ss_submodule'],
-                sector_type=sector,
-                gva=scenario_data['gva'][curr_yr][region]))
+    # Create dwellings
+    dwellings = create_dwellings(
+        floorarea=floorarea_sectors_cy,
+        sector_type=sectors,
+        gva=scenario_data['gva'][curr_yr][region])
 
     # Add regional base year dwelling to dwelling stock
     dwelling_stock = DwellingStock(
         region,
-        dw_stock,
-        enduses)
+        dwellings,
+        enduses,
+        assumptions.scenario_drivers['ss_submodule'])
 
     return dwelling_stock
 
@@ -633,10 +814,7 @@ def rs_dw_stock(
     # Only calculate changing
     if curr_yr == base_yr:
         dw_stock_base = generate_dw_existing(
-            driver_assumptions=driver_assumptions,
             scenario_data=scenario_data,
-            enduses=enduses,
-            reg_coord=reg_coord,
             region=region,
             curr_yr=curr_yr,
             dw_lu=dwelling_types,
@@ -651,7 +829,8 @@ def rs_dw_stock(
         dwelling_stock = DwellingStock(
             region,
             dw_stock_base,
-            enduses)
+            enduses,
+            driver_assumptions)
     else:
         """The number of people in the base year dwelling stock may change.
         If the floor area pp decreased with constant pop, the same number of
@@ -672,10 +851,7 @@ def rs_dw_stock(
 
         # Generate stock for existing area
         dw_stock_cy = generate_dw_existing(
-            driver_assumptions=driver_assumptions,
             scenario_data=scenario_data,
-            enduses=enduses,
-            reg_coord=reg_coord,
             region=region,
             curr_yr=curr_yr,
             dw_lu=dwelling_types,
@@ -688,18 +864,16 @@ def rs_dw_stock(
 
         # Append buildings of new floor area to
         if new_floorarea_cy > 0:
-            dw_stock_cy = generate_dw_new(
-                driver_assumptions=driver_assumptions,
+            dw_stock_new_dw = generate_dw_new(
                 scenario_data=scenario_data,
-                reg_coord=reg_coord,
-                enduses=enduses,
                 dwtypes=dwelling_types,
                 region=region,
                 curr_yr=curr_yr,
                 floorarea_p_by=floorarea_p[curr_yr],
                 floorarea_pp_cy=floorarea_pp_cy,
-                dw_stock_new_dw=dw_stock_cy,
                 new_floorarea_cy=new_floorarea_cy)
+
+            dw_stock_cy = np.concatenate((dw_stock_cy, dw_stock_new_dw))
         else:
             pass # no new floor area is added
 
@@ -707,7 +881,8 @@ def rs_dw_stock(
         dwelling_stock = DwellingStock(
             region,
             dw_stock_cy,
-            enduses)
+            enduses,
+            driver_assumptions)
 
     return dwelling_stock
 
@@ -757,10 +932,7 @@ def get_floorarea_dwtype_p(dw_lookup, dw_floorarea, dwtype_distr):
     return dw_floorarea_p
 
 def generate_dw_existing(
-        driver_assumptions,
         scenario_data,
-        enduses,
-        reg_coord,
         region,
         curr_yr,
         dw_lu,
@@ -776,12 +948,8 @@ def generate_dw_existing(
 
     Arguments
     ----------
-    assumptions : dict
-        Assumptions
     scenario_data : dict
         Scenario data
-    enduses : list
-        Enduses
     region : dict
         Region name
     curr_yr : int
@@ -803,77 +971,57 @@ def generate_dw_existing(
 
     Return
     ------
-    dw_stock_by : list
-        Dwelling stocks in a list
+    dw_stock_by : array
+        Dwellings of every dwelling type and age class (see `DWELLING_DTYPE`)
     """
-    dw_stock_by, control_pop, control_floorarea = [], 0, 0
-
-    # Iterate dwelling types
-    for dwtype_name in dw_lu.values():
+    dwtypes = list(dw_lu.values())
+    dwtype_ages = list(dwtype_age_distr_by.keys())
 
-        # Calculate floor area per dwelling type
-        dwtype_floorarea = floorarea_p[dwtype_name] * floorarea_by
+    # Floor area of every dwelling type and age class (distribute proportionally floor area)
+    dwtype_floorarea = np.array([floorarea_p[dwtype_name] * floorarea_by for dwtype_name in dwtypes])
+    age_distr = np.array([dwtype_age_distr_by[dwtype_age] for dwtype_age in dwtype_ages])
+    dwtype_age_class_floorarea = np.outer(dwtype_floorarea, age_distr).ravel()
 
-        # Distribute according to age
-        for dwtype_age in dwtype_age_distr_by.keys():
+    # Floor area per person is divided by base area value to calc pop
+    if floorarea_pp != 0:
+        pop_dwtype_age_class = dwtype_age_class_floorarea / floorarea_pp
+    else:
+        pop_dwtype_age_class = np.zeros_like(dwtype_age_class_floorarea)
 
-            # Floor area of dwelling_class_age (distribute proportionally floor area)
-            dwtype_age_class_floorarea = dwtype_floorarea * dwtype_age_distr_by[dwtype_age]
-
-            # Floor area per person is divided by base area value to calc pop
-            if floorarea_pp != 0:
-                pop_dwtype_age_class = dwtype_age_class_floorarea / floorarea_pp
-            else:
-                pop_dwtype_age_class = 0
-
-            # create building object
-            dw_stock_by.append(
-                Dwelling(
-                    curr_yr=curr_yr,
-                    coordinates=reg_coord[region],
-                    floorarea=dwtype_age_class_floorarea,
-                    enduses=enduses,
-                    driver_assumptions=driver_assumptions,
-                    population=pop_dwtype_age_class,
-                    age=float(dwtype_age),
-                    dwtype=dwtype_name,
-                    gva=scenario_data['gva'][curr_yr][region]))
-
-            control_floorarea += dwtype_age_class_floorarea
-            control_pop += pop_dwtype_age_class
+    dw_stock_by = create_dwellings(
+        floorarea=dwtype_age_class_floorarea,
+        population=pop_dwtype_age_class,
+        age=np.tile(np.array(dwtype_ages, dtype=float), len(dwtypes)),
+        dwtype=np.repeat(dwtypes, len(dwtype_ages)),
+        gva=scenario_data['gva'][curr_yr][region])
 
     #Testing
     '''np.testing.assert_array_almost_equal(
         tot_floorarea_cy,
-        control_floorarea,
+        np.sum(dw_stock_by['floorarea']),
         decimal=3,
-        err_msg="ERROR: in dwelling stock {} ---  {}".format(tot_floorarea_cy, control_floorarea))
-    np.testing.assert_array_almost_equal(pop_by, control_pop, decimal=3, err_msg="Error NR XXX")'''
+        err_msg="ERROR: in dwelling stock {}".format(tot_floorarea_cy))
+    np.testing.assert_array_almost_equal(pop_by, np.sum(dw_stock_by['population']), decimal=3, err_msg="Error NR XXX")'''
 
     return dw_stock_by
 
 def generate_dw_new(
-        driver_assumptions,
         scenario_data,
-        reg_coord,
-        enduses,
         dwtypes,
         region,
         curr_yr,
         floorarea_p_by,
         floorarea_pp_cy,
-        dw_stock_new_dw,
         new_floorarea_cy
     ):
-    """Generate dwelling objects for all new dwellings
-
-    All new dwellings are appended to the existing
-    building stock of the region
+    """Generate dwellings for all new dwellings
 
     Arguments
     ----------
-    data : dict
-        Data container
+    scenario_data : dict
+        Scenario data
+    dwtypes : dict
+        Dwelling type look-up
     region : str
         Region
     curr_yr : int
@@ -882,15 +1030,13 @@ def generate_dw_new(
         Fraction of floorarea in base year
     floorarea_pp_cy : dict
         Floor area per person in current year
-    dw_stock_new_dw : dict
-        New dwellings
     new_floorarea_cy : dict
         New floorarea in current year
 
     Returns
     -------
-    dw_stock_new_dw : list
-        List with appended dwellings
+    dw_stock_new_dw : array
+        New dwellings of every dwelling type (see `DWELLING_DTYPE`)
 
     Notes
     -----
@@ -898,32 +1044,21 @@ def generate_dw_new(
     Then the population is distributed
     builindg is creatd
     """
-    control_pop, control_floorarea = 0, 0
+    dwtype_names = list(dwtypes.values())
 
-    # Iterate dwelling types
-    for dwtype_name in dwtypes.values():
+    # Calculate new floor area per dewlling type
+    dw_type_new_floorarea = np.array(
+        [floorarea_p_by[dwtype_name] for dwtype_name in dwtype_names]) * new_floorarea_cy
 
-        # Calculate new floor area per dewlling type
-        dw_type_new_floorarea = floorarea_p_by[dwtype_name] * new_floorarea_cy
+    # Calculate pop (Floor area is divided by floorarea_per_person)
+    pop_dwtype_new_build_cy = dw_type_new_floorarea / floorarea_pp_cy
 
-        # Calculate pop (Floor area is divided by floorarea_per_person)
-        pop_dwtype_new_build_cy = dw_type_new_floorarea / floorarea_pp_cy
-
-        # create building object
-        dw_stock_new_dw.append(
-            Dwelling(
-                curr_yr=curr_yr,
-                coordinates=reg_coord[region],
-                floorarea=dw_type_new_floorarea,
-                enduses=enduses,
-                driver_assumptions=driver_assumptions,
-                population=pop_dwtype_new_build_cy,
-                age=curr_yr,
-                dwtype=dwtype_name,
-                gva=scenario_data['gva'][curr_yr][region]))
-
-        control_floorarea += dw_type_new_floorarea
-        control_pop += pop_dwtype_new_build_cy
+    dw_stock_new_dw = create_dwellings(
+        floorarea=dw_type_new_floorarea,
+        population=pop_dwtype_new_build_cy,
+        age=curr_yr,
+        dwtype=dwtype_names,
+        gva=scenario_data['gva'][curr_yr][region])
 
     # Test if floor area and pop are the same
     #assert round(new_floorarea_cy, 3) == round(control_floorarea, 3)
@@ -967,3 +1102,29 @@ def get_hlc(dw_type, age):
     hlc = linear_fits_hlc[dw_type][0] * age + linear_fits_hlc[dw_type][1]
 
     return hlc
+
+def get_hlc_dwellings(dwtypes, ages):
+    """Calculates the heat loss coefficients of
+    all dwellings (see `get_hlc`)
+
+    Arguments
+    ----------
+    dwtypes : array
+        Dwelling type of every dwelling
+    ages : array
+        Age of every dwelling
+
+    Returns
+    -------
+    hlc : array
+        Heat loss coefficient of every dwelling (`np.nan`
+        if the dwelling type or age is not defined)
+    """
+    hlc = np.full((len(ages)), np.nan)
+
+    for dw_type in np.unique(dwtypes):
+        if dw_type != '':
+            dwtype_dwellings = dwtypes == dw_type
+            hlc[dwtype_dwellings] = get_hlc(dw_type, ages[dwtype_dwellings])
+
+    return hlc
@@ -0,0 +1,985 @@
+"""Contains the `EnduseBatch` Class. The annual cascade of the `Enduse`
+Class is calculated for a single enduse (and sector) for many regions
+at once. Fuels are stored as arrays with a leading region dimension,
+e.g. (regions, fueltypes) or (regions, fueltypes, yeardays, 24).
+"""
+import logging
+import numpy as np
+from energy_demand import enduse_func
+from energy_demand import enduse_factors
+from energy_demand.profiles import load_profile as lp
+from energy_demand.technologies import diffusion_technologies
+from energy_demand.technologies import fuel_service_switch
+from energy_demand.technologies import tech_related
+
+class EnduseBatch(object):
+    """Enduse calculations for all regions of a single enduse and sector
+
+    The same calculations as in `enduse_func.Enduse` are performed,
+    but every step operates on arrays over all regions. The Python
+    overhead therefore depends on the number of technologies and
+    weather regions, not on the number of regions.
+
+    Arguments
+    ----------
+    submodel : str
+        Submodel
+    regions : list
+        Region names
+    scenario_data : dict
+        Scenario data
+    assumptions : dict
+        Assumptions
+    regional_lp_stocks : list
+        Load profile stock of every weather region
+    non_regional_lp_stock : dict
+        Load profile stock
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    enduse : str
+        Enduse name
+    sector : str
+        Sector name
+    fuels : array
+        Yearly fuel of every region (regions, fueltypes)
+    tech_stocks : list
+        Technology stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region (in `tech_stocks`,
+        `regional_lp_stocks`, `heating_factor_y`, `cooling_factor_y`)
+        of every region
+    heating_factor_y : array
+        Heating climate change factor of every weather region
+    cooling_factor_y : array
+        Cooling climate change factor of every weather region
+    fuel_fueltype_tech_p_by : dict
+        Fuel tech assumtions in base year
+    sig_param_tech : dict or list
+        Sigmoid parameters (a list with the parameters of
+        every region if spatially explicit diffusion)
+    enduse_overall_change : dict
+        Assumptions related to overal change in endyear
+    criterias : dict
+        Criterias
+    strategy_variables : dict
+        Strategy variables. The ``scenario_value`` of a strategy variable
+        is either a single value or an array with the value of every
+        region (see `RegionalStrategyVariables.get_regions_strategy_variables`)
+    fueltypes_nr : int
+        Number of fueltypes
+    fueltypes : dict
+        Fueltypes lookup
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+    dw_stocks : list, default=False
+        Dwelling stock of every region
+    reg_scen_drivers : bool,default=None
+        Scenario drivers per enduse
+    flat_profile_crit : bool,default=False
+        Criteria of enduse has a flat shape or not
+    driver_factors : array, default=None
+        Precalculated scenario driver factor of every region
+
+    Note
+    ----
+    - ``self.fuel_y`` is (regions, fueltypes). Depending on the
+      configuration, either ``self.fuel_yh`` (regions, fueltypes,
+      yeardays, 24) or ``self.techs_fuel_yh`` ({tech: (regions, yeardays, 24)})
+      is calculated. For regions without any fuel all values are zero.
+
+    - Technologies without fuel are not removed from ``self.enduse_techs``
+      because they may have fuel in other regions.
+    """
+    def __init__(
+            self,
+            submodel,
+            regions,
+            scenario_data,
+            assumptions,
+            regional_lp_stocks,
+            non_regional_lp_stock,
+            base_yr,
+            curr_yr,
+            enduse,
+            sector,
+            fuels,
+            tech_stocks,
+            reg_weather_region_nrs,
+            heating_factor_y,
+            cooling_factor_y,
+            fuel_fueltype_tech_p_by,
+            sig_param_tech,
+            enduse_overall_change,
+            criterias,
+            strategy_variables,
+            fueltypes_nr,
+            fueltypes,
+            model_yeardays_nrs,
+            dw_stocks=False,
+            reg_scen_drivers=None,
+            flat_profile_crit=False,
+            driver_factors=None
+        ):
+        """EnduseBatch class constructor
+        """
+        self.regions = regions
+        self.enduse = enduse
+        self.sector = sector
+        self.fuel_y = np.array(fuels, dtype=float)
+        self.flat_profile_crit = flat_profile_crit
+        self.fuel_yh = None
+        self.techs_fuel_yh = None
+
+        reg_weather_region_nrs = np.asarray(reg_weather_region_nrs, dtype=int)
+        nr_of_regions = len(regions)
+
+        if np.sum(self.fuel_y) == 0:
+            self.flat_profile_crit = True
+            self.fuel_yh = 0
+            self.enduse_techs = []
+        else:
+            # Load profile stock of every weather region
+            if enduse in non_regional_lp_stock.stock_enduses:
+                load_profiles = [non_regional_lp_stock] * len(tech_stocks)
+            else:
+                load_profiles = regional_lp_stocks
+
+            self.enduse_techs = enduse_func.get_enduse_techs(fuel_fueltype_tech_p_by)
+
+            # Number of days represented by every modelled day
+            yearday_weights = getattr(assumptions, 'yearday_weights', None)
+
+            # -------------------------------
+            # Cascade of calculations on a yearly scale
+            # --------------------------------
+            self.fuel_y = enduse_func.apply_climate_change(
+                enduse,
+                self.fuel_y,
+                np.asarray(cooling_factor_y, dtype=float)[reg_weather_region_nrs][:, np.newaxis],
+                np.asarray(heating_factor_y, dtype=float)[reg_weather_region_nrs][:, np.newaxis],
+                assumptions.enduse_space_heating,
+                assumptions.ss_enduse_space_cooling)
+
+            self.fuel_y = apply_driver_factors(
+                self.fuel_y,
+                enduse_factors.get_smart_meter_factors(
+                    enduse,
+                    assumptions.smart_meter_assump,
+                    strategy_variables,
+                    base_yr,
+                    curr_yr,
+                    nr_of_regions))
+
+            self.fuel_y = apply_driver_factors(
+                self.fuel_y,
+                enduse_factors.get_specific_change_factors(
+                    enduse,
+                    enduse_overall_change,
+                    strategy_variables,
+                    base_yr,
+                    curr_yr,
+                    nr_of_regions))
+
+            if driver_factors is None:
+                driver_factors = get_scenario_driver_factors(
+                    enduse,
+                    regions,
+                    dw_stocks,
+                    scenario_data['gva'],
+                    scenario_data['population'],
+                    reg_scen_drivers,
+                    base_yr,
+                    curr_yr)
+            self.fuel_y = apply_driver_factors(self.fuel_y, driver_factors)
+
+            self.fuel_y = apply_driver_factors(
+                self.fuel_y,
+                enduse_factors.get_cooling_factors(
+                    enduse,
+                    strategy_variables,
+                    assumptions.cooled_ss_floorarea_by,
+                    enduse_overall_change['other_enduse_mode_info'],
+                    base_yr,
+                    curr_yr,
+                    nr_of_regions))
+
+            self.fuel_y = apply_driver_factors(
+                self.fuel_y,
+                enduse_factors.get_industry_change_factors(
+                    enduse,
+                    sector,
+                    base_yr,
+                    curr_yr,
+                    strategy_variables,
+                    enduse_overall_change['other_enduse_mode_info'],
+                    assumptions,
+                    nr_of_regions))
+
+            # ----------------------------------
+            # Hourly Disaggregation
+            # ----------------------------------
+            if self.enduse_techs == []:
+                if flat_profile_crit:
+                    # Representative days: flat shape is weighted (see `model.get_fuels_yh`)
+                    if yearday_weights is None:
+                        self.fuel_y = self.fuel_y * model_yeardays_nrs / 365.0
+                else:
+                    self.fuel_yh = assign_lp_no_techs(
+                        enduse,
+                        sector,
+                        load_profiles,
+                        reg_weather_region_nrs,
+                        self.fuel_y,
+                        yearday_weights)
+            else:
+                mode_constrained = enduse_func.get_enduse_configuration(
+                    criterias['mode_constrained'],
+                    enduse,
+                    assumptions.enduse_space_heating)
+
+                _, s_tech_y_cy = fuel_to_service(
+                    enduse,
+                    self.fuel_y,
+                    fuel_fueltype_tech_p_by,
+                    tech_stocks,
+                    reg_weather_region_nrs,
+                    fueltypes,
+                    mode_constrained)
+
+                service_factors = enduse_factors.get_heat_recovery_factors(
+                    enduse,
+                    strategy_variables,
+                    assumptions.enduse_overall_change,
+                    base_yr,
+                    curr_yr,
+                    nr_of_regions) * enduse_factors.get_air_leakage_factors(
+                        enduse,
+                        strategy_variables,
+                        assumptions.enduse_overall_change,
+                        base_yr,
+                        curr_yr,
+                        nr_of_regions)
+
+                for tech in s_tech_y_cy:
+                    s_tech_y_cy[tech] = s_tech_y_cy[tech] * service_factors
+
+                s_tech_y_cy = calc_service_switch(
+                    enduse,
+                    s_tech_y_cy,
+                    self.enduse_techs,
+                    sig_param_tech,
+                    curr_yr,
+                    base_yr,
+                    sector,
+                    assumptions.crit_switch_happening)
+
+                self.fuel_y, fuel_tech_y = service_to_fuel(
+                    enduse,
+                    s_tech_y_cy,
+                    tech_stocks,
+                    reg_weather_region_nrs,
+                    fueltypes_nr,
+                    fueltypes,
+                    mode_constrained)
+
+                if self.flat_profile_crit:
+                    self.fuel_y = calc_fuel_tech_y(
+                        enduse,
+                        tech_stocks,
+                        fuel_tech_y,
+                        fueltypes_nr,
+                        fueltypes,
+                        mode_constrained)
+                else:
+                    fuel_yh = calc_fuel_tech_yh(
+                        enduse,
+                        sector,
+                        self.enduse_techs,
+                        fuel_tech_y,
+                        load_profiles,
+                        reg_weather_region_nrs,
+                        fueltypes_nr,
+                        fueltypes,
+                        model_yeardays_nrs,
+                        mode_constrained,
+                        yearday_weights)
+
+                    # --------------------------------------
+                    # Demand Management (peak shaving)
+                    # ---------------------------------------
+                    if mode_constrained:
+                        self.techs_fuel_yh = {}
+                        for tech in fuel_yh:
+                            self.techs_fuel_yh[tech] = demand_management(
+                                enduse,
+                                base_yr,
+                                curr_yr,
+                                strategy_variables,
+                                fuel_yh[tech],
+                                mode_constrained=True)
+                    else:
+                        self.fuel_yh = demand_management(
+                            enduse,
+                            base_yr,
+                            curr_yr,
+                            strategy_variables,
+                            fuel_yh,
+                            mode_constrained=False)
+
+class EnduseBatchRegion(object):
+    """Results of a single region of an `EnduseBatch`. The
+    attributes are the same as of `enduse_func.Enduse`, so
+    the results can be aggregated with `model.aggregate_final_results`
+
+    Arguments
+    ----------
+    enduse_batch : EnduseBatch
+        Enduse calculated for all regions
+    reg_array_nr : int
+        Position of the region in ``enduse_batch.regions``
+    """
+    def __init__(self, enduse_batch, reg_array_nr):
+        """Constructor
+        """
+        self.region = enduse_batch.regions[reg_array_nr]
+        self.enduse = enduse_batch.enduse
+        self.sector = enduse_batch.sector
+        self.flat_profile_crit = enduse_batch.flat_profile_crit
+        self.enduse_techs = enduse_batch.enduse_techs
+        self.fuel_factors = None
+        self.fuel_y = enduse_batch.fuel_y[reg_array_nr]
+
+        if isinstance(enduse_batch.fuel_yh, np.ndarray):
+            self.fuel_yh = enduse_batch.fuel_yh[reg_array_nr]
+        else:
+            self.fuel_yh = enduse_batch.fuel_yh
+
+        if enduse_batch.techs_fuel_yh is None:
+            self.techs_fuel_yh = None
+        else:
+            self.techs_fuel_yh = dict(
+                (tech, fuel_tech_yh[reg_array_nr])
+                for tech, fuel_tech_yh in enduse_batch.techs_fuel_yh.items())
+
+def get_scenario_driver_factors(
+        enduse,
+        regions,
+        dw_stocks,
+        gva,
+        population,
+        reg_scen_drivers,
+        base_yr,
+        curr_yr,
+        scenario_driver_tensor=None
+    ):
+    """Calculate the scenario driver factor of every region.
+    This is the same factor as applied in `enduse_func.apply_scenario_drivers`
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    regions : list
+        Regions
+    dw_stocks : list or bool
+        Dwelling stocks of every region
+    gva, population : dict
+        Scenario data
+    reg_scen_drivers : dict
+        Scenario drivers per enduse
+    base_yr, curr_yr : int
+        Base and current year
+    scenario_driver_tensor : ScenarioDriverTensor, default=None
+        Scenario drivers of all regions (used if no dwelling stocks)
+
+    Returns
+    -------
+    driver_factors : array
+        Factor of every region (regions)
+    """
+    if not dw_stocks and scenario_driver_tensor is not None:
+        all_driver_factors = scenario_driver_tensor.get_driver_factors(
+            reg_scen_drivers[enduse], base_yr, curr_yr)
+        reg_nrs = [scenario_driver_tensor.regions[region] for region in regions]
+
+        return all_driver_factors[reg_nrs]
+
+    driver_factors = np.ones((len(regions)), dtype=float)
+
+    for reg_array_nr, region in enumerate(regions):
+        if dw_stocks:
+            dw_stock = dw_stocks[reg_array_nr]
+        else:
+            dw_stock = False
+
+        # Factor is calculated with a fuel of one
+        driver_factors[reg_array_nr] = enduse_func.apply_scenario_drivers(
+            None,
+            enduse,
+            None,
+            1.0,
+            dw_stock,
+            region,
+            gva,
+            population,
+            None,
+            reg_scen_drivers,
+            base_yr,
+            curr_yr)
+
+    return driver_factors
+
+def apply_driver_factors(fuels, driver_factors):
+    """Multiply the fuel of every region with its scenario driver factor
+
+    Arguments
+    ---------
+    fuels : array
+        Fuel per region and fueltype (regions, fueltypes)
+    driver_factors : array
+        Factor of every region (regions)
+
+    Returns
+    -------
+    fuels : array
+        Changed fuels (regions, fueltypes)
+    """
+    return fuels * driver_factors[:, np.newaxis]
+
+def get_tech_attr_regs(enduse, tech, attribute_to_get, tech_stocks, reg_weather_region_nrs):
+    """Get an attribute of a technology for every region
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    tech : str
+        Technology
+    attribute_to_get : str
+        Technology attribute
+    tech_stocks : list
+        Technology stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+
+    Returns
+    -------
+    attribute_regs : array
+        Attribute of every region (regions)
+    """
+    attribute_weather_regs = np.array([
+        tech_stock.get_tech_attr(enduse, tech, attribute_to_get) for tech_stock in tech_stocks])
+
+    return attribute_weather_regs[reg_weather_region_nrs]
+
+def fuel_to_service(
+        enduse,
+        fuels,
+        fuel_fueltype_tech_p_by,
+        tech_stocks,
+        reg_weather_region_nrs,
+        fueltypes,
+        mode_constrained
+    ):
+    """Converts fuel to energy service for every region
+    (see `enduse_func.fuel_to_service`)
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    fuels : array
+        Fuel per region and fueltype (regions, fueltypes)
+    fuel_fueltype_tech_p_by : dict
+        Fuel composition of base year for every fueltype
+    tech_stocks : list
+        Technology stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    fueltypes : dict
+        Fueltype look-up
+    mode_constrained : bool
+        Criteria about mode
+
+    Return
+    ------
+    s_tot_y : array
+        Total annual energy service of every region (regions)
+    s_tech_y : dict
+        Total annual energy service per technology {tech: (regions)}
+    """
+    s_tech_y = {}
+    s_tot_y = 0
+
+    for fueltype_int, tech_list in fuel_fueltype_tech_p_by.items():
+
+        if tech_list == {} and np.all(fuels[:, fueltype_int] == 0):
+            techs_with_fuel = {}
+        elif tech_list == {}:
+            fueltype_str = tech_related.get_fueltype_str(fueltypes, fueltype_int)
+            placeholder_tech = 'placeholder_tech__{}'.format(fueltype_str)
+            techs_with_fuel = {placeholder_tech: 1.0}
+        else:
+            techs_with_fuel = tech_list
+
+        for tech, fuel_share in techs_with_fuel.items():
+            if mode_constrained:
+                tech_eff = get_tech_attr_regs(
+                    enduse, tech, 'eff_by', tech_stocks, reg_weather_region_nrs)
+
+                s_tech = fuels[:, fueltype_int] * fuel_share * tech_eff
+            else:
+                s_tech = fuels[:, fueltype_int] * fuel_share
+
+            s_tech_y[tech] = s_tech
+            s_tot_y += s_tech
+
+    return s_tot_y, s_tech_y
+
+def get_service_diffusion(sig_param_tech, tech, curr_yr, nr_of_regions):
+    """Calculate energy service fraction of a technology for every
+    region (see `enduse_func.get_service_diffusion`)
+
+    Arguments
+    ----------
+    sig_param_tech : dict or list
+        Sigmoid diffusion parameters per technology (list for every region)
+    tech : str
+        Technology
+    curr_yr : dict
+        Current year
+    nr_of_regions : int
+        Number of regions
+
+    Returns
+    -------
+    s_tech_p : array
+        Share of service of every region (regions)
+    identical_crit : array
+        True for regions where the service stays identical (linear)
+    """
+    if isinstance(sig_param_tech, dict):
+        s_tech_p = enduse_func.get_service_diffusion(sig_param_tech[tech], curr_yr)
+
+        if s_tech_p == 'identical':
+            return np.zeros((nr_of_regions), dtype=float), np.ones((nr_of_regions), dtype=bool)
+        else:
+            return np.full((nr_of_regions), s_tech_p, dtype=float), np.zeros((nr_of_regions), dtype=bool)
+    else:
+        l_values = np.zeros((nr_of_regions), dtype=float)
+        midpoints = np.zeros((nr_of_regions), dtype=float)
+        steepnesses = np.zeros((nr_of_regions), dtype=float)
+        identical_crit = np.zeros((nr_of_regions), dtype=bool)
+
+        for reg_array_nr, reg_sig_param_tech in enumerate(sig_param_tech):
+            l_parameter = reg_sig_param_tech[tech]['l_parameter']
+
+            if l_parameter is None:
+                pass
+            elif l_parameter == 'linear':
+                identical_crit[reg_array_nr] = True
+            else:
+                l_values[reg_array_nr] = l_parameter
+                midpoints[reg_array_nr] = reg_sig_param_tech[tech]['midpoint']
+                steepnesses[reg_array_nr] = reg_sig_param_tech[tech]['steepness']
+
+        s_tech_p = diffusion_technologies.sigmoid_function(
+            curr_yr, l_values, midpoints, steepnesses)
+
+        return s_tech_p, identical_crit
+
+def calc_service_switch(
+        enduse,
+        s_tech_y_cy,
+        all_technologies,
+        sig_param_tech,
+        curr_yr,
+        base_yr,
+        sector,
+        crit_switch_happening
+    ):
+    """Apply change in service depending on defined service
+    switches for every region (see `enduse_func.calc_service_switch`)
+
+    Arguments
+    ---------
+    s_tech_y_cy : dict
+        Service per technology {tech: (regions)}
+    all_technologies : dict
+        Technologies to iterate
+    sig_param_tech : dict or list
+        Sigmoid diffusion parameters
+    curr_yr : int
+        Current year
+
+    Returns
+    -------
+    switched_s_tech_y_cy : dict
+        Service per technology in current year after switch {tech: (regions)}
+    """
+    crit_switch_service = fuel_service_switch.get_switch_criteria(
+        enduse,
+        sector,
+        crit_switch_happening,
+        base_yr,
+        curr_yr)
+
+    if crit_switch_service:
+        switched_s_tech_y_cy = {}
+
+        service_all_techs = sum(s_tech_y_cy.values())
+
+        for tech in all_technologies:
+            s_tech_cy_p, identical_crit = get_service_diffusion(
+                sig_param_tech, tech, curr_yr, service_all_techs.shape[0])
+
+            switched_s_tech_y_cy[tech] = np.where(
+                identical_crit,
+                s_tech_y_cy[tech],
+                service_all_techs * s_tech_cy_p)
+
+            assert np.all(switched_s_tech_y_cy[tech] >= 0)
+
+        return switched_s_tech_y_cy
+    else:
+        return s_tech_y_cy
+
+def service_to_fuel(
+        enduse,
+        service_tech,
+        tech_stocks,
+        reg_weather_region_nrs,
+        fueltypes_nr,
+        fueltypes,
+        mode_constrained
+    ):
+    """Convert yearly energy service to yearly fuel demand
+    for every region (see `enduse_func.service_to_fuel`)
+
+    Arguments
+    ------
+    enduse : str
+        Enduse
+    service_tech : dict
+        Service per technology {tech: (regions)}
+    tech_stocks : list
+        Technology stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    fueltypes_nr : int
+        Number of fueltypes
+    fueltypes : dict
+        Fueltypes
+    mode_constrained : bool
+        Mode running criteria
+
+    Returns
+    -------
+    fuels : array
+        Fuel per region and fueltype (regions, fueltypes)
+    fuel_tech_y : dict
+        Fuel per technology {tech: (regions)}
+    """
+    fuel_tech_y = {}
+    fuels = np.zeros((reg_weather_region_nrs.shape[0], fueltypes_nr), dtype=float)
+
+    if mode_constrained:
+        for tech, service in service_tech.items():
+            tech_eff = get_tech_attr_regs(
+                enduse, tech, 'eff_cy', tech_stocks, reg_weather_region_nrs)
+            fueltype_int = tech_stocks[0].get_tech_attr(enduse, tech, 'fueltype_int')
+
+            fuel = service / tech_eff
+
+            fuel_tech_y[tech] = fuel
+            fuels[:, fueltype_int] += fuel
+    else:
+        for tech, fuel_tech in service_tech.items():
+            fuels[:, fueltypes['heat']] += fuel_tech
+            fuel_tech_y[tech] = fuel_tech
+
+    return fuels, fuel_tech_y
+
+def calc_fuel_tech_y(
+        enduse,
+        tech_stocks,
+        fuel_tech_y,
+        fueltypes_nr,
+        fueltypes,
+        mode_constrained
+    ):
+    """Calculate yearly fuel per fueltype for every region
+    (see `enduse_func.calc_fuel_tech_y`)
+
+    Arguments
+    -----------
+    enduse : str
+        Enduse
+    tech_stocks : list
+        Technology stock of every weather region
+    fuel_tech_y : dict
+        Fuel per technology {tech: (regions)}
+    fueltypes_nr : int
+        Number of fueltypes
+    fueltype : dict
+        Integer of fueltypes
+    mode_constrained : bool
+        Running mode
+
+    Returns
+    -------
+    fuels : array
+        Fuel per region and fueltype (regions, fueltypes)
+    """
+    fuels = None
+
+    for tech, fuel_tech in fuel_tech_y.items():
+        if fuels is None:
+            fuels = np.zeros((fuel_tech.shape[0], fueltypes_nr), dtype=float)
+
+        if mode_constrained:
+            fueltype_int = tech_stocks[0].get_tech_attr(enduse, tech, 'fueltype_int')
+            fuels[:, fueltype_int] += fuel_tech
+        else:
+            fuels[:, fueltypes['heat']] += fuel_tech
+
+    return fuels
+
+def get_lp_regs(
+        enduse,
+        sector,
+        tech,
+        load_profiles,
+        reg_weather_region_nrs,
+        model_yeardays_nrs,
+        yearday_weights=None
+    ):
+    """Get the shape_yh of every weather region and the regions
+    which are assigned to the weather region
+
+    Arguments
+    ---------
+    enduse, sector, tech : str
+        Enduse, sector, technology
+    load_profiles : list
+        Load profile stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
+
+    Yields
+    ------
+    reg_array_nrs : array
+        Position of regions of weather region
+    shape_yh : array
+        Load profile (yeardays, 24)
+    """
+    for weather_region_nr, lp_stock in enumerate(load_profiles):
+        reg_array_nrs = np.where(reg_weather_region_nrs == weather_region_nr)[0]
+
+        if reg_array_nrs.shape[0] > 0:
+            shape_yh = lp_stock.get_lp(enduse, sector, tech, 'shape_yh')
+
+            if yearday_weights is not None:
+                shape_yh = lp.abs_to_rel_weighted(shape_yh, yearday_weights)
+            elif model_yeardays_nrs is not None and model_yeardays_nrs != 365:
+                shape_yh = lp.abs_to_rel(shape_yh)
+
+            yield reg_array_nrs, shape_yh
+
+def assign_lp_no_techs(
+        enduse,
+        sector,
+        load_profiles,
+        reg_weather_region_nrs,
+        fuels,
+        yearday_weights=None
+    ):
+    """Assign load profiles for an enduse which has no technologies
+    defined for every region (see `enduse_func.assign_lp_no_techs`)
+
+    Arguments
+    ---------
+    enduse, sector : str
+        Enduse, sector
+    load_profiles : list
+        Load profile stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    fuels : array
+        Fuel per region and fueltype (regions, fueltypes)
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
+
+    Returns
+    -------
+    fuel_yh : array
+        Fuel (regions, fueltypes, yeardays, 24)
+    """
+    fuel_yh = None
+
+    for reg_array_nrs, shape_yh in get_lp_regs(
+            enduse,
+            sector,
+            'placeholder_tech',
+            load_profiles,
+            reg_weather_region_nrs,
+            None,
+            yearday_weights):
+
+        if fuel_yh is None:
+            fuel_yh = np.zeros((fuels.shape[0], fuels.shape[1]) + shape_yh.shape, dtype=float)
+
+        fuel_yh[reg_array_nrs] = shape_yh * fuels[reg_array_nrs][:, :, np.newaxis, np.newaxis]
+
+    return fuel_yh
+
+def calc_fuel_tech_yh(
+        enduse,
+        sector,
+        enduse_techs,
+        enduse_fuel_tech,
+        load_profiles,
+        reg_weather_region_nrs,
+        fueltypes_nr,
+        fueltypes,
+        model_yeardays_nrs,
+        mode_constrained,
+        yearday_weights=None
+    ):
+    """Iterate fuels for each technology and assign shape yh for every region
+    (see `enduse_func.calc_fuel_tech_yh`)
+
+    Arguments
+    ----------
+    enduse, sector : str
+        Enduse, sector
+    enduse_techs : list
+        Technologies
+    enduse_fuel_tech : dict
+        Fuel per technology {tech: (regions)}
+    load_profiles : list
+        Load profile stock of every weather region
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    fueltypes_nr : dict
+        Nr of fueltypes
+    fueltypes : dict
+        Fueltypes lookup
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+    mode_constrained : bool
+        Mode criteria
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
+
+    Return
+    ------
+    fuels_yh : array or dict
+        Hourly fuel (regions, fueltypes, yeardays, 24) or per
+        technology {tech: (regions, yeardays, 24)}
+    """
+    nr_of_regions = reg_weather_region_nrs.shape[0]
+
+    if mode_constrained:
+        fuels_yh = {}
+        for tech in enduse_techs:
+            fuel_tech_yh = np.zeros((nr_of_regions, model_yeardays_nrs, 24), dtype=float)
+
+            for reg_array_nrs, shape_yh in get_lp_regs(
+                    enduse,
+                    sector,
+                    tech,
+                    load_profiles,
+                    reg_weather_region_nrs,
+                    model_yeardays_nrs,
+                    yearday_weights):
+                fuel_tech_yh[reg_array_nrs] = enduse_fuel_tech[tech][reg_array_nrs][:, np.newaxis, np.newaxis] * shape_yh
+
+            fuels_yh[tech] = fuel_tech_yh
+    else:
+        fuels_yh = np.zeros((nr_of_regions, fueltypes_nr, model_yeardays_nrs, 24), dtype=float)
+
+        for tech in enduse_techs:
+            for reg_array_nrs, shape_yh in get_lp_regs(
+                    enduse,
+                    sector,
+                    tech,
+                    load_profiles,
+                    reg_weather_region_nrs,
+                    model_yeardays_nrs,
+                    yearday_weights):
+                fuels_yh[reg_array_nrs, fueltypes['heat']] += enduse_fuel_tech[tech][reg_array_nrs][:, np.newaxis, np.newaxis] * shape_yh
+
+    return fuels_yh
+
+def demand_management(
+        enduse,
+        base_yr,
+        curr_yr,
+        strategy_variables,
+        fuel_yh,
+        mode_constrained
+    ):
+    """Demand management for every region (see `enduse_func.demand_management`)
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    base_yr, curr_yr : int
+        Base and current year
+    strategy_variables : dict
+        Assumptions of strategy variables
+    fuel_yh : array
+        Fuel per hours of every region
+    mode_constrained : bool
+        Running mode
+
+    Returns
+    -------
+    fuel_yh : array
+        Fuel of yh of every region
+    """
+    param_name = 'demand_management_improvement__{}'.format(enduse)
+    nr_of_regions = fuel_yh.shape[0]
+
+    try:
+        lf_improvements = enduse_factors.get_sample_values(
+            strategy_variables, param_name, nr_of_regions)
+    except KeyError:
+        lf_improvements = np.zeros((nr_of_regions), dtype=float)
+
+    if np.any(lf_improvements != 0):
+        logging.debug("... demand management for %s regions", nr_of_regions)
+
+        yrs_until_changed = enduse_factors.get_sample_values(
+            strategy_variables, 'demand_management_yr_until_changed', nr_of_regions)
+
+        # Load shifting depends on daily load factors of every region
+        for reg_array_nr in np.where(lf_improvements != 0)[0]:
+            reg_strategy_variables = {
+                param_name: {
+                    'scenario_value': lf_improvements[reg_array_nr]},
+                'demand_management_yr_until_changed': {
+                    'scenario_value': yrs_until_changed[reg_array_nr]}}
+
+            fuel_yh[reg_array_nr] = enduse_func.demand_management(
+                enduse,
+                base_yr,
+                curr_yr,
+                reg_strategy_variables,
+                fuel_yh[reg_array_nr],
+                None,
+                None,
+                None,
+                None,
+                None,
+                mode_constrained)
+
+    return fuel_yh
@@ -0,0 +1,301 @@
+"""Contains the `EnduseEnsemble` Class. The annual cascade of the
+`Enduse` Class is calculated for a single region and enduse for
+many samples of the strategy variables at once (e.g. for
+Monte-Carlo uncertainty analysis).
+
+Every strategy variable can either have a single ``scenario_value``
+or an array with a value of every sample (samples). Sampled strategy
+variables can be created with
+`scenario_sweep.get_scenario_strategy_variables`, e.g.::
+
+    strategy_variables = scenario_sweep.get_scenario_strategy_variables(
+        strategy_variables,
+        {'smart_meter_improvement_p': np.random.uniform(0, 0.8, 1000)})
+
+Fuels are stored as arrays with a leading sample dimension,
+e.g. (samples, fueltypes).
+"""
+import numpy as np
+from energy_demand import enduse_func
+from energy_demand import enduse_batch
+from energy_demand import enduse_factors
+
+class EnduseEnsemble(object):
+    """Annual enduse calculations of a single region and enduse
+    for all samples of the strategy variables
+
+    The same yearly calculations as in `enduse_func.Enduse` are
+    performed, but the strategy variable dependent steps operate
+    on arrays over all samples.
+
+    Arguments
+    ----------
+    submodel : str
+        Submodel
+    region : str
+        Region name
+    scenario_data : dict
+        Scenario data
+    assumptions : dict
+        Assumptions
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    enduse : str
+        Enduse name
+    sector : str
+        Sector name
+    fuel : array
+        Yearly fuel per fueltype
+    tech_stock : object
+        Technology stock of region
+    heating_factor_y : float
+        Heating climate change factor
+    cooling_factor_y : float
+        Cooling climate change factor
+    fuel_fueltype_tech_p_by : dict
+        Fuel tech assumtions in base year
+    sig_param_tech : dict
+        Sigmoid parameters
+    enduse_overall_change : dict
+        Assumptions related to overal change in endyear
+    criterias : dict
+        Criterias
+    strategy_variables : dict
+        Strategy variables with single or sampled scenario values
+    fueltypes_nr : int
+        Number of fueltypes
+    fueltypes : dict
+        Fueltypes lookup
+    nr_of_samples : int, default=None
+        Number of samples. If None, the number of samples
+        is taken from the sampled strategy variables
+    dw_stock : object,default=False
+        Dwelling stock
+    reg_scen_drivers : bool,default=None
+        Scenario drivers per enduse
+    driver_factor : float, default=None
+        Precalculated scenario driver factor
+
+    Note
+    ----
+    - ``self.fuel_y`` is (samples, fueltypes) and ``self.fuel_tech_y``
+      ({tech: (samples)}) is the fuel of every technology (None if
+      the enduse has no technologies).
+
+    - Only the yearly fuel is calculated. The hourly fuel of a sample
+      can be calculated by running `enduse_func.Enduse` with the
+      strategy variables of the sample.
+    """
+    def __init__(
+            self,
+            submodel,
+            region,
+            scenario_data,
+            assumptions,
+            base_yr,
+            curr_yr,
+            enduse,
+            sector,
+            fuel,
+            tech_stock,
+            heating_factor_y,
+            cooling_factor_y,
+            fuel_fueltype_tech_p_by,
+            sig_param_tech,
+            enduse_overall_change,
+            criterias,
+            strategy_variables,
+            fueltypes_nr,
+            fueltypes,
+            nr_of_samples=None,
+            dw_stock=False,
+            reg_scen_drivers=None,
+            driver_factor=None
+        ):
+        """EnduseEnsemble class constructor
+        """
+        self.region = region
+        self.enduse = enduse
+        self.sector = sector
+        self.fuel_tech_y = None
+
+        if nr_of_samples is None:
+            nr_of_samples = get_nr_of_samples(strategy_variables)
+        self.nr_of_samples = nr_of_samples
+
+        self.fuel_y = np.tile(np.array(fuel, dtype=float), (nr_of_samples, 1))
+
+        if np.sum(fuel) == 0:
+            self.enduse_techs = []
+        else:
+            self.enduse_techs = enduse_func.get_enduse_techs(fuel_fueltype_tech_p_by)
+
+            # -------------------------------
+            # Cascade of calculations on a yearly scale
+            # --------------------------------
+            self.fuel_y = enduse_func.apply_climate_change(
+                enduse,
+                self.fuel_y,
+                cooling_factor_y,
+                heating_factor_y,
+                assumptions.enduse_space_heating,
+                assumptions.ss_enduse_space_cooling)
+
+            self.fuel_y = apply_sample_factors(
+                self.fuel_y,
+                enduse_factors.get_smart_meter_factors(
+                    enduse,
+                    assumptions.smart_meter_assump,
+                    strategy_variables,
+                    base_yr,
+                    curr_yr,
+                    nr_of_samples))
+
+            self.fuel_y = apply_sample_factors(
+                self.fuel_y,
+                enduse_factors.get_specific_change_factors(
+                    enduse,
+                    enduse_overall_change,
+                    strategy_variables,
+                    base_yr,
+                    curr_yr,
+                    nr_of_samples))
+
+            if driver_factor is None:
+                driver_factor = enduse_batch.get_scenario_driver_factors(
+                    enduse,
+                    [region],
+                    [dw_stock] if dw_stock else False,
+                    scenario_data['gva'],
+                    scenario_data['population'],
+                    reg_scen_drivers,
+                    base_yr,
+                    curr_yr)[0]
+            self.fuel_y = self.fuel_y * driver_factor
+
+            self.fuel_y = apply_sample_factors(
+                self.fuel_y,
+                enduse_factors.get_cooling_factors(
+                    enduse,
+                    strategy_variables,
+                    assumptions.cooled_ss_floorarea_by,
+                    enduse_overall_change['other_enduse_mode_info'],
+                    base_yr,
+                    curr_yr,
+                    nr_of_samples))
+
+            self.fuel_y = apply_sample_factors(
+                self.fuel_y,
+                enduse_factors.get_industry_change_factors(
+                    enduse,
+                    sector,
+                    base_yr,
+                    curr_yr,
+                    strategy_variables,
+                    enduse_overall_change['other_enduse_mode_info'],
+                    assumptions,
+                    nr_of_samples))
+
+            if self.enduse_techs != []:
+                mode_constrained = enduse_func.get_enduse_configuration(
+                    criterias['mode_constrained'],
+                    enduse,
+                    assumptions.enduse_space_heating)
+
+                # The technology calculations of `EnduseBatch` are used
+                # with samples instead of regions as leading dimension
+                tech_stocks = [tech_stock]
+                sample_tech_stock_nrs = np.zeros((nr_of_samples), dtype=int)
+
+                s_tot_y_cy, s_tech_y_cy = enduse_batch.fuel_to_service(
+                    enduse,
+                    self.fuel_y,
+                    fuel_fueltype_tech_p_by,
+                    tech_stocks,
+                    sample_tech_stock_nrs,
+                    fueltypes,
+                    mode_constrained)
+
+                service_factors = enduse_factors.get_heat_recovery_factors(
+                    enduse,
+                    strategy_variables,
+                    assumptions.enduse_overall_change,
+                    base_yr,
+                    curr_yr,
+                    nr_of_samples) * enduse_factors.get_air_leakage_factors(
+                        enduse,
+                        strategy_variables,
+                        assumptions.enduse_overall_change,
+                        base_yr,
+                        curr_yr,
+                        nr_of_samples)
+
+                for tech in s_tech_y_cy:
+                    s_tech_y_cy[tech] = s_tech_y_cy[tech] * service_factors
+
+                s_tech_y_cy = enduse_batch.calc_service_switch(
+                    enduse,
+                    s_tech_y_cy,
+                    self.enduse_techs,
+                    sig_param_tech,
+                    curr_yr,
+                    base_yr,
+                    sector,
+                    assumptions.crit_switch_happening)
+
+                self.fuel_y, self.fuel_tech_y = enduse_batch.service_to_fuel(
+                    enduse,
+                    s_tech_y_cy,
+                    tech_stocks,
+                    sample_tech_stock_nrs,
+                    fueltypes_nr,
+                    fueltypes,
+                    mode_constrained)
+
+def get_nr_of_samples(strategy_variables):
+    """Get the number of samples of sampled strategy variables
+
+    Arguments
+    ----------
+    strategy_variables : dict
+        Strategy variables
+
+    Returns
+    -------
+    nr_of_samples : int
+        Number of samples (1 if no strategy variable is sampled)
+    """
+    nr_of_samples = 1
+    for name, strategy_variable in strategy_variables.items():
+        try:
+            scenario_value = strategy_variable['scenario_value']
+        except (KeyError, TypeError):
+            continue
+
+        if np.ndim(scenario_value) == 1 and not isinstance(scenario_value, str):
+            if nr_of_samples != 1 and len(scenario_value) != nr_of_samples:
+                raise ValueError(
+                    "Strategy variable {} has {} instead of {} samples".format(
+                        name, len(scenario_value), nr_of_samples))
+            nr_of_samples = len(scenario_value)
+
+    return nr_of_samples
+
+def apply_sample_factors(fuel_y, factors):
+    """Multiply the fuel of every sample with its factor
+
+    Arguments
+    ---------
+    fuel_y : array
+        Fuel per sample and fueltype (samples, fueltypes)
+    factors : array
+        Factor of every sample (samples)
+
+    Returns
+    -------
+    fuel_y : array
+        Changed fuels (samples, fueltypes)
+    """
+    return fuel_y * factors[:, np.newaxis]
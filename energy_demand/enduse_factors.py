@@ -0,0 +1,436 @@
+"""Factors of the yearly calculations of `enduse_func.Enduse` which
+depend on strategy variables. The factors are calculated for many
+values of the strategy variables at once, i.e. for the samples of
+`enduse_ensemble.EnduseEnsemble` or the regions of
+`enduse_batch.EnduseBatch`.
+
+Every strategy variable can either have a single ``scenario_value``
+or an array with a value of every sample (samples).
+"""
+import numpy as np
+from energy_demand.technologies import diffusion_technologies
+
+def get_sample_values(strategy_variables, name, nr_of_samples):
+    """Get the scenario value of a strategy variable for every sample
+
+    Arguments
+    ----------
+    strategy_variables : dict
+        Strategy variables
+    name : str
+        Name of strategy variable
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    values : array
+        Scenario value of every sample (samples)
+
+    Note
+    ----
+    A KeyError is raised if the strategy variable is not defined
+    """
+    scenario_value = strategy_variables[name]['scenario_value']
+
+    return np.array(
+        np.broadcast_to(np.asarray(scenario_value, dtype=float), (nr_of_samples)))
+
+def sigmoid_diffusion_samples(base_yr, curr_yr, end_yrs, sig_midpoint, sig_steepness):
+    """Calculate the sigmoid diffusion of every sample
+    (see `diffusion_technologies.sigmoid_diffusion`)
+
+    Arguments
+    ----------
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    end_yrs : array
+        Year until changed of every sample (samples)
+    sig_midpoint : float
+        Sigmoid midpoint
+    sig_steepness : float
+        Sigmoid steepness
+
+    Returns
+    -------
+    diffusion_factors : array
+        Diffusion of every sample (samples)
+
+    Note
+    ----
+    The diffusion is calculated only once for every distinct end year
+    """
+    diffusion_factors = np.zeros((len(end_yrs)), dtype=float)
+
+    for end_yr in np.unique(end_yrs):
+        diffusion_factors[end_yrs == end_yr] = diffusion_technologies.sigmoid_diffusion(
+            base_yr,
+            curr_yr,
+            end_yr,
+            sig_midpoint,
+            sig_steepness)
+
+    return diffusion_factors
+
+def linear_diff_samples(base_yr, curr_yr, value_start, values_end, yrs_until_changed):
+    """Calculate the linear diffusion of every sample
+    (see `diffusion_technologies.linear_diff`)
+
+    Arguments
+    ----------
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    value_start : float
+        Value in base year
+    values_end : array
+        Value in end year of every sample (samples)
+    yrs_until_changed : array
+        Year until changed of every sample (samples)
+
+    Returns
+    -------
+    values_cy : array
+        Value in current year of every sample (samples)
+    """
+    sim_years = yrs_until_changed - base_yr + 1
+
+    no_change = (curr_yr == base_yr) | (sim_years == 0) | (values_end == value_start)
+
+    # Avoid division by zero of samples without any change
+    sim_years_safe = np.where(sim_years == 1, 2, sim_years)
+    values_cy = ((values_end - value_start) / (sim_years_safe - 1)) * (curr_yr - base_yr) + value_start
+
+    return np.where(no_change, value_start, values_cy)
+
+def get_smart_meter_factors(
+        enduse,
+        sm_assump,
+        strategy_variables,
+        base_yr,
+        curr_yr,
+        nr_of_samples
+    ):
+    """Calculate the factor of every sample depending on smart
+    meter penetration (see `enduse_func.apply_smart_metering`)
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    sm_assump : dict
+        smart meter assumptions
+    strategy_variables : dict
+        Strategy variables
+    base_yr, curr_yr : int
+        years
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    factors : array
+        Factor of every sample (samples)
+    """
+    try:
+        enduse_savings = get_sample_values(
+            strategy_variables, 'smart_meter_improvement_{}'.format(enduse), nr_of_samples)
+
+        sigm_factors = sigmoid_diffusion_samples(
+            base_yr,
+            curr_yr,
+            get_sample_values(strategy_variables, 'smart_meter_yr_until_changed', nr_of_samples),
+            sm_assump['smart_meter_diff_params']['sig_midpoint'],
+            sm_assump['smart_meter_diff_params']['sig_steepness'])
+
+        penetration_improvement = get_sample_values(
+            strategy_variables, 'smart_meter_improvement_p', nr_of_samples)
+
+        penetration_by = sm_assump['smart_meter_p_by']
+        penetration_cy = sm_assump['smart_meter_p_by'] + sigm_factors * penetration_improvement
+
+        return 1 - (penetration_cy - penetration_by) * enduse_savings
+
+    except KeyError:
+        # not defined for this enduse
+        return np.ones((nr_of_samples), dtype=float)
+
+def get_specific_change_factors(
+        enduse,
+        enduse_overall_change,
+        strategy_variables,
+        base_yr,
+        curr_yr,
+        nr_of_samples
+    ):
+    """Calculate the factor of every sample depending on the overall
+    enduse specific change (see `enduse_func.apply_specific_change`)
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    enduse_overall_change : dict
+        Info about how the enduse is overall changed (e.g. diff method)
+    strategy_variables : dict
+        Strategy variables
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    factors : array
+        Factor of every sample (samples)
+    """
+    percent_by = 1.0
+
+    diff_fuel_consump = get_sample_values(
+        strategy_variables, 'enduse_change__{}'.format(enduse), nr_of_samples)
+    percent_ey = percent_by + diff_fuel_consump
+
+    yrs_until_changed = get_sample_values(
+        strategy_variables, 'enduse_specific_change_yr_until_changed', nr_of_samples)
+
+    diffusion_choice = enduse_overall_change['other_enduse_mode_info']['diff_method']
+
+    if diffusion_choice == 'linear':
+        change_cy = linear_diff_samples(
+            base_yr,
+            curr_yr,
+            percent_by,
+            percent_ey,
+            yrs_until_changed)
+    elif diffusion_choice == 'sigmoid':
+        sig_diff_factors = sigmoid_diffusion_samples(
+            base_yr,
+            curr_yr,
+            yrs_until_changed,
+            enduse_overall_change['other_enduse_mode_info']['sigmoid']['sig_midpoint'],
+            enduse_overall_change['other_enduse_mode_info']['sigmoid']['sig_steepness'])
+        change_cy = diff_fuel_consump * sig_diff_factors
+
+    # Samples without change in fuel consumption are not changed
+    return np.where(diff_fuel_consump != 0, change_cy, 1.0)
+
+def get_cooling_factors(
+        enduse,
+        strategy_variables,
+        cooled_floorarea_p_by,
+        other_enduse_mode_info,
+        base_yr,
+        curr_yr,
+        nr_of_samples
+    ):
+    """Calculate the factor of every sample depending on the
+    cooled floor area (see `enduse_func.apply_cooling`)
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    strategy_variables : dict
+        Strategy variables
+    cooled_floorarea_p_by : dict
+        Assumption about cooling floor area in base year
+    other_enduse_mode_info : dict
+        diffusion parameters
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    factors : array
+        Factor of every sample (samples)
+    """
+    try:
+        cooled_floorearea_p_ey = cooled_floorarea_p_by + get_sample_values(
+            strategy_variables, "cooled_floorarea__{}".format(enduse), nr_of_samples)
+
+        sig_diff_factors = sigmoid_diffusion_samples(
+            base_yr,
+            curr_yr,
+            get_sample_values(strategy_variables, 'cooled_floorarea_yr_until_changed', nr_of_samples),
+            other_enduse_mode_info['sigmoid']['sig_midpoint'],
+            other_enduse_mode_info['sigmoid']['sig_steepness'])
+
+        cooled_floorarea_p_cy = cooled_floorarea_p_by + sig_diff_factors * (
+            cooled_floorearea_p_ey - cooled_floorarea_p_by)
+
+        return cooled_floorarea_p_cy / cooled_floorarea_p_by
+
+    except KeyError:
+        # no cooling defined for enduse
+        return np.ones((nr_of_samples), dtype=float)
+
+def get_industry_change_factors(
+        enduse,
+        sector,
+        base_yr,
+        curr_yr,
+        strategy_variables,
+        other_enduse_mode_info,
+        assumptions,
+        nr_of_samples
+    ):
+    """Calculate the factor of every sample of industry related
+    changes (see `enduse_func.industry_enduse_changes`)
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    sector : str
+        Sector
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    strategy_variables : dict
+        Strategy variables
+    other_enduse_mode_info : dict
+        Sigmoid diffusion parameters
+    assumptions : dict
+        Assumptions
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    factors : array
+        Factor of every sample (samples)
+    """
+    if enduse == 'is_high_temp_process' and sector == 'basic_metals':
+
+        # Fraction of hot and cold steel rolling process
+        p_cold_rolling_by = assumptions.p_cold_rolling_steel_by
+        p_hot_rolling_by = 1.0 - p_cold_rolling_by
+
+        sig_diff_factors = sigmoid_diffusion_samples(
+            base_yr,
+            curr_yr,
+            get_sample_values(strategy_variables, 'hot_cold_rolling_yr_until_changed', nr_of_samples),
+            other_enduse_mode_info['sigmoid']['sig_midpoint'],
+            other_enduse_mode_info['sigmoid']['sig_steepness'])
+
+        diff_cold_rolling = get_sample_values(
+            strategy_variables, 'p_cold_rolling_steel', nr_of_samples) - p_cold_rolling_by
+
+        p_cold_rolling_cy = p_cold_rolling_by + sig_diff_factors * diff_cold_rolling
+        p_hot_rolling_cy = 1 - p_cold_rolling_cy
+
+        eff_cold = assumptions.eff_cold_rolling_process
+        eff_hot = assumptions.eff_hot_rolling_process
+
+        p_by = p_cold_rolling_by * eff_cold + p_hot_rolling_by * eff_hot
+        p_cy = p_cold_rolling_cy * eff_cold  + p_hot_rolling_cy * eff_hot
+
+        return p_cy / p_by
+    else:
+        return np.ones((nr_of_samples), dtype=float)
+
+def get_heat_recovery_factors(
+        enduse,
+        strategy_variables,
+        enduse_overall_change,
+        base_yr,
+        curr_yr,
+        nr_of_samples
+    ):
+    """Calculate the factor of every sample to reduce service
+    depending on heat recovery (see `enduse_func.apply_heat_recovery`)
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    strategy_variables : dict
+        Strategy variables
+    enduse_overall_change : dict
+        Sigmoid diffusion info
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    factors : array
+        Factor of every sample (samples)
+    """
+    try:
+        heat_recovered_p = get_sample_values(
+            strategy_variables, "heat_recoved__{}".format(enduse), nr_of_samples)
+
+        sig_diff_factors = sigmoid_diffusion_samples(
+            base_yr,
+            curr_yr,
+            get_sample_values(strategy_variables, 'heat_recovered_yr_until_changed', nr_of_samples),
+            enduse_overall_change['other_enduse_mode_info']['sigmoid']['sig_midpoint'],
+            enduse_overall_change['other_enduse_mode_info']['sigmoid']['sig_steepness'])
+
+        return 1.0 - sig_diff_factors * heat_recovered_p
+
+    except KeyError:
+        # no recycling defined
+        return np.ones((nr_of_samples), dtype=float)
+
+def get_air_leakage_factors(
+        enduse,
+        strategy_variables,
+        enduse_overall_change,
+        base_yr,
+        curr_yr,
+        nr_of_samples
+    ):
+    """Calculate the factor of every sample to reduce service
+    depending on improvements in air leaking
+    (see `enduse_func.apply_air_leakage`)
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    strategy_variables : dict
+        Strategy variables
+    enduse_overall_change : dict
+        Sigmoid diffusion info
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    nr_of_samples : int
+        Number of samples
+
+    Returns
+    -------
+    factors : array
+        Factor of every sample (samples)
+    """
+    try:
+        air_leakage_improvement = get_sample_values(
+            strategy_variables, "air_leakage__{}".format(enduse), nr_of_samples)
+
+        sig_diff_factors = sigmoid_diffusion_samples(
+            base_yr,
+            curr_yr,
+            get_sample_values(strategy_variables, 'air_leakage_yr_until_changed', nr_of_samples),
+            enduse_overall_change['other_enduse_mode_info']['sigmoid']['sig_midpoint'],
+            enduse_overall_change['other_enduse_mode_info']['sigmoid']['sig_steepness'])
+
+        return 1 - sig_diff_factors * air_leakage_improvement
+
+    except KeyError:
+        return np.ones((nr_of_samples), dtype=float)
@@ -68,6 +68,9 @@ class Enduse(object):
         Scenario drivers per enduse
     flat_profile_crit : bool,default=False
         Criteria of enduse has a flat shape or not
+    driver_factor : float,default=None
+        Precalculated scenario driver factor (see `ScenarioDriverTensor`).
+        Only used for enduses without a dwelling stock
 
     Note
     ----
@@ -77,6 +80,11 @@ class Enduse(object):
     - ``self.fuel_y`` is always overwritten
       in the cascade of calculations
 
+    - If ``criterias['factorised_fuel']`` is True, the hourly fuel
+      is not calculated for enduses which only multiply the annual
+      fuel with load profiles. Instead, ``self.fuel_factors`` stores
+      fueltype, profile id and annual fuel (see `fuel_factors`)
+
     Warning
     -------
     Not all enduses have technologies assigned. Load peaks are derived
@@ -109,7 +117,8 @@ class Enduse(object):
             model_yeardays_nrs,
             dw_stock=False,
             reg_scen_drivers=None,
-            flat_profile_crit=False
+            flat_profile_crit=False,
+            driver_factor=None
         ):
         """Enduse class constructor
         """
@@ -120,6 +129,7 @@ class Enduse(object):
         self.flat_profile_crit = flat_profile_crit
 
         self.techs_fuel_yh = None
+        self.fuel_factors = None
 
         if np.sum(fuel) == 0:
             #If enduse has no fuel return empty shapes
@@ -134,6 +144,12 @@ class Enduse(object):
                 non_regional_lp_stock,
                 regional_lp_stock)
 
+            factorised_crit = get_factorised_crit(
+                criterias, load_profiles, model_yeardays_nrs)
+
+            # Number of days represented by every modelled day
+            yearday_weights = getattr(assumptions, 'yearday_weights', None)
+
             # Get technologies of enduse
             self.enduse_techs = get_enduse_techs(fuel_fueltype_tech_p_by)
 
@@ -174,6 +190,14 @@ class Enduse(object):
             #logging.debug("... Fuel train D: " + str(np.sum(self.fuel_y)))
 
             # Calculate new fuel demands after scenario drivers
+            if driver_factor is None:
+                gva = scenario_data['gva']
+                population = scenario_data['population']
+                industry_gva = scenario_data['industry_gva']
+            else:
+                # Scenario data is already contained in `driver_factor`
+                gva, population, industry_gva = None, None, None
+
             _fuel_new_y = apply_scenario_drivers(
                 submodel,
                 enduse,
@@ -181,12 +205,13 @@ class Enduse(object):
                 self.fuel_y,
                 dw_stock,
                 region,
-                scenario_data['gva'],
-                scenario_data['population'],
-                scenario_data['industry_gva'],
+                gva,
+                population,
+                industry_gva,
                 reg_scen_drivers,
                 base_yr,
-                curr_yr)
+                curr_yr,
+                driver_factor)
             self.fuel_y = _fuel_new_y
             #logging.debug("... Fuel train E: " + str(np.sum(self.fuel_y)))
 
@@ -226,13 +251,23 @@ class Enduse(object):
                 Note: for heating, technologies need to be assigned.
                 """
                 if flat_profile_crit:
-                    self.fuel_y = self.fuel_y * model_yeardays_nrs / 365.0
+                    # Representative days: flat shape is weighted (see `model.get_fuels_yh`)
+                    if yearday_weights is None:
+                        self.fuel_y = self.fuel_y * model_yeardays_nrs / 365.0
+                elif factorised_crit:
+                    self.fuel_factors = get_fuel_factors_no_techs(
+                        enduse,
+                        sector,
+                        load_profiles,
+                        self.fuel_y)
+                    self.fuel_yh = None
                 else:
                     self.fuel_yh = assign_lp_no_techs(
                         enduse,
                         sector,
                         load_profiles,
-                        self.fuel_y)
+                        self.fuel_y,
+                        yearday_weights)
             else:
                 """If technologies are defined for an enduse
                 """
@@ -322,6 +357,16 @@ class Enduse(object):
                         fueltypes_nr,
                         fueltypes,
                         mode_constrained)
+                elif factorised_crit and not mode_constrained and not get_peak_shift_crit(
+                        enduse, strategy_variables):
+                    self.fuel_factors = get_fuel_factors_techs(
+                        enduse,
+                        sector,
+                        self.enduse_techs,
+                        fuel_tech_y,
+                        load_profiles,
+                        fueltypes)
+                    self.fuel_yh = None
                 else:
                     fuel_yh = calc_fuel_tech_yh(
                         enduse,
@@ -332,7 +377,8 @@ class Enduse(object):
                         fueltypes_nr,
                         fueltypes,
                         model_yeardays_nrs,
-                        mode_constrained)
+                        mode_constrained,
+                        yearday_weights)
 
                     # --------------------------------------
                     # Demand Management (peak shaving)
@@ -417,29 +463,12 @@ def demand_management(
     fuel_yh : array
         Fuel of yh
     """
-    # ------------------------------
-    # Test if peak is shifted or not
-    # ------------------------------
-    try:
-        # Get assumed load shift
-        param_name = 'demand_management_improvement__{}'.format(enduse)
-
-        if strategy_variables[param_name]['scenario_value'] == 0:
-
-            # no load management
-            peak_shift_crit = False
-        else:
-            # load management
-            peak_shift_crit = True
-    except KeyError:
-
-        # no load management
-        peak_shift_crit = False
+    param_name = 'demand_management_improvement__{}'.format(enduse)
 
     # ------------------------------
     # If peak shifting implemented, calculate new lp
     # ------------------------------
-    if peak_shift_crit:
+    if get_peak_shift_crit(enduse, strategy_variables):
 
         # Calculate average for every day
         if mode_constrained:
@@ -467,6 +496,39 @@ def demand_management(
 
     return fuel_yh
 
+def get_peak_shift_crit(enduse, strategy_variables):
+    """Test if peak of enduse is shifted or not
+
+    Arguments
+    ----------
+    enduse : str
+        Enduse
+    strategy_variables : dict
+        Assumptions of strategy variables
+
+    Returns
+    -------
+    peak_shift_crit : bool
+        True: Peak is shifted, False: Peak isn't shifed
+    """
+    try:
+        # Get assumed load shift
+        param_name = 'demand_management_improvement__{}'.format(enduse)
+
+        if strategy_variables[param_name]['scenario_value'] == 0:
+
+            # no load management
+            peak_shift_crit = False
+        else:
+            # load management
+            peak_shift_crit = True
+    except KeyError:
+
+        # no load management
+        peak_shift_crit = False
+
+    return peak_shift_crit
+
 def calc_lf_improvement(
         lf_improvement_ey,
         base_yr,
@@ -512,7 +574,7 @@ def calc_lf_improvement(
 
     return lf_improved_cy
 
-def assign_lp_no_techs(enduse, sector, load_profiles, fuel_y):
+def assign_lp_no_techs(enduse, sector, load_profiles, fuel_y, yearday_weights=None):
     """Assign load profiles for an enduse which has no technologies defined
 
     Arguments
@@ -525,6 +587,9 @@ def assign_lp_no_techs(enduse, sector, load_profiles, fuel_y):
         Load profiles
     fuel_y : array
         Fuels
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day. If
+        provided, the weighted sum of the load profile is one
 
     Returns
     -------
@@ -533,11 +598,119 @@ def assign_lp_no_techs(enduse, sector, load_profiles, fuel_y):
     """
     fuel = fuel_y[:, np.newaxis, np.newaxis]
 
-    fuel_yh = load_profiles.get_lp(
-        enduse, sector, 'placeholder_tech', 'shape_yh') * fuel
+    load_profile = load_profiles.get_lp(
+        enduse, sector, 'placeholder_tech', 'shape_yh')
+
+    if yearday_weights is not None:
+        load_profile = lp.abs_to_rel_weighted(load_profile, yearday_weights)
+
+    fuel_yh = load_profile * fuel
 
     return fuel_yh
 
+def get_factorised_crit(criterias, load_profiles, model_yeardays_nrs):
+    """Test if the hourly fuel of an enduse is stored factorised,
+    i.e. as annual fuel per load profile
+
+    Arguments
+    ---------
+    criterias : dict
+        Criterias
+    load_profiles : obj
+        Load profiles
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+
+    Returns
+    -------
+    factorised_crit : bool
+        Criteria whether fuel is stored factorised
+
+    Note
+    ----
+    Only possible if the load profile stock is registered
+    (see `fuel_factors.register_profile_stocks`) and all
+    yeardays are modelled
+    """
+    try:
+        factorised_fuel = criterias['factorised_fuel']
+    except KeyError:
+        factorised_fuel = False
+
+    if factorised_fuel and load_profiles.profile_offset is not None and model_yeardays_nrs == 365:
+        return True
+    else:
+        return False
+
+def get_fuel_factors_no_techs(enduse, sector, load_profiles, fuel_y):
+    """Get fuel factors of an enduse which has no technologies
+    defined (factorised form of `assign_lp_no_techs`)
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    sector : str
+        Enduse
+    load_profiles : obj
+        Load profiles
+    fuel_y : array
+        Fuels
+
+    Returns
+    -------
+    fuel_factors : list
+        Fueltype, profile id and annual fuel
+    """
+    profile_id = load_profiles.get_profile_id(enduse, sector, 'placeholder_tech')
+
+    fuel_factors = []
+    for fueltype, fuel_fueltype in enumerate(fuel_y):
+        if fuel_fueltype != 0:
+            fuel_factors.append((fueltype, profile_id, fuel_fueltype))
+
+    return fuel_factors
+
+def get_fuel_factors_techs(
+        enduse,
+        sector,
+        enduse_techs,
+        enduse_fuel_tech,
+        load_profiles,
+        fueltypes
+    ):
+    """Get fuel factors of technologies of an enduse (factorised form
+    of `calc_fuel_tech_yh` in unconstrained mode)
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    sector : str
+        Sector
+    enduse_techs : list
+        Enduse technologies
+    enduse_fuel_tech : dict
+        Fuel per technology in enduse
+    load_profiles : obj
+        Load profiles
+    fueltypes : dict
+        Fueltypes lookup
+
+    Returns
+    -------
+    fuel_factors : list
+        Fueltype, profile id and annual fuel
+    """
+    fuel_factors = []
+    for tech in enduse_techs:
+        fuel_factors.append((
+            fueltypes['heat'],
+            load_profiles.get_profile_id(enduse, sector, tech),
+            enduse_fuel_tech[tech]))
+
+    return fuel_factors
+
 def get_lp_stock(enduse, non_regional_lp_stock, regional_lp_stock):
     """Defines the load profile stock depending on `enduse`.
     (Get regional or non-regional load profile data)
@@ -828,7 +1001,8 @@ def calc_fuel_tech_yh(
         fueltypes_nr,
         fueltypes,
         model_yeardays_nrs,
-        mode_constrained
+        mode_constrained,
+        yearday_weights=None
     ):
     """Iterate fuels for each technology and assign shape yd and yh shape
 
@@ -848,6 +1022,9 @@ def calc_fuel_tech_yh(
         Mode criteria
     model_yeardays_nrs : int
         Number of modelled yeardays
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day. If
+        provided, the weighted sum of the load profiles is one
 
     Return
     ------
@@ -862,7 +1039,9 @@ def calc_fuel_tech_yh(
             load_profile = load_profiles.get_lp(
                 enduse, sector, tech, 'shape_yh')
 
-            if model_yeardays_nrs != 365:
+            if yearday_weights is not None:
+                load_profile = lp.abs_to_rel_weighted(load_profile, yearday_weights)
+            elif model_yeardays_nrs != 365:
                 load_profile = lp.abs_to_rel(load_profile)
 
             fuel_tech_yh = enduse_fuel_tech[tech] * load_profile
@@ -880,7 +1059,9 @@ def calc_fuel_tech_yh(
             load_profile = load_profiles.get_lp(
                 enduse, sector, tech, 'shape_yh')
 
-            if model_yeardays_nrs != 365:
+            if yearday_weights is not None:
+                load_profile = lp.abs_to_rel_weighted(load_profile, yearday_weights)
+            elif model_yeardays_nrs != 365:
                 load_profile = lp.abs_to_rel(load_profile)
 
             # If no fuel for this tech and not defined in enduse
@@ -1241,7 +1422,8 @@ def apply_scenario_drivers(
         industry_gva,
         reg_scen_drivers,
         base_yr,
-        curr_yr
+        curr_yr,
+        driver_factor=None
     ):
     """The fuel data for every end use are multiplied with respective
     scenario drivers. If no dwelling specific scenario driver is found,
@@ -1267,6 +1449,9 @@ def apply_scenario_drivers(
         Base year
     curr_yr : int
         Current year
+    driver_factor : float, default=None
+        Precalculated scenario driver factor (non-dwelling
+        related scenario drivers, see `ScenarioDriverTensor`)
 
     Returns
     -------
@@ -1276,7 +1461,9 @@ def apply_scenario_drivers(
     if reg_scen_drivers is None:
         reg_scen_drivers = {}
 
-    if not dw_stock:
+    if not dw_stock and driver_factor is not None:
+        fuel_y = fuel_y * driver_factor
+    elif not dw_stock:
         """Calculate non-dwelling related scenario drivers, if no dwelling stock
         Info: No dwelling stock is defined for this submodel
         """
@@ -1364,6 +1551,130 @@ def apply_scenario_drivers(
 
     return fuel_y
 
+class ScenarioDriverTensor(object):
+    """Values of all (non-dwelling related) scenario drivers
+    for all regions and years stored in an array
+    (drivers, regions, years)
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    scenario_data : dict
+        Scenario data with drivers {driver: {year: {region: value}}}
+    drivers : list, default=None
+        Scenario drivers. If None, 'gva' and 'population'
+
+    Note
+    ----
+    Missing values are stored as ``np.nan`` and raise a KeyError when
+    used. Values which are ``nan`` in the scenario data are replaced by one
+    (as in `apply_scenario_drivers`).
+    """
+    def __init__(self, regions, scenario_data, drivers=None):
+        if drivers is None:
+            drivers = ['gva', 'population']
+
+        self.regions = dict((region, reg_nr) for reg_nr, region in enumerate(regions))
+        self.drivers = dict((driver, driver_nr) for driver_nr, driver in enumerate(drivers))
+
+        years = set([])
+        for driver in drivers:
+            years.update(scenario_data[driver].keys())
+        self.years = dict((year, year_nr) for year_nr, year in enumerate(sorted(years)))
+
+        self.values = np.full((len(drivers), len(regions), len(years)), np.nan, dtype=float)
+
+        for driver, driver_nr in self.drivers.items():
+            for year, year_nr in self.years.items():
+                try:
+                    driver_data = scenario_data[driver][year]
+                except KeyError:
+                    continue
+                for region, reg_nr in self.regions.items():
+                    try:
+                        value = driver_data[region]
+                    except KeyError:
+                        continue
+                    if math.isnan(value):
+                        logging.warning("INF ERROR")
+                        value = 1
+                    self.values[driver_nr, reg_nr, year_nr] = value
+
+        self._factors = {}
+
+    def get_driver_factors(self, scenario_drivers, base_yr, curr_yr):
+        """Calculate scenario driver factor of all regions
+
+        Arguments
+        ----------
+        scenario_drivers : list
+            Scenario drivers of enduse
+        base_yr : int
+            Base year
+        curr_yr : int
+            Current year
+
+        Returns
+        -------
+        driver_factors : array
+            Factor of every region (regions)
+        """
+        key = (tuple(scenario_drivers), base_yr, curr_yr)
+        try:
+            return self._factors[key]
+        except KeyError:
+            pass
+
+        by_driver = np.ones((len(self.regions)), dtype=float)
+        cy_driver = np.ones((len(self.regions)), dtype=float)
+
+        for scenario_driver in scenario_drivers:
+            driver_nr = self.drivers[scenario_driver]
+            by_driver_data = self.values[driver_nr, :, self.years[base_yr]]
+            cy_driver_data = self.values[driver_nr, :, self.years[curr_yr]]
+
+            if np.isnan(by_driver_data).any() or np.isnan(cy_driver_data).any():
+                raise KeyError(
+                    "Scenario driver {} is missing for a region".format(scenario_driver))
+
+            # Multiply drivers
+            by_driver = by_driver * by_driver_data
+            cy_driver = cy_driver * cy_driver_data
+
+        driver_factors = np.ones((len(self.regions)), dtype=float)
+        np.divide(cy_driver, by_driver, out=driver_factors, where=by_driver != 0)
+
+        if np.isnan(driver_factors).any():
+            raise Exception("Error xcx")
+
+        self._factors[key] = driver_factors
+
+        return driver_factors
+
+    def get_driver_factor(self, scenario_drivers, region, base_yr, curr_yr):
+        """Get scenario driver factor of a single region
+
+        Arguments
+        ----------
+        scenario_drivers : list
+            Scenario drivers of enduse
+        region : str
+            Region
+        base_yr : int
+            Base year
+        curr_yr : int
+            Current year
+
+        Returns
+        -------
+        driver_factor : float
+            Factor of region
+        """
+        driver_factors = self.get_driver_factors(scenario_drivers, base_yr, curr_yr)
+
+        return driver_factors[self.regions[region]]
+
 def apply_specific_change(
         enduse,
         fuel_y,
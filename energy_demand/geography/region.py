@@ -19,8 +19,10 @@ class Region(object):
         Nested dict by region, sector, enduse => np.array, single dimension for fuel type
     is_fuel_disagg : dict
         Nested dict by region, sector, enduse => np.array, single dimension for fuel type
-    weather_regions : dict
-        Weather regions
+    weather_stations : dict
+        Weather stations
+    station_index : WeatherStationIndex, default=None
+        Spatial index of weather stations
 
     Note
     ----
@@ -34,7 +36,8 @@ class Region(object):
             rs_fuel_disagg,
             ss_fuel_disagg,
             is_fuel_disagg,
-            weather_stations
+            weather_stations,
+            station_index=None
         ):
         """Constructor
         """
@@ -51,4 +54,5 @@ class Region(object):
         self.closest_weather_region_id = weather_station_location.get_closest_station(
             longitude,
             latitude,
-            weather_stations)
+            weather_stations,
+            station_index)
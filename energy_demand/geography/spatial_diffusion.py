@@ -3,78 +3,111 @@ to spatial explicit calculations of technology/innovation
 penetration."""
 
 import logging
-from collections import defaultdict
+from collections.abc import Mapping
 import numpy as np
 from energy_demand.plotting import plotting_program
 
 def realdata_to_spatialdiffval(regions, real_values, speed_con_max):
     """Create SDI from socio-economic data
 
-    concepts : list
-        List with concepts (e.g. poor, welathy, rich)
+    Arguments
+    ---------
+    regions : list
+        Regions
+    real_values : dict
+        Real values of every region (e.g. population density)
+    speed_con_max : float
+        Speed of diffusion at a congruence value of one
+
+    Returns
+    -------
+    diffusion_values : dict
+        Diffusion value of every region
 
     Info
     ------
     *   SPEED 'speed_con_min'
+    *   Regions without real value get the average real value
     """
-    diffusion_values = {}
-
     # Diffusion speed assumptions
     speed_con_min = 1               # Speed at val_con == 0
     speed_con_max = speed_con_max   # Speed at con_val == 1
 
     # ----------------
-    # plot real values to check for outliers
+    # Remove extrems (cap values larger than the largest outlier)
     # ----------------
-    #plotting_program.plot_xy(list(real_values.values()))
+    capped_values = cap_outliers(
+        np.array(list(real_values.values()), dtype=float),
+        nr_of_outliers=20)
+    capped_real_values = dict(zip(real_values.keys(), capped_values))
 
-    # Select number of outliers to remove extrems
-    nr_of_utliers = 20
+    # Average value for regions without real data
+    missing_regions = [region for region in regions if region not in capped_real_values]
+    if missing_regions:
+        logging.warning("Set average real data for %s regions", len(missing_regions))
 
-    sorted_vals = list(real_values.values())
-    sorted_vals.sort()
-
-    # Get value of largest outlier
-    treshold_upper_real_value = sorted_vals[-nr_of_utliers]
-
-    for reg, val in real_values.items():
-        if val > treshold_upper_real_value:
-            real_values[reg] = treshold_upper_real_value
-
-    # Plot after removing outliers
-    #plotting_program.plot_xy(list(real_values.values()))
+    reg_real_values = np.array([
+        capped_real_values.get(region, np.average(capped_values)) for region in regions])
 
     # ----------------
     # Concruence calculations
     # -----------------
-    # Max congruence value
-    con_max = max(real_values.values())
+    diffusion_values = calc_diffusion_values(
+        congruence_values=reg_real_values / np.max(capped_values),
+        speed_con_min=speed_con_min,
+        speed_con_max=speed_con_max)
 
-    for region in regions:
+    return dict(zip(regions, diffusion_values))
 
-        # Multiply speed of diffusion of concept with concept congruence value
-        try:
-            real_value = real_values[region]
-        except KeyError:
-            real_value = np.average(real_values.values())
-            logging.warning("Set average real data for region %s", region)
+def cap_outliers(values, nr_of_outliers):
+    """Cap all values larger than the smallest of
+    the `nr_of_outliers` largest values
 
-        # Calculate congruence value
-        congruence_value = real_value / con_max
+    Arguments
+    ---------
+    values : array
+        Values
+    nr_of_outliers : int
+        Number of largest values to cap
+
+    Returns
+    -------
+    capped_values : array
+        Values capped at the value of the largest outlier
+        (not capped if there are fewer values than outliers)
+    """
+    if len(values) < nr_of_outliers:
+        return values
+
+    threshold_position = len(values) - nr_of_outliers
+
+    # Get value of largest outlier
+    treshold_upper_real_value = np.partition(values, threshold_position)[threshold_position]
+
+    return np.minimum(values, treshold_upper_real_value)
 
-        # Calculate diffusion value
-        lower_concept_val = (1 - congruence_value) * speed_con_min
-        higher_concept_val = congruence_value * speed_con_max
+def calc_diffusion_values(congruence_values, speed_con_min, speed_con_max):
+    """Calculate diffusion values by multiplying speed
+    of diffusion of concept with concept congruence value
 
-        diffusion_values[region] = lower_concept_val + higher_concept_val
+    Arguments
+    ---------
+    congruence_values : array
+        Congruence value of every region
+    speed_con_min : float
+        Speed at congruence value of zero
+    speed_con_max : float
+        Speed at congruence value of one
 
-        logging.info(
-            "Reg: %s diffusion_value: %s real_value: %s",
-            region,
-            lower_concept_val + higher_concept_val,
-            real_value)
+    Returns
+    -------
+    diffusion_values : array
+        Diffusion value of every region
+    """
+    lower_concept_val = (1 - congruence_values) * speed_con_min
+    higher_concept_val = congruence_values * speed_con_max
 
-    return diffusion_values
+    return lower_concept_val + higher_concept_val
 
 def spatial_diffusion_values(regions, real_values, speed_con_max):
     """Load spatial diffusion values
@@ -122,8 +155,8 @@ def calc_diffusion_f(regions, f_reg, spatial_diff_values, fuels):
         Regional not weighted diffusion factors
     spatial_diff_values : dict
         Spatial diffusion index values
-    fuels : array
-        Fuels per enduse or fuel per sector and enduse
+    fuels : list
+        Fuels per enduse or fuel per sector and enduse of every submodel
 
     Example
     -------
@@ -140,139 +173,69 @@ def calc_diffusion_f(regions, f_reg, spatial_diff_values, fuels):
     The total sum can be higher than 1 in case of high values.
     Therfore the factors need to be capped. TODO MORE INFO
     """
+    f_reg = np.array([f_reg[region] for region in regions])
+    spatial_diff_values = np.array([spatial_diff_values[region] for region in regions])
 
-    # Calculate fraction of energy demand of every region of total demand
-    reg_enduse_p = defaultdict(dict)
-    fuels_enduse = {}
+    f_reg_norm = {}
+    f_reg_norm_abs = {}
 
     for fuel_submodel in fuels:
+        for enduse, reg_fuels in get_reg_enduse_fuels(regions, fuel_submodel).items():
 
-        # -----------------------------------
-        # Sum fuel across sectors
-        # -----------------------------------
-        fuel_submodel_new = defaultdict(dict)
-        for reg, entries in fuel_submodel.items():
-            enduses = entries.keys()
-            try:
-                for enduse in entries:
-                    for sector in entries[enduse]:
-                        fuel_submodel_new[reg][enduse] = 0
-
-                for enduse in entries:
-                    for sector in entries[enduse]:
-                        fuel_submodel_new[reg][enduse] += np.sum(entries[enduse][sector])
-
-                fuel_submodel = fuel_submodel_new
-            except IndexError:
-                enduses = entries.keys()
-                break
-
-        # --------------------
-        # Calculate fraction of fuel for each region
-        # --------------------
-        for enduse in enduses:
-            fuels_enduse[enduse] = 0
-
-            # Total uk fuel of enduse
-            tot_enduse_uk = 0
-            for reg in regions:
-                tot_enduse_uk += np.sum(fuel_submodel[reg][enduse])
-
-            # Calculate regional % of enduse
-            for region in regions:
-                reg_enduse_p[enduse][region] = np.sum(fuel_submodel[region][enduse]) / tot_enduse_uk
-                fuels_enduse[enduse] += np.sum(fuel_submodel[region][enduse])
-
-        # ----------
-        # Norm spatial factor (f_reg_norm) with population (does not sum upt to 1.p Eq. 7 Appendix)
-        # ----------
-        f_reg_norm = {}
-
-        for enduse, regions_fuel_p in reg_enduse_p.items():
-
-            # Sum across all regs (factor * fuel_p)
-            sum_p_f_all_regs = 0
-            for i in regions:
-                sum_p_f_all_regs += f_reg[i] * regions_fuel_p[reg]
-
-            f_reg_norm[enduse] = {}
-            for reg, fuel_p in regions_fuel_p.items():
-                f_reg_norm[enduse][reg] = f_reg[reg] / sum_p_f_all_regs
-
-        # ----------
-        # Norm which sums up to 1 (f_reg_norm_abs) (e.g. distriubte 200 units across space)
-        # ----------
-        f_reg_norm_abs = {}
-        for enduse, regions_fuel_p in reg_enduse_p.items():
-            f_reg_norm_abs[enduse] = {}
-            for reg, fuel_p in regions_fuel_p.items():
-                f_reg_norm_abs[enduse][reg] = fuel_p * spatial_diff_values[reg]
-
-    #-----------
-    # Normalize f_reg_norm_abs
-    #-----------
-    for enduse in f_reg_norm_abs:
-        sum_enduse = sum(f_reg_norm_abs[enduse].values())
-        for reg in f_reg_norm_abs[enduse]:
-            f_reg_norm_abs[enduse][reg] = f_reg_norm_abs[enduse][reg] / sum_enduse
-
-    # Testing
-    for enduse in f_reg_norm_abs:
-        np.testing.assert_almost_equal(
-            sum(f_reg_norm_abs[enduse].values()),
-            1,
-            decimal=2)
-
-    #-----------
-    # TESTING 
-    #-----------
-    '''enduse = 'ss_water_heating'
-    tot_amount_to_distribute = 200
+            # Calculate fraction of fuel for each region
+            reg_enduse_p = reg_fuels / np.sum(reg_fuels)
 
-    # -----
-    # f_reg_norm_abs
-    # -----
-    # To distribute full absolute amount across all regs
-    __t = 0
-    for reg in regions:
-        __t += f_reg_norm_abs[enduse][reg] * tot_amount_to_distribute
+            # ----------
+            # Norm spatial factor (f_reg_norm) with population (does not sum upt to 1.p Eq. 7 Appendix)
+            # ----------
+            sum_p_f_all_regs = np.sum(f_reg * reg_enduse_p)
+            f_reg_norm[enduse] = dict(zip(regions, f_reg / sum_p_f_all_regs))
 
-    logging.info("TOTAL MOUNT TO DISTR: " + str(tot_amount_to_distribute))
-    logging.info("TOTAL MOUNT TO DISTR CTONRLL: " + str(__t))
+            # ----------
+            # Norm which sums up to 1 (f_reg_norm_abs) (e.g. distriubte 200 units across space)
+            # ----------
+            reg_f_norm_abs = reg_enduse_p * spatial_diff_values
+            reg_f_norm_abs = reg_f_norm_abs / np.sum(reg_f_norm_abs)
 
-    # -----
-    # f_reg_norm_abs
-    # -----
-    global_f = 0.9
-    _0 = []
-    _1 = []
-    _2 = []
-    
-    for reg in regions:
-        logging.warning("-------")
-        logging.warning("Not Normed: %s ", f_reg[reg] * global_f)                               # not normed
-        logging.warning("Normed: %s ", f_reg_norm[enduse][reg] * global_f)  # normed with not summing up to 1
-        logging.warning("Sums up to one: %s ", (f_reg_norm_abs[enduse][reg] * global_f))    #new
-        logging.warning((f_reg_norm_abs[enduse][reg] * global_f) / reg_enduse_p[enduse][reg]) #old
-
-        _0.append(f_reg[reg] * global_f)
-        _1.append(f_reg_norm[enduse][reg] * global_f)
-        _2.append(f_reg_norm_abs[enduse][reg] * global_f)
-
-
-    logging.info("INFOF FOR DEBBUGING")
-    logging.info(max(_0))
-    logging.info(max(_1))
-    logging.info(max(_2))
-
-    logging.info("--")
-
-    logging.info(sum(_0))
-    logging.info(sum(_1))
-    logging.info(sum(_2))'''
+            # Testing
+            np.testing.assert_almost_equal(np.sum(reg_f_norm_abs), 1, decimal=2)
+
+            f_reg_norm_abs[enduse] = dict(zip(regions, reg_f_norm_abs))
 
     return f_reg_norm_abs, f_reg_norm
 
+def get_reg_enduse_fuels(regions, fuel_submodel):
+    """Sum fuel of every enduse across fueltypes
+    (and sectors) for all regions
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    fuel_submodel : dict
+        Fuel per region and enduse {region: {enduse: fuel}}
+        or per region, enduse and sector {region: {enduse: {sector: fuel}}}
+
+    Returns
+    -------
+    reg_enduse_fuels : dict
+        Fuel of every region {enduse: array(regions)}
+    """
+    reg_enduse_fuels = {}
+
+    for reg_nr, region in enumerate(regions):
+        for enduse, enduse_fuel in fuel_submodel[region].items():
+            if enduse not in reg_enduse_fuels:
+                reg_enduse_fuels[enduse] = np.zeros((len(regions)), dtype=float)
+
+            if isinstance(enduse_fuel, dict):
+                reg_enduse_fuels[enduse][reg_nr] = sum(
+                    np.sum(sector_fuel) for sector_fuel in enduse_fuel.values())
+            else:
+                reg_enduse_fuels[enduse][reg_nr] = np.sum(enduse_fuel)
+
+    return reg_enduse_fuels
+
 def calc_regional_services(
         enduse,
         uk_techs_service_p,
@@ -293,7 +256,8 @@ def calc_regional_services(
     spatial_factors : dict
         Spatial factor per enduse and region
     fuel_disaggregated : dict
-        Fuels per region
+        Fuels per region (not used as the service of technologies
+        not affected by spatial diffusion is not disaggregated)
     techs_affected_spatial_f : list
         List with technologies where spatial diffusion is affected
 
@@ -313,59 +277,38 @@ def calc_regional_services(
 
     C.) Convert regional service reduction to ey % in region
     """
-    reg_enduse_tech_p_ey = defaultdict(dict)
-
-    # ------------------------------------
-    # Calculate national total enduse fuel and service
-    # ------------------------------------
-    uk_enduse_fuel = 0
-    for region in regions:
-        reg_enduse_tech_p_ey[region] = {}
-        uk_enduse_fuel += np.sum(fuel_disaggregated[region][enduse])
-
-    # ----
-    # Service of enduse for all regions
-    # ----
-    for region in regions:
-
-        # Disaggregation factor
-        f_fuel_disagg = np.sum(fuel_disaggregated[region][enduse]) / uk_enduse_fuel
+    reg_enduse_tech_p_ey = dict((region, {}) for region in regions)
 
-        # Calculate fraction of regional service
-        for tech, uk_tech_service_ey_p in uk_techs_service_p.items():
+    reg_spatial_factors = np.array([spatial_factors[enduse][region] for region in regions])
 
-            global_tech_service_ey_p = uk_tech_service_ey_p
+    # Calculate fraction of regional service
+    for tech, uk_tech_service_ey_p in uk_techs_service_p.items():
 
-            # ---------------------------------------------
-            # B.) Calculate regional service for technology
-            # ---------------------------------------------
-            if tech in techs_affected_spatial_f:
-                # Use spatial factors
-                reg_service_tech = global_tech_service_ey_p * spatial_factors[enduse][region]
-            else:
-                # If not specified, use fuel disaggregation for enduse factor
-                reg_service_tech = global_tech_service_ey_p #* f_fuel_disagg
-
-            reg_enduse_tech_p_ey[region][tech] = reg_service_tech
+        # ---------------------------------------------
+        # B.) Calculate regional service for technology
+        # ---------------------------------------------
+        if tech in techs_affected_spatial_f:
+            # Use spatial factors
+            reg_service_tech = uk_tech_service_ey_p * reg_spatial_factors
+        else:
+            reg_service_tech = np.full((len(regions)), uk_tech_service_ey_p, dtype=float)
 
         # ---------------------------------------------
-        # C.) Calculate regional fraction
+        # C.) Calculate regional fraction (capped)
         # ---------------------------------------------
-        for tech, service_tech in reg_enduse_tech_p_ey[region].items():
+        capping_val = 1
+        nr_capped_regions = np.sum(reg_service_tech > capping_val)
+        if nr_capped_regions > 0:
+            logging.warning(
+                "CAPPING VALUE REACHED {} {} in {} regions".format(
+                    enduse, tech, nr_capped_regions))
 
-            # ----------------------------------
-            #MAYBE ADD CAPPING VALUE TODO
-            # ----------------------------------
-            capping_val = 1
-            service_share = service_tech
+        reg_service_tech = np.minimum(reg_service_tech, capping_val)
 
-            if service_share > capping_val:
-                reg_enduse_tech_p_ey[region][tech] = capping_val
-                logging.warning("CAPPING VALUE REACHED {}  {}  ".format(region, service_share))
-            else:
-                reg_enduse_tech_p_ey[region][tech] = service_share
+        for region, service_share in zip(regions, reg_service_tech):
+            reg_enduse_tech_p_ey[region][tech] = float(service_share)
 
-    return dict(reg_enduse_tech_p_ey)
+    return reg_enduse_tech_p_ey
 
 def calc_spatially_diffusion_factors(
         regions,
@@ -415,11 +358,8 @@ def calc_spatially_diffusion_factors(
     # -----
     # II. Calculation of diffusion factors ( Not weighted with demand)
     # -----
-    f_reg = {}
-
-    max_value_diffusion = max(list(spatial_diff_values.values()))
-    for region in regions:
-        f_reg[region] = spatial_diff_values[region] / max_value_diffusion
+    reg_spatial_diff_values = np.array([spatial_diff_values[region] for region in regions])
+    f_reg = dict(zip(regions, reg_spatial_diff_values / np.max(reg_spatial_diff_values)))
 
     # Weighted with demand
     f_reg_norm_abs, f_reg_norm = calc_diffusion_f(
@@ -553,8 +493,6 @@ def factor_improvements_single(
         Regional spatial factors normed with fuel demand (sum is not 1)
     f_reg_norm_abs : dict
         Regional spatial factors normed with fuel demand and normed that sum is 1
-    spatial_diff_values : dict
-        Spatial diffusion values
     fuel_regs_enduse : dict
         Fuels per region and end use
 
@@ -574,8 +512,6 @@ def factor_improvements_single(
 
     C.) Convert regional service reduction to ey % in region
     """
-    reg_enduse_tech_p_ey = {}
-
     # Check which factors is to be used
     # if only distribute:               f_reg_norm_abs
     # if max 1:                         f_reg_nrm
@@ -583,65 +519,33 @@ def factor_improvements_single(
     if fuel_regs_enduse == {}:
         logging.info("spatial_factor: fuel_regs_enduse")
         spatial_factor = f_reg
-
     else:
         logging.info("spatial_factor: f_reg_norm_abs")
         spatial_factor = f_reg_norm_abs
 
-
-    # Sum fuel for all regions
-    uk_enduse_fuel = sum(fuel_regs_enduse.values())
-
-    test = 0
-    for region in regions:
-        
-        try:
-            test += (reg_enduse_tech_p_ey[region] * np.sum(fuel_regs_enduse[region]))
-            logging.info(
-                "FUEL FACTOR reg: {}  val: {}, fuel: {}  fuel: {} ".format(
-                    region,
-                    round(reg_enduse_tech_p_ey[region],3),
-                    round(uk_enduse_fuel, 3),
-                    round(np.sum(fuel_regs_enduse[region]),3)))
-        except:
-            pass
-
-        reg_enduse_tech_p_ey[region] = factor_uk * spatial_factor[region]
-        
-        logging.info("spatial single factor reg: {}  val: {}".format(
-            region,
-            round(reg_enduse_tech_p_ey[region],3)))
+    reg_enduse_tech_p_ey = factor_uk * np.array([spatial_factor[region] for region in regions])
 
     # ---------
     # PROBLEM THAT MORE THAN 100 percent could be reached if nt normed
-    # ---------
-    reg_enduse_tech_p_ey_capped = {}
-
     # Cap regions which have already reached and are larger than 1.0
+    # ---------
     cap_max_crit = 1.0 #100%
-    demand_lost = 0
+    capped_regions = reg_enduse_tech_p_ey > cap_max_crit
 
-    for region, region_factor in reg_enduse_tech_p_ey.items():
-        if region_factor > cap_max_crit:
-            logging.warning("INFO: FOR A REGION THE SHARE OF IMPROVEMENTIS LARGER THAN 1.0.")
+    if np.any(capped_regions):
+        logging.warning("INFO: FOR A REGION THE SHARE OF IMPROVEMENTIS LARGER THAN 1.0.")
 
-            # Demand which is lost and capped
-            diff_to_cap = region_factor - cap_max_crit
-            demand_lost += diff_to_cap * np.sum(fuel_regs_enduse[region])
+        # Demand which is lost and capped
+        reg_fuels = np.array([
+            np.sum(fuel_regs_enduse.get(region, 0)) for region in regions])
+        demand_lost = np.sum(
+            (reg_enduse_tech_p_ey[capped_regions] - cap_max_crit) * reg_fuels[capped_regions])
 
-            reg_enduse_tech_p_ey_capped[region] = cap_max_crit
-        else:
-            reg_enduse_tech_p_ey_capped[region] = region_factor
+        logging.warning("FAKTOR UK: %s Lost demand: %s", factor_uk, demand_lost)
 
-    # Replace
-    reg_enduse_tech_p_ey = reg_enduse_tech_p_ey_capped
+    reg_enduse_tech_p_ey = np.minimum(reg_enduse_tech_p_ey, cap_max_crit)
 
-    logging.warning("FAKTOR UK :" + str(factor_uk))
-    logging.warning("Lost demand: " + str(demand_lost))
-    logging.warning("TESTDUM a " + str(test))
-    logging.warning("TESTDUM b " + str(uk_enduse_fuel * factor_uk))
-
-    return reg_enduse_tech_p_ey
+    return dict(zip(regions, reg_enduse_tech_p_ey))
 
 def get_enduse_regs(
         enduse,
@@ -677,3 +581,207 @@ def get_enduse_regs(
     #    raise Exception("Could not find fuel to get for regions %s", enduse)
 
     return fuels_enduse
+
+class RegionalStrategyVariables(object):
+    """Regional specific values of all strategy variables
+    stored in an array (variables, regions)
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    strategy_variables : dict
+        Strategy variables. The values of all regions are initialised
+        with the national ``scenario_value`` of every variable. If no
+        ``affected_enduse`` is defined, an empty list is assigned
+
+    Note
+    ----
+    The strategy variables of a region can be accessed like a dict
+    of strategy variables, e.g.
+    ``regional_strategy_variables[region][var_name]['scenario_value']``
+    (see `RegionStrategyVariables`).
+    """
+    def __init__(self, regions, strategy_variables):
+        self.regions = dict((region, reg_nr) for reg_nr, region in enumerate(regions))
+        self.variables = dict(
+            (var_name, var_nr) for var_nr, var_name in enumerate(strategy_variables))
+
+        self.affected_enduses = {}
+        self.values = np.zeros((len(self.variables), len(self.regions)), dtype=float)
+
+        for var_name, var_nr in self.variables.items():
+            try:
+                self.affected_enduses[var_name] = strategy_variables[var_name]['affected_enduse']
+            except KeyError:
+                # Not affected enduses defined
+                self.affected_enduses[var_name] = []
+
+            self.values[var_nr] = float(strategy_variables[var_name]['scenario_value'])
+
+    def set_values(self, var_name, reg_values):
+        """Set the values of a strategy variable of all regions
+
+        Arguments
+        ----------
+        var_name : str
+            Name of strategy variable
+        reg_values : dict
+            Value of every region {region: value}
+        """
+        var_nr = self.variables[var_name]
+
+        for region, reg_nr in self.regions.items():
+            self.values[var_nr, reg_nr] = float(reg_values[region])
+
+    def get_values(self, var_name):
+        """Get the values of a strategy variable of all regions
+
+        Arguments
+        ----------
+        var_name : str
+            Name of strategy variable
+
+        Returns
+        -------
+        values : array
+            Value of every region (regions)
+        """
+        return self.values[self.variables[var_name]]
+
+    def get_regions_strategy_variables(self, regions):
+        """Get the strategy variables of several regions
+        with an array of the values of the regions as ``scenario_value``
+        (e.g. for `enduse_batch.EnduseBatch`)
+
+        Arguments
+        ----------
+        regions : list
+            Regions
+
+        Returns
+        -------
+        strategy_variables : dict
+            Strategy variables {var_name: {'scenario_value': (regions), 'affected_enduse': ...}}
+        """
+        reg_nrs = [self.regions[region] for region in regions]
+
+        strategy_variables = {}
+        for var_name, var_nr in self.variables.items():
+            strategy_variables[var_name] = {
+                'scenario_value': self.values[var_nr, reg_nrs],
+                'affected_enduse': self.affected_enduses[var_name]}
+
+        return strategy_variables
+
+    def __getitem__(self, region):
+        return RegionStrategyVariables(self, self.regions[region])
+
+    def __contains__(self, region):
+        return region in self.regions
+
+    def __iter__(self):
+        return iter(self.regions)
+
+    def __len__(self):
+        return len(self.regions)
+
+class RegionStrategyVariables(Mapping):
+    """Read-only view of the strategy variables
+    of a single region of `RegionalStrategyVariables`
+
+    Arguments
+    ----------
+    regional_strategy_variables : RegionalStrategyVariables
+        Strategy variables of all regions
+    reg_nr : int
+        Position of the region
+
+    Note
+    ----
+    Every item is a dict with the ``scenario_value`` of the region
+    and the ``affected_enduse`` of the strategy variable (as the
+    national strategy variables). A KeyError is raised for
+    not defined strategy variables.
+    """
+    def __init__(self, regional_strategy_variables, reg_nr):
+        self.regional_strategy_variables = regional_strategy_variables
+        self.reg_nr = reg_nr
+
+    def __getitem__(self, var_name):
+        var_nr = self.regional_strategy_variables.variables[var_name]
+
+        return {
+            'scenario_value': float(self.regional_strategy_variables.values[var_nr, self.reg_nr]),
+            'affected_enduse': self.regional_strategy_variables.affected_enduses[var_name]}
+
+    def __iter__(self):
+        return iter(self.regional_strategy_variables.variables)
+
+    def __len__(self):
+        return len(self.regional_strategy_variables.variables)
+
+def calc_regional_strategy_variables(
+        regions,
+        strategy_variables,
+        spatially_modelled_vars,
+        fuel_disagg,
+        f_reg,
+        f_reg_norm,
+        f_reg_norm_abs
+    ):
+    """Convert national strategy variables to regional strategy variables
+
+    Arguments
+    ---------
+    regions : list
+        Regions
+    strategy_variables : dict
+        Strategy variables
+    spatially_modelled_vars : list
+        Strategy variables which are spatially modelled
+    fuel_disagg : dict
+        Disaggregated fuel per region
+    f_reg, f_reg_norm, f_reg_norm_abs : dict
+        Spatial diffusion factors (see `calc_spatially_diffusion_factors`)
+
+    Returns
+    -------
+    regional_strategy_variables : RegionalStrategyVariables
+        Strategy variables of all regions. Values of variables which
+        are not spatially modelled are the national values
+    """
+    regional_strategy_variables = RegionalStrategyVariables(regions, strategy_variables)
+
+    for var_name, strategy_var in strategy_variables.items():
+
+        # Check whether scenario varaible is regionally modelled
+        if var_name in spatially_modelled_vars:
+            logging.info("Spatially explicit diffusion modelling %s", var_name)
+            affected_enduse = regional_strategy_variables.affected_enduses[var_name]
+
+            if affected_enduse == []:
+                logging.info(
+                    "For scenario var %s no affected enduse is defined. Thus speed is used for diffusion",
+                        var_name)
+
+            # Get enduse specific fuel for each region
+            fuels_reg = get_enduse_regs(
+                enduse=affected_enduse,
+                fuels_disagg=[
+                    fuel_disagg['rs_fuel_disagg'],
+                    fuel_disagg['ss_fuel_disagg'],
+                    fuel_disagg['is_fuel_disagg']])
+
+            # Calculate regional specific strategy variables values
+            reg_specific_variables = factor_improvements_single(
+                factor_uk=strategy_var['scenario_value'],
+                regions=regions,
+                f_reg=f_reg,
+                f_reg_norm=f_reg_norm,
+                f_reg_norm_abs=f_reg_norm_abs,
+                fuel_regs_enduse=fuels_reg)
+
+            regional_strategy_variables.set_values(var_name, reg_specific_variables)
+
+    return regional_strategy_variables
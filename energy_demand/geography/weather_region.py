@@ -1,7 +1,12 @@
 """Weather Region: Depending on the number of weather stations, a ``WeatherRegion``
 is generated per weather station. Within this regions,
 regional load profiles are calculated."""
+import os
 import uuid
+import pickle
+import hashlib
+import logging
+from collections import OrderedDict
 import numpy as np
 from energy_demand.technologies import technological_stock
 from energy_demand.profiles import load_profile
@@ -10,6 +15,10 @@ from energy_demand.technologies import diffusion_technologies
 from energy_demand.basic import basic_functions
 from energy_demand.enduse_func import get_peak_day_single_fueltype
 
+# Version of cached weather regions. Increase if the
+# calculations or the inputs of `WeatherRegion` change
+WEATHER_REGION_CACHE_VERSION = 3
+
 class WeatherRegion(object):
     """WeaterRegion
 
@@ -33,11 +42,21 @@ class WeatherRegion(object):
         Technology load profiles
     sectors : list
         Sectors
+    previous_weather_region : WeatherRegion, default=None
+        Weather region of the same weather station of the previously
+        simulated year (with identical year-invariant inputs)
 
     Note
     ----
     - For each region, a technology stock is defined
     - regional specific fuel shapes are assigned to technologies
+    - If ``previous_weather_region`` is provided, the year-invariant
+      state (base year HDD/CDD, technology load profiles of the modelled
+      yeardays) is taken from it. If the current year HDD/CDD are unchanged
+      (no climate change and base temperature change between the years),
+      also its load profile stocks are reused and only the parts which
+      depend on diffusion (technology stocks, heat pump load profile)
+      are calculated
     """
     def __init__(
             self,
@@ -58,11 +77,32 @@ class WeatherRegion(object):
             temp_by,
             tech_lp,
             sectors,
+            previous_weather_region=None
         ):
         """Constructor of weather region
         """
         self.name = name
 
+        # -----------------------------------
+        # Year-invariant state
+        # -----------------------------------
+        if previous_weather_region is None:
+
+            # Base year HDD/CDD (rs, ss, is heating and ss cooling)
+            hdd_by, _, cdd_by, _ = hdd_cdd.calc_hdd_cdd_stations(
+                temp_by[np.newaxis],
+                [t_bases.rs_t_heating_by, t_bases.ss_t_heating_by, t_bases.is_t_heating_by],
+                [t_bases.ss_t_cooling_by],
+                model_yeardays)
+            self.hdd_by, self.cdd_by = hdd_by[0], cdd_by[0]
+
+            # Technology load profiles of modelled yeardays
+            self.tech_lp_y_dh = get_modelled_tech_lp(tech_lp, model_yeardays)
+        else:
+            self.hdd_by = previous_weather_region.hdd_by
+            self.cdd_by = previous_weather_region.cdd_by
+            self.tech_lp_y_dh = previous_weather_region.tech_lp_y_dh
+
         # -----------------------------------
         # Calculate current year temperatures
         # -----------------------------------
@@ -111,6 +151,18 @@ class WeatherRegion(object):
             curr_yr,
             t_diff_param)'''
 
+        # -----------------------------------
+        # Calculate current year HDD/CDD of all submodels at once
+        # (rs, ss, is heating and ss cooling)
+        # -----------------------------------
+        hdd_cy, shape_hdd_cy, cdd_cy, shape_cdd_cy = hdd_cdd.calc_hdd_cdd_stations(
+            temp_cy[np.newaxis],
+            [rs_t_base_heating_cy, ss_t_base_heating_cy, is_t_base_heating_cy],
+            [ss_t_base_cooling_cy],
+            model_yeardays)
+        self.hdd_cy, self.shape_hdd_cy = hdd_cy[0], shape_hdd_cy[0]
+        self.cdd_cy, self.shape_cdd_cy = cdd_cy[0], shape_cdd_cy[0]
+
         # -------------------
         # Technology stocks
         # -------------------
@@ -160,21 +212,14 @@ class WeatherRegion(object):
             assumptions.is_specified_tech_enduse_by)
 
         # -------------------
-        # Residential Load profiles
-        # ------------------
-        self.rs_load_profiles = load_profile.LoadProfileStock("rs_load_profiles")
-
-        # --------Calculate HDD/CDD
-        self.rs_hdd_by, _ = hdd_cdd.calc_reg_hdd(
-            temp_by, t_bases.rs_t_heating_by, model_yeardays)
-        self.rs_hdd_cy, rs_fuel_shape_heating_yd = hdd_cdd.calc_reg_hdd(
-            temp_cy, rs_t_base_heating_cy, model_yeardays)
+        # Climate change correction factors
+        # -------------------
+        self.rs_hdd_by = self.hdd_by[0]
+        self.rs_hdd_cy = self.hdd_cy[0]
         #self.rs_cdd_by, _ = hdd_cdd.calc_reg_cdd(
         #    temp_by, t_bases.rs_t_cooling_by, model_yeardays)
         #self.rs_cdd_cy, rs_fuel_shape_cooling_yd = hdd_cdd.calc_reg_cdd(
         #    temp_cy, rs_t_base_cooling_cy, model_yeardays)
-
-        # -------Calculate climate change correction factors
         try:
             self.f_heat_rs_y = np.nan_to_num(
                 1.0 / float(np.sum(self.rs_hdd_by))) * np.sum(self.rs_hdd_cy)
@@ -185,6 +230,97 @@ class WeatherRegion(object):
             self.f_heat_rs_y = 1
             self.f_cooling_rs_y = 1
 
+        try:
+            self.f_heat_ss_y = np.nan_to_num(
+                1.0 / float(np.sum(self.hdd_by[1]))) * np.sum(self.hdd_cy[1])
+            self.f_cooling_ss_y = np.nan_to_num(
+                1.0 / float(np.sum(self.cdd_by[0]))) * np.sum(self.cdd_cy[0])
+        except ZeroDivisionError:
+            self.f_heat_ss_y = 1
+            self.f_cooling_ss_y = 1
+
+        # Take same base temperature as for service sector
+        #is_cdd_by, _ = hdd_cdd.calc_reg_cdd(
+        #    temp_by, t_bases.is_t_cooling_by, model_yeardays)
+        #is_cdd_cy, _ = hdd_cdd.calc_reg_cdd(
+        #    temp_cy, ss_t_base_cooling_cy, model_yeardays)
+        try:
+            self.f_heat_is_y = np.nan_to_num(
+                1.0 / float(np.sum(self.hdd_by[2]))) * np.sum(self.hdd_cy[2])
+            #self.f_cooling_is_y = np.nan_to_num(1.0 / float(np.sum(is_cdd_by))) * np.sum(is_cdd_cy)
+            self.f_cooling_is_y = 1
+        except ZeroDivisionError:
+            self.f_heat_is_y = 1
+            self.f_cooling_is_y = 1
+
+        # -------------------
+        # Load profiles
+        # -------------------
+        if previous_weather_region is not None and self.climate_unchanged(previous_weather_region):
+
+            # Only the heat pump profile depends on diffusion
+            self.rs_hp_lp_id = previous_weather_region.rs_hp_lp_id
+            self.rs_load_profiles = previous_weather_region.rs_load_profiles.copy()
+            self.rs_load_profiles.update_shape_yh(
+                self.rs_hp_lp_id,
+                get_fuel_shape_heating_hp_yh(
+                    tech_lp['rs_profile_hp_y_dh'],
+                    self.rs_tech_stock,
+                    self.rs_hdd_cy,
+                    model_yeardays)[0])
+
+            self.ss_load_profiles = previous_weather_region.ss_load_profiles
+            self.is_load_profiles = previous_weather_region.is_load_profiles
+        else:
+            self.rs_hp_lp_id = uuid.uuid4()
+            self.rs_load_profiles = self.create_rs_load_profiles(
+                tech_lists, tech_lp, model_yeardays)
+            self.ss_load_profiles = self.create_ss_load_profiles(
+                tech_lists, tech_lp, assumptions, model_yeardays_nrs, sectors)
+            self.is_load_profiles = self.create_is_load_profiles(
+                tech_lists, tech_lp, assumptions, model_yeardays_nrs, sectors)
+
+    def climate_unchanged(self, weather_region_obj):
+        """Test if the current year HDD/CDD are identical
+        to those of another weather region
+
+        Arguments
+        ----------
+        weather_region_obj : WeatherRegion
+            Weather region
+
+        Returns
+        -------
+        unchanged : bool
+            Whether the HDD/CDD and their shapes are identical
+        """
+        return (
+            np.array_equal(self.hdd_cy, weather_region_obj.hdd_cy) and
+            np.array_equal(self.shape_hdd_cy, weather_region_obj.shape_hdd_cy) and
+            np.array_equal(self.cdd_cy, weather_region_obj.cdd_cy) and
+            np.array_equal(self.shape_cdd_cy, weather_region_obj.shape_cdd_cy))
+
+    def create_rs_load_profiles(self, tech_lists, tech_lp, model_yeardays):
+        """Create residential load profiles
+
+        Arguments
+        ----------
+        tech_lists : dict
+            Technology lists
+        tech_lp : dict
+            Technology load profiles
+        model_yeardays : array
+            Modelled yeardays
+
+        Returns
+        -------
+        rs_load_profiles : LoadProfileStock
+            Residential load profiles
+        """
+        rs_load_profiles = load_profile.LoadProfileStock("rs_load_profiles")
+
+        rs_fuel_shape_heating_yd = self.shape_hdd_cy[0]
+
         # yd peak factors for heating and cooling
         rs_peak_yd_heating_factor = get_shape_peak_yd_factor(self.rs_hdd_cy)
 
@@ -212,9 +348,8 @@ class WeatherRegion(object):
                 shape_peak_dh=tech_lp['rs_shapes_cooling_dh']['peakday'])
         '''
         # ------Heating boiler
-        rs_profile_boilers_y_dh = load_profile.calc_yh(
-            rs_fuel_shape_heating_yd, tech_lp['rs_profile_boilers_y_dh'], model_yeardays)
-        self.rs_load_profiles.add_lp(
+        rs_profile_boilers_y_dh = rs_fuel_shape_heating_yd[:, np.newaxis] * self.tech_lp_y_dh['rs_profile_boilers_y_dh']
+        rs_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=tech_lists['heating_const'],
             enduses=['rs_space_heating', 'rs_water_heating'],
@@ -224,10 +359,9 @@ class WeatherRegion(object):
             shape_peak_dh=tech_lp['rs_lp_heating_boilers_dh']['peakday'])
 
         # ------Heating CHP
-        rs_profile_chp_y_dh = load_profile.calc_yh(
-            rs_fuel_shape_heating_yd, tech_lp['rs_profile_chp_y_dh'], model_yeardays)
+        rs_profile_chp_y_dh = rs_fuel_shape_heating_yd[:, np.newaxis] * self.tech_lp_y_dh['rs_profile_chp_y_dh']
 
-        self.rs_load_profiles.add_lp(
+        rs_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=tech_lists['tech_CHP'],
             enduses=['rs_space_heating', 'rs_water_heating'],
@@ -237,9 +371,8 @@ class WeatherRegion(object):
             shape_peak_dh=tech_lp['rs_lp_heating_CHP_dh']['peakday'])
 
         # ------Electric heating, storage heating (primary)
-        rs_profile_storage_heater_y_dh = load_profile.calc_yh(
-            rs_fuel_shape_heating_yd, tech_lp['rs_profile_storage_heater_y_dh'], model_yeardays)
-        self.rs_load_profiles.add_lp(
+        rs_profile_storage_heater_y_dh = rs_fuel_shape_heating_yd[:, np.newaxis] * self.tech_lp_y_dh['rs_profile_storage_heater_y_dh']
+        rs_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=tech_lists['storage_heating_electricity'],
             enduses=['rs_space_heating', 'rs_water_heating'],
@@ -249,9 +382,8 @@ class WeatherRegion(object):
             shape_peak_dh=tech_lp['rs_lp_storage_heating_dh']['peakday'])
 
         # ------Electric heating secondary (direct elec heating)
-        rs_profile_elec_heater_y_dh = load_profile.calc_yh(
-            rs_fuel_shape_heating_yd, tech_lp['rs_profile_elec_heater_y_dh'], model_yeardays)
-        self.rs_load_profiles.add_lp(
+        rs_profile_elec_heater_y_dh = rs_fuel_shape_heating_yd[:, np.newaxis] * self.tech_lp_y_dh['rs_profile_elec_heater_y_dh']
+        rs_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=tech_lists['secondary_heating_electricity'],
             enduses=['rs_space_heating', 'rs_water_heating'],
@@ -267,8 +399,8 @@ class WeatherRegion(object):
             self.rs_hdd_cy,
             model_yeardays)
 
-        self.rs_load_profiles.add_lp(
-            unique_identifier=uuid.uuid4(),
+        rs_load_profiles.add_lp(
+            unique_identifier=self.rs_hp_lp_id,
             technologies=tech_lists['heating_non_const'],
             enduses=['rs_space_heating', 'rs_water_heating'],
             shape_yd=rs_fuel_shape_heating_yd,
@@ -277,10 +409,7 @@ class WeatherRegion(object):
             shape_peak_dh=tech_lp['rs_lp_heating_CHP_dh']['peakday'])
 
         # ------District_heating_electricity --> Assumption made that same curve as CHP
-        rs_profile_chp_y_dh = load_profile.calc_yh(
-            rs_fuel_shape_heating_yd, tech_lp['rs_profile_chp_y_dh'], model_yeardays)
-
-        self.rs_load_profiles.add_lp(
+        rs_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=tech_lists['tech_district_heating'],
             enduses=['rs_space_heating', 'rs_water_heating'],
@@ -289,30 +418,37 @@ class WeatherRegion(object):
             f_peak_yd=rs_peak_yd_heating_factor,
             shape_peak_dh=tech_lp['rs_lp_heating_boilers_dh']['peakday'])
 
-        # -------------------
-        # Service Load profiles
-        # ------------------
-        self.ss_load_profiles = load_profile.LoadProfileStock("ss_load_profiles")
+        return rs_load_profiles
+
+    def create_ss_load_profiles(self, tech_lists, tech_lp, assumptions, model_yeardays_nrs, sectors):
+        """Create service load profiles
+
+        Arguments
+        ----------
+        tech_lists : dict
+            Technology lists
+        tech_lp : dict
+            Technology load profiles
+        assumptions : dict
+            Assumptions
+        model_yeardays_nrs : int
+            Number of modelled yeardays
+        sectors : dict
+            Sectors
+
+        Returns
+        -------
+        ss_load_profiles : LoadProfileStock
+            Service load profiles
+        """
+        ss_load_profiles = load_profile.LoadProfileStock("ss_load_profiles")
 
         # --------HDD/CDD
-        ss_hdd_by, _ = hdd_cdd.calc_reg_hdd(
-            temp_by, t_bases.ss_t_heating_by, model_yeardays)
-        ss_hdd_cy, ss_fuel_shape_heating_yd = hdd_cdd.calc_reg_hdd(
-            temp_cy, ss_t_base_heating_cy, model_yeardays)
+        ss_hdd_cy = self.hdd_cy[1]
+        ss_fuel_shape_heating_yd = self.shape_hdd_cy[1]
 
-        ss_cdd_by, _ = hdd_cdd.calc_reg_cdd(
-            temp_by, t_bases.ss_t_cooling_by, model_yeardays)
-        ss_cdd_cy, ss_fuel_shape_coolin_yd = hdd_cdd.calc_reg_cdd(
-            temp_cy, ss_t_base_cooling_cy, model_yeardays)
-
-        try:
-            self.f_heat_ss_y = np.nan_to_num(
-                1.0 / float(np.sum(ss_hdd_by))) * np.sum(ss_hdd_cy)
-            self.f_cooling_ss_y = np.nan_to_num(
-                1.0 / float(np.sum(ss_cdd_by))) * np.sum(ss_cdd_cy)
-        except ZeroDivisionError:
-            self.f_heat_ss_y = 1
-            self.f_cooling_ss_y = 1
+        ss_cdd_cy = self.cdd_cy[0]
+        ss_fuel_shape_coolin_yd = self.shape_cdd_cy[0]
 
         # ----------------------------------------------
         # Apply weekend correction factor fo ss heating
@@ -320,7 +456,6 @@ class WeatherRegion(object):
         ss_peak_yd_heating_factor = get_shape_peak_yd_factor(ss_hdd_cy)
         ss_peak_yd_cooling_factor = get_shape_peak_yd_factor(ss_cdd_cy)
 
-
         # --Heating technologies for service sector
         #
         # (the heating shape follows the gas shape of aggregated sectors)
@@ -347,7 +482,7 @@ class WeatherRegion(object):
         peak_day = get_peak_day_single_fueltype(ss_fuel_shape)
         ss_space_heating_shape_peak_dh = load_profile.abs_to_rel(ss_fuel_shape[peak_day])
 
-        self.ss_load_profiles.add_lp(
+        ss_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=all_techs_ss_space_heating,
             enduses=['ss_space_heating'],
@@ -370,11 +505,9 @@ class WeatherRegion(object):
                 ss_fuel_shape_coolin_yd = load_profile.abs_to_rel(ss_fuel_shape_coolin_yd)
 
                 # Ev auch tech_lp['ss_shapes_cooling_dh']
-                ss_shape_yh = load_profile.calc_yh(
-                    ss_fuel_shape_coolin_yd,
-                    tech_lp['ss_profile_cooling_y_dh'], model_yeardays)
+                ss_shape_yh = ss_fuel_shape_coolin_yd[:, np.newaxis] * self.tech_lp_y_dh['ss_profile_cooling_y_dh']
 
-                self.ss_load_profiles.add_lp(
+                ss_load_profiles.add_lp(
                     unique_identifier=uuid.uuid4(),
                     technologies=coolings_techs,
                     enduses=[cooling_enduse],
@@ -384,30 +517,34 @@ class WeatherRegion(object):
                     f_peak_yd=ss_peak_yd_cooling_factor,
                     shape_peak_dh=tech_lp['ss_shapes_cooling_dh']['peakday'])
 
-        # --------------------------------
-        # Industry submodel
-        # --------------------------------
-        self.is_load_profiles = load_profile.LoadProfileStock("is_load_profiles")
-
-        # --------HDD/CDD
-        is_hdd_by, _ = hdd_cdd.calc_reg_hdd(
-            temp_by, t_bases.is_t_heating_by, model_yeardays)
-        #is_cdd_by, _ = hdd_cdd.calc_reg_cdd(
-        #    temp_by, t_bases.is_t_cooling_by, model_yeardays)
-
-        # Take same base temperature as for service sector
-        is_hdd_cy, is_fuel_shape_heating_yd = hdd_cdd.calc_reg_hdd(
-            temp_cy, is_t_base_heating_cy, model_yeardays)
-        #is_cdd_cy, _ = hdd_cdd.calc_reg_cdd(
-        #    temp_cy, ss_t_base_cooling_cy, model_yeardays)
+        return ss_load_profiles
+
+    def create_is_load_profiles(self, tech_lists, tech_lp, assumptions, model_yeardays_nrs, sectors):
+        """Create industry load profiles
+
+        Arguments
+        ----------
+        tech_lists : dict
+            Technology lists
+        tech_lp : dict
+            Technology load profiles
+        assumptions : dict
+            Assumptions
+        model_yeardays_nrs : int
+            Number of modelled yeardays
+        sectors : dict
+            Sectors
+
+        Returns
+        -------
+        is_load_profiles : LoadProfileStock
+            Industry load profiles
+        """
+        is_load_profiles = load_profile.LoadProfileStock("is_load_profiles")
 
-        try:
-            self.f_heat_is_y = np.nan_to_num(1.0 / float(np.sum(is_hdd_by))) * np.sum(is_hdd_cy)
-            #self.f_cooling_is_y = np.nan_to_num(1.0 / float(np.sum(is_cdd_by))) * np.sum(is_cdd_cy)
-            self.f_cooling_is_y = 1
-        except ZeroDivisionError:
-            self.f_heat_is_y = 1
-            self.f_cooling_is_y = 1
+        # --------HDD/CDD (same base temperature as for service sector)
+        is_hdd_cy = self.hdd_cy[2]
+        is_fuel_shape_heating_yd = self.shape_hdd_cy[2]
 
         is_peak_yd_heating_factor = get_shape_peak_yd_factor(is_hdd_cy)
         #is_peak_yd_cooling_factor = self.get_shape_peak_yd_factor(is_cdd_cy)
@@ -438,7 +575,7 @@ class WeatherRegion(object):
         #flat_is_fuel_shape_any_tech = np.full((assumptions.model_yeardays_nrs, 24), (1.0/24.0), dtype=float)
         #flat_is_fuel_shape_any_tech = flat_is_fuel_shape_any_tech * is_fuel_shape_heating_yd[:, np.newaxis]
 
-        self.is_load_profiles.add_lp(
+        is_load_profiles.add_lp(
             unique_identifier=uuid.uuid4(),
             technologies=all_techs_is_space_heating,
             enduses=['is_space_heating'],
@@ -447,6 +584,242 @@ class WeatherRegion(object):
             shape_yh=is_fuel_shape_any_tech, #flat_is_fuel_shape_any_tech,
             f_peak_yd=is_peak_yd_heating_factor)
 
+        return is_load_profiles
+
+
+class WeatherRegionCache(object):
+    """Content-addressed cache of `WeatherRegion` objects
+
+    Arguments
+    ----------
+    path : str, default=None
+        Folder to store cached weather regions. If None,
+        weather regions are only cached in memory
+    max_weather_regions : int, default=None
+        Maximum number of weather regions kept in memory. If
+        exceeded, the least recently used weather region is
+        removed. If None, the number is not limited
+
+    Note
+    ----
+    The key of a weather region is a hash of the weather station,
+    the base and current year, the temperatures, the strategy
+    variables used to create a weather region and all other
+    (constant) inputs (see `get_weather_region_context_key`).
+    Cached weather regions are not pickled, i.e. the cache is
+    empty when sent to another process.
+    """
+    def __init__(self, path=None, max_weather_regions=None):
+        self.path = path
+        self.max_weather_regions = max_weather_regions
+        self.weather_regions = OrderedDict()
+
+    def add_weather_region(self, key, weather_region_obj):
+        """Add weather region to memory and remove
+        least recently used weather regions
+
+        Arguments
+        ----------
+        key : str
+            Key of weather region
+        weather_region_obj : WeatherRegion
+            Weather region
+        """
+        self.weather_regions[key] = weather_region_obj
+
+        if self.max_weather_regions is not None:
+            while len(self.weather_regions) > self.max_weather_regions:
+                self.weather_regions.popitem(last=False)
+
+    def get_weather_region(self, context_key, name, base_yr, curr_yr, strategy_variables, temp_by, **kwargs):
+        """Get weather region from cache or create weather region
+
+        Arguments
+        ----------
+        context_key : str
+            Hash of all other inputs (`get_weather_region_context_key`)
+        name, base_yr, curr_yr, strategy_variables, temp_by, kwargs
+            Arguments of `WeatherRegion`
+
+        Returns
+        -------
+        weather_region_obj : WeatherRegion
+            Weather region
+        """
+        key = get_weather_region_key(
+            context_key, name, base_yr, curr_yr, strategy_variables, temp_by)
+
+        try:
+            weather_region_obj = self.weather_regions[key]
+            self.weather_regions.move_to_end(key)
+            logging.debug("... weather region %s taken from cache", name)
+            return weather_region_obj
+        except KeyError:
+            pass
+
+        if self.path:
+            path_file = os.path.join(self.path, "weather_region_{}.pickle".format(key))
+            if os.path.isfile(path_file):
+                with open(path_file, 'rb') as file_handle:
+                    weather_region_obj = pickle.load(file_handle)
+                self.add_weather_region(key, weather_region_obj)
+                return weather_region_obj
+
+        weather_region_obj = WeatherRegion(
+            name=name,
+            base_yr=base_yr,
+            curr_yr=curr_yr,
+            strategy_variables=strategy_variables,
+            temp_by=temp_by,
+            **kwargs)
+        self.add_weather_region(key, weather_region_obj)
+
+        if self.path:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+
+            # Write to temporary file first to not leave incomplete files
+            path_tmp = "{}.{}.tmp".format(path_file, os.getpid())
+            with open(path_tmp, 'wb') as file_handle:
+                pickle.dump(weather_region_obj, file_handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path_tmp, path_file)
+
+        return weather_region_obj
+
+    def __getstate__(self):
+        """Do not pickle cached weather regions
+        """
+        return {
+            'path': self.path,
+            'max_weather_regions': self.max_weather_regions,
+            'weather_regions': OrderedDict()}
+
+def get_weather_region_context_key(
+        t_bases,
+        t_diff_param,
+        tech_lists,
+        technologies,
+        assumptions,
+        fueltypes,
+        model_yeardays_nrs,
+        model_yeardays,
+        yeardays_month_days,
+        all_enduses,
+        tech_lp,
+        sectors
+    ):
+    """Calculate hash of all inputs of a `WeatherRegion` which
+    are the same for all weather stations and years
+
+    Arguments
+    ----------
+    See `WeatherRegion`
+
+    Returns
+    -------
+    context_key : str
+        Hash
+    """
+    hash_obj = hashlib.sha1()
+    basic_functions.update_hash(hash_obj, WEATHER_REGION_CACHE_VERSION)
+
+    # Only the assumptions used to create weather regions
+    assumptions_used = [
+        assumptions.enduse_overall_change['other_enduse_mode_info'],
+        assumptions.rs_specified_tech_enduse_by,
+        assumptions.ss_specified_tech_enduse_by,
+        assumptions.is_specified_tech_enduse_by,
+        assumptions.enduse_rs_space_cooling,
+        assumptions.ss_enduse_space_cooling,
+        assumptions.ss_weekend_f,
+        assumptions.is_weekend_f,
+        assumptions.cdd_weekend_cfactors,
+        assumptions.model_yeardays_nrs]
+
+    for value in [
+            t_bases,
+            t_diff_param,
+            tech_lists,
+            technologies,
+            assumptions_used,
+            fueltypes,
+            model_yeardays_nrs,
+            model_yeardays,
+            yeardays_month_days,
+            all_enduses,
+            tech_lp,
+            sectors]:
+        basic_functions.update_hash(hash_obj, value)
+
+    return hash_obj.hexdigest()
+
+def get_weather_region_key(context_key, name, base_yr, curr_yr, strategy_variables, temp_by):
+    """Calculate key of a weather region
+
+    Arguments
+    ----------
+    context_key : str
+        Hash of all other inputs (`get_weather_region_context_key`)
+    name : str
+        Weather station
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    strategy_variables : dict
+        Strategy variables
+    temp_by : array
+        Base year temperatures
+
+    Returns
+    -------
+    key : str
+        Hash
+
+    Note
+    ----
+    Only strategy variables on climate change and base
+    temperatures are used to create a weather region.
+    """
+    hash_obj = hashlib.sha1()
+
+    strategy_values = {}
+    for var_name, strategy_var in strategy_variables.items():
+        if var_name.startswith('climate_change_temp') or '_t_base_' in var_name:
+            strategy_values[var_name] = strategy_var['scenario_value']
+
+    for value in [context_key, name, base_yr, curr_yr, strategy_values, temp_by]:
+        basic_functions.update_hash(hash_obj, value)
+
+    return hash_obj.hexdigest()
+
+def get_modelled_tech_lp(tech_lp, model_yeardays):
+    """Get the y_dh technology load profiles of the
+    modelled yeardays which are independent of the temperatures
+
+    Arguments
+    ----------
+    tech_lp : dict
+        Technology load profiles
+    model_yeardays : array
+        Modelled yeardays
+
+    Returns
+    -------
+    tech_lp_y_dh : dict
+        Technology load profiles of modelled yeardays
+    """
+    tech_lp_y_dh = {}
+    for key in [
+            'rs_profile_boilers_y_dh',
+            'rs_profile_chp_y_dh',
+            'rs_profile_storage_heater_y_dh',
+            'rs_profile_elec_heater_y_dh',
+            'ss_profile_cooling_y_dh']:
+        tech_lp_y_dh[key] = tech_lp[key][[model_yeardays]]
+
+    return tech_lp_y_dh
+
 def get_shape_peak_yd_factor(demand_yd):
     """From yd shape calculate maximum relative yearly service demand
     which is provided in a day
@@ -1,7 +1,12 @@
 """Weather Station location
 """
+import numpy as np
+from scipy.spatial import cKDTree
 from haversine import haversine # Package to calculate distance between two long/lat points
 
+# Mean earth radius used for distances (same as haversine package)
+EARTH_RADIUS_KM = 6371.0088
+
 def calc_distance_two_points(long_from, lat_from, long_to, lat_to):
     """Calculate distance between two points
 
@@ -28,7 +33,7 @@ def calc_distance_two_points(long_from, lat_from, long_to, lat_to):
 
     return distance_in_km
 
-def get_closest_station(longitude_reg, latitude_reg, weather_stations):
+def get_closest_station(longitude_reg, latitude_reg, weather_stations, station_index=None):
     """Search ID of closest weater station
 
     Arguments
@@ -39,12 +44,18 @@ def get_closest_station(longitude_reg, latitude_reg, weather_stations):
         Latitute coordinate of Region Object
     weather_stations : dict
         Weater station data
+    station_index : WeatherStationIndex, default=None
+        Spatial index of weather stations. If provided, the
+        index is used instead of comparing all stations
 
     Return
     ------
     closest_id : int
         ID of closest weather station
     """
+    if station_index is not None:
+        return station_index.get_closest_station(longitude_reg, latitude_reg)
+
     closest_dist = 99999999999
 
     for station_id in weather_stations:
@@ -59,3 +70,171 @@ def get_closest_station(longitude_reg, latitude_reg, weather_stations):
             closest_id = station_id
 
     return closest_id
+
+def coord_to_unit_vector(longitude, latitude):
+    """Convert coordinates to unit vectors on the sphere.
+
+    The coordinates are used in the same order as in
+    `calc_distance_two_points`, i.e. the nearest unit vector
+    is the station with the smallest haversine distance
+
+    Arguments
+    ----------
+    longitude : array
+        Longitute coordinates
+    latitude : array
+        Latitute coordinates
+
+    Returns
+    -------
+    unit_vectors : array
+        Unit vectors (points, 3)
+    """
+    first = np.radians(np.asarray(longitude, dtype=float))
+    second = np.radians(np.asarray(latitude, dtype=float))
+
+    return np.stack([
+        np.cos(first) * np.cos(second),
+        np.cos(first) * np.sin(second),
+        np.sin(first)], axis=-1)
+
+class WeatherStationIndex(object):
+    """Spatial index (KD-tree on unit vectors) of weather stations
+    to search closest weather stations of regions
+
+    Arguments
+    ----------
+    weather_stations : dict
+        Weater station data
+
+    Note
+    ----
+    If several stations have the same distance, the station which
+    is listed first in `weather_stations` is selected (same as
+    in `get_closest_station` without index)
+    """
+    def __init__(self, weather_stations):
+        self.station_ids = list(weather_stations)
+        self.unit_vectors = coord_to_unit_vector(
+            [weather_stations[station_id]['station_longitude'] for station_id in self.station_ids],
+            [weather_stations[station_id]['station_latitude'] for station_id in self.station_ids])
+        self.tree = cKDTree(self.unit_vectors)
+
+    def __getstate__(self):
+        """The tree is rebuilt when unpickled
+        """
+        state = self.__dict__.copy()
+        del state['tree']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tree = cKDTree(self.unit_vectors)
+
+    def get_closest_station(self, longitude, latitude):
+        """Get ID of closest weather station
+
+        Arguments
+        ----------
+        longitude : float
+            Longitute coordinate
+        latitude : float
+            Latitute coordinate
+
+        Returns
+        -------
+        closest_id : str
+            ID of closest weather station
+        """
+        unit_vector = coord_to_unit_vector(longitude, latitude)
+        chord_distance, _ = self.tree.query(unit_vector, k=1)
+
+        # Select first listed station if several stations have the same distance
+        station_nrs = self.tree.query_ball_point(
+            unit_vector, chord_distance * (1 + 1e-9) + 1e-12)
+
+        return self.station_ids[min(station_nrs)]
+
+    def get_closest_stations(self, longitude, latitude, k=1):
+        """Get the k closest weather stations and their distances
+
+        Arguments
+        ----------
+        longitude : float
+            Longitute coordinate
+        latitude : float
+            Latitute coordinate
+        k : int, default=1
+            Number of stations
+
+        Returns
+        -------
+        station_ids : list
+            IDs of closest stations (closest first)
+        distances : array
+            Distance in km to stations
+        """
+        k = min(k, len(self.station_ids))
+        chord_distances, station_nrs = self.tree.query(
+            coord_to_unit_vector(longitude, latitude), k=k)
+        chord_distances = np.atleast_1d(chord_distances)
+        station_nrs = np.atleast_1d(station_nrs)
+
+        station_ids = [self.station_ids[station_nr] for station_nr in station_nrs]
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord_distances / 2, 1))
+
+        return station_ids, distances
+
+    def get_idw_weights(self, longitude, latitude, k=4, power=2):
+        """Get inverse distance weights of the k closest weather stations
+
+        Arguments
+        ----------
+        longitude : float
+            Longitute coordinate
+        latitude : float
+            Latitute coordinate
+        k : int, default=4
+            Number of stations
+        power : float, default=2
+            Power of inverse distance
+
+        Returns
+        -------
+        weights : dict
+            Weight of every station {station_id: weight}. The
+            weights sum up to one. If the coordinate is at a station,
+            only this station gets a weight
+        """
+        station_ids, distances = self.get_closest_stations(longitude, latitude, k=k)
+
+        if distances[0] == 0:
+            return {station_ids[0]: 1.0}
+
+        inverse_distances = 1.0 / distances ** power
+        weights = inverse_distances / np.sum(inverse_distances)
+
+        return dict(zip(station_ids, weights))
+
+    def assign_regions(self, regions, reg_coord):
+        """Get closest weather station of every region
+
+        Arguments
+        ----------
+        regions : list
+            Regions
+        reg_coord : dict
+            Coordinates of regions
+
+        Returns
+        -------
+        reg_closest_station : dict
+            Closest weather station of every region {region: station_id}
+        """
+        reg_closest_station = {}
+        for region in regions:
+            reg_closest_station[region] = self.get_closest_station(
+                reg_coord[region]['longitude'],
+                reg_coord[region]['latitude'])
+
+        return reg_closest_station
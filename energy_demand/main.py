@@ -42,20 +42,26 @@ from energy_demand.basic import conversions
 from energy_demand.assumptions import non_param_assumptions
 from energy_demand.assumptions import param_assumptions
 from energy_demand.read_write import data_loader
+from energy_demand.profiles import representative_days
 from energy_demand.basic import logger_setup
 from energy_demand.read_write import write_data
+from energy_demand.read_write import result_store
 from energy_demand.read_write import read_data
 from energy_demand.basic import basic_functions
+from energy_demand.geography.weather_region import WeatherRegionCache
+from energy_demand.geography.weather_station_location import WeatherStationIndex
 
 NR_OF_MODELLEd_REGIONS = 2
 
-def energy_demand_model(data, assumptions, fuel_in=0, fuel_in_elec=0):
+def energy_demand_model(data, assumptions, fuel_in=0, fuel_in_elec=0, year_invariant=None):
     """Main function of energy demand model to calculate yearly demand
 
     Arguments
     ----------
     data : dict
         Data container
+    year_invariant : dict, default=None
+        Inputs which are the same for every simulation year
 
     Returns
     -------
@@ -73,7 +79,8 @@ def energy_demand_model(data, assumptions, fuel_in=0, fuel_in_elec=0):
     modelrun_obj = model.EnergyDemandModel(
         regions=data['regions'],
         data=data,
-        assumptions=assumptions)
+        assumptions=assumptions,
+        year_invariant=year_invariant)
 
     # Calculate base year demand
     fuel_in, fuel_in_biomass, fuel_in_elec, fuel_in_gas, fuel_in_heat, fuel_in_hydrogen, fuel_in_solid_fuel, fuel_in_oil, tot_heating = testing.test_function_fuel_sum(
@@ -88,44 +95,44 @@ def energy_demand_model(data, assumptions, fuel_in=0, fuel_in_elec=0):
 
     print("-----------------")
     print("[GWh] Total fuel input:    " + str(fuel_in))
-    print("[GWh] Total output:        " + str(np.sum(modelrun_obj.ed_fueltype_national_yh)))
-    print("[GWh] Total difference:    " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh) - fuel_in), 4)))
+    print("[GWh] Total output:        " + str(np.sum(modelrun_obj.ed_fueltype_national_y)))
+    print("[GWh] Total difference:    " + str(round((np.sum(modelrun_obj.ed_fueltype_national_y) - fuel_in), 4)))
     print("-----------")
     print("[GWh] oil fuel in:         " + str(fuel_in_oil))
-    print("[GWh] oil fuel out:        " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['oil']])))
-    print("[GWh] oil diff:            " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['oil']]) - fuel_in_oil, 4)))
+    print("[GWh] oil fuel out:        " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['oil']]))
+    print("[GWh] oil diff:            " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['oil']] - fuel_in_oil, 4)))
     print("-----------")
     print("[GWh] biomass fuel in:     " + str(fuel_in_biomass))
-    print("[GWh] biomass fuel out:    " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['biomass']])))
-    print("[GWh] biomass diff:        " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['biomass']]) - fuel_in_biomass, 4)))
+    print("[GWh] biomass fuel out:    " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['biomass']]))
+    print("[GWh] biomass diff:        " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['biomass']] - fuel_in_biomass, 4)))
     print("-----------")
     print("[GWh] solid_fuel fuel in:  " + str(fuel_in_solid_fuel))
-    print("[GWh] solid_fuel fuel out: " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['solid_fuel']])))
-    print("[GWh] solid_fuel diff:     " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['solid_fuel']]) - fuel_in_solid_fuel, 4)))
+    print("[GWh] solid_fuel fuel out: " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['solid_fuel']]))
+    print("[GWh] solid_fuel diff:     " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['solid_fuel']] - fuel_in_solid_fuel, 4)))
     print("-----------")
     print("[GWh] elec fuel in:        " + str(fuel_in_elec))
-    print("[GWh] elec fuel out:       " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['electricity']])))
-    print("[GWh] ele fuel diff:       " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['electricity']]) - fuel_in_elec, 4)))
+    print("[GWh] elec fuel out:       " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['electricity']]))
+    print("[GWh] ele fuel diff:       " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['electricity']] - fuel_in_elec, 4)))
     print("-----------")
     print("[GWh] gas fuel in:         " + str(fuel_in_gas))
-    print("[GWh] gas fuel out:        " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['gas']])))
-    print("[GWh] gas diff:            " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['gas']]) - fuel_in_gas, 4)))
+    print("[GWh] gas fuel out:        " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['gas']]))
+    print("[GWh] gas diff:            " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['gas']] - fuel_in_gas, 4)))
     print("-----------")
     print("[GWh] hydro fuel in:       " + str(fuel_in_hydrogen))
-    print("[GWh] hydro fuel out:      " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['hydrogen']])))
-    print("[GWh] hydro diff:          " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['hydrogen']]) - fuel_in_hydrogen, 4)))
+    print("[GWh] hydro fuel out:      " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['hydrogen']]))
+    print("[GWh] hydro diff:          " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['hydrogen']] - fuel_in_hydrogen, 4)))
     print("-----------")
     print("TOTAL HEATING        " + str(tot_heating))
     print("[GWh] heat fuel in:        " + str(fuel_in_heat))
-    print("[GWh] heat fuel out:       " + str(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['heat']])))
-    print("[GWh] heat diff:           " + str(round(np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['heat']]) - fuel_in_heat, 4)))
+    print("[GWh] heat fuel out:       " + str(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['heat']]))
+    print("[GWh] heat diff:           " + str(round(modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['heat']] - fuel_in_heat, 4)))
     print("-----------")
-    print("Diff elec %:         " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['electricity']])/ fuel_in_elec), 4)))
-    print("Diff gas %:          " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['gas']])/ fuel_in_gas), 4)))
-    print("Diff oil %:          " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['oil']])/ fuel_in_oil), 4)))
-    print("Diff solid_fuel %:   " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['solid_fuel']])/ fuel_in_solid_fuel), 4)))
-    print("Diff hydrogen %:     " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['hydrogen']])/ fuel_in_hydrogen), 4)))
-    print("Diff biomass %:      " + str(round((np.sum(modelrun_obj.ed_fueltype_national_yh[data['lookups']['fueltypes']['biomass']])/ fuel_in_biomass), 4)))
+    print("Diff elec %:         " + str(round((modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['electricity']]/ fuel_in_elec), 4)))
+    print("Diff gas %:          " + str(round((modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['gas']]/ fuel_in_gas), 4)))
+    print("Diff oil %:          " + str(round((modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['oil']]/ fuel_in_oil), 4)))
+    print("Diff solid_fuel %:   " + str(round((modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['solid_fuel']]/ fuel_in_solid_fuel), 4)))
+    print("Diff hydrogen %:     " + str(round((modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['hydrogen']]/ fuel_in_hydrogen), 4)))
+    print("Diff biomass %:      " + str(round((modelrun_obj.ed_fueltype_national_y[data['lookups']['fueltypes']['biomass']]/ fuel_in_biomass), 4)))
     print("================================================")
 
     logging.info("...finished running energy demand model simulation")
@@ -163,6 +170,13 @@ if __name__ == "__main__":
     data['criterias']['write_to_txt'] = True                    # Wheater results are written to txt files
     data['criterias']['beyond_supply_outputs'] = True           # Wheater all results besides integraded smif run are calculated
     data['criterias']['plot_tech_lp'] = True                    # Wheater all individual load profils are plotted
+    data['criterias']['nr_of_processes'] = 1                    # Number of processes to simulate regions (1: no parallel simulation)
+    data['criterias']['write_result_store'] = False             # Whether hourly results are written to the chunked result store instead of '.npy' files
+    data['criterias']['cache_scenario_initialisation'] = True   # Whether scenario initialisation results are cached and reused if inputs are unchanged
+    data['criterias']['factorised_fuel'] = False                # Whether hourly fuel is calculated from annual fuel per load profile after all regions are simulated
+    data['criterias']['representative_days'] = None             # Number of modelled representative days (None: all days are modelled)
+    data['criterias']['batch_enduses'] = False                  # Whether every enduse is calculated for all regions at once (EnduseBatch)
+    data['criterias']['cache_weather_regions'] = False          # Whether weather regions are cached and reused for repeated years and scenarios
 
     # Paths
     data['paths'] = data_loader.load_paths(path_main)
@@ -243,6 +257,39 @@ if __name__ == "__main__":
 
     data['weather_stations'], data['temp_data'] = data_loader.load_temp_data(data['local_paths'])
 
+    # Select representative days and reload load profiles of selected days
+    if data['criterias']['representative_days']:
+        day_features = representative_days.get_day_features(
+            data['temp_data'],
+            [shape_yd['shape_non_peak_yd'] for shape_yd in data['tech_lp']['rs_shapes_yd'].values()],
+            data['assumptions'].model_yeardays_daytype)
+
+        model_yeardays, yearday_weights, _ = representative_days.select_representative_days(
+            day_features, data['criterias']['representative_days'])
+        representative_days.log_selection_error(
+            data['temp_data'], model_yeardays, yearday_weights)
+
+        # Technology load profiles are created for every day of the year
+        yeardays_daytype = data['assumptions'].model_yeardays_daytype
+
+        data['assumptions'].update_model_yeardays(model_yeardays, yearday_weights)
+
+        data['tech_lp'] = data_loader.load_data_profiles(
+            data['paths'], data['local_paths'],
+            data['assumptions'].model_yeardays,
+            yeardays_daytype,
+            False)
+
+    # Spatial index to search closest weather stations
+    data['weather_station_index'] = WeatherStationIndex(data['weather_stations'])
+
+    # Cache of weather regions (path to store cache on disk or None)
+    # keeping at most the weather regions of one simulation year in memory
+    if data['criterias']['cache_weather_regions']:
+        data['weather_region_cache'] = WeatherRegionCache(
+            path=None,
+            max_weather_regions=len(data['weather_stations']))
+
     data['reg_nrs'] = len(data['regions'])
 
     
@@ -294,6 +341,16 @@ if __name__ == "__main__":
         data['reg_nrs'],
         data['regions'])
 
+    # Chunked store to which regional hourly results are written
+    if data['criterias']['write_result_store']:
+        data['result_store'] = result_store.ResultStore(
+            os.path.join(data['result_paths']['data_results_model_runs'], "result_store"),
+            data['reg_nrs'])
+
+    # Inputs which are not recalculated for every simulation year
+    year_invariant = model.create_year_invariant_inputs(
+        data['regions'], data, data['assumptions'])
+
     for sim_yr in data['assumptions'].simulated_yrs:
         setattr(data['assumptions'], 'curr_yr', sim_yr)
 
@@ -310,7 +367,8 @@ if __name__ == "__main__":
             data,
             data['assumptions'],
             fuel_in,
-            fuel_in_elec)
+            fuel_in_elec,
+            year_invariant)
 
         # --------------------
         # Result unconstrained
@@ -318,7 +376,9 @@ if __name__ == "__main__":
         # Sum according to first element in array (sectors)
         # which aggregtes over the sectors
         # ---
-        supply_results_unconstrained = sum(modelrun_obj.ed_submodel_fueltype_regs_yh[:,])
+        # (regional results are None if written to the result store)
+        if not data['criterias']['write_result_store']:
+            supply_results_unconstrained = sum(modelrun_obj.ed_submodel_fueltype_regs_yh[:,])
 
         # Write out all calculations which are not used for SMIF
         if data['criterias']['beyond_supply_outputs']:
@@ -351,12 +411,13 @@ if __name__ == "__main__":
                     path_runs,
                     supply_results_unconstrained,
                     "supply_results")'''
-                write_data.write_supply_results(
-                    sim_yr,
-                    "result_tot_yh",
-                    path_runs,
-                    modelrun_obj.ed_fueltype_regs_yh,
-                    "result_tot_submodels_fueltypes")
+                if not data['criterias']['write_result_store']:
+                    write_data.write_supply_results(
+                        sim_yr,
+                        "result_tot_yh",
+                        path_runs,
+                        modelrun_obj.ed_fueltype_regs_yh,
+                        "result_tot_submodels_fueltypes")
                 write_data.write_enduse_specific(
                     sim_yr,
                     path_runs,
@@ -2,15 +2,21 @@
 """
 
 import logging
+import multiprocessing
 from collections import defaultdict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 import numpy as np
 
 import energy_demand.enduse_func as endusefunctions
+from energy_demand import enduse_batch
 from energy_demand.geography.region import Region
-from energy_demand.geography.weather_region import WeatherRegion
+from energy_demand.geography.weather_region import WeatherRegion, get_weather_region_context_key
 from energy_demand.dwelling_stock import dw_stock
 from energy_demand.basic import testing_functions as testing
-from energy_demand.profiles import load_profile, load_factors
+from energy_demand.profiles import load_profile, load_factors, fuel_factors, representative_days
 from energy_demand.charts import figure_HHD_gas_demand
 
 class EnergyDemandModel(object):
@@ -25,46 +31,57 @@ class EnergyDemandModel(object):
         Main data container
     assumptions : obj
         Assumptions and calculations based on assumptions
+    year_invariant : dict, default=None
+        Inputs which are the same for all simulation years
+        (see `create_year_invariant_inputs`). If not provided,
+        these inputs are created
+
+    Note
+    ----
+    If ``data['result_store']`` is provided, the hourly results of every
+    region are written to the store as soon as the region is simulated.
+    The regional hourly results (e.g. ``ed_fueltype_regs_yh``) are then
+    None and are read with `ResultStore.read`.
     """
-    def __init__(self, regions, data, assumptions):
+    def __init__(self, regions, data, assumptions, year_invariant=None):
         """Constructor
         """
         logging.info("... start main energy demand function")
         self.curr_yr = assumptions.curr_yr
 
+        if year_invariant is None:
+            year_invariant = create_year_invariant_inputs(regions, data, assumptions)
+
         # --------------
-        # Create non regional dependent load profiles
+        # Non regional dependent load profiles
         # --------------
-        data['non_regional_lp_stock'] = load_profile.create_load_profile_stock(
-            data['tech_lp'],
-            assumptions,
-            data['sectors'],
-            assumptions.model_yeardays,
-            data['enduses'])
+        data['non_regional_lp_stock'] = year_invariant['non_regional_lp_stock']
+        data['scenario_driver_tensor'] = year_invariant['scenario_driver_tensor']
 
         # --------------
-        # Create Weather Regions
+        # Create Weather Regions (year-invariant state is
+        # taken from the weather regions of the previous year)
         # --------------
-        weather_regions = {}
-        for weather_region in data['weather_stations']:
-            weather_regions[weather_region] = WeatherRegion(
-                name=weather_region,
-                base_yr=assumptions.base_yr,
-                curr_yr=assumptions.curr_yr,
-                strategy_variables=assumptions.strategy_variables,
-                t_bases=assumptions.t_bases,
-                t_diff_param=assumptions.base_temp_diff_params,
-                tech_lists=assumptions.tech_list,
-                technologies=data['technologies'],
-                assumptions=assumptions,
-                fueltypes=data['lookups']['fueltypes'],
-                model_yeardays_nrs=assumptions.model_yeardays_nrs,
-                model_yeardays=assumptions.model_yeardays,
-                yeardays_month_days=assumptions.yeardays_month_days,
-                all_enduses=data['enduses'],
-                temp_by=data['temp_data'][weather_region],
-                tech_lp=data['tech_lp'],
-                sectors=data['sectors'])
+        weather_regions = create_weather_regions(
+            data, assumptions, year_invariant['previous_weather_regions'])
+        year_invariant['previous_weather_regions'] = weather_regions
+
+        # --------------
+        # Register load profiles of all stocks (factorised fuel)
+        # --------------
+        try:
+            factorised_fuel = data['criterias']['factorised_fuel']
+        except KeyError:
+            factorised_fuel = False
+
+        if factorised_fuel:
+            lp_stocks = [data['non_regional_lp_stock']]
+            for weather_region in weather_regions.values():
+                lp_stocks += [
+                    weather_region.rs_load_profiles,
+                    weather_region.ss_load_profiles,
+                    weather_region.is_load_profiles]
+            lp_stocks = fuel_factors.register_profile_stocks(lp_stocks)
 
         # ------------------------
         # Create Dwelling Stock
@@ -74,7 +91,11 @@ class EnergyDemandModel(object):
 
             # Virtual dwelling stocks
             rs_dw_stock, ss_dw_stock = create_virtual_dwelling_stocks(
-                regions, self.curr_yr, data)
+                regions,
+                self.curr_yr,
+                data,
+                year_invariant['rs_dw_stock_by'],
+                year_invariant['ss_dw_stock_by'])
             data['rs_dw_stock'] = rs_dw_stock
             data['ss_dw_stock'] = ss_dw_stock
         else:
@@ -84,57 +105,111 @@ class EnergyDemandModel(object):
 
         logging.info("... finished generating dwelling stock")
 
+        # Store to which regional results are streamed (optional)
+        try:
+            result_store = data['result_store']
+        except KeyError:
+            result_store = None
+
         # --------------------
         # Initialise result container to aggregate results
+        #
+        # If regional results are streamed to a result store, the hourly
+        # results of every region are not kept. Fuel factors are only
+        # distributed after all regions are simulated (factorised fuel),
+        # all regional results are then kept
         # --------------------
+        stream_results = result_store is not None and not factorised_fuel
+
         aggr_results = initialise_result_container(
             data['lookups']['fueltypes_nr'],
             data['sectors'],
             data['reg_nrs'],
             assumptions.model_yearhours_nrs,
             assumptions.model_yeardays_nrs,
-            assumptions.heating_technologies)
+            assumptions.heating_technologies,
+            data['technologies'],
+            regional_yh=not stream_results)
 
         # ---------------------------------------------
         # Iterate over regions and Simulate
+        #
+        # Every region is aggregated into its own result container
+        # which is then added to ``aggr_results`` in region order.
+        # Serial and parallel runs therefore give identical results.
         # ---------------------------------------------
-        for reg_array_nr, region in enumerate(regions):
-            logging.info(
-                "... Simulate region %s for year %s", region, self.curr_yr)
-
-            reg_rs_submodel, reg_ss_submodel, reg_is_submodel = simulate_region(
-                region, data, assumptions, weather_regions)
+        try:
+            nr_of_processes = data['criterias']['nr_of_processes']
+        except KeyError:
+            nr_of_processes = 1
+
+        try:
+            batch_enduses = data['criterias']['batch_enduses']
+        except KeyError:
+            batch_enduses = False
+
+        if batch_enduses:
+            if factorised_fuel:
+                raise Exception(
+                    "Batched enduses cannot be combined with factorised fuel")
+
+            simulated_regions = simulate_regions_batch(
+                regions, data, assumptions, weather_regions)
+        else:
+            simulated_regions = simulate_regions(
+                regions, data, assumptions, weather_regions, nr_of_processes)
 
-            # Store submodel results
-            all_submodels = [reg_rs_submodel, reg_ss_submodel, reg_is_submodel]
+        for reg_array_nr, region_results in simulated_regions:
 
-            # ---------------------------------------------
-            # Aggregate results
-            # ---------------------------------------------
-            aggr_results = aggregate_final_results(
+            aggr_results = add_region_results(
                 aggr_results,
                 reg_array_nr,
-                all_submodels,
-                data['criterias']['mode_constrained'],
+                region_results)
+
+            if stream_results:
+                write_region_results(
+                    result_store,
+                    self.curr_yr,
+                    reg_array_nr,
+                    region_results)
+
+        if factorised_fuel:
+            aggr_results = distribute_fuel_factors(
+                aggr_results,
+                lp_stocks,
                 data['lookups']['fueltypes'],
-                data['lookups']['fueltypes_nr'],
                 assumptions.model_yearhours_nrs,
                 assumptions.model_yeardays_nrs,
                 assumptions.seasons,
-                assumptions.enduse_space_heating,
-                data['technologies'],
                 data['criterias']['beyond_supply_outputs'])
 
+            # Regional results are only complete after distributing fuel factors
+            if result_store is not None:
+                for reg_array_nr in range(data['reg_nrs']):
+                    write_region_results(
+                        result_store,
+                        self.curr_yr,
+                        reg_array_nr,
+                        get_region_results(aggr_results, reg_array_nr))
+
+        if result_store is not None:
+            result_store.flush()
+
         # -------
     	# Set all keys of aggr_results as self.attributes (EnergyDemandModel)
         # -------
         for key_attribute_name, value in aggr_results.items():
             setattr(self, key_attribute_name, value)
 
+        # Annual fuel (weighted if representative days are modelled)
+        self.ed_fueltype_national_y = representative_days.calc_annual_fuel(
+            self.ed_fueltype_national_yh, assumptions.yearday_weights)
+
         # ------------------------------
         # TESTING
         # ------------------------------
-        testing.test_region_selection(self.ed_fueltype_regs_yh)
+        if self.ed_fueltype_regs_yh is not None:
+            testing.test_region_selection(self.ed_fueltype_regs_yh)
 
         # ------------------------------
         # Chart HDD * Pop vs actual gas demand
@@ -162,14 +237,7 @@ def simulate_region(region, data, assumptions, weather_regions):
     """
     logging.debug("... Simulate region %s", region)
 
-    region_obj = Region(
-        name=region,
-        longitude=data['reg_coord'][region]['longitude'],
-        latitude=data['reg_coord'][region]['latitude'],
-        rs_fuel_disagg=data['rs_fuel_disagg'][region],
-        ss_fuel_disagg=data['ss_fuel_disagg'][region],
-        is_fuel_disagg=data['is_fuel_disagg'][region],
-        weather_stations=data['weather_stations'])
+    region_obj = create_region(region, data)
 
     # Closest weather region object
     weather_region_obj = weather_regions[region_obj.closest_weather_region_id]
@@ -206,6 +274,11 @@ def simulate_region(region, data, assumptions, weather_regions):
     # --------------------
     # Industry SubModel
     # --------------------
+    try:
+        scenario_driver_tensor = data['scenario_driver_tensor']
+    except KeyError:
+        scenario_driver_tensor = None
+
     is_submodel = industry_submodel(
         region_obj,
         weather_region_obj,
@@ -215,302 +288,755 @@ def simulate_region(region, data, assumptions, weather_regions):
         data['lookups'],
         data['criterias'],
         data['enduses']['is_enduses'],
-        data['sectors']['is_sectors'])
+        data['sectors']['is_sectors'],
+        scenario_driver_tensor)
 
     return rs_submodel, ss_submodel, is_submodel
 
-def fuel_aggr(
-        sector_models,
-        sum_crit,
-        model_yearhours_nrs,
-        fueltypes_nr,
-        model_yeardays_nrs,
-        attribute_non_technology,
-        attribute_technologies,
-        technologies
-    ):
-    """Collect hourly data from all regions and sum across
-    all fuel types and enduses
+def create_region(region, data):
+    """Create the region object of a region
 
     Arguments
-    ----------
-    sector_models : list
-        Sector models
-    sum_crit : str
-        Criteria
-    model_yearhours_nrs : int
-        Number of modelled hours in a year
-    fueltypes_nr : int
-        Number of fueltypes
-    attribute_to_get : str
-        Attribue to sumarise
-    model_yeardays_nrs : int
-        Number of modelled yeardays
-    attribute_non_technology : str
-        Attribute
-    attribute_technologies : str
-        Attribute 'techs_fuel_yh'
-    technologies : dict
-        Technologies
+    ---------
+    region : str
+        Region name
+    data : dict
+        Data container
 
     Returns
     -------
-    input_array : array
-        Summarised array
+    region_obj : Region
+        Region
     """
-    input_array = np.zeros((
-        fueltypes_nr, model_yeardays_nrs, 24), dtype=float)
+    try:
+        station_index = data['weather_station_index']
+    except KeyError:
+        station_index = None
 
-    for sector_model in sector_models:
-        for enduse_object in sector_model:
+    region_obj = Region(
+        name=region,
+        longitude=data['reg_coord'][region]['longitude'],
+        latitude=data['reg_coord'][region]['latitude'],
+        rs_fuel_disagg=data['rs_fuel_disagg'][region],
+        ss_fuel_disagg=data['ss_fuel_disagg'][region],
+        is_fuel_disagg=data['is_fuel_disagg'][region],
+        weather_stations=data['weather_stations'],
+        station_index=station_index)
 
-            fuels = get_fuels_yh(
-                enduse_object,
-                attribute_technologies,
-                model_yearhours_nrs,
-                model_yeardays_nrs)
+    return region_obj
 
-            if isinstance(fuels, dict):
-                for tech, fuel_tech in fuels.items():
-                    tech_fueltype = technologies[tech].fueltype_int
-                    input_array[tech_fueltype] += fuel_tech
-            else:
-                # Fuel per technology
-                fuels = get_fuels_yh(
-                    enduse_object,
-                    attribute_non_technology, #'fuel_yh'
-                    model_yearhours_nrs,
-                    model_yeardays_nrs)
-                input_array += fuels
-
-    if sum_crit == 'no_sum':
-        return input_array
-    elif sum_crit == 'sum':
-        return np.sum(input_array)
-
-def aggr_fuel_aggr(
-        input_array,
-        attribute_non_technology,
-        attribute_technologies,
-        sector_models,
-        sum_crit,
-        model_yearhours_nrs,
-        model_yeardays_nrs,
-        technologies
-    ):
-    """Collect hourly data from all regions and sum across
-    all fuel types and enduses
+def write_region_results(result_store, sim_yr, reg_array_nr, region_results):
+    """Write hourly results of a single region to a result store
 
     Arguments
     ----------
-    input_array : array
-        Array to sum results
-    attribute_to_get : str
-        Attribue to sumarise
-    sum_crit : bool
-        Criteria to sum or not
-    model_yearhours_nrs : int
-        Number of modelled hours in a year
-    model_yeardays_nrs : int
-        Number of modelled yeardays
+    result_store : ResultStore
+        Result store
+    sim_yr : int
+        Simulation year
+    reg_array_nr : int
+        Region array number
+    region_results : dict
+        Results of region (see `simulate_aggregate_region`)
 
-    Returns
-    -------
-    input_array : array
-        Summarised array
+    Note
+    ----
+    The results of heating technologies are stored as
+    ``ed_techs__<technology>`` (fueltypes, submodels, days, 24)
     """
-    for sector_model in sector_models:
-        for enduse_object in sector_model:
-
-            fuels = get_fuels_yh(
-                enduse_object,
-                attribute_technologies, #'techs_fuel_yh'
-                model_yearhours_nrs,
-                model_yeardays_nrs)
-
-            if isinstance(fuels, dict):
-                for tech, fuel_tech in fuels.items():
-                    tech_fueltype = technologies[tech].fueltype_int
-                    input_array[tech_fueltype] += fuel_tech
-            else:
-                # Fuel per technology
-                fuels = get_fuels_yh(
-                    enduse_object,
-                    attribute_non_technology, #'fuel_yh'
-                    model_yearhours_nrs,
-                    model_yeardays_nrs)
-                input_array += fuels
+    result_store.write_region(
+        sim_yr,
+        'ed_fueltype_regs_yh',
+        reg_array_nr,
+        region_results['ed_fueltype_regs_yh'][:, 0])
 
-    if sum_crit == 'no_sum':
-        return input_array
-    elif sum_crit == 'sum':
-        return np.sum(input_array)
+    techs_results = region_results['ed_techs_submodel_fueltype_regs_yh']
+    for tech in techs_results.get_techs_with_fuel():
+        result_store.write_region(
+            sim_yr,
+            'ed_techs__{}'.format(tech),
+            reg_array_nr,
+            np.swapaxes(techs_results[tech][:, 0], 0, 1))
 
-def get_fuels_yh(
-        enduse_object,
-        attribute_to_get,
-        model_yearhours_nrs,
-        model_yeardays_nrs
-    ):
-    """Get yh load profile and assign yh shape
-    for enduses with flat load profiles
+def create_weather_regions(data, assumptions, previous_weather_regions=None):
+    """Create a weather region for every weather station
 
     Arguments
     ----------
-    enduse_object : dict
-        Object of submodel run
-    attribute_to_get : str
-        Attribute to read out
-    model_yearhours_nrs : int
-        Number of modelled hours in a year
-    model_yeardays_nrs : int
-        Number of modelled yeardays
+    data : dict
+        Data container
+    assumptions : obj
+        Assumptions
+    previous_weather_regions : dict, default=None
+        Weather regions of the previously simulated year
+        {weather_station: WeatherRegion}
 
     Returns
     -------
-    fuels : array
-        Fuels with flat load profile
+    weather_regions : dict
+        Weather regions {weather_station: WeatherRegion}
 
     Note
-    -----
-    -   For enduses where 'flat_profile_crit' in Enduse Class is True
-        a flat load profile is generated. Otherwise, the yh as calculated
-        for each enduse is used
-    -   Flat shape
+    ----
+    If ``data['weather_region_cache']`` is provided (`WeatherRegionCache`),
+    weather regions with identical inputs are taken from the cache.
+
+    The year-invariant state (base year HDD/CDD, technology load profiles)
+    of a weather region is taken from the weather region of the same weather
+    station in ``previous_weather_regions``. Only the climate and diffusion
+    dependent parts are calculated (see `WeatherRegion`).
     """
-    if enduse_object.flat_profile_crit:
-
-        # Annual fuel
-        fuels_reg_y = enduse_object.fuel_y
-
-        if attribute_to_get == 'fuel_peak_dh' or attribute_to_get == 'techs_fuel_peak_dh':
-            shape_peak_dh = np.full((24), 1 / 8760)
-            fuels_reg_peak = fuels_reg_y
-            fuels = fuels_reg_peak[:, np.newaxis] * shape_peak_dh
-        elif attribute_to_get == 'fuel_peak_h':
-            shape_peak_h = 1 / 8760
-            fuels = fuels_reg_y * shape_peak_h
-        elif attribute_to_get == 'shape_non_peak_y_dh':
-            shape_non_peak_y_dh = np.full((model_yeardays_nrs, 24), (1.0 / 24))
-            fuels = fuels_reg_y * shape_non_peak_y_dh
-        elif attribute_to_get == 'shape_non_peak_yd':
-            shape_non_peak_yd = np.ones((model_yeardays_nrs), dtype=float) / model_yeardays_nrs
-            fuels = fuels_reg_y * shape_non_peak_yd
-        elif attribute_to_get == 'fuel_yh' or attribute_to_get == 'techs_fuel_yh':
-            nr_modelled_hours_factor = 1 / model_yearhours_nrs
-            fast_shape = np.full(
-                (enduse_object.fuel_y.shape[0], model_yeardays_nrs, 24),
-                nr_modelled_hours_factor, dtype=float)
-            fuels = fuels_reg_y[:, np.newaxis, np.newaxis] * fast_shape
-        elif attribute_to_get == 'techs_fuel_peak_h':
-            fuels = 1 / model_yearhours_nrs
-    else: #If not flat shape, use yh load profile of enduse
-
-        fuels = getattr(enduse_object, attribute_to_get)
-
-    return fuels
-
-def residential_submodel(
-        region,
-        weather_region,
-        scenario_data,
-        rs_dw_stock,
-        non_regional_lp_stock,
+    if previous_weather_regions is None:
+        previous_weather_regions = {}
+
+    weather_region_inputs = {
+        'base_yr': assumptions.base_yr,
+        'curr_yr': assumptions.curr_yr,
+        'strategy_variables': assumptions.strategy_variables,
+        't_bases': assumptions.t_bases,
+        't_diff_param': assumptions.base_temp_diff_params,
+        'tech_lists': assumptions.tech_list,
+        'technologies': data['technologies'],
+        'assumptions': assumptions,
+        'fueltypes': data['lookups']['fueltypes'],
+        'model_yeardays_nrs': assumptions.model_yeardays_nrs,
+        'model_yeardays': assumptions.model_yeardays,
+        'yeardays_month_days': assumptions.yeardays_month_days,
+        'all_enduses': data['enduses'],
+        'tech_lp': data['tech_lp'],
+        'sectors': data['sectors']}
+
+    try:
+        weather_region_cache = data['weather_region_cache']
+    except KeyError:
+        weather_region_cache = None
+
+    weather_regions = {}
+    if weather_region_cache is None:
+        for weather_station in data['weather_stations']:
+            weather_regions[weather_station] = WeatherRegion(
+                name=weather_station,
+                temp_by=data['temp_data'][weather_station],
+                previous_weather_region=previous_weather_regions.get(weather_station),
+                **weather_region_inputs)
+    else:
+        context_key = get_weather_region_context_key(
+            **{key: value for key, value in weather_region_inputs.items() if key not in [
+                'base_yr', 'curr_yr', 'strategy_variables']})
+
+        for weather_station in data['weather_stations']:
+            weather_regions[weather_station] = weather_region_cache.get_weather_region(
+                context_key,
+                name=weather_station,
+                temp_by=data['temp_data'][weather_station],
+                previous_weather_region=previous_weather_regions.get(weather_station),
+                **weather_region_inputs)
+
+    return weather_regions
+
+def simulate_regions(
+        regions,
+        data,
         assumptions,
-        lookups,
-        criterias,
-        enduses,
-        sectors=False
+        weather_regions,
+        nr_of_processes=1
     ):
-    """Create the residential submodules (per enduse and region) and add them to list
-    data['lookups']
+    """Simulate and aggregate all regions either serially or
+    in a pool of worker processes
+
     Arguments
-    ----------
+    ---------
+    regions : list
+        Region names
     data : dict
         Data container
-    enduses : list
-        All residential enduses
-    sectors : list, default=False
-        Sectors
+    assumptions : obj
+        Assumptions
+    weather_regions : dict
+        Weather regions
+    nr_of_processes : int, default=1
+        Number of worker processes. If 1, the regions are
+        simulated in the current process
 
-    Returns
-    -------
-    submodule_list : list
-        List with submodules
+    Yields
+    ------
+    reg_array_nr : int
+        Array position of region
+    region_results : dict
+        Result container of a single region (see
+        `simulate_aggregate_region`)
+
+    Note
+    ----
+    Results are yielded in the order of `regions`. With the
+    'fork' start method, the workers share `data` with the parent
+    process (copy-on-write) and only the regional results
+    are sent back.
     """
-    logging.debug("... residential submodel start")
+    if nr_of_processes <= 1:
+        for reg_array_nr, region in enumerate(regions):
+            logging.info(
+                "... Simulate region %s for year %s", region, assumptions.curr_yr)
 
-    if not sectors:
-        sectors = [False]
+            yield reg_array_nr, simulate_aggregate_region(
+                region, data, assumptions, weather_regions)
     else:
-        pass
-
-    submodels = []
+        logging.info(
+            "... Simulate %s regions with %s processes", len(regions), nr_of_processes)
 
-    for sector in sectors:
-        for enduse in enduses:
+        with multiprocessing.Pool(
+                processes=nr_of_processes,
+                initializer=_init_region_worker,
+                initargs=(data, assumptions, weather_regions)) as pool:
 
-            # ------------------------------------------------------
-            # Configure and select correct Enduse() specific inputs
-            # ------------------------------------------------------
-            if criterias['spatial_exliclit_diffusion']:
-                sig_param_tech = assumptions.rs_sig_param_tech[enduse][region.name]
-                strategy_variables = assumptions.regional_strategy_variables[region.name]
-            else:
-                sig_param_tech = assumptions.rs_sig_param_tech[enduse]
-                strategy_variables = assumptions.strategy_variables
+            for reg_array_nr, region_results in enumerate(
+                    pool.imap(_simulate_region_worker, regions)):
+                yield reg_array_nr, region_results
 
-            # ------------------------------------------------------
-            # Create submodel
-            # ------------------------------------------------------
-            submodel = endusefunctions.Enduse(
-                submodel='rs_submodel',
-                region=region.name,
-                scenario_data=scenario_data,
-                assumptions=assumptions,
-                regional_lp_stock=weather_region.rs_load_profiles,
-                non_regional_lp_stock=non_regional_lp_stock,
-                base_yr=assumptions.base_yr,
-                curr_yr=assumptions.curr_yr,
-                enduse=enduse,
-                sector=sector,
-                fuel=region.rs_enduses_fuel[enduse],
-                tech_stock=weather_region.rs_tech_stock,
-                heating_factor_y=weather_region.f_heat_rs_y,
-                cooling_factor_y=weather_region.f_cooling_rs_y,
-                fuel_fueltype_tech_p_by=assumptions.rs_fuel_tech_p_by[enduse],
-                sig_param_tech=sig_param_tech,
-                criterias=criterias,
-                strategy_variables=strategy_variables,
-                fueltypes_nr=lookups['fueltypes_nr'],
-                fueltypes=lookups['fueltypes'],
-                model_yeardays_nrs=assumptions.model_yeardays_nrs,
-                enduse_overall_change=assumptions.enduse_overall_change,
-                dw_stock=rs_dw_stock)
+# Inputs of worker processes set by `_init_region_worker`
+_REGION_WORKER_INPUTS = {}
 
-            submodels.append(submodel)
+def _init_region_worker(data, assumptions, weather_regions):
+    """Store model inputs in a worker process
+    """
+    _REGION_WORKER_INPUTS['data'] = data
+    _REGION_WORKER_INPUTS['assumptions'] = assumptions
+    _REGION_WORKER_INPUTS['weather_regions'] = weather_regions
 
-    return submodels
+def _simulate_region_worker(region):
+    """Simulate a region in a worker process
+    """
+    logging.info("... Simulate region %s in process", region)
 
-def service_submodel(
+    return simulate_aggregate_region(
         region,
-        weather_region,
-        scenario_data,
-        ss_dw_stock,
-        non_regional_lp_stock,
-        assumptions,
-        lookups,
-        criterias,
-        enduses,
-        sectors
-    ):
-    """Create the service submodules per enduse, sector and region and add to list
+        _REGION_WORKER_INPUTS['data'],
+        _REGION_WORKER_INPUTS['assumptions'],
+        _REGION_WORKER_INPUTS['weather_regions'])
+
+def simulate_aggregate_region(region, data, assumptions, weather_regions):
+    """Simulate a single region and aggregate the results
+    in a result container which only contains this region
 
     Arguments
-    ----------
+    ---------
+    region : str
+        Region name
     data : dict
         Data container
-    enduses : list
+    assumptions : obj
+        Assumptions
+    weather_regions : dict
+        Weather regions
+
+    Returns
+    -------
+    region_results : dict
+        Result container with a region dimension of one
+    """
+    reg_rs_submodel, reg_ss_submodel, reg_is_submodel = simulate_region(
+        region, data, assumptions, weather_regions)
+
+    return aggregate_region(
+        [reg_rs_submodel, reg_ss_submodel, reg_is_submodel], data, assumptions)
+
+def aggregate_region(all_submodels, data, assumptions):
+    """Aggregate the enduses of a single region in a result
+    container which only contains this region
+
+    Arguments
+    ---------
+    all_submodels : list
+        Enduse objects of every submodel of the region
+    data : dict
+        Data container
+    assumptions : obj
+        Assumptions
+
+    Returns
+    -------
+    region_results : dict
+        Result container with a region dimension of one
+    """
+    region_results = initialise_result_container(
+        data['lookups']['fueltypes_nr'],
+        data['sectors'],
+        1,
+        assumptions.model_yearhours_nrs,
+        assumptions.model_yeardays_nrs,
+        assumptions.heating_technologies,
+        data['technologies'])
+
+    try:
+        factorised_fuel = data['criterias']['factorised_fuel']
+    except KeyError:
+        factorised_fuel = False
+
+    region_results = aggregate_final_results(
+        region_results,
+        0,
+        all_submodels,
+        data['criterias']['mode_constrained'],
+        data['lookups']['fueltypes'],
+        data['lookups']['fueltypes_nr'],
+        assumptions.model_yearhours_nrs,
+        assumptions.model_yeardays_nrs,
+        assumptions.seasons,
+        assumptions.enduse_space_heating,
+        data['technologies'],
+        data['criterias']['beyond_supply_outputs'],
+        factorised_fuel,
+        assumptions.yearday_weights)
+
+    return region_results
+
+def simulate_regions_batch(regions, data, assumptions, weather_regions):
+    """Simulate all regions with `enduse_batch.EnduseBatch`, i.e. every
+    enduse (and sector) is calculated for all regions at once, and
+    aggregate the results of every region
+
+    Arguments
+    ---------
+    regions : list
+        Region names
+    data : dict
+        Data container
+    assumptions : obj
+        Assumptions
+    weather_regions : dict
+        Weather regions
+
+    Yields
+    ------
+    reg_array_nr : int
+        Array position of region
+    region_results : dict
+        Result container of a single region (see
+        `simulate_aggregate_region`)
+
+    Note
+    ----
+    The results are the same as of `simulate_regions`
+    (``data['criterias']['batch_enduses']``). Factorised
+    fuel is not supported.
+    """
+    logging.info(
+        "... Simulate %s regions with batched enduses for year %s",
+        len(regions), assumptions.curr_yr)
+
+    region_objs = [create_region(region, data) for region in regions]
+
+    # Position of the closest weather region of every region
+    weather_region_ids = list(weather_regions.keys())
+    weather_region_objs = [
+        weather_regions[weather_region_id] for weather_region_id in weather_region_ids]
+    reg_weather_region_nrs = np.array([
+        weather_region_ids.index(region_obj.closest_weather_region_id)
+        for region_obj in region_objs], dtype=int)
+
+    try:
+        scenario_driver_tensor = data['scenario_driver_tensor']
+    except KeyError:
+        scenario_driver_tensor = None
+
+    rs_batches = residential_submodel_batch(
+        region_objs,
+        weather_region_objs,
+        reg_weather_region_nrs,
+        data['scenario_data'],
+        [data['rs_dw_stock'][region] for region in regions],
+        data['non_regional_lp_stock'],
+        assumptions,
+        data['lookups'],
+        data['criterias'],
+        data['enduses']['rs_enduses'])
+
+    ss_batches = service_submodel_batch(
+        region_objs,
+        weather_region_objs,
+        reg_weather_region_nrs,
+        data['scenario_data'],
+        [data['ss_dw_stock'][region] for region in regions],
+        data['non_regional_lp_stock'],
+        assumptions,
+        data['lookups'],
+        data['criterias'],
+        data['enduses']['ss_enduses'],
+        data['sectors']['ss_sectors'])
+
+    is_batches = industry_submodel_batch(
+        region_objs,
+        weather_region_objs,
+        reg_weather_region_nrs,
+        data['scenario_data'],
+        data['non_regional_lp_stock'],
+        assumptions,
+        data['lookups'],
+        data['criterias'],
+        data['enduses']['is_enduses'],
+        data['sectors']['is_sectors'],
+        scenario_driver_tensor)
+
+    for reg_array_nr in range(len(regions)):
+        all_submodels = [
+            [enduse_batch.EnduseBatchRegion(batch, reg_array_nr) for batch in batches]
+            for batches in [rs_batches, ss_batches, is_batches]]
+
+        yield reg_array_nr, aggregate_region(all_submodels, data, assumptions)
+
+def add_region_results(aggr_results, reg_array_nr, region_results):
+    """Add the results of a single region to the result container
+
+    Arguments
+    ---------
+    aggr_results : dict
+        Contains all results to aggregate (see `initialise_result_container`)
+    reg_array_nr : int
+        Region array number
+    region_results : dict
+        Result container of a single region (see `simulate_aggregate_region`)
+
+    Returns
+    -------
+    aggr_results : dict
+        Contains all aggregated results
+    """
+    # Hourly results of every region (None if streamed to a result store)
+    if aggr_results['ed_fueltype_regs_yh'] is not None:
+        aggr_results['ed_submodel_fueltype_regs_yh'][:, reg_array_nr] += region_results[
+            'ed_submodel_fueltype_regs_yh'][:, 0]
+
+        aggr_results['ed_techs_submodel_fueltype_regs_yh'].values[:, :, reg_array_nr] += region_results[
+            'ed_techs_submodel_fueltype_regs_yh'].values[:, :, 0]
+
+        aggr_results['ed_fueltype_regs_yh'][:, reg_array_nr] += region_results['ed_fueltype_regs_yh'][:, 0]
+
+    aggr_results['ed_fueltype_national_yh'] += region_results['ed_fueltype_national_yh']
+
+    for enduse, fuel_enduse in region_results['tot_fuel_y_enduse_specific_yh'].items():
+        if enduse not in aggr_results['tot_fuel_y_enduse_specific_yh']:
+            aggr_results['tot_fuel_y_enduse_specific_yh'][enduse] = np.copy(fuel_enduse)
+        else:
+            aggr_results['tot_fuel_y_enduse_specific_yh'][enduse] += fuel_enduse
+
+    aggr_results['reg_load_factor_y'][:, reg_array_nr] = region_results['reg_load_factor_y'][:, 0]
+    aggr_results['reg_load_factor_yd'][:, reg_array_nr] = region_results['reg_load_factor_yd'][:, 0]
+
+    for season, lf_season in region_results['reg_seasons_lf'].items():
+        aggr_results['reg_seasons_lf'][season][:, reg_array_nr] = lf_season[:, 0]
+
+    for season, averaged_h in region_results['averaged_h'].items():
+        aggr_results['averaged_h'][season][:, reg_array_nr] = averaged_h[:, 0]
+
+    aggr_results['fuel_factors'].add_region(region_results['fuel_factors'], reg_array_nr)
+
+    return aggr_results
+
+def get_region_results(aggr_results, reg_array_nr):
+    """Get the results of a single region which are written
+    to a result store (see `write_region_results`)
+
+    Arguments
+    ---------
+    aggr_results : dict
+        Contains all aggregated results
+    reg_array_nr : int
+        Region array number
+
+    Returns
+    -------
+    region_results : dict
+        Results with a region dimension of one
+    """
+    techs_results = aggr_results['ed_techs_submodel_fueltype_regs_yh']
+
+    region_techs_results = HeatingTechResults(
+        techs_results.heating_technologies,
+        techs_results.fueltypes_int,
+        techs_results.values.shape[1],
+        1,
+        techs_results.fueltypes_nr,
+        techs_results.values.shape[3])
+    region_techs_results.values[:, :, 0] = techs_results.values[:, :, reg_array_nr]
+
+    region_results = {
+        'ed_fueltype_regs_yh': aggr_results['ed_fueltype_regs_yh'][:, [reg_array_nr]],
+        'ed_techs_submodel_fueltype_regs_yh': region_techs_results}
+
+    return region_results
+
+def distribute_fuel_factors(
+        aggr_results,
+        lp_stocks,
+        fueltypes,
+        model_yearhours_nrs,
+        model_yeardays_nrs,
+        seasons,
+        beyond_supply_outputs=True
+    ):
+    """Calculate the hourly fuel of all factorised enduses
+    (see `fuel_factors`) of all regions and add it to the results
+
+    Arguments
+    ---------
+    aggr_results : dict
+        Contains all aggregated results
+    lp_stocks : list
+        Registered load profile stocks
+    fueltypes : dict
+        Fueltypes lookup
+    model_yearhours_nrs : int
+        Number of modelled hours in a year
+    model_yeardays_nrs : int
+        Number of modelled days in a year
+    seasons : dict
+        Seasons
+    beyond_supply_outputs : bool
+        Criteria whether additional results are aggregated
+        for plotting purposes going beyond the SMIF framework
+
+    Returns
+    -------
+    aggr_results : dict
+        Contains all aggregated results
+
+    Note
+    ----
+    The regional load factors and averaged hours per season
+    are calculated once the fuel of all enduses is added.
+    """
+    factors = aggr_results['fuel_factors']
+    submodel_fuel_yh = aggr_results['ed_submodel_fueltype_regs_yh']
+    submodels_nr, reg_nrs, fueltypes_nr = submodel_fuel_yh.shape[:3]
+
+    submodel_nrs = np.array(factors.submodel_nrs, dtype=int)
+    reg_array_nrs = np.array(factors.reg_array_nrs, dtype=int)
+    fueltypes_factors = np.array(factors.fueltypes, dtype=int)
+    profile_ids = np.array(factors.profile_ids, dtype=int)
+    fuels = np.array(factors.fuels, dtype=float)
+
+    # Fuel per submodel, region and fueltype
+    rows = (submodel_nrs * reg_nrs + reg_array_nrs) * fueltypes_nr + fueltypes_factors
+    fuel_yh = fuel_factors.calc_fuel_yh(
+        rows,
+        profile_ids,
+        fuels,
+        submodels_nr * reg_nrs * fueltypes_nr,
+        lp_stocks,
+        model_yeardays_nrs)
+    fuel_yh = fuel_yh.reshape(submodel_fuel_yh.shape)
+    submodel_fuel_yh += fuel_yh
+
+    if beyond_supply_outputs:
+
+        # Fuel per region [fueltype, region, fuel_yh]
+        fuel_regs_yh = np.sum(fuel_yh, axis=0)
+        aggr_results['ed_fueltype_regs_yh'] += np.swapaxes(fuel_regs_yh, 0, 1).reshape(
+            fueltypes_nr, reg_nrs, model_yearhours_nrs)
+        aggr_results['ed_fueltype_national_yh'] += np.sum(fuel_regs_yh, axis=0)
+
+        # Fuel per enduse and fueltype
+        enduses, enduse_nrs = np.unique(
+            np.array(factors.enduses, dtype=object), return_inverse=True)
+        fuel_enduses_yh = fuel_factors.calc_fuel_yh(
+            enduse_nrs.reshape(-1) * fueltypes_nr + fueltypes_factors,
+            profile_ids,
+            fuels,
+            len(enduses) * fueltypes_nr,
+            lp_stocks,
+            model_yeardays_nrs)
+        fuel_enduses_yh = fuel_enduses_yh.reshape(
+            len(enduses), fueltypes_nr, model_yeardays_nrs, 24)
+
+        for enduse_nr, enduse in enumerate(enduses):
+            aggr_results['tot_fuel_y_enduse_specific_yh'][enduse] += fuel_enduses_yh[enduse_nr]
+
+        # Load factors and averaged hours with the fuel of all enduses
+        for reg_array_nr in range(reg_nrs):
+            fuel_region_yh = aggr_results['ed_fueltype_regs_yh'][:, reg_array_nr].reshape(
+                fueltypes_nr, model_yeardays_nrs, 24)
+
+            aggr_results = calc_region_load_factors(
+                aggr_results,
+                reg_array_nr,
+                fuel_region_yh,
+                fueltypes,
+                seasons)
+
+    return aggr_results
+
+def get_fuels_yh(
+        enduse_object,
+        attribute_to_get,
+        model_yearhours_nrs,
+        model_yeardays_nrs,
+        yearday_weights=None
+    ):
+    """Get yh load profile and assign yh shape
+    for enduses with flat load profiles
+
+    Arguments
+    ----------
+    enduse_object : dict
+        Object of submodel run
+    attribute_to_get : str
+        Attribute to read out
+    model_yearhours_nrs : int
+        Number of modelled hours in a year
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day. If
+        provided, the weighted sum of the flat shape is one
+
+    Returns
+    -------
+    fuels : array
+        Fuels with flat load profile
+
+    Note
+    -----
+    -   For enduses where 'flat_profile_crit' in Enduse Class is True
+        a flat load profile is generated. Otherwise, the yh as calculated
+        for each enduse is used
+    -   Flat shape
+    """
+    if enduse_object.flat_profile_crit:
+
+        # Annual fuel
+        fuels_reg_y = enduse_object.fuel_y
+
+        if attribute_to_get == 'fuel_peak_dh' or attribute_to_get == 'techs_fuel_peak_dh':
+            shape_peak_dh = np.full((24), 1 / 8760)
+            fuels_reg_peak = fuels_reg_y
+            fuels = fuels_reg_peak[:, np.newaxis] * shape_peak_dh
+        elif attribute_to_get == 'fuel_peak_h':
+            shape_peak_h = 1 / 8760
+            fuels = fuels_reg_y * shape_peak_h
+        elif attribute_to_get == 'shape_non_peak_y_dh':
+            shape_non_peak_y_dh = np.full((model_yeardays_nrs, 24), (1.0 / 24))
+            fuels = fuels_reg_y * shape_non_peak_y_dh
+        elif attribute_to_get == 'shape_non_peak_yd':
+            shape_non_peak_yd = np.ones((model_yeardays_nrs), dtype=float) / model_yeardays_nrs
+            fuels = fuels_reg_y * shape_non_peak_yd
+        elif attribute_to_get == 'fuel_yh' or attribute_to_get == 'techs_fuel_yh':
+            if yearday_weights is None:
+                nr_modelled_hours_factor = 1 / model_yearhours_nrs
+            else:
+                nr_modelled_hours_factor = 1 / (24 * np.sum(yearday_weights))
+            fast_shape = np.full(
+                (enduse_object.fuel_y.shape[0], model_yeardays_nrs, 24),
+                nr_modelled_hours_factor, dtype=float)
+            fuels = fuels_reg_y[:, np.newaxis, np.newaxis] * fast_shape
+        elif attribute_to_get == 'techs_fuel_peak_h':
+            fuels = 1 / model_yearhours_nrs
+    else: #If not flat shape, use yh load profile of enduse
+
+        fuels = getattr(enduse_object, attribute_to_get)
+
+    return fuels
+
+def residential_submodel(
+        region,
+        weather_region,
+        scenario_data,
+        rs_dw_stock,
+        non_regional_lp_stock,
+        assumptions,
+        lookups,
+        criterias,
+        enduses,
+        sectors=False
+    ):
+    """Create the residential submodules (per enduse and region) and add them to list
+    data['lookups']
+    Arguments
+    ----------
+    data : dict
+        Data container
+    enduses : list
+        All residential enduses
+    sectors : list, default=False
+        Sectors
+
+    Returns
+    -------
+    submodule_list : list
+        List with submodules
+    """
+    logging.debug("... residential submodel start")
+
+    if not sectors:
+        sectors = [False]
+    else:
+        pass
+
+    submodels = []
+
+    for sector in sectors:
+        for enduse in enduses:
+
+            # ------------------------------------------------------
+            # Configure and select correct Enduse() specific inputs
+            # ------------------------------------------------------
+            if criterias['spatial_exliclit_diffusion']:
+                sig_param_tech = assumptions.rs_sig_param_tech[enduse][region.name]
+                strategy_variables = assumptions.regional_strategy_variables[region.name]
+            else:
+                sig_param_tech = assumptions.rs_sig_param_tech[enduse]
+                strategy_variables = assumptions.strategy_variables
+
+            # ------------------------------------------------------
+            # Create submodel
+            # ------------------------------------------------------
+            submodel = endusefunctions.Enduse(
+                submodel='rs_submodel',
+                region=region.name,
+                scenario_data=scenario_data,
+                assumptions=assumptions,
+                regional_lp_stock=weather_region.rs_load_profiles,
+                non_regional_lp_stock=non_regional_lp_stock,
+                base_yr=assumptions.base_yr,
+                curr_yr=assumptions.curr_yr,
+                enduse=enduse,
+                sector=sector,
+                fuel=region.rs_enduses_fuel[enduse],
+                tech_stock=weather_region.rs_tech_stock,
+                heating_factor_y=weather_region.f_heat_rs_y,
+                cooling_factor_y=weather_region.f_cooling_rs_y,
+                fuel_fueltype_tech_p_by=assumptions.rs_fuel_tech_p_by[enduse],
+                sig_param_tech=sig_param_tech,
+                criterias=criterias,
+                strategy_variables=strategy_variables,
+                fueltypes_nr=lookups['fueltypes_nr'],
+                fueltypes=lookups['fueltypes'],
+                model_yeardays_nrs=assumptions.model_yeardays_nrs,
+                enduse_overall_change=assumptions.enduse_overall_change,
+                dw_stock=rs_dw_stock)
+
+            submodels.append(submodel)
+
+    return submodels
+
+def service_submodel(
+        region,
+        weather_region,
+        scenario_data,
+        ss_dw_stock,
+        non_regional_lp_stock,
+        assumptions,
+        lookups,
+        criterias,
+        enduses,
+        sectors
+    ):
+    """Create the service submodules per enduse, sector and region and add to list
+
+    Arguments
+    ----------
+    data : dict
+        Data container
+    enduses : list
         All residential enduses
     sectors : list
         Service sectors
@@ -578,7 +1104,8 @@ def industry_submodel(
         lookups,
         criterias,
         enduses,
-        sectors
+        sectors,
+        scenario_driver_tensor=None
     ):
     """Industry subsector model
 
@@ -594,6 +1121,9 @@ def industry_submodel(
         Enduses of industry submodel
     sectors : list
         Sectors of industry submodel
+    scenario_driver_tensor : ScenarioDriverTensor, default=None
+        Scenario drivers of all regions. If not provided, scenario
+        drivers are read from the scenario data for every enduse
 
     Return
     ------
@@ -621,6 +1151,17 @@ def industry_submodel(
                 sig_param_tech = assumptions.is_sig_param_tech[enduse][sector]
                 strategy_variables = assumptions.strategy_variables
 
+            # Precalculated scenario driver factor (if not available,
+            # scenario drivers are read in `Enduse`)
+            try:
+                driver_factor = scenario_driver_tensor.get_driver_factor(
+                    assumptions.scenario_drivers['is_submodule'][enduse],
+                    region.name,
+                    assumptions.base_yr,
+                    assumptions.curr_yr)
+            except (AttributeError, KeyError):
+                driver_factor = None
+
             # ------------------------------------------------------
             # Create submodel
             # ------------------------------------------------------
@@ -648,117 +1189,346 @@ def industry_submodel(
                 fueltypes=lookups['fueltypes'],
                 model_yeardays_nrs=assumptions.model_yeardays_nrs,
                 reg_scen_drivers=assumptions.scenario_drivers['is_submodule'],
-                flat_profile_crit=flat_profile_crit)
+                flat_profile_crit=flat_profile_crit,
+                driver_factor=driver_factor)
 
             submodels.append(submodel)
 
     return submodels
 
-def aggr_fuel_regions_fueltype(
-        aggregation_array,
-        fueltypes_nr,
-        fueltypes,
-        array_region_nr,
-        model_yearhours_nrs,
-        model_yeardays_nrs,
-        submodels,
-        technologies
+def get_batch_strategy_variables(regions, assumptions, criterias):
+    """Get the strategy variables of an `enduse_batch.EnduseBatch`
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    assumptions : obj
+        Assumptions
+    criterias : dict
+        Criterias
+
+    Returns
+    -------
+    strategy_variables : dict
+        Strategy variables (with the values of every
+        region if spatially explicit diffusion)
+    """
+    if criterias['spatial_exliclit_diffusion']:
+        return assumptions.regional_strategy_variables.get_regions_strategy_variables(regions)
+    else:
+        return assumptions.strategy_variables
+
+def residential_submodel_batch(
+        regions,
+        weather_regions,
+        reg_weather_region_nrs,
+        scenario_data,
+        rs_dw_stocks,
+        non_regional_lp_stock,
+        assumptions,
+        lookups,
+        criterias,
+        enduses
     ):
-    """Aggregate fuels for every fueltype, region and timestep (unconstrained mode).
+    """Create the residential enduses of all regions
+    (see `residential_submodel`)
 
     Arguments
-    ---------
-    aggregation_array : array
-        Array to aggregate ed
-    fueltypes_nr : dict
-        Number of fueltypes
-    fueltypes : dict
-        Fueltypes
-    array_region_nr : int
-        Array nr position of region
-    model_yearhours_nrs : int
-        Modelled houry in a year (max 8760)
-    model_yeardays_nrs : int
-        Number of modelled yeardays (max 365)
-    submodels : list
-        List with submodels
+    ----------
+    regions : list
+        Region objects
+    weather_regions : list
+        Weather region objects
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    scenario_data : dict
+        Scenario data
+    rs_dw_stocks : list
+        Residential dwelling stock of every region
+    non_regional_lp_stock : object
+        Non regional load profiles
+    assumptions : obj
+        Assumptions
+    lookups : dict
+        Lookups
+    criterias : dict
+        Criterias
+    enduses : list
+        All residential enduses
 
     Returns
     -------
-    aggregation_array : array
-        Aggregated fuels per fueltype, region, yearhours
+    submodels : list
+        `enduse_batch.EnduseBatch` of every enduse
+    """
+    logging.debug("... residential submodel batch start")
+    submodels = []
+
+    region_names = [region.name for region in regions]
+    strategy_variables = get_batch_strategy_variables(
+        region_names, assumptions, criterias)
+
+    for enduse in enduses:
+        if criterias['spatial_exliclit_diffusion']:
+            sig_param_tech = [
+                assumptions.rs_sig_param_tech[enduse][region] for region in region_names]
+        else:
+            sig_param_tech = assumptions.rs_sig_param_tech[enduse]
+
+        submodel = enduse_batch.EnduseBatch(
+            submodel='rs_submodel',
+            regions=region_names,
+            scenario_data=scenario_data,
+            assumptions=assumptions,
+            regional_lp_stocks=[
+                weather_region.rs_load_profiles for weather_region in weather_regions],
+            non_regional_lp_stock=non_regional_lp_stock,
+            base_yr=assumptions.base_yr,
+            curr_yr=assumptions.curr_yr,
+            enduse=enduse,
+            sector=False,
+            fuels=[region.rs_enduses_fuel[enduse] for region in regions],
+            tech_stocks=[weather_region.rs_tech_stock for weather_region in weather_regions],
+            reg_weather_region_nrs=reg_weather_region_nrs,
+            heating_factor_y=[weather_region.f_heat_rs_y for weather_region in weather_regions],
+            cooling_factor_y=[weather_region.f_cooling_rs_y for weather_region in weather_regions],
+            fuel_fueltype_tech_p_by=assumptions.rs_fuel_tech_p_by[enduse],
+            sig_param_tech=sig_param_tech,
+            enduse_overall_change=assumptions.enduse_overall_change,
+            criterias=criterias,
+            strategy_variables=strategy_variables,
+            fueltypes_nr=lookups['fueltypes_nr'],
+            fueltypes=lookups['fueltypes'],
+            model_yeardays_nrs=assumptions.model_yeardays_nrs,
+            dw_stocks=rs_dw_stocks)
+
+        submodels.append(submodel)
+
+    return submodels
+
+def service_submodel_batch(
+        regions,
+        weather_regions,
+        reg_weather_region_nrs,
+        scenario_data,
+        ss_dw_stocks,
+        non_regional_lp_stock,
+        assumptions,
+        lookups,
+        criterias,
+        enduses,
+        sectors
+    ):
+    """Create the service enduses per sector of all regions
+    (see `service_submodel`)
 
-    fuel_region : dict
-        Aggregated fuel per fueltype, yeardays, hours
+    Arguments
+    ----------
+    regions : list
+        Region objects
+    weather_regions : list
+        Weather region objects
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    scenario_data : dict
+        Scenario data
+    ss_dw_stocks : list
+        Service dwelling stock of every region
+    non_regional_lp_stock : object
+        Non regional load profiles
+    assumptions : obj
+        Assumptions
+    lookups : dict
+        Lookups
+    criterias : dict
+        Criterias
+    enduses : list
+        All service enduses
+    sectors : list
+        Service sectors
+
+    Returns
+    -------
+    submodels : list
+        `enduse_batch.EnduseBatch` of every enduse and sector
     """
-    fuel_region = fuel_aggr(
-        submodels,
-        'no_sum',
-        model_yearhours_nrs,
-        fueltypes_nr,
-        model_yeardays_nrs,
-        'fuel_yh',
-        'techs_fuel_yh',
-        technologies)
+    logging.debug("... service submodel batch start")
+    submodels = []
 
-    # Reshape
-    for fueltype_nr in fueltypes.values():
-        aggregation_array[fueltype_nr][array_region_nr] += fuel_region[fueltype_nr].reshape(model_yearhours_nrs)
+    region_names = [region.name for region in regions]
+    strategy_variables = get_batch_strategy_variables(
+        region_names, assumptions, criterias)
 
-    return aggregation_array, fuel_region
+    for sector in sectors:
+        for enduse in enduses:
+            if criterias['spatial_exliclit_diffusion']:
+                sig_param_tech = [
+                    assumptions.ss_sig_param_tech[enduse][sector][region]
+                    for region in region_names]
+            else:
+                sig_param_tech = assumptions.ss_sig_param_tech[enduse][sector]
 
-def sum_enduse_all_regions(
-        input_dict,
-        sector_models,
-        technologies,
-        model_yearhours_nrs,
-        model_yeardays_nrs,
-        fueltypes_nr
+            submodel = enduse_batch.EnduseBatch(
+                submodel='ss_submodel',
+                regions=region_names,
+                scenario_data=scenario_data,
+                assumptions=assumptions,
+                regional_lp_stocks=[
+                    weather_region.ss_load_profiles for weather_region in weather_regions],
+                non_regional_lp_stock=non_regional_lp_stock,
+                base_yr=assumptions.base_yr,
+                curr_yr=assumptions.curr_yr,
+                enduse=enduse,
+                sector=sector,
+                fuels=[region.ss_enduses_sectors_fuels[enduse][sector] for region in regions],
+                tech_stocks=[weather_region.ss_tech_stock for weather_region in weather_regions],
+                reg_weather_region_nrs=reg_weather_region_nrs,
+                heating_factor_y=[weather_region.f_heat_ss_y for weather_region in weather_regions],
+                cooling_factor_y=[
+                    weather_region.f_cooling_ss_y for weather_region in weather_regions],
+                fuel_fueltype_tech_p_by=assumptions.ss_fuel_tech_p_by[enduse][sector],
+                sig_param_tech=sig_param_tech,
+                enduse_overall_change=assumptions.enduse_overall_change,
+                criterias=criterias,
+                strategy_variables=strategy_variables,
+                fueltypes_nr=lookups['fueltypes_nr'],
+                fueltypes=lookups['fueltypes'],
+                model_yeardays_nrs=assumptions.model_yeardays_nrs,
+                dw_stocks=ss_dw_stocks)
+
+            submodels.append(submodel)
+
+    return submodels
+
+def industry_submodel_batch(
+        regions,
+        weather_regions,
+        reg_weather_region_nrs,
+        scenario_data,
+        non_regional_lp_stock,
+        assumptions,
+        lookups,
+        criterias,
+        enduses,
+        sectors,
+        scenario_driver_tensor=None
     ):
-    """Summarise an enduse attribute across all regions
+    """Create the industry enduses per sector of all regions
+    (see `industry_submodel`)
 
     Arguments
     ----------
-    attribute_to_get : string
-        Enduse attribute to summarise
-    sector_models : List
-        List with sector models
+    regions : list
+        Region objects
+    weather_regions : list
+        Weather region objects
+    reg_weather_region_nrs : array
+        Position of the weather region of every region
+    scenario_data : dict
+        Scenario data
+    non_regional_lp_stock : object
+        Non regional load profiles
+    assumptions : obj
+        Assumptions
+    lookups : dict
+        Lookups
+    criterias : dict
+        Criterias
+    enduses : list
+        Enduses of industry submodel
+    sectors : list
+        Sectors of industry submodel
+    scenario_driver_tensor : ScenarioDriverTensor, default=None
+        Scenario drivers of all regions
 
-    Return
-    ------
-    enduse_dict : dict
-        Summarise enduses across all regions
+    Returns
+    -------
+    submodels : list
+        `enduse_batch.EnduseBatch` of every enduse and sector
     """
-    enduse_dict = input_dict
+    logging.debug("... industry submodel batch start")
+    submodels = []
 
-    for sector_model in sector_models:
-        for model_object in sector_model:
+    region_names = [region.name for region in regions]
+    strategy_variables = get_batch_strategy_variables(
+        region_names, assumptions, criterias)
 
-            if model_object.enduse not in enduse_dict:
-                enduse_dict[model_object.enduse] = np.zeros((fueltypes_nr, model_yeardays_nrs, 24))
+    for sector in sectors:
+        for enduse in enduses:
+            if enduse == "is_space_heating":
+                flat_profile_crit = False
+            else:
+                flat_profile_crit = True
 
-            fuels = get_fuels_yh(
-                model_object,
-                'techs_fuel_yh',
-                model_yearhours_nrs,
-                model_yeardays_nrs)
+            if criterias['spatial_exliclit_diffusion']:
+                sig_param_tech = [
+                    assumptions.is_sig_param_tech[enduse][sector][region]
+                    for region in region_names]
+            else:
+                sig_param_tech = assumptions.is_sig_param_tech[enduse][sector]
 
-            if isinstance(fuels, dict):
-                for tech, fuel_tech in fuels.items():
-                    tech_fueltype = technologies[tech].fueltype_int
-                    enduse_dict[model_object.enduse][tech_fueltype] += fuel_tech
+            # Precalculated scenario driver factors (if not available,
+            # scenario drivers are read in `EnduseBatch`)
+            if scenario_driver_tensor is None:
+                driver_factors = None
             else:
-                # Fuel per technology
-                fuels = get_fuels_yh(
-                    model_object,
-                    'fuel_yh',
-                    model_yearhours_nrs,
-                    model_yeardays_nrs)
-                enduse_dict[model_object.enduse] += fuels
+                try:
+                    driver_factors = enduse_batch.get_scenario_driver_factors(
+                        enduse,
+                        region_names,
+                        False,
+                        scenario_data['gva'],
+                        scenario_data['population'],
+                        assumptions.scenario_drivers['is_submodule'],
+                        assumptions.base_yr,
+                        assumptions.curr_yr,
+                        scenario_driver_tensor)
+                except KeyError:
+                    driver_factors = None
+
+            submodel = enduse_batch.EnduseBatch(
+                submodel='is_submodel',
+                regions=region_names,
+                scenario_data=scenario_data,
+                assumptions=assumptions,
+                regional_lp_stocks=[
+                    weather_region.is_load_profiles for weather_region in weather_regions],
+                non_regional_lp_stock=non_regional_lp_stock,
+                base_yr=assumptions.base_yr,
+                curr_yr=assumptions.curr_yr,
+                enduse=enduse,
+                sector=sector,
+                fuels=[region.is_enduses_sectors_fuels[enduse][sector] for region in regions],
+                tech_stocks=[weather_region.is_tech_stock for weather_region in weather_regions],
+                reg_weather_region_nrs=reg_weather_region_nrs,
+                heating_factor_y=[weather_region.f_heat_is_y for weather_region in weather_regions],
+                cooling_factor_y=[
+                    weather_region.f_cooling_is_y for weather_region in weather_regions],
+                fuel_fueltype_tech_p_by=assumptions.is_fuel_tech_p_by[enduse][sector],
+                sig_param_tech=sig_param_tech,
+                enduse_overall_change=assumptions.enduse_overall_change,
+                criterias=criterias,
+                strategy_variables=strategy_variables,
+                fueltypes_nr=lookups['fueltypes_nr'],
+                fueltypes=lookups['fueltypes'],
+                model_yeardays_nrs=assumptions.model_yeardays_nrs,
+                reg_scen_drivers=assumptions.scenario_drivers['is_submodule'],
+                flat_profile_crit=flat_profile_crit,
+                driver_factors=driver_factors)
+
+            submodels.append(submodel)
 
-    return enduse_dict
+    return submodels
 
-def averaged_season_hourly(averaged_h, fuel_region_yh, reg_array_nr, fueltypes, seasons):
+def averaged_season_hourly(
+        averaged_h,
+        fuel_region_yh,
+        reg_array_nr,
+        fueltypes,
+        seasons,
+        yearday_weights=None
+    ):
     """Calculate averaged hourly values for each season
 
     Arguments
@@ -771,85 +1541,184 @@ def averaged_season_hourly(averaged_h, fuel_region_yh, reg_array_nr, fueltypes,
         Integer of region
     fueltypes : dict
         Fueltype lookup
-    ed_fueltype_regs_yh : array
-       (fueltypes_nr, reg_nrs, yearhours_nrs)
+    seasons : dict
+        Modelled days of every season
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
 
     Return
     ------
     averaged_h : dict
         Averaged hourly value per season {season: array(fuetlype, region, 24)}
     """
+    if yearday_weights is None:
+        yearday_weights = np.ones((fuel_region_yh.shape[1]), dtype=float)
+
     for fueltype in fueltypes:
         for season, yeardays_modelled in seasons.items():
             for yearday in yeardays_modelled:
-                averaged_h[season][fueltype][reg_array_nr] += fuel_region_yh[fueltype][yearday]
+                averaged_h[season][fueltype][reg_array_nr] += fuel_region_yh[fueltype][yearday] * yearday_weights[yearday]
 
     # Calculate average hourly values for every season
     for season, yeardays_modelled in seasons.items():
+        season_weights = np.sum(yearday_weights[yeardays_modelled])
+        if season_weights == 0:
+            continue
         for fueltype in fueltypes:
-            averaged_h[season][fueltype][reg_array_nr] = averaged_h[season][fueltype][reg_array_nr] / len(yeardays_modelled)
+            averaged_h[season][fueltype][reg_array_nr] = averaged_h[season][fueltype][reg_array_nr] / season_weights
 
     return averaged_h
 
-def create_virtual_dwelling_stocks(regions, curr_yr, data):
+def create_year_invariant_inputs(regions, data, assumptions):
+    """Create all inputs which are the same for every simulation
+    year, i.e. which do not depend on ``assumptions.curr_yr``
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    data : dict
+        Data container
+    assumptions : obj
+        Assumptions
+
+    Returns
+    -------
+    year_invariant : dict
+        Non regional load profile stock, scenario drivers
+        of all years, base year dwelling stocks and the weather
+        regions of the previously simulated year
+
+    Note
+    ----
+    Year dependent inputs (diffusion of technologies, scenario drivers,
+    climate change) are calculated for every simulation year. The
+    year-invariant state of the weather regions is carried forward from
+    the previously simulated year (``previous_weather_regions``, updated
+    by `EnergyDemandModel`). Weather regions are reused across
+    repeated years and scenarios with ``data['weather_region_cache']``.
+    """
+    year_invariant = {}
+
+    year_invariant['non_regional_lp_stock'] = load_profile.create_load_profile_stock(
+        data['tech_lp'],
+        assumptions,
+        data['sectors'],
+        assumptions.model_yeardays,
+        data['enduses'])
+
+    year_invariant['scenario_driver_tensor'] = endusefunctions.ScenarioDriverTensor(
+        regions, data['scenario_data'])
+
+    if data['criterias']['virtual_building_stock_criteria']:
+        rs_dw_stock_by = {}
+        ss_dw_stock_by = {}
+        for region in regions:
+            rs_dw_stock_by[region], ss_dw_stock_by[region] = create_virtual_dwelling_stock(
+                region, assumptions.base_yr, data)
+
+        year_invariant['rs_dw_stock_by'] = rs_dw_stock_by
+        year_invariant['ss_dw_stock_by'] = ss_dw_stock_by
+    else:
+        year_invariant['rs_dw_stock_by'] = None
+        year_invariant['ss_dw_stock_by'] = None
+
+    # Weather regions of previously simulated year
+    year_invariant['previous_weather_regions'] = {}
+
+    return year_invariant
+
+def create_virtual_dwelling_stock(region, curr_yr, data):
+    """Create virtual dwelling stock of a region for residential
+    and service sector for a single year
+
+    Arguments
+    ----------
+    region : str
+        Region
+    curr_yr : int
+        Year of dwelling stock
+    data : dict
+        Data container
+
+    Returns
+    -------
+    rs_dw_stock, ss_dw_stock : obj
+        Residential and service dwelling stock
+    """
+    rs_dw_stock = dw_stock.rs_dw_stock(
+        region,
+        data['assumptions'],
+        data['scenario_data'],
+        data['assumptions'].simulated_yrs,
+        data['lookups']['dwtype'],
+        data['enduses']['rs_enduses'],
+        data['reg_coord'],
+        data['assumptions'].scenario_drivers['rs_submodule'],
+        curr_yr,
+        data['assumptions'].base_yr,
+        data['criterias']['virtual_building_stock_criteria'])
+
+    ss_dw_stock = dw_stock.ss_dw_stock(
+        region,
+        data['enduses']['ss_enduses'],
+        data['sectors']['ss_sectors'],
+        data['scenario_data'],
+        data['reg_coord'],
+        data['assumptions'],
+        curr_yr,
+        data['assumptions'].base_yr,
+        data['criterias']['virtual_building_stock_criteria'])
+
+    return rs_dw_stock, ss_dw_stock
+
+def create_virtual_dwelling_stocks(
+        regions,
+        curr_yr,
+        data,
+        rs_dw_stock_by=None,
+        ss_dw_stock_by=None
+    ):
     """Create virtual dwelling stocks for residential
     and service sector
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    curr_yr : int
+        Current year
+    data : dict
+        Data container
+    rs_dw_stock_by, ss_dw_stock_by : dict, default=None
+        Already created base year dwelling stocks {region: stock}
+
+    Returns
+    -------
+    rs_dw_stock, ss_dw_stock : dict
+        Dwelling stocks {region: {year: stock}}
     """
+    base_yr = data['assumptions'].base_yr
+
     rs_dw_stock = defaultdict(dict)
     ss_dw_stock = defaultdict(dict)
     for region in regions:
 
-        # Dwelling stock of residential SubModel for base year
-        rs_dw_stock[region][data['assumptions'].base_yr] = dw_stock.rs_dw_stock(
-            region,
-            data['assumptions'],
-            data['scenario_data'],
-            data['assumptions'].simulated_yrs,
-            data['lookups']['dwtype'],
-            data['enduses']['rs_enduses'],
-            data['reg_coord'],
-            data['assumptions'].scenario_drivers['rs_submodule'],
-            data['assumptions'].base_yr,
-            data['assumptions'].base_yr,
-            data['criterias']['virtual_building_stock_criteria'])
-
-        # Dwelling stock of service SubModel for base year
-        ss_dw_stock[region][data['assumptions'].base_yr] = dw_stock.ss_dw_stock(
-            region,
-            data['enduses']['ss_enduses'],
-            data['sectors']['ss_sectors'],
-            data['scenario_data'],
-            data['reg_coord'],
-            data['assumptions'],
-            data['assumptions'].base_yr,
-            data['assumptions'].base_yr,
-            data['criterias']['virtual_building_stock_criteria'])
-
-        # Dwelling stock of residential SubModel for current year
-        rs_dw_stock[region][curr_yr] = dw_stock.rs_dw_stock(
-            region,
-            data['assumptions'],
-            data['scenario_data'],
-            data['assumptions'].simulated_yrs,
-            data['lookups']['dwtype'],
-            data['enduses']['rs_enduses'],
-            data['reg_coord'],
-            data['assumptions'].scenario_drivers['rs_submodule'],
-            curr_yr,
-            data['assumptions'].base_yr,
-            data['criterias']['virtual_building_stock_criteria'])
-
-        # Dwelling stock of service SubModel for current year
-        ss_dw_stock[region][curr_yr] = dw_stock.ss_dw_stock(
-            region,
-            data['enduses']['ss_enduses'],
-            data['sectors']['ss_sectors'],
-            data['scenario_data'],
-            data['reg_coord'],
-            data['assumptions'],
-            curr_yr,
-            data['assumptions'].base_yr,
-            data['criterias']['virtual_building_stock_criteria'])
+        # Dwelling stock for base year
+        if rs_dw_stock_by is None or ss_dw_stock_by is None:
+            rs_dw_stock[region][base_yr], ss_dw_stock[region][base_yr] = create_virtual_dwelling_stock(
+                region, base_yr, data)
+        else:
+            rs_dw_stock[region][base_yr] = rs_dw_stock_by[region]
+            ss_dw_stock[region][base_yr] = ss_dw_stock_by[region]
+
+        # Dwelling stock for current year
+        if curr_yr == base_yr and rs_dw_stock_by is not None and ss_dw_stock_by is not None:
+            rs_dw_stock[region][curr_yr] = rs_dw_stock_by[region]
+            ss_dw_stock[region][curr_yr] = ss_dw_stock_by[region]
+        else:
+            rs_dw_stock[region][curr_yr], ss_dw_stock[region][curr_yr] = create_virtual_dwelling_stock(
+                region, curr_yr, data)
 
     return dict(rs_dw_stock), dict(ss_dw_stock)
 
@@ -881,7 +1750,9 @@ def aggregate_final_results(
         seasons,
         enduse_space_heating,
         technologies,
-        beyond_supply_outputs=True
+        beyond_supply_outputs=True,
+        factorised_fuel=False,
+        yearday_weights=None
     ):
     """Aggregate results for a single region
 
@@ -913,6 +1784,11 @@ def aggregate_final_results(
     beyond_supply_outputs : bool
         Criteria whether additional results are aggregated
         for plotting purposes going beyond the SMIF framework
+    factorised_fuel : bool, default=False
+        Criteria whether enduses store factorised fuel. The load
+        factors are then calculated in `distribute_fuel_factors`
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
 
     Returns
     --------
@@ -921,162 +1797,349 @@ def aggregate_final_results(
     """
     logging.debug("... start summing for supply model")
 
-    if mode_constrained:
-        # -------------
-        # Summarise ed of constrained technologies
-        # Aggregate fuel for constrained enduses (heating techs)
-        # -------------
-        for submodel_nr, submodel in enumerate(all_submodels):
-            for enduse_object in submodel:
-
-                # Aggregate over heating technologies
-                if enduse_object.enduse in enduse_space_heating:
-
-                    # Get fuels for all techs
-                    submodel_techs_fueltypes_yh = get_fuels_yh(
-                        enduse_object,
-                        'techs_fuel_yh',
-                        model_yearhours_nrs,
-                        model_yeardays_nrs)
-
-                    # All used heating technologies
-                    heating_techs = enduse_object.enduse_techs
-
-                    # Iterate technologies and get fuel per technology
-                    for heating_tech in heating_techs:
-
-                        # Fuel of technology
-                        tech_fuel = submodel_techs_fueltypes_yh[heating_tech]
-
-                        # Fueltype of technology
-                        fueltype_tech_int = technologies[heating_tech].fueltype_int
-
-                        # Aggregate Submodel (sector) specific enduse for fueltype
-                        aggr_results['ed_techs_submodel_fueltype_regs_yh'][heating_tech][submodel_nr][reg_array_nr][fueltype_tech_int] += tech_fuel[fueltype_tech_int]
-
-        # -------------
-        # Summarise remaining fuel of other enduses
-        # -------------
-        for submodel_nr, submodel in enumerate(all_submodels):
-            submodel_ed_fueltype_regs_yh = fuel_aggr(
-                [submodel],
-                'no_sum',
-                model_yearhours_nrs,
-                fueltypes_nr,
-                model_yeardays_nrs,
-                'fuel_yh',
-                'techs_fuel_yh',
-                technologies)
-
-            # Add SubModel specific ed
-            aggr_results['ed_submodel_fueltype_regs_yh'][submodel_nr][reg_array_nr] += submodel_ed_fueltype_regs_yh
-    else:
-        # -------------
-        # Summarise ed of Unconstrained mode (heat is provided)
-        #
-        # np.array(fueltypes, sectors, regions, timesteps)
-        # -------------
-        # Sum across all fueltypes, sectors, regs and hours
-        for submodel_nr, submodel in enumerate(all_submodels):
-            submodel_ed_fueltype_regs_yh = fuel_aggr(
-                [submodel],
-                'no_sum',
-                model_yearhours_nrs,
-                fueltypes_nr,
-                model_yeardays_nrs,
-                'fuel_yh',
-                'techs_fuel_yh',
-                technologies)
-
-            # Add SubModel specific ed
-            aggr_results['ed_submodel_fueltype_regs_yh'][submodel_nr][reg_array_nr] += submodel_ed_fueltype_regs_yh
+    # Sum fuels of all enduses (submodel, region, national, enduse specific)
+    fuel_region_yh = aggregate_enduse_fuels(
+        aggr_results,
+        reg_array_nr,
+        all_submodels,
+        mode_constrained,
+        fueltypes_nr,
+        model_yearhours_nrs,
+        model_yeardays_nrs,
+        enduse_space_heating,
+        technologies,
+        beyond_supply_outputs,
+        yearday_weights)
 
     # -----------
     # Other summing for other purposes
     # -----------
     if beyond_supply_outputs:
 
-        # Sum across all regions, all enduse and sectors sum_reg
-        # [fueltype, region, fuel_yh], [fueltype, fuel_yh]
-        aggr_results['ed_fueltype_regs_yh'], fuel_region_yh = aggr_fuel_regions_fueltype(
-            aggr_results['ed_fueltype_regs_yh'],
-            fueltypes_nr,
-            fueltypes,
-            reg_array_nr,
-            model_yearhours_nrs,
-            model_yeardays_nrs,
-            all_submodels,
-            technologies)
+        # [fueltype, region, fuel_yh]
+        for fueltype_nr in fueltypes.values():
+            aggr_results['ed_fueltype_regs_yh'][fueltype_nr][reg_array_nr] += fuel_region_yh[fueltype_nr].reshape(model_yearhours_nrs)
 
         # Sum across all regions, all enduse and sectors
-        aggr_results['ed_fueltype_national_yh'] = aggr_fuel_aggr(
-            aggr_results['ed_fueltype_national_yh'],
-            'fuel_yh', # unconstrained
-            'techs_fuel_yh', # constrained
-            all_submodels,
-            'no_sum',
-            model_yearhours_nrs,
-            model_yeardays_nrs,
-            technologies)
-
-        # Sum across all regions and provide specific enduse
-        aggr_results['tot_fuel_y_enduse_specific_yh'] = sum_enduse_all_regions(
-            aggr_results['tot_fuel_y_enduse_specific_yh'],
-            all_submodels,
-            technologies,
-            model_yearhours_nrs,
-            model_yeardays_nrs,
-            fueltypes_nr)
-
-        # --------------------------------------
-        # Calculate averaged hour profile per season
-        # --------------------------------------
-        aggr_results['averaged_h'] = averaged_season_hourly(
-            aggr_results['averaged_h'],
-            fuel_region_yh,
-            reg_array_nr,
-            fueltypes.values(),
-            seasons)
-
-        # --------------------------------------
-        # Regional load factor calculations
-        # --------------------------------------
-        # Calculate average load for every day
-        average_fuel_yd = np.average(fuel_region_yh, axis=2)
-
-        # Calculate load factors across all enduses (Yearly lf)
-        load_factor_y = load_factors.calc_lf_y(
-            fuel_region_yh,
-            average_fuel_yd)
-
-        # Calculate load factors across all enduses (Daily lf)
-        load_factor_yd = load_factors.calc_lf_d(
-            fuel_region_yh,
-            average_fuel_yd,
-            mode_constrained=False)
-
-        load_factor_seasons = load_factors.calc_lf_season(
-            seasons,
-            fuel_region_yh,
-            average_fuel_yd)
-
-        # Copy regional load factors
-        for fueltype_nr in fueltypes.values():
-            aggr_results['reg_load_factor_y'][fueltype_nr][reg_array_nr] = load_factor_y[fueltype_nr]
-            aggr_results['reg_load_factor_yd'][fueltype_nr][reg_array_nr] = load_factor_yd[fueltype_nr]
+        aggr_results['ed_fueltype_national_yh'] += fuel_region_yh
+
+        if not factorised_fuel:
+            aggr_results = calc_region_load_factors(
+                aggr_results,
+                reg_array_nr,
+                fuel_region_yh,
+                fueltypes,
+                seasons,
+                yearday_weights)
+
+    return aggr_results
+
+def calc_region_load_factors(
+        aggr_results,
+        reg_array_nr,
+        fuel_region_yh,
+        fueltypes,
+        seasons,
+        yearday_weights=None
+    ):
+    """Calculate averaged hours per season and load factors of a region
+
+    Arguments
+    ---------
+    aggr_results : dict
+        Contains alls results to aggregate
+    reg_array_nr : int
+        Region array number
+    fuel_region_yh : array
+        Fuel of region (fueltypes, model_yeardays_nrs, 24)
+    fueltypes : dict
+        Fueltypes lookup
+    seasons : dict
+        Seasons
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
+
+    Returns
+    --------
+    aggr_results : dict
+        Contains all aggregated results
+    """
+    # --------------------------------------
+    # Calculate averaged hour profile per season
+    # --------------------------------------
+    aggr_results['averaged_h'] = averaged_season_hourly(
+        aggr_results['averaged_h'],
+        fuel_region_yh,
+        reg_array_nr,
+        fueltypes.values(),
+        seasons,
+        yearday_weights)
+
+    # --------------------------------------
+    # Regional load factor calculations
+    # --------------------------------------
+    # Calculate average load for every day
+    average_fuel_yd = np.average(fuel_region_yh, axis=2)
+
+    # Calculate load factors across all enduses (Yearly lf)
+    load_factor_y = load_factors.calc_lf_y(
+        fuel_region_yh,
+        average_fuel_yd,
+        yearday_weights)
+
+    # Calculate load factors across all enduses (Daily lf)
+    load_factor_yd = load_factors.calc_lf_d(
+        fuel_region_yh,
+        average_fuel_yd,
+        mode_constrained=False)
+
+    load_factor_seasons = load_factors.calc_lf_season(
+        seasons,
+        fuel_region_yh,
+        average_fuel_yd,
+        yearday_weights)
 
-            for season, lf_season in load_factor_seasons.items():
-                aggr_results['reg_seasons_lf'][season][fueltype_nr][reg_array_nr] = lf_season[fueltype_nr]
+    # Copy regional load factors
+    for fueltype_nr in fueltypes.values():
+        aggr_results['reg_load_factor_y'][fueltype_nr][reg_array_nr] = load_factor_y[fueltype_nr]
+        aggr_results['reg_load_factor_yd'][fueltype_nr][reg_array_nr] = load_factor_yd[fueltype_nr]
+
+        for season, lf_season in load_factor_seasons.items():
+            aggr_results['reg_seasons_lf'][season][fueltype_nr][reg_array_nr] = lf_season[fueltype_nr]
 
     return aggr_results
 
+def aggregate_enduse_fuels(
+        aggr_results,
+        reg_array_nr,
+        all_submodels,
+        mode_constrained,
+        fueltypes_nr,
+        model_yearhours_nrs,
+        model_yeardays_nrs,
+        enduse_space_heating,
+        technologies,
+        beyond_supply_outputs=True,
+        yearday_weights=None
+    ):
+    """Add the fuel of every enduse of a region to all aggregated
+    results. Every enduse object is only read once and its fuel is
+    added to the submodel, heating technology and enduse specific
+    results. Factorised fuel of enduses is added to
+    ``aggr_results['fuel_factors']``
+
+    Arguments
+    ----------
+    aggr_results : dict
+        Contains alls results to aggregate
+    reg_array_nr : int
+        Region array number
+    all_submodels : list
+        Submodel objects
+    mode_constrained : bool
+        Mode of how to run the model
+    fueltypes_nr : int
+        Number of fueltypes
+    model_yearhours_nrs : int
+        Number of modelled hours in a year
+    model_yeardays_nrs : int
+        Number of modelled days in a year
+    enduse_space_heating : list
+        All heating enduses
+    technologies : dict
+        Technologies
+    beyond_supply_outputs : bool
+        Criteria whether the fuel of the region and the enduse
+        specific fuels are aggregated
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
+
+    Returns
+    -------
+    fuel_region_yh : array
+        Fuel of region summed over all submodels and enduses
+        (fueltypes, model_yeardays_nrs, 24)
+    """
+    fuel_region_yh = np.zeros((fueltypes_nr, model_yeardays_nrs, 24), dtype=float)
+    enduse_specific_yh = aggr_results['tot_fuel_y_enduse_specific_yh']
+    techs_submodel_yh = aggr_results['ed_techs_submodel_fueltype_regs_yh']
+
+    for submodel_nr, submodel in enumerate(all_submodels):
+        submodel_fuel_yh = aggr_results['ed_submodel_fueltype_regs_yh'][submodel_nr][reg_array_nr]
+
+        for enduse_object in submodel:
+
+            if beyond_supply_outputs and enduse_object.enduse not in enduse_specific_yh:
+                enduse_specific_yh[enduse_object.enduse] = np.zeros(
+                    (fueltypes_nr, model_yeardays_nrs, 24))
+
+            enduse_fuel_factors = getattr(enduse_object, 'fuel_factors', None)
+            if enduse_fuel_factors is not None:
+                aggr_results['fuel_factors'].add_enduse(
+                    submodel_nr,
+                    reg_array_nr,
+                    enduse_object.enduse,
+                    enduse_fuel_factors)
+                continue
+
+            fuels = get_fuels_yh(
+                enduse_object,
+                'techs_fuel_yh',
+                model_yearhours_nrs,
+                model_yeardays_nrs,
+                yearday_weights)
+
+            if isinstance(fuels, dict):
+
+                # Aggregate fuel of heating technologies (constrained mode)
+                if mode_constrained and enduse_object.enduse in enduse_space_heating:
+                    for heating_tech in enduse_object.enduse_techs:
+                        techs_submodel_yh.add_fuel(
+                            heating_tech,
+                            submodel_nr,
+                            reg_array_nr,
+                            fuels[heating_tech][techs_submodel_yh.get_fueltype(heating_tech)])
+
+                for tech, fuel_tech in fuels.items():
+                    tech_fueltype = technologies[tech].fueltype_int
+                    submodel_fuel_yh[tech_fueltype] += fuel_tech
+
+                    if beyond_supply_outputs:
+                        fuel_region_yh[tech_fueltype] += fuel_tech
+                        enduse_specific_yh[enduse_object.enduse][tech_fueltype] += fuel_tech
+            else:
+                fuels = get_fuels_yh(
+                    enduse_object,
+                    'fuel_yh',
+                    model_yearhours_nrs,
+                    model_yeardays_nrs,
+                    yearday_weights)
+                submodel_fuel_yh += fuels
+
+                if beyond_supply_outputs:
+                    fuel_region_yh += fuels
+                    enduse_specific_yh[enduse_object.enduse] += fuels
+
+    return fuel_region_yh
+
+class HeatingTechResults(Mapping):
+    """Fuel of heating technologies. The fuel of a technology
+    is only stored for the fueltype of the technology
+
+    Arguments
+    ----------
+    heating_technologies : list
+        Heating technologies
+    fueltypes_int : list
+        Fueltype of every heating technology
+    submodels_nr : int
+        Number of submodels
+    reg_nrs : int
+        Number of regions
+    fueltypes_nr : int
+        Number of fueltypes
+    model_yeardays_nrs : int
+        Number of yeardays
+
+    Note
+    ----
+    The fuel is stored in `values` (techs, submodels, regions, yeardays, 24).
+
+    Can be used as (read-only) dictionary which provides the fuel of a
+    technology for all fueltypes (submodels, regions, fueltypes, yeardays, 24),
+    e.g. `heating_tech_results['boiler_gas']`. All other fueltypes are zero.
+    """
+    def __init__(
+            self,
+            heating_technologies,
+            fueltypes_int,
+            submodels_nr,
+            reg_nrs,
+            fueltypes_nr,
+            model_yeardays_nrs
+        ):
+        self.heating_technologies = []
+        self.tech_nrs = {}
+        tech_fueltypes_int = []
+        for tech, fueltype_int in zip(heating_technologies, fueltypes_int):
+            if tech not in self.tech_nrs:
+                self.tech_nrs[tech] = len(self.heating_technologies)
+                self.heating_technologies.append(tech)
+                tech_fueltypes_int.append(fueltype_int)
+
+        self.fueltypes_int = np.array(tech_fueltypes_int, dtype=int)
+        self.fueltypes_nr = fueltypes_nr
+        self.values = np.zeros((
+            len(self.heating_technologies), submodels_nr, reg_nrs, model_yeardays_nrs, 24), dtype=float)
+
+    def get_fueltype(self, tech):
+        """Get fueltype of technology
+
+        Arguments
+        ----------
+        tech : str
+            Technology
+
+        Returns
+        -------
+        fueltype_int : int
+            Fueltype of technology
+        """
+        return self.fueltypes_int[self.tech_nrs[tech]]
+
+    def add_fuel(self, tech, submodel_nr, reg_array_nr, fuel_yh):
+        """Add fuel of technology (fueltype of technology)
+
+        Arguments
+        ----------
+        tech : str
+            Technology
+        submodel_nr : int
+            Submodel
+        reg_array_nr : int
+            Region array number
+        fuel_yh : array
+            Fuel (yeardays, 24)
+        """
+        self.values[self.tech_nrs[tech], submodel_nr, reg_array_nr] += fuel_yh
+
+    def get_techs_with_fuel(self):
+        """Get all technologies with any fuel
+
+        Returns
+        -------
+        techs : list
+            Technologies
+        """
+        techs_fuel = np.any(self.values.reshape(len(self.heating_technologies), -1), axis=1)
+
+        return [tech for tech, tech_fuel in zip(self.heating_technologies, techs_fuel) if tech_fuel]
+
+    def __getitem__(self, tech):
+        tech_nr = self.tech_nrs[tech]
+        fuel_tech = self.values[tech_nr]
+
+        fueltypes_fuel_tech = np.zeros(
+            fuel_tech.shape[:2] + (self.fueltypes_nr, ) + fuel_tech.shape[2:], dtype=float)
+        fueltypes_fuel_tech[:, :, self.fueltypes_int[tech_nr]] = fuel_tech
+
+        return fueltypes_fuel_tech
+
+    def __iter__(self):
+        return iter(self.heating_technologies)
+
+    def __len__(self):
+        return len(self.heating_technologies)
+
 def initialise_result_container(
         fueltypes_nr,
         sectors,
         reg_nrs,
         model_yearhours_nrs,
         model_yeardays_nrs,
-        heating_technologies
+        heating_technologies,
+        technologies,
+        regional_yh=True
     ):
     """Create container with empty dict or arrays
     as values in a dict. This is used to aggregate the
@@ -1096,6 +2159,12 @@ def initialise_result_container(
         Number of yeardays
     heating_technologies : list
         Heating technologies
+    technologies : dict
+        Technologies
+    regional_yh : bool, default=True
+        Criteria whether the hourly results of every region are
+        kept. If False (results are streamed to a result store),
+        these results are None
 
     Returns
     -------
@@ -1104,16 +2173,24 @@ def initialise_result_container(
     """
     result_container = {}
 
-    result_container['ed_submodel_fueltype_regs_yh'] = np.zeros(
-        (len(sectors.keys()), reg_nrs, fueltypes_nr, model_yeardays_nrs, 24), dtype=float)
-
-    result_container['ed_techs_submodel_fueltype_regs_yh'] = {}
-    for heating_tech in heating_technologies:
-        result_container['ed_techs_submodel_fueltype_regs_yh'][heating_tech] = np.zeros(
+    if regional_yh:
+        result_container['ed_submodel_fueltype_regs_yh'] = np.zeros(
             (len(sectors.keys()), reg_nrs, fueltypes_nr, model_yeardays_nrs, 24), dtype=float)
 
-    result_container['ed_fueltype_regs_yh'] = np.zeros(
-        (fueltypes_nr, reg_nrs, model_yearhours_nrs), dtype=float)
+        result_container['ed_techs_submodel_fueltype_regs_yh'] = HeatingTechResults(
+            heating_technologies,
+            [technologies[heating_tech].fueltype_int for heating_tech in heating_technologies],
+            len(sectors.keys()),
+            reg_nrs,
+            fueltypes_nr,
+            model_yeardays_nrs)
+
+        result_container['ed_fueltype_regs_yh'] = np.zeros(
+            (fueltypes_nr, reg_nrs, model_yearhours_nrs), dtype=float)
+    else:
+        result_container['ed_submodel_fueltype_regs_yh'] = None
+        result_container['ed_techs_submodel_fueltype_regs_yh'] = None
+        result_container['ed_fueltype_regs_yh'] = None
 
     result_container['ed_fueltype_national_yh'] = np.zeros(
         (fueltypes_nr, model_yeardays_nrs, 24), dtype=float)
@@ -1123,6 +2200,8 @@ def initialise_result_container(
 
     result_container['tot_fuel_y_enduse_specific_yh'] = {}
 
+    result_container['fuel_factors'] = fuel_factors.FuelFactors()
+
     result_container['reg_load_factor_y'] = np.zeros(
         (fueltypes_nr, reg_nrs), dtype=float)
 
@@ -1,7 +1,10 @@
 """Plotting model results and storing as PDF to result folder
 """
 import os
+import json
+import hashlib
 import logging
+import multiprocessing
 from collections import defaultdict
 import operator
 from math import pi
@@ -17,202 +20,434 @@ from energy_demand.basic import basic_functions, conversions
 from energy_demand.plotting import plotting_styles
 from energy_demand.technologies import tech_related
 
-def run_all_plot_functions(
+# Version of plotted figures. Increase if plot functions change
+# to render figures again whose inputs have not changed
+PLOT_INPUTS_VERSION = 1
+
+# Figures which are plotted by default
+DEFAULT_PLOTS = [
+    'lad_comparison',
+    'stacked_enduses',
+    'y_all_enduses',
+    'fuels_enduses_y',
+    'week_h',
+    'averaged_season_fueltype',
+    'h_peak_fueltypes']
+
+# All figures which can be plotted
+PLOT_NAMES = DEFAULT_PLOTS + ['lf']
+
+class PlotTask(object):
+    """Figure which is plotted independently of all other figures
+
+    Arguments
+    ---------
+    name : str
+        Name of plot (see `PLOT_NAMES`)
+    path_fig : str
+        Path of figure
+    plot_function : function
+        Function which plots the figure
+    kwargs : dict
+        Arguments of `plot_function`
+    ignore_errors : bool, default=False
+        Criteria whether errors while plotting are only logged
+    """
+    def __init__(
+            self,
+            name,
+            path_fig,
+            plot_function,
+            kwargs,
+            ignore_errors=False
+        ):
+        self.name = name
+        self.path_fig = path_fig
+        self.plot_function = plot_function
+        self.kwargs = kwargs
+        self.ignore_errors = ignore_errors
+
+    def get_inputs_hash(self):
+        """Get hash of all inputs of the figure
+
+        Returns
+        -------
+        inputs_hash : str
+            Hash of plot function and its arguments
+        """
+        hash_obj = hashlib.sha1()
+        basic_functions.update_hash(hash_obj, PLOT_INPUTS_VERSION)
+        basic_functions.update_hash(hash_obj, self.plot_function.__name__)
+        basic_functions.update_hash(hash_obj, self.kwargs)
+
+        return hash_obj.hexdigest()
+
+    def plot(self):
+        """Plot figure
+
+        Returns
+        -------
+        plotted : bool
+            Whether the figure was plotted
+        """
+        try:
+            self.plot_function(**self.kwargs)
+        except Exception:
+            if not self.ignore_errors:
+                raise
+            logging.info("... figure %s could not be plotted", self.path_fig)
+            return False
+
+        return True
+
+def get_plot_tasks(
         results_container,
         reg_nrs,
         regions,
         lookups,
         result_paths,
         assumptions,
-        enduses
+        enduses,
+        plots=None
     ):
-    """Summary function to plot all results
+    """Get all figures to plot. The arguments of the figures
+    refer to the results container and are not copied
+
+    Arguments
+    ---------
+    plots : list, default=None
+        Names of plots (see `PLOT_NAMES`). If None, `DEFAULT_PLOTS` are plotted
+
+    Returns
+    -------
+    plot_tasks : list
+        Figures to plot (`PlotTask`)
     """
+    if plots is None:
+        plots = DEFAULT_PLOTS
+
+    for plot_name in plots:
+        if plot_name not in PLOT_NAMES:
+            raise Exception("Plot '{}' is not defined".format(plot_name))
+
+    path_pdf = result_paths['data_results_PDF']
+    plot_radar = False  # Plot radar spider charts
+    plot_tasks = []
 
-    # -----------
-    # Set which plots to plot
-    # -----------
-    plot_stacked_enduses = True
-    plot_y_all_enduses = True
-    plot_fuels_enduses_y = True
-    plot_lf = False                         # Plot load factors
-    plot_week_h = True
-    plot_h_peak_fueltypes = True
-    plot_averaged_season_fueltype = True   # Compare for every season and daytype the daily loads
-    plot_radar = False                      # Plot radar spider charts
     # ----------
     # Plot LAD differences for first and last year
     # ----------
-    try:
-        plot_lad_comparison(
-            base_yr=2015,
-            comparison_year=2050,
-            regions=regions,
-            ed_year_fueltype_regs_yh=results_container['results_every_year'],
-            fueltype_int=lookups['fueltypes']['electricity'],
-            fueltype_str='electricity',
-            fig_name=os.path.join(
-                result_paths['data_results_PDF'], "comparions_LAD_modelled_by_cy.pdf"),
-            label_points=False,
-            plotshow=False)
-        print("... plotted by-cy LAD energy demand compariosn")
-    except:
-        pass
+    if 'lad_comparison' in plots:
+        plot_tasks.append(PlotTask(
+            'lad_comparison',
+            os.path.join(path_pdf, "comparions_LAD_modelled_by_cy.pdf"),
+            plot_lad_comparison,
+            {
+                'base_yr': 2015,
+                'comparison_year': 2050,
+                'regions': regions,
+                'ed_year_fueltype_regs_yh': results_container['results_every_year'],
+                'fueltype_int': lookups['fueltypes']['electricity'],
+                'fueltype_str': 'electricity',
+                'fig_name': os.path.join(path_pdf, "comparions_LAD_modelled_by_cy.pdf"),
+                'label_points': False,
+                'plotshow': False},
+            ignore_errors=True))
 
     # ------------
     # Plot stacked annual enduses
     # ------------
-    if plot_stacked_enduses:
-        logging.info("plot stacked enduses")
-        # Residential
-        plt_stacked_enduse(
-            assumptions['simulated_yrs'],
-            results_container['results_enduse_every_year'],
-            enduses['rs_enduses'],
-            os.path.join(
-                result_paths['data_results_PDF'], "stacked_rs_country.pdf"))
-
-        # Service
-        plt_stacked_enduse(
-            assumptions['simulated_yrs'],
-            results_container['results_enduse_every_year'],
-            enduses['ss_enduses'],
-            os.path.join(
-                result_paths['data_results_PDF'], "stacked_ss_country.pdf"))
-
-        # Industry
-        plt_stacked_enduse(
-            assumptions['simulated_yrs'],
-            results_container['results_enduse_every_year'],
-            enduses['is_enduses'],
-            os.path.join(
-                result_paths['data_results_PDF'], "stacked_is_country_.pdf"))
+    if 'stacked_enduses' in plots:
+        for submodel_enduses, fig_name in [
+                ('rs_enduses', "stacked_rs_country.pdf"),
+                ('ss_enduses', "stacked_ss_country.pdf"),
+                ('is_enduses', "stacked_is_country_.pdf")]:
+            plot_tasks.append(PlotTask(
+                'stacked_enduses',
+                os.path.join(path_pdf, fig_name),
+                plt_stacked_enduse,
+                {
+                    'years_simulated': assumptions['simulated_yrs'],
+                    'results_enduse_every_year': results_container['results_enduse_every_year'],
+                    'enduses_data': enduses[submodel_enduses],
+                    'fig_name': os.path.join(path_pdf, fig_name)}))
 
     # ------------------------------
     # Plot annual demand for enduses for all submodels
     # ------------------------------
-    if plot_y_all_enduses:
-        logging.info("plot annual demand for enduses for all submodels")
-        plt_stacked_enduse_sectors(
-            lookups,
-            assumptions['simulated_yrs'],
-            results_container['results_enduse_every_year'],
-            enduses['rs_enduses'],
-            enduses['ss_enduses'],
-            enduses['is_enduses'],
-            os.path.join(result_paths['data_results_PDF'],
-            "stacked_all_enduses_country.pdf"))
+    if 'y_all_enduses' in plots:
+        plot_tasks.append(PlotTask(
+            'y_all_enduses',
+            os.path.join(path_pdf, "stacked_all_enduses_country.pdf"),
+            plt_stacked_enduse_sectors,
+            {
+                'lookups': lookups,
+                'years_simulated': assumptions['simulated_yrs'],
+                'results_enduse_every_year': results_container['results_enduse_every_year'],
+                'rs_enduses': enduses['rs_enduses'],
+                'ss_enduses': enduses['ss_enduses'],
+                'is_enduses': enduses['is_enduses'],
+                'fig_name': os.path.join(path_pdf, "stacked_all_enduses_country.pdf")}))
 
     # --------------
     # Fuel per fueltype for whole country over annual timesteps
     # ----------------
-    if plot_fuels_enduses_y:
-        logging.info("... plot fuel per fueltype for whole country over annual timesteps")
-        #... Plot total fuel (y) per fueltype as line chart"
-        plt_fuels_enduses_y(
-            results_container['results_every_year'],
-            lookups,
-            os.path.join(
-                result_paths['data_results_PDF'],
-                'y_fueltypes_all_enduses.pdf'))
-
-    # ----------
-    # Plot seasonal typical load profiles
-    # Averaged load profile per daytpe for a region
-    # ----------
+    if 'fuels_enduses_y' in plots:
+        plot_tasks.append(PlotTask(
+            'fuels_enduses_y',
+            os.path.join(path_pdf, 'y_fueltypes_all_enduses.pdf'),
+            plt_fuels_enduses_y,
+            {
+                'results': results_container['results_every_year'],
+                'lookups': lookups,
+                'fig_name': os.path.join(path_pdf, 'y_fueltypes_all_enduses.pdf')}))
 
     # ------------------------------------
     # Load factors per fueltype and region
     # ------------------------------------
-    if plot_lf:
+    if 'lf' in plots:
         for fueltype_str, fueltype_int in lookups['fueltypes'].items():
-            logging.info("plot Load factors per fueltype and region")
-            plot_seasonal_lf(
-                fueltype_int,
-                fueltype_str,
-                results_container['load_factor_seasons'],
-                reg_nrs,
-                os.path.join(
-                    result_paths['data_results_PDF'],
-                    'lf_seasonal_{}.pdf'.format(fueltype_str)))
-
-            plot_lf_y(
-                fueltype_int,
-                fueltype_str,
-                results_container['load_factors_yd'],
-                reg_nrs,
-                os.path.join(
-                    result_paths['data_results_PDF'], 'lf_yd_{}.pdf'.format(fueltype_str)))
-
-            # load_factors_yd = max daily value / average annual daily value
-            plot_lf_y(
-                fueltype_int,
-                fueltype_str,
-                results_container['load_factors_y'],
-                reg_nrs,
-                os.path.join(
-                    result_paths['data_results_PDF'],
-                    'lf_y_{}.pdf'.format(fueltype_str)))
+            for plot_function, load_factors, fig_name in [
+                    (plot_seasonal_lf, 'load_factor_seasons', 'lf_seasonal_{}.pdf'),
+                    (plot_lf_y, 'load_factors_yd', 'lf_yd_{}.pdf'),
+                    (plot_lf_y, 'load_factors_y', 'lf_y_{}.pdf')]:
+                kwargs = {
+                    'fueltype_int': fueltype_int,
+                    'fueltype_str': fueltype_str,
+                    'reg_nrs': reg_nrs,
+                    'path_plot_fig': os.path.join(path_pdf, fig_name.format(fueltype_str))}
+                if plot_function is plot_seasonal_lf:
+                    kwargs['load_factors_seasonal'] = results_container[load_factors]
+                else:
+                    kwargs['load_factors_y'] = results_container[load_factors]
+
+                plot_tasks.append(PlotTask(
+                    'lf', kwargs['path_plot_fig'], plot_function, kwargs))
 
     # --------------
     # Fuel week of base year
     # ----------------
-    if plot_week_h:
-        logging.debug("... plot a full week")
-        plt_fuels_enduses_week(
-            results_container['results_every_year'],
-            lookups,
-            assumptions['model_yearhours_nrs'],
-            assumptions['model_yeardays_nrs'],
-            2015,
-            os.path.join(result_paths['data_results_PDF'], "tot_all_enduse03.pdf"))
+    if 'week_h' in plots:
+        plot_tasks.append(PlotTask(
+            'week_h',
+            os.path.join(path_pdf, "tot_all_enduse03.pdf"),
+            plt_fuels_enduses_week,
+            {
+                'results_resid': results_container['results_every_year'],
+                'lookups': lookups,
+                'nr_of_h_to_plot': assumptions['model_yearhours_nrs'],
+                'model_yeardays_nrs': assumptions['model_yeardays_nrs'],
+                'year_to_plot': 2015,
+                'fig_name': os.path.join(path_pdf, "tot_all_enduse03.pdf")}))
 
     # ------------------------------------
     # Plot averaged per season and fueltype
     # ------------------------------------
-    if plot_averaged_season_fueltype:
+    if 'averaged_season_fueltype' in plots:
         base_year = 2015
         for year in results_container['av_season_daytype_cy'].keys():
             for fueltype_int in results_container['av_season_daytype_cy'][year].keys():
 
                 fueltype_str = tech_related.get_fueltype_str(
                     lookups['fueltypes'], fueltype_int)
-
-                plot_load_profile_dh_multiple(
-                    path_fig_folder=result_paths['data_results_PDF'],
-                    path_plot_fig=os.path.join(
-                        result_paths['data_results_PDF'],
-                        'season_daytypes_by_cy_comparison__{}__{}.pdf'.format(year, fueltype_str)),
-                    calc_av_lp_modelled=results_container['av_season_daytype_cy'][year][fueltype_int],  # current year
-                    calc_av_lp_real=results_container['av_season_daytype_cy'][base_year][fueltype_int], # base year
-                    calc_lp_modelled=results_container['season_daytype_cy'][year][fueltype_int],        # current year
-                    calc_lp_real=results_container['season_daytype_cy'][base_year][fueltype_int],       # base year
-                    plot_peak=True,
-                    plot_all_entries=False,
-                    plot_max_min_polygon=True,
-                    plotshow=False,
-                    plot_radar=plot_radar,
-                    max_y_to_plot=120,
-                    fueltype_str=fueltype_str,
-                    year=year)
+                path_plot_fig = os.path.join(
+                    path_pdf,
+                    'season_daytypes_by_cy_comparison__{}__{}.pdf'.format(year, fueltype_str))
+
+                plot_tasks.append(PlotTask(
+                    'averaged_season_fueltype',
+                    path_plot_fig,
+                    plot_load_profile_dh_multiple,
+                    {
+                        'path_fig_folder': path_pdf,
+                        'path_plot_fig': path_plot_fig,
+                        'calc_av_lp_modelled': results_container['av_season_daytype_cy'][year][fueltype_int],  # current year
+                        'calc_av_lp_real': results_container['av_season_daytype_cy'][base_year][fueltype_int], # base year
+                        'calc_lp_modelled': results_container['season_daytype_cy'][year][fueltype_int],        # current year
+                        'calc_lp_real': results_container['season_daytype_cy'][base_year][fueltype_int],       # base year
+                        'plot_peak': True,
+                        'plot_all_entries': False,
+                        'plot_max_min_polygon': True,
+                        'plotshow': False,
+                        'plot_radar': plot_radar,
+                        'max_y_to_plot': 120,
+                        'fueltype_str': fueltype_str,
+                        'year': year}))
 
     # ---------------------------------
     # Plot hourly peak loads over time for different fueltypes
     # --------------------------------
-    if plot_h_peak_fueltypes:
+    if 'h_peak_fueltypes' in plots:
+        plot_tasks.append(PlotTask(
+            'h_peak_fueltypes',
+            os.path.join(path_pdf, 'fuel_fueltypes_peak_h.pdf'),
+            plt_fuels_peak_h,
+            {
+                'results_every_year': results_container['results_every_year'],
+                'lookups': lookups,
+                'path_plot_fig': os.path.join(path_pdf, 'fuel_fueltypes_peak_h.pdf')}))
 
-        plt_fuels_peak_h(
-            results_container['results_every_year'], #results_container['tot_peak_enduses_fueltype'],
-            lookups,
-            os.path.join(
-                result_paths['data_results_PDF'],
-                'fuel_fueltypes_peak_h.pdf'))
+    return plot_tasks
+
+def read_plot_inputs_hashes(path_folder):
+    """Read hashes of inputs of last plotted figures
+
+    Arguments
+    ---------
+    path_folder : str
+        Folder with figures
+
+    Returns
+    -------
+    inputs_hashes : dict
+        Hash of inputs of every figure {path_fig: hash}
+    """
+    try:
+        with open(os.path.join(path_folder, "plot_inputs_hashes.json"), 'r') as file_handle:
+            return json.load(file_handle)
+    except (IOError, OSError, ValueError):
+        return {}
+
+def write_plot_inputs_hashes(path_folder, inputs_hashes):
+    """Write hashes of inputs of plotted figures
+
+    Arguments
+    ---------
+    path_folder : str
+        Folder with figures
+    inputs_hashes : dict
+        Hash of inputs of every figure {path_fig: hash}
+    """
+    with open(os.path.join(path_folder, "plot_inputs_hashes.json"), 'w') as file_handle:
+        json.dump(inputs_hashes, file_handle, indent=2, sort_keys=True)
+
+# Figures to plot in a worker process set by `_init_plot_worker`
+_PLOT_WORKER_TASKS = []
+
+def _init_plot_worker(plot_tasks):
+    """Store figures to plot in a worker process
+    and use a non-interactive backend
+    """
+    plt.switch_backend('Agg')
+    _PLOT_WORKER_TASKS[:] = plot_tasks
+
+def _plot_task(task_nr):
+    """Plot a figure in a worker process
+    """
+    return task_nr, _PLOT_WORKER_TASKS[task_nr].plot()
+
+def run_all_plot_functions(
+        results_container,
+        reg_nrs,
+        regions,
+        lookups,
+        result_paths,
+        assumptions,
+        enduses,
+        plots=None,
+        nr_of_processes=1,
+        skip_unchanged=False
+    ):
+    """Summary function to plot all results
+
+    Arguments
+    ----------
+    plots : list, default=None
+        Names of plots (see `PLOT_NAMES`). If None, `DEFAULT_PLOTS` are plotted
+    nr_of_processes : int, default=1
+        Number of worker processes. If 1, all figures are plotted
+        in the current process. With the 'fork' start method, the
+        workers share the results container with the parent process
+    skip_unchanged : bool, default=False
+        Criteria whether figures are skipped if they exist and their
+        inputs have not changed since they were last plotted
+
+    Returns
+    -------
+    plotted_figs : list
+        Paths of plotted figures
+    """
+    plot_tasks = get_plot_tasks(
+        results_container,
+        reg_nrs,
+        regions,
+        lookups,
+        result_paths,
+        assumptions,
+        enduses,
+        plots)
+
+    # ------------------------------------
+    # Skip figures whose inputs have not changed
+    # ------------------------------------
+    if skip_unchanged:
+        inputs_hashes = read_plot_inputs_hashes(result_paths['data_results_PDF'])
+        tasks_inputs_hashes = [plot_task.get_inputs_hash() for plot_task in plot_tasks]
+
+        task_nrs = [
+            task_nr for task_nr, plot_task in enumerate(plot_tasks)
+            if inputs_hashes.get(plot_task.path_fig) != tasks_inputs_hashes[task_nr] or
+            not os.path.isfile(plot_task.path_fig)]
+        logging.info(
+            "... skip %s unchanged figures", len(plot_tasks) - len(task_nrs))
+    else:
+        inputs_hashes = None
+        tasks_inputs_hashes = None
+        task_nrs = list(range(len(plot_tasks)))
+
+    if nr_of_processes <= 1:
+        plotted_figs = _store_plotted_figs(
+            ((task_nr, plot_tasks[task_nr].plot()) for task_nr in task_nrs),
+            plot_tasks,
+            tasks_inputs_hashes,
+            inputs_hashes)
+    else:
+        with multiprocessing.Pool(
+                processes=nr_of_processes,
+                initializer=_init_plot_worker,
+                initargs=(plot_tasks,)) as pool:
+
+            plotted_figs = _store_plotted_figs(
+                pool.imap_unordered(_plot_task, task_nrs),
+                plot_tasks,
+                tasks_inputs_hashes,
+                inputs_hashes)
+
+    if skip_unchanged:
+        write_plot_inputs_hashes(result_paths['data_results_PDF'], inputs_hashes)
 
-    # -
-    #     #tot_fuel_y_enduse_specific_h
-    # -
     print("finisthed plotting")
-    return
+    return plotted_figs
+
+def _store_plotted_figs(results, plot_tasks, tasks_inputs_hashes, inputs_hashes):
+    """Store input hashes of all plotted figures
+
+    Arguments
+    ---------
+    results : iterable
+        Task number and whether the figure was plotted [(task_nr, plotted)]
+    plot_tasks : list
+        Figures to plot
+    tasks_inputs_hashes : list
+        Hash of inputs of every figure to plot (None if not stored)
+    inputs_hashes : dict
+        Hash of inputs of every plotted figure {path_fig: hash} (None if not stored)
+
+    Returns
+    -------
+    plotted_figs : list
+        Paths of plotted figures
+    """
+    plotted_figs = []
+    for task_nr, plotted in results:
+        if plotted:
+            path_fig = plot_tasks[task_nr].path_fig
+            logging.info("... plotted %s", path_fig)
+            if inputs_hashes is not None:
+                inputs_hashes[path_fig] = tasks_inputs_hashes[task_nr]
+            plotted_figs.append(path_fig)
+
+    return plotted_figs
 
 
 def plot_lp_dh_SCRAP(data_dh_modelled):
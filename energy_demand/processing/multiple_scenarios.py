@@ -70,7 +70,8 @@ def process_scenarios(path_to_scenarios, year_to_model=2015):
         scenario_data[scenario] = read_data.read_in_results(
             path_runs=path_to_result_files,
             seasons=seasons,
-            model_yeardays_daytype=model_yeardays_daytype)
+            model_yeardays_daytype=model_yeardays_daytype,
+            mmap_mode='r')
 
     # -----------------------
     # Generate result folder
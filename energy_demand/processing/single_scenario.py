@@ -61,7 +61,8 @@ def main(path_data_energy_demand, path_shapefile_input):
     data['scenario_data'] = {}
 
     data['scenario_data']['population'] = read_data.read_scenaric_population_data(
-        data['result_paths']['model_run_pop'])
+        data['result_paths']['model_run_pop'],
+        mmap_mode='r')
 
     # --------------------------------------------
     # Reading in results from different model runs
@@ -70,7 +71,8 @@ def main(path_data_energy_demand, path_shapefile_input):
     results_container = read_data.read_in_results(
         data['result_paths']['data_results_model_runs'],
         data['assumptions']['seasons'],
-        data['assumptions']['model_yeardays_daytype'])
+        data['assumptions']['model_yeardays_daytype'],
+        mmap_mode='r')
 
     # ----------------
     # Write results to CSV files and merge with shapefile
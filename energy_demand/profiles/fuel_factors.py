@@ -0,0 +1,150 @@
+"""Factorised representation of hourly fuel
+
+The hourly fuel of an enduse is the annual fuel multiplied
+with a load profile. Instead of calculating the hourly fuel of
+every enduse, the annual fuel is stored together with the
+position of the load profile (profile id). The hourly fuel of all
+enduses is calculated at once with a sparse matrix
+(rows, profiles) multiplied with the shapes of all profiles
+(profiles, yeardays * 24).
+"""
+import numpy as np
+from scipy import sparse
+
+def register_profile_stocks(lp_stocks):
+    """Assign every load profile stock the position of its
+    first profile in the profiles of all stocks
+
+    Arguments
+    ----------
+    lp_stocks : list
+        Load profile stocks
+
+    Returns
+    -------
+    registered_stocks : list
+        Registered load profile stocks (every stock only once)
+    """
+    registered_stocks = []
+    registered_ids = set([])
+    profiles_nr = 0
+    for lp_stock in lp_stocks:
+        if id(lp_stock) not in registered_ids:
+            registered_ids.add(id(lp_stock))
+            registered_stocks.append(lp_stock)
+
+            lp_stock.profile_offset = profiles_nr
+            profiles_nr += len(lp_stock.profiles)
+
+    return registered_stocks
+
+class FuelFactors(object):
+    """Annual fuel per load profile of enduses
+
+    Every entry consists of submodel, region, enduse,
+    fueltype, profile id and annual fuel.
+    """
+    def __init__(self):
+        self.submodel_nrs = []
+        self.reg_array_nrs = []
+        self.enduses = []
+        self.fueltypes = []
+        self.profile_ids = []
+        self.fuels = []
+
+    def add_enduse(self, submodel_nr, reg_array_nr, enduse, fuel_factors):
+        """Add the fuel factors of an enduse
+
+        Arguments
+        ----------
+        submodel_nr : int
+            Submodel
+        reg_array_nr : int
+            Region array number
+        enduse : str
+            Enduse
+        fuel_factors : list
+            Fueltype, profile id and annual fuel
+            of enduse (see `Enduse.fuel_factors`)
+        """
+        for fueltype, profile_id, fuel in fuel_factors:
+            self.submodel_nrs.append(submodel_nr)
+            self.reg_array_nrs.append(reg_array_nr)
+            self.enduses.append(enduse)
+            self.fueltypes.append(fueltype)
+            self.profile_ids.append(profile_id)
+            self.fuels.append(fuel)
+
+    def add_region(self, fuel_factors, reg_array_nr):
+        """Add all fuel factors of a single region
+
+        Arguments
+        ----------
+        fuel_factors : FuelFactors
+            Fuel factors of region
+        reg_array_nr : int
+            Region array number
+        """
+        self.submodel_nrs += fuel_factors.submodel_nrs
+        self.reg_array_nrs += [reg_array_nr] * len(fuel_factors)
+        self.enduses += fuel_factors.enduses
+        self.fueltypes += fuel_factors.fueltypes
+        self.profile_ids += fuel_factors.profile_ids
+        self.fuels += fuel_factors.fuels
+
+    def __len__(self):
+        return len(self.fuels)
+
+def calc_fuel_yh(rows, profile_ids, fuels, rows_nr, lp_stocks, model_yeardays_nrs):
+    """Calculate hourly fuel of factorised fuel
+
+    Arguments
+    ----------
+    rows : array
+        Row of every fuel factor
+    profile_ids : array
+        Profile id of every fuel factor
+    fuels : array
+        Annual fuel of every fuel factor
+    rows_nr : int
+        Number of rows
+    lp_stocks : list
+        Registered load profile stocks (see `register_profile_stocks`)
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+
+    Returns
+    -------
+    fuel_yh : array
+        Hourly fuel of every row (rows_nr, model_yeardays_nrs, 24)
+
+    Note
+    ----
+    Fuel factors with the same row and profile are summed
+    before the profile is applied.
+    """
+    fuel_yh = np.zeros((rows_nr, model_yeardays_nrs * 24), dtype=float)
+
+    if len(fuels) == 0:
+        return fuel_yh.reshape(rows_nr, model_yeardays_nrs, 24)
+
+    profiles_nr = max(
+        lp_stock.profile_offset + len(lp_stock.profiles) for lp_stock in lp_stocks)
+
+    fuel_matrix = sparse.csc_matrix(
+        (fuels, (rows, profile_ids)), shape=(rows_nr, profiles_nr))
+
+    # Multiply with the profiles of every stock (the shapes are not copied)
+    for lp_stock in lp_stocks:
+        stock_profiles_nr = len(lp_stock.profiles)
+        if stock_profiles_nr == 0:
+            continue
+
+        fuel_matrix_stock = fuel_matrix[
+            :, lp_stock.profile_offset:lp_stock.profile_offset + stock_profiles_nr]
+
+        if fuel_matrix_stock.nnz > 0:
+            fuel_yh += fuel_matrix_stock.dot(
+                lp_stock.shapes_yh[:stock_profiles_nr].reshape(stock_profiles_nr, -1))
+
+    return fuel_yh.reshape(rows_nr, model_yeardays_nrs, 24)
@@ -1,6 +1,7 @@
 """Functions related to heating or cooling degree days
 """
 import numpy as np
+from scipy import signal
 from energy_demand.geography import weather_station_location as weather_station
 from energy_demand.technologies import diffusion_technologies
 from energy_demand.profiles import load_profile
@@ -72,25 +73,38 @@ def effective_temps(temp_yh, nr_day_to_av):
         nr_day_to_av = 1: 0.840 ()
         nr_day_to_av = 2: 0.865 ()
         nr_day_to_av = 3: 0.878
-    """
-    effective_temp_yh = np.zeros((365, 24))
-
-    # Copy all border days
-    for day in range(nr_day_to_av):
-        effective_temp_yh[day] = temp_yh[day]
-
-    # Iterate days in a year
-    for day in range(365)[nr_day_to_av:]: #Skip first dates in January
-
-        # Add todays temperature and previous effective temps
-        tot_temp = temp_yh[day]
-
-        # Add effective temperature of previous day(s)
-        for i in range(nr_day_to_av):
-            tot_temp = tot_temp + effective_temp_yh[day - (i+1)] #not +=
-
-        effective_temp_yh[day] = tot_temp / (nr_day_to_av + 1)
 
+    The effective temperatures are calculated as linear recursive
+    filter along the days, i.e. for temperatures of several weather
+    stations (stations, nr_of_days, 24) at once.
+    """
+    temp_yh = np.asarray(temp_yh, dtype=float)
+    effective_temp_yh = np.array(temp_yh)
+
+    if nr_day_to_av == 0:
+        return effective_temp_yh
+
+    # Filter coefficients of recursion
+    # effective_temp[day] = (temp[day] + sum(effective_temp[day - i])) / (nr_day_to_av + 1)
+    factor = 1.0 / (nr_day_to_av + 1)
+    filter_b = [factor]
+    filter_a = [1.0] + [-factor] * nr_day_to_av
+
+    # Initial filter state from border days (most recent day first)
+    day_axis = temp_yh.ndim - 2
+    border_days = np.moveaxis(temp_yh[..., nr_day_to_av - 1::-1, :], day_axis, -1)
+    initial_state_basis = np.array([
+        signal.lfiltic(filter_b, filter_a, y=past_day) for past_day in np.eye(nr_day_to_av)])
+    initial_state = np.moveaxis(
+        np.dot(border_days, initial_state_basis), -1, day_axis)
+
+    # Skip first dates in January
+    effective_temp_yh[..., nr_day_to_av:, :], _ = signal.lfilter(
+        filter_b,
+        filter_a,
+        temp_yh[..., nr_day_to_av:, :],
+        axis=day_axis,
+        zi=initial_state)
 
     return effective_temp_yh
 
@@ -111,9 +125,9 @@ def calc_weekend_corr_f(model_yeardays_daytype, wkend_factor):
     --------
     cdd_weekend_f : array
         Factor to multiply cdd calculations for every
-        day in a year
+        modelled day
     """
-    cdd_weekend_f = np.ones((365))
+    cdd_weekend_f = np.ones((len(model_yeardays_daytype)))
 
     for day_nr, day in enumerate(model_yeardays_daytype):
         if day == 'holiday':
@@ -176,31 +190,18 @@ def get_hdd_country(
     data : dict
         Dictionary with data
     """
-    hdd_regions = {}
-
-    for region in regions:
-
-        # Get closest weather station and temperatures
-        closest_station_id = weather_station.get_closest_station(
-            reg_coord[region]['longitude'],
-            reg_coord[region]['latitude'],
-            weather_stations)
-
-        temperatures = temp_data[closest_station_id]
-
-        # Base temperature for base year
-        t_base_heating_cy = sigm_temp(
-            t_base_fy,
-            t_base_cy,
-            base_yr,
-            curr_yr,
-            diff_params)
-
-        hdd_reg = calc_hdd(t_base_heating_cy, temperatures, nr_day_to_av=1)
-
-        hdd_regions[region] = np.sum(hdd_reg)
+    hdd_regions, _ = get_reg_hdd_cdd(
+        base_yr,
+        curr_yr,
+        regions,
+        temp_data,
+        diff_params,
+        [(t_base_fy, t_base_cy)],
+        [],
+        reg_coord,
+        weather_stations)
 
-    return hdd_regions
+    return dict(zip(regions, hdd_regions[0]))
 
 def get_cdd_country(
         base_yr,
@@ -230,34 +231,138 @@ def get_cdd_country(
     t_base_type : str
         Type of base temperature
     """
-    cdd_regions = {}
+    _, cdd_regions = get_reg_hdd_cdd(
+        base_yr,
+        curr_yr,
+        regions,
+        temp_data,
+        diff_params,
+        [],
+        [(t_base_fy, t_base_cy)],
+        reg_coord,
+        weather_stations)
 
-    for region in regions:
-        longitude = reg_coord[region]['longitude']
-        latitude = reg_coord[region]['latitude']
+    return dict(zip(regions, cdd_regions[0]))
 
-        # Get closest weather station and temperatures
-        closest_station_id = weather_station.get_closest_station(
-            longitude,
-            latitude,
-            weather_stations)
+def get_reg_hdd_cdd(
+        base_yr,
+        curr_yr,
+        regions,
+        temp_data,
+        diff_params,
+        t_bases_heating,
+        t_bases_cooling,
+        reg_coord,
+        weather_stations,
+        station_index=None
+    ):
+    """Calculate total number of heating and cooling degree days
+    of all regions for several base temperatures. The closest weather
+    station of every region is only searched once.
 
-        # Temp data
-        temperatures = temp_data[closest_station_id]
+    Arguments
+    ----------
+    base_yr : int
+        Base year
+    curr_yr : int
+        Current year
+    regions : list
+        Regions
+    temp_data : dict
+        Temperatures of weather stations
+    diff_params : dict
+        Sigmoid diffusion parameters of base temperatures
+    t_bases_heating : list
+        Future and base year base temperatures for heating [(t_base_fy, t_base_by)]
+    t_bases_cooling : list
+        Future and base year base temperatures for cooling [(t_base_fy, t_base_by)]
+    reg_coord : dict
+        Coordinates of regions
+    weather_stations : dict
+        Weather stations
+    station_index : WeatherStationIndex, default=None
+        Spatial index of `weather_stations`. Built if not provided
 
-        # Base temperature for base year
-        t_base_heating_cy = sigm_temp(
-            t_base_fy,
-            t_base_cy,
-            base_yr,
-            curr_yr,
-            diff_params)
+    Returns
+    -------
+    hdd_regions : array
+        Heating degree days of every region (heating_bases, regions)
+    cdd_regions : array
+        Cooling degree days of every region (cooling_bases, regions)
+    """
+    t_bases_heating_cy = [
+        sigm_temp(t_base_fy, t_base_by, base_yr, curr_yr, diff_params)
+        for t_base_fy, t_base_by in t_bases_heating]
+    t_bases_cooling_cy = [
+        sigm_temp(t_base_fy, t_base_by, base_yr, curr_yr, diff_params)
+        for t_base_fy, t_base_by in t_bases_cooling]
+
+    # Get closest weather station and temperatures
+    temp_stations_yh, reg_station_nrs = get_closest_station_temps(
+        regions, temp_data, reg_coord, weather_stations, station_index)
+
+    hdd_d, _, cdd_d, _ = calc_hdd_cdd_stations(
+        temp_stations_yh,
+        t_bases_heating_cy,
+        t_bases_cooling_cy,
+        range(temp_stations_yh.shape[1]),
+        nr_day_to_av=1)
+
+    # Annual degree days of the closest station (bases, regions)
+    hdd_regions = np.sum(hdd_d, axis=2)[reg_station_nrs].T
+    cdd_regions = np.sum(cdd_d, axis=2)[reg_station_nrs].T
+
+    return hdd_regions, cdd_regions
+
+def get_closest_station_temps(
+        regions,
+        temp_data,
+        reg_coord,
+        weather_stations,
+        station_index=None
+    ):
+    """Get temperatures of the closest weather station of all regions.
+    The temperatures of every station are only provided once
 
-        cdd_reg = calc_cdd(t_base_heating_cy, temperatures, nr_day_to_av=1)
+    Arguments
+    ----------
+    regions : list
+        Regions
+    temp_data : dict
+        Temperatures of weather stations {station_id: array (365, 24)}
+    reg_coord : dict
+        Coordinates of regions
+    weather_stations : dict
+        Weather stations
+    station_index : WeatherStationIndex, default=None
+        Spatial index of `weather_stations`. Built if not provided
+
+    Returns
+    -------
+    temp_stations_yh : array
+        Temperatures of closest stations (stations, 365, 24)
+    reg_station_nrs : list
+        Position of closest station in `temp_stations_yh` for every region
+    """
+    if station_index is None:
+        station_index = weather_station.WeatherStationIndex(weather_stations)
+
+    station_nrs = {}
+    reg_station_nrs = []
+
+    for region in regions:
+        closest_station_id = station_index.get_closest_station(
+            reg_coord[region]['longitude'],
+            reg_coord[region]['latitude'])
 
-        cdd_regions[region] = np.sum(cdd_reg)
+        if closest_station_id not in station_nrs:
+            station_nrs[closest_station_id] = len(station_nrs)
+        reg_station_nrs.append(station_nrs[closest_station_id])
 
-    return cdd_regions
+    temp_stations_yh = np.array(
+        [temp_data[station_id] for station_id in station_nrs], dtype=float)
+
+    return temp_stations_yh, reg_station_nrs
 
 def sigm_temp(
         t_future_yr,
@@ -397,3 +502,94 @@ def calc_reg_cdd(temperatures, t_base_cooling, model_yeardays):
             1 / len(model_yeardays))
 
     return cdd_d_selection, shape_cdd_d_selection
+
+def calc_hdd_cdd_stations(
+        temp_stations_yh,
+        t_bases_heating,
+        t_bases_cooling,
+        model_yeardays,
+        nr_day_to_av=1
+    ):
+    """Calculate HDD and CDD and daily yd shapes for several weather
+    stations and base temperatures at once. The effective temperatures
+    are only calculated once for all base temperatures.
+
+    Arguments
+    ----------
+    temp_stations_yh : array
+        Temperatures of all stations (stations, nr_of_days, 24)
+    t_bases_heating : array
+        Base temperatures for heating (heating_bases)
+    t_bases_cooling : array
+        Base temperatures for cooling (cooling_bases)
+    model_yeardays : list
+        Modelled yeardays
+    nr_day_to_av : int, default=1
+        Number of previous days to average current day
+
+    Returns
+    -------
+    hdd_d : array
+        Heating degree days for every day (stations, heating_bases, nr_of_days)
+    shape_hdd_d : array
+        Shape of heating days (only selected modelling days)
+        (stations, heating_bases, modelled days)
+    cdd_d : array
+        Cooling degree days for every modelled day
+        (stations, cooling_bases, modelled days)
+    shape_cdd_d : array
+        Shape of cooling days (only selected modelling days)
+        (stations, cooling_bases, modelled days)
+
+    Note
+    ----
+    The results of a station and base temperature are the same as
+    with `calc_reg_hdd` and `calc_reg_cdd`
+    """
+    effective_temp_yh = effective_temps(temp_stations_yh, nr_day_to_av)[:, np.newaxis]
+
+    t_bases_heating = np.asarray(t_bases_heating, dtype=float)[np.newaxis, :, np.newaxis, np.newaxis]
+    t_bases_cooling = np.asarray(t_bases_cooling, dtype=float)[np.newaxis, :, np.newaxis, np.newaxis]
+
+    # Heating degree days
+    temp_diff = (t_bases_heating - effective_temp_yh) / 24
+    temp_diff[temp_diff < 0] = 0
+    hdd_d = np.sum(temp_diff, axis=3)
+
+    # Cooling degree days
+    temp_diff = (effective_temp_yh - t_bases_cooling) / 24
+    temp_diff[temp_diff < 0] = 0
+    cdd_d = np.sum(temp_diff, axis=3)
+
+    shape_hdd_d = abs_to_rel_days(hdd_d)[:, :, model_yeardays]
+    shape_cdd_d = abs_to_rel_days(cdd_d)[:, :, model_yeardays]
+    cdd_d = cdd_d[:, :, model_yeardays]
+
+    # If no cooling degree days, provide flat curve
+    no_cdd = np.sum(cdd_d, axis=2) == 0
+    shape_cdd_d[no_cdd] = 1 / len(model_yeardays)
+
+    return hdd_d, shape_hdd_d, cdd_d, shape_cdd_d
+
+def abs_to_rel_days(days_abs):
+    """Convert absolute daily values to relative values
+    along the last axis (see `load_profile.abs_to_rel`)
+
+    Arguments
+    ----------
+    days_abs : array
+        Absolute values (..., nr_of_days)
+
+    Returns
+    -------
+    days_rel : array
+        Relative values. If the sum over all days
+        is zero, the absolute values are returned
+    """
+    sum_days = np.sum(days_abs, axis=-1, keepdims=True)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_rel = np.where(sum_days != 0, days_abs / sum_days, days_abs)
+    days_rel[np.isnan(days_rel)] = 0
+
+    return days_rel
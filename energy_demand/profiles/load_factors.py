@@ -104,7 +104,7 @@ def peak_shaving_max_min(
 
     return shifted_fuel_yh
 
-def calc_lf_y(fuel_yh, average_fuel_yd):
+def calc_lf_y(fuel_yh, average_fuel_yd, yearday_weights=None):
     """Calculate the yearly load factor for every fueltype
     by dividing the yearly average load by the peak hourly
     load in a year.
@@ -115,6 +115,8 @@ def calc_lf_y(fuel_yh, average_fuel_yd):
         Fuel for every day in year per fueltype
     average_fuel_yd : array
         Average load per day
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
 
     Returns
     -------
@@ -127,7 +129,7 @@ def calc_lf_y(fuel_yh, average_fuel_yd):
         https://en.wikipedia.org/wiki/Load_factor_(electrical)
     """
     # Calculate average yearly fuel per fueltype
-    average_load_y = np.average(average_fuel_yd, axis=1)
+    average_load_y = np.average(average_fuel_yd, axis=1, weights=yearday_weights)
 
     # Calculate maximum hour in every day of a year
     max_load_h_days = np.max(fuel_yh, axis=2)
@@ -140,7 +142,7 @@ def calc_lf_y(fuel_yh, average_fuel_yd):
 
     return load_factor_y
 
-def calc_lf_season(seasons, fuel_region_yh, average_fuel_yd):
+def calc_lf_season(seasons, fuel_region_yh, average_fuel_yd, yearday_weights=None):
     """Calculate load factors per fueltype per region.
     The load factor is calculated based on average
     yearly load and maximum saisonal peak factor.
@@ -153,6 +155,8 @@ def calc_lf_season(seasons, fuel_region_yh, average_fuel_yd):
         Fuels
     average_fuel_yd : array
         Average fuels
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
 
     Returns
     -------
@@ -167,9 +171,15 @@ def calc_lf_season(seasons, fuel_region_yh, average_fuel_yd):
     seasons_lfs = {}
     for season, yeardays_modelled in seasons.items():
 
+        # Season without modelled days
+        if len(yeardays_modelled) == 0:
+            seasons_lfs[season] = np.zeros((fuel_region_yh.shape[0]), dtype=float)
+            continue
+
         average_fuel_yd_full_year = np.average(
             average_fuel_yd[:, ],
-            axis=1)
+            axis=1,
+            weights=yearday_weights)
 
         # Calculate maximum hour in year
         max_load_h_days_season = np.max(
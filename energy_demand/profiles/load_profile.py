@@ -1,5 +1,6 @@
 """Functions related to load profiles
 """
+import copy
 import uuid
 import logging
 import numpy as np
@@ -7,18 +8,41 @@ from energy_demand.profiles import generic_shapes
 from energy_demand.initalisations import helpers
 
 class LoadProfileStock(object):
-    """Collection of load shapes in a list
+    """Collection of load shapes
+
+    The hourly shapes of all load profiles are stored in a single
+    contiguous array (``shapes_yh``, (profiles, yeardays, 24)).
+    The position of a profile in this array is looked up with
+    ``lp_index`` ((enduse, sector, technology): position).
 
     Arguments
     ----------
     name : string
         Load profile stock name
+
+    Note
+    ----
+    The array with the shapes can be moved to shared memory
+    (`export_shared_memory`) or to a memory-mapped file (`export_memmap`).
+    A pickled stock then only contains the name of the shared
+    memory block or file and not the shapes.
+
+    ``profile_offset`` is the position of the first profile of the
+    stock in the profiles of all stocks (set by
+    `fuel_factors.register_profile_stocks`).
     """
     def __init__(self, name):
         self.name = name
         self.load_profiles = {}
-        self.dict_tuple_keys = {}
+        self.profiles = []
+        self.profile_nrs = {}
+        self.lp_index = {}
         self.stock_enduses = set([])
+        self.profile_offset = None
+
+        self.shapes_yh = None
+        self._block_source = None
+        self._shared_memory = None
 
     def add_lp(
             self,
@@ -63,18 +87,32 @@ class LoadProfileStock(object):
         else:
             pass
 
-        self.load_profiles[unique_identifier] = LoadProfile(
+        # Position of profile in array
+        if unique_identifier in self.profile_nrs:
+            profile_nr = self.profile_nrs[unique_identifier]
+        else:
+            profile_nr = len(self.profiles)
+            self.profiles.append(None)
+            self.profile_nrs[unique_identifier] = profile_nr
+
+        self._set_shape_yh(profile_nr, shape_yh)
+
+        load_profile_obj = LoadProfile(
             enduses,
             unique_identifier,
             shape_yd,
             shape_yh,
             f_peak_yd,
             shape_peak_dh)
+        load_profile_obj.assign_to_stock(self, profile_nr)
+
+        self.load_profiles[unique_identifier] = load_profile_obj
+        self.profiles[profile_nr] = load_profile_obj
 
         # Generate lookup dictionary with triple key
-        self.dict_tuple_keys = generate_key_lu_dict(
-            self.dict_tuple_keys,
-            unique_identifier,
+        self.lp_index = generate_key_lu_dict(
+            self.lp_index,
+            profile_nr,
             enduses,
             sectors,
             technologies)
@@ -82,6 +120,85 @@ class LoadProfileStock(object):
         # Update enduses in stock
         self.stock_enduses = get_stock_enduses(self.load_profiles)
 
+    def _set_shape_yh(self, profile_nr, shape_yh):
+        """Copy a shape into the array of all shapes. The
+        array is enlarged (doubled) if it is full.
+
+        Arguments
+        ---------
+        profile_nr : int
+            Position of profile
+        shape_yh : array
+            Shape yh
+        """
+        shape_yh = np.asarray(shape_yh, dtype=float)
+
+        if self.shapes_yh is None:
+            self.shapes_yh = np.zeros((4,) + shape_yh.shape, dtype=float)
+        elif shape_yh.shape != self.shapes_yh.shape[1:]:
+            raise ValueError(
+                "Load profile shape {} does not match shapes of stock {} {}".format(
+                    shape_yh.shape, self.name, self.shapes_yh.shape[1:]))
+
+        if profile_nr >= self.shapes_yh.shape[0] or self._block_source is not None:
+
+            # Enlarge array (and detach from shared memory or file)
+            capacity = max(2 * self.shapes_yh.shape[0], profile_nr + 1)
+            shapes_yh = np.zeros((capacity,) + self.shapes_yh.shape[1:], dtype=float)
+            shapes_yh[:self.shapes_yh.shape[0]] = self.shapes_yh
+            self.shapes_yh = shapes_yh
+            self._block_source = None
+            self._shared_memory = None
+
+        self.shapes_yh[profile_nr] = shape_yh
+
+    def update_shape_yh(self, unique_identifier, shape_yh):
+        """Replace the shape yh of a load profile in the stock
+
+        Arguments
+        ---------
+        unique_identifier : str
+            Name (unique identifier) of load profile
+        shape_yh : array
+            Shape yh (from year to hour)
+        """
+        profile_nr = self.profile_nrs[unique_identifier]
+        self._set_shape_yh(profile_nr, shape_yh)
+
+        # Shape y_dh is calculated again when needed
+        self.profiles[profile_nr]._shape_y_dh = None
+
+    def copy(self):
+        """Copy the stock. The shapes of the copy can
+        be changed without changing the shapes of this stock
+
+        Returns
+        -------
+        stock : LoadProfileStock
+            Copied load profile stock
+
+        Note
+        ----
+        The copy is not registered (``profile_offset``) and
+        does not use shared memory or a file.
+        """
+        stock = LoadProfileStock(self.name)
+        stock.profile_nrs = dict(self.profile_nrs)
+        stock.lp_index = dict(self.lp_index)
+        stock.stock_enduses = list(self.stock_enduses)
+
+        if self.shapes_yh is not None:
+            stock.shapes_yh = np.array(self.shapes_yh[:len(self.profiles)], dtype=float)
+
+        for profile_nr, profile_obj in enumerate(self.profiles):
+            profile_copy = copy.copy(profile_obj)
+            profile_copy.assign_to_stock(stock, profile_nr)
+
+            stock.profiles.append(profile_copy)
+            stock.load_profiles[profile_copy.unique_identifier] = profile_copy
+
+        return stock
+
     def get_lp(self, enduse, sector, technology, shape):
         """Get shape for a certain technology, enduse and sector
 
@@ -100,26 +217,32 @@ class LoadProfileStock(object):
         ------
         Load profile attribute
         """
-        # Get key from lookup dict
-        position_in_dict = self.dict_tuple_keys[(enduse, sector, technology)]
-
-        # Get correct object
-        load_profile_obj = self.load_profiles[position_in_dict]
-
-        return getattr(load_profile_obj, shape)
-        '''if shape == 'shape_yh':
-            return load_profile_obj.shape_yh
-        elif shape == 'shape_yd':
-            return load_profile_obj.shape_yd
-        elif shape == 'shape_y_dh':
-            return load_profile_obj.shape_y_dh
-        elif shape == 'f_peak_yd':
-            return load_profile_obj.f_peak_yd
-        elif shape == 'shape_peak_dh':
-            return load_profile_obj.shape_peak_dh
+        profile_nr = self.lp_index[(enduse, sector, technology)]
+
+        if shape == 'shape_yh':
+            return self.shapes_yh[profile_nr]
         else:
-            logging.critical("Specific load shape is not found in object")
-            return'''
+            return getattr(self.profiles[profile_nr], shape)
+
+    def get_profile_id(self, enduse, sector, technology):
+        """Get position of a profile in the profiles of all
+        registered stocks
+
+        Arguments
+        ----------
+        enduse : str
+            Enduse
+        sector : str
+            Sector
+        technology : str
+            technology
+
+        Return
+        ------
+        profile_id : int
+            Position of profile
+        """
+        return self.profile_offset + self.lp_index[(enduse, sector, technology)]
 
     def get_shape_peak_dh(self, enduse, sector, technology):
         """Get peak_dh shape for a certain technology, enduse and sector
@@ -133,19 +256,105 @@ class LoadProfileStock(object):
         technology : str
             technology
         """
-        position_in_dict = self.dict_tuple_keys[(enduse, sector, technology)]
-        load_profile_obj = self.load_profiles[position_in_dict]
+        profile_nr = self.lp_index[(enduse, sector, technology)]
 
-        # Test if dummy sector and thus shape_peak not provided for different sectors
-        if sector == False:
-            return load_profile_obj.shape_peak_dh
-        else:
-            # CHECK
-            '''if isinstance(load_profile_obj.shape_peak_dh, dict):
-                return load_profile_obj.shape_peak_dh[enduse][sector]['shape_peak_dh']
+        return self.profiles[profile_nr].shape_peak_dh
+
+    def export_shared_memory(self):
+        """Move the array with all shapes to a shared memory block
+
+        Returns
+        -------
+        shared_memory_block : multiprocessing.shared_memory.SharedMemory
+            Shared memory block
+
+        Note
+        ----
+        The block needs to be released with `release_shared_memory`
+        by the creating process once no worker uses it anymore.
+        """
+        from multiprocessing import shared_memory
+
+        shapes_yh = self.shapes_yh[:len(self.profiles)]
+
+        shared_memory_block = shared_memory.SharedMemory(
+            create=True, size=max(shapes_yh.nbytes, 1))
+
+        shared_shapes_yh = np.ndarray(
+            shapes_yh.shape, dtype=float, buffer=shared_memory_block.buf)
+        shared_shapes_yh[:] = shapes_yh
+
+        self.shapes_yh = shared_shapes_yh
+        self._block_source = (
+            'shared_memory', shared_memory_block.name, shapes_yh.shape)
+        self._shared_memory = shared_memory_block
+
+        return shared_memory_block
+
+    def release_shared_memory(self, unlink=True):
+        """Copy the shapes back from shared memory and close
+        the shared memory block
+
+        Arguments
+        ---------
+        unlink : bool, default=True
+            Whether the shared memory block is destroyed
+            (only by the process which created the block)
+        """
+        if self._shared_memory is None:
+            return
+
+        self.shapes_yh = np.array(self.shapes_yh)
+
+        self._shared_memory.close()
+        if unlink:
+            self._shared_memory.unlink()
+
+        self._block_source = None
+        self._shared_memory = None
+
+    def export_memmap(self, path):
+        """Write the array with all shapes to a file which is
+        then read as a memory-mapped array
+
+        Arguments
+        ---------
+        path : str
+            Path to file ('.npy')
+        """
+        np.save(path, self.shapes_yh[:len(self.profiles)])
+
+        self.shapes_yh = np.load(path, mmap_mode='r')
+        self._block_source = ('memmap', path, self.shapes_yh.shape)
+        self._shared_memory = None
+
+    def __getstate__(self):
+        """Do not pickle shapes stored in shared memory or a file
+        """
+        state = self.__dict__.copy()
+
+        if self._block_source is not None:
+            state['shapes_yh'] = None
+            state['_shared_memory'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        """Attach to shared memory or file when unpickled
+        """
+        self.__dict__.update(state)
+
+        if self._block_source is not None:
+            source_type, source_name, shape = self._block_source
+
+            if source_type == 'shared_memory':
+                from multiprocessing import shared_memory
+
+                self._shared_memory = shared_memory.SharedMemory(name=source_name)
+                self.shapes_yh = np.ndarray(
+                    shape, dtype=float, buffer=self._shared_memory.buf)
             else:
-                return load_profile_obj.shape_peak_dh'''
-            return load_profile_obj.shape_peak_dh
+                self.shapes_yh = np.load(source_name, mmap_mode='r')
 
 def generate_key_lu_dict(dict_tuple_keys, unique_identifier, enduses, sectors, technologies):
     """Generate look_up keys to position in 'load_profiles'
@@ -154,8 +363,8 @@ def generate_key_lu_dict(dict_tuple_keys, unique_identifier, enduses, sectors, t
     ----------
     dict_tuple_keys : dict
         Already existing lu keys
-    unique_identifier : string
-        Unique identifier of load shape object
+    unique_identifier : string or int
+        Unique identifier (or position) of load shape object
     enduses : list
         List with enduses
     sectors : list
@@ -214,6 +423,12 @@ class LoadProfile(object):
         Standard value is average daily amount
     shape_peak_dh : array
         Shape (dh), shape of a day for every hour
+
+    Note
+    ----
+    If the load profile is part of a `LoadProfileStock`, the
+    shape yh is read from the array of the stock. ``shape_y_dh``
+    is only calculated when first needed.
     """
     def __init__(
             self,
@@ -229,12 +444,45 @@ class LoadProfile(object):
         self.unique_identifier = unique_identifier
         self.enduses = enduses
         self.shape_yd = shape_yd
-        self.shape_yh = shape_yh
         self.f_peak_yd = f_peak_yd
         self.shape_peak_dh = shape_peak_dh
 
-        # Calculate percentage for every day
-        self.shape_y_dh = calc_y_dh_shape_from_yh(shape_yh)
+        self._shape_yh = shape_yh
+        self._shape_y_dh = None
+        self._stock = None
+        self._profile_nr = None
+
+    def assign_to_stock(self, stock, profile_nr):
+        """Read shape yh from the array of a load profile stock
+
+        Arguments
+        ---------
+        stock : LoadProfileStock
+            Load profile stock
+        profile_nr : int
+            Position of profile in stock
+        """
+        self._stock = stock
+        self._profile_nr = profile_nr
+        self._shape_yh = None
+
+    @property
+    def shape_yh(self):
+        """Shape yh (from year to hour)
+        """
+        if self._stock is None:
+            return self._shape_yh
+        else:
+            return self._stock.shapes_yh[self._profile_nr]
+
+    @property
+    def shape_y_dh(self):
+        """Shape for every day (calculated when first needed)
+        """
+        if self._shape_y_dh is None:
+            self._shape_y_dh = calc_y_dh_shape_from_yh(self.shape_yh)
+
+        return self._shape_y_dh
 
 def calc_y_dh_shape_from_yh(shape_yh):
     """Calculate shape for every day
@@ -295,6 +543,34 @@ def abs_to_rel(absolute_array):
     else:
         return absolute_array
 
+def abs_to_rel_weighted(absolute_array, yearday_weights):
+    """Convert absolute numbers of modelled days to relative numbers.
+    Every day is weighted with the number of days it represents
+
+    Arguments
+    ----------
+    absolute_array : array
+        Contains absolute numbers for every modelled day (days, 24)
+    yearday_weights : array
+        Number of days represented by every modelled day
+
+    Returns
+    -------
+    relative_array : array
+        Relative numbers, the weighted sum is one
+
+    Note
+    ----
+    - If the total sum is zero, return an array with zeros
+    """
+    sum_array = float(np.sum(np.sum(absolute_array, axis=1) * yearday_weights))
+    if sum_array != 0.0:
+        relative_array = absolute_array / sum_array
+        relative_array[np.isnan(relative_array)] = 0
+        return relative_array
+    else:
+        return absolute_array
+
 def calk_peak_h_dh(fuel_peak_dh):
     """Ger peak hour in peak day
 
@@ -0,0 +1,260 @@
+"""Selection of representative days
+
+Instead of all 365 days, only a number of representative days can
+be modelled (``model_yeardays``). The representative days are selected
+with k-medoids clustering of daily features (temperature and load
+shapes). Every representative day has a weight, which is the number
+of days of a year represented by the day.
+"""
+import logging
+import numpy as np
+from scipy.spatial import distance
+
+def get_day_features(temp_data, load_shapes_yd=None, yeardays_daytype=None):
+    """Create standardised daily features to select representative days
+
+    Arguments
+    ----------
+    temp_data : dict
+        Temperatures of weather stations {station: array(365, 24)}
+    load_shapes_yd : list, default=None
+        Load shapes (yd) of enduses (365)
+    yeardays_daytype : array, default=None
+        Daytype ('workday' or 'holiday') of every day
+
+    Returns
+    -------
+    features : array
+        Standardised features of every day (365, features)
+
+    Note
+    ----
+    The temperature features are the daily mean, minimum and
+    maximum of the temperature averaged over all stations.
+    """
+    temp_yh = np.mean(np.array(list(temp_data.values())), axis=0)
+
+    features = [
+        np.mean(temp_yh, axis=1),
+        np.min(temp_yh, axis=1),
+        np.max(temp_yh, axis=1)]
+
+    if load_shapes_yd is not None:
+        for shape_yd in load_shapes_yd:
+            features.append(np.asarray(shape_yd, dtype=float).reshape(365))
+
+    if yeardays_daytype is not None:
+        features.append(np.asarray(yeardays_daytype) == 'holiday')
+
+    features = np.column_stack(features).astype(float)
+
+    # Standardise every feature
+    std_features = np.std(features, axis=0)
+    std_features[std_features == 0] = 1
+
+    return (features - np.mean(features, axis=0)) / std_features
+
+def k_medoids(features, nr_of_clusters, max_iterations=100):
+    """Cluster days with k-medoids (alternating assignment of days
+    and update of medoids)
+
+    Arguments
+    ----------
+    features : array
+        Features of every day (days, features)
+    nr_of_clusters : int
+        Number of clusters
+    max_iterations : int, default=100
+        Maximum number of iterations
+
+    Returns
+    -------
+    medoids : array
+        Day of medoid of every cluster
+    labels : array
+        Cluster of every day
+
+    Note
+    ----
+    The initial medoids are the most central day and then
+    repeatedly the day with the largest distance to all medoids.
+    Extreme days (e.g. the coldest day) are therefore selected
+    and the clustering is deterministic.
+    """
+    distances = distance.cdist(features, features)
+
+    medoids = [int(np.argmin(np.sum(distances, axis=1)))]
+    while len(medoids) < nr_of_clusters:
+        distance_medoids = np.min(distances[:, medoids], axis=1)
+        medoids.append(int(np.argmax(distance_medoids)))
+    medoids = np.array(medoids, dtype=int)
+
+    for _ in range(max_iterations):
+        labels = np.argmin(distances[:, medoids], axis=1)
+
+        new_medoids = np.copy(medoids)
+        for cluster in range(nr_of_clusters):
+            members = np.where(labels == cluster)[0]
+            if len(members) > 0:
+                costs = np.sum(distances[np.ix_(members, members)], axis=1)
+                new_medoids[cluster] = members[np.argmin(costs)]
+
+        if np.array_equal(new_medoids, medoids):
+            break
+        medoids = new_medoids
+
+    labels = np.argmin(distances[:, medoids], axis=1)
+
+    return medoids, labels
+
+def select_representative_days(features, nr_of_days, max_iterations=100):
+    """Select representative days and their weights
+
+    Arguments
+    ----------
+    features : array
+        Features of every day (365, features)
+    nr_of_days : int
+        Number of representative days
+    max_iterations : int, default=100
+        Maximum number of iterations of clustering
+
+    Returns
+    -------
+    model_yeardays : list
+        Representative yeardays (sorted)
+    yearday_weights : array
+        Number of days represented by every representative day
+    yearday_positions : array
+        For every day of the year the position of its
+        representative day in `model_yeardays`
+    """
+    medoids, labels = k_medoids(features, nr_of_days, max_iterations)
+
+    order = np.argsort(medoids)
+    model_yeardays = [int(yearday) for yearday in medoids[order]]
+
+    yearday_weights = np.bincount(labels, minlength=nr_of_days)[order].astype(float)
+
+    # Position of cluster in sorted representative days
+    cluster_positions = np.zeros((nr_of_days), dtype=int)
+    cluster_positions[order] = np.arange(nr_of_days)
+    yearday_positions = cluster_positions[labels]
+
+    return model_yeardays, yearday_weights, yearday_positions
+
+def calc_selection_error(values_yd, model_yeardays, yearday_weights):
+    """Calculate the error of the representative days
+    for a daily value (e.g. heating degree days)
+
+    Arguments
+    ----------
+    values_yd : array
+        Value of every day (365)
+    model_yeardays : list
+        Representative yeardays
+    yearday_weights : array
+        Weight of every representative day
+
+    Returns
+    -------
+    annual_error : float
+        Relative error of the weighted annual sum
+    peak_error : float
+        Relative error of the maximum daily value
+    """
+    values_yd = np.asarray(values_yd, dtype=float)
+    values_selection = values_yd[model_yeardays]
+
+    annual = np.sum(values_yd)
+    peak = np.max(values_yd)
+
+    if annual == 0:
+        annual_error = 0.0
+    else:
+        annual_error = (np.sum(values_selection * yearday_weights) - annual) / annual
+
+    if peak == 0:
+        peak_error = 0.0
+    else:
+        peak_error = (np.max(values_selection) - peak) / peak
+
+    return annual_error, peak_error
+
+def get_seasons_model_yeardays(seasons, model_yeardays):
+    """Get the positions of the modelled days of every season
+
+    Arguments
+    ----------
+    seasons : dict
+        Yeardays of every season
+    model_yeardays : list
+        Modelled yeardays
+
+    Returns
+    -------
+    seasons_model_yeardays : dict
+        Positions in `model_yeardays` of every season
+    """
+    seasons_model_yeardays = {}
+    for season, yeardays in seasons.items():
+        yeardays = set(yeardays)
+        seasons_model_yeardays[season] = [
+            position for position, yearday in enumerate(model_yeardays) if yearday in yeardays]
+
+    return seasons_model_yeardays
+
+def log_selection_error(temp_data, model_yeardays, yearday_weights, t_base_heating=15.5):
+    """Log the error of the representative days for the
+    heating degree days averaged over all weather stations
+
+    Arguments
+    ----------
+    temp_data : dict
+        Temperatures of weather stations {station: array(365, 24)}
+    model_yeardays : list
+        Representative yeardays
+    yearday_weights : array
+        Weight of every representative day
+    t_base_heating : float, default=15.5
+        Base temperature
+
+    Returns
+    -------
+    annual_error : float
+        Relative error of the annual heating degree days
+    peak_error : float
+        Relative error of the maximum daily heating degree days
+    """
+    temp_yd = np.mean(np.mean(np.array(list(temp_data.values())), axis=0), axis=1)
+    hdd_yd = np.maximum(t_base_heating - temp_yd, 0)
+
+    annual_error, peak_error = calc_selection_error(hdd_yd, model_yeardays, yearday_weights)
+
+    logging.info(
+        "... %s representative days: error annual HDD %.4f, error peak HDD %.4f",
+        len(model_yeardays), annual_error, peak_error)
+
+    return annual_error, peak_error
+
+def calc_annual_fuel(fuel_yh, yearday_weights=None):
+    """Calculate annual fuel of modelled days
+
+    Arguments
+    ----------
+    fuel_yh : array
+        Fuel of modelled days (..., model_yeardays_nrs, 24)
+    yearday_weights : array, default=None
+        Number of days represented by every modelled day
+
+    Returns
+    -------
+    fuel_y : array
+        Annual fuel (...)
+    """
+    fuel_yd = np.sum(fuel_yh, axis=-1)
+
+    if yearday_weights is None:
+        return np.sum(fuel_yd, axis=-1)
+    else:
+        return np.dot(fuel_yd, yearday_weights)
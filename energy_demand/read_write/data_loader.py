@@ -231,6 +231,8 @@ def load_local_paths(path):
             path, '_processed_data', '_post_installation_data', 'load_profiles'),
         'dir_disaggregated': os.path.join(
             path, '_processed_data', '_post_installation_data', 'disaggregated'),
+        'dir_scenario_init_cache': os.path.join(
+            path, '_processed_data', '_post_installation_data', 'scenario_init_cache'),
         'rs_load_profile_txt': os.path.join(
             path, '_processed_data', '_post_installation_data', 'load_profiles', 'rs_submodel'),
         'ss_load_profile_txt': os.path.join(
@@ -7,9 +7,11 @@ import os
 import csv
 import logging
 from collections import defaultdict
+from collections.abc import Mapping
 import numpy as np
 from energy_demand.technologies import tech_related
 from energy_demand.profiles import load_profile
+from energy_demand.read_write import result_store
 from energy_demand.scripts import init_scripts
 
 class TechnologyData(object):
@@ -210,7 +212,102 @@ class ServiceSwitch(object):
         """
         setattr(self, name, value)
 
-def read_in_results(path_runs, seasons, model_yeardays_daytype):
+class LazyResults(Mapping):
+    """Results stored in '.npy' files. A file is only
+    opened (memory-mapped) when its results are accessed
+
+    Arguments
+    ---------
+    paths : dict
+        Path to file of every key (e.g. year)
+    mmap_mode : str, default='r'
+        Memory-map mode (see `numpy.load`)
+
+    Note
+    ----
+    Can be used as a (read-only) dictionary. Keys are sorted.
+    """
+    def __init__(self, paths, mmap_mode='r'):
+        self.paths = dict(sorted(paths.items()))
+        self.mmap_mode = mmap_mode
+
+    def __getitem__(self, key):
+        return np.load(self.paths[key], mmap_mode=self.mmap_mode)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get_fueltype(self, key, fueltype):
+        """Get results of a single fueltype
+
+        Arguments
+        ---------
+        key : any
+            Key (e.g. year)
+        fueltype : int
+            Fueltype
+
+        Returns
+        -------
+        results : array
+            Results of fueltype (only read from file)
+        """
+        return self[key][fueltype]
+
+class StoreResults(Mapping):
+    """Results stored in a `ResultStore`. The results of
+    a year are only read when they are accessed
+
+    Arguments
+    ---------
+    store : ResultStore
+        Result store
+    name : str
+        Name of result
+
+    Note
+    ----
+    Can be used as a (read-only) dictionary with
+    the simulation years as keys.
+    """
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self.sim_yrs = store.get_sim_yrs(name)
+
+    def __getitem__(self, key):
+        if key not in self.sim_yrs:
+            raise KeyError(key)
+        return self.store.read(key, self.name)
+
+    def __iter__(self):
+        return iter(self.sim_yrs)
+
+    def __len__(self):
+        return len(self.sim_yrs)
+
+    def get_fueltype(self, key, fueltype):
+        """Get results of a single fueltype
+
+        Arguments
+        ---------
+        key : int
+            Simulation year
+        fueltype : int
+            Fueltype
+
+        Returns
+        -------
+        results : array
+            Results of fueltype (only the files of
+            the fueltype are read)
+        """
+        return self.store.read(key, self.name, fueltype_nr=fueltype)
+
+def read_in_results(path_runs, seasons, model_yeardays_daytype, mmap_mode=None):
     """Read and post calculate results from txt files
     and store into container
 
@@ -222,6 +319,9 @@ def read_in_results(path_runs, seasons, model_yeardays_daytype):
         seasons
     model_yeardays_daytype : dict
         Daytype of modelled yeardays
+    mmap_mode : str, default=None
+        If provided (e.g. 'r'), the results are not read in
+        but memory-mapped when accessed (see `LazyResults`)
     """
     logging.info("... Reading in results")
 
@@ -231,41 +331,52 @@ def read_in_results(path_runs, seasons, model_yeardays_daytype):
     # Fuels
     # -------------
     results_container['results_enduse_every_year'] = read_enduse_specific_results(
-        path_runs)
+        path_runs, mmap_mode)
 
-    results_container['results_every_year'] = read_results_yh(path_runs)
+    results_container['results_every_year'] = read_results_yh(path_runs, mmap_mode)
 
     # -------------
     # Load factors
     # -------------
     results_container['load_factors_y'] = read_lf_y(
-        os.path.join(path_runs, "result_reg_load_factor_y"))
+        os.path.join(path_runs, "result_reg_load_factor_y"), mmap_mode)
     results_container['load_factors_yd'] = read_lf_y(
-        os.path.join(path_runs, "result_reg_load_factor_yd"))
+        os.path.join(path_runs, "result_reg_load_factor_yd"), mmap_mode)
 
     results_container['load_factor_seasons'] = {}
     results_container['load_factor_seasons']['winter'] = read_lf_y(
-        os.path.join(path_runs, "result_reg_load_factor_winter"))
+        os.path.join(path_runs, "result_reg_load_factor_winter"), mmap_mode)
     results_container['load_factor_seasons']['spring'] = read_lf_y(
-        os.path.join(path_runs, "result_reg_load_factor_spring"))
+        os.path.join(path_runs, "result_reg_load_factor_spring"), mmap_mode)
     results_container['load_factor_seasons']['summer'] = read_lf_y(
-        os.path.join(path_runs, "result_reg_load_factor_summer"))
+        os.path.join(path_runs, "result_reg_load_factor_summer"), mmap_mode)
     results_container['load_factor_seasons']['autumn'] = read_lf_y(
-        os.path.join(path_runs, "result_reg_load_factor_autumn"))
+        os.path.join(path_runs, "result_reg_load_factor_autumn"), mmap_mode)
 
     # -------------
     # Post-calculations
     # -------------
     # Calculate average per season and fueltype for every fueltype
+    if mmap_mode:
+        region_block_size = 50
+    else:
+        region_block_size = None
+
     results_container['av_season_daytype_cy'], results_container['season_daytype_cy'] = calc_av_per_season_fueltype(
         results_container['results_every_year'],
         seasons,
-        model_yeardays_daytype)
+        model_yeardays_daytype,
+        region_block_size)
 
     logging.info("... Reading in results finished")
     return results_container
 
-def calc_av_per_season_fueltype(results_every_year, seasons, model_yeardays_daytype):
+def calc_av_per_season_fueltype(
+        results_every_year,
+        seasons,
+        model_yeardays_daytype,
+        region_block_size=None
+    ):
     """Calculate average demand per season and fueltype for every fueltype
 
     Arguments
@@ -276,6 +387,9 @@ def calc_av_per_season_fueltype(results_every_year, seasons, model_yeardays_dayt
         Seasons
     model_yeardays_daytype : list
         Daytype of modelled days
+    region_block_size : int, default=None
+        If provided, regions are summed in blocks of regions. Only a
+        single block is then read at a time from memory-mapped results
 
     Returns
     -------
@@ -292,7 +406,10 @@ def calc_av_per_season_fueltype(results_every_year, seasons, model_yeardays_dayt
         for fueltype, reg_fuels in enumerate(fueltypes_data):
 
             # Summarise across regions
-            tot_all_reg_fueltype = np.sum(reg_fuels, axis=0)
+            if region_block_size is None:
+                tot_all_reg_fueltype = np.sum(reg_fuels, axis=0)
+            else:
+                tot_all_reg_fueltype = sum_regions_in_blocks(reg_fuels, region_block_size)
 
             tot_all_reg_fueltype_reshape = tot_all_reg_fueltype.reshape((365, 24))
 
@@ -306,27 +423,65 @@ def calc_av_per_season_fueltype(results_every_year, seasons, model_yeardays_dayt
 
     return dict(av_season_daytype_cy), dict(season_daytype_cy)
 
-def read_results_yh(path_to_folder):
+def sum_regions_in_blocks(reg_fuels, region_block_size):
+    """Sum results over regions, block of regions by block
+
+    Arguments
+    ---------
+    reg_fuels : array
+        Results (regions, ...)
+    region_block_size : int
+        Number of regions summed at once
+
+    Returns
+    -------
+    tot_fuels : array
+        Sum over all regions
+    """
+    tot_fuels = np.zeros(reg_fuels.shape[1:], dtype=float)
+
+    for first_reg_nr in range(0, reg_fuels.shape[0], region_block_size):
+        tot_fuels += np.sum(
+            reg_fuels[first_reg_nr:first_reg_nr + region_block_size], axis=0)
+
+    return tot_fuels
+
+def read_results_yh(path_to_folder, mmap_mode=None):
     """Read results
 
     Arguments
     ---------
-    fueltypes_nr : int
-        Number of fueltypes
-    reg_nrs : int
-        Number of regions
     path_to_folder : str
         Path to folder
+    mmap_mode : str, default=None
+        If provided, files are memory-mapped when accessed
 
     Returns
     -------
     results = dict
         Results
+
+    Note
+    ----
+    If the results were written to the chunked result store
+    (folder 'result_store') instead of '.npy' files, the
+    results are read from the store. With ``mmap_mode``, the
+    results of a year are only read when accessed (see `StoreResults`)
     """
     results = {}
 
+    path_store = os.path.join(path_to_folder, 'result_store')
     path_to_folder = os.path.join(path_to_folder, 'result_tot_yh')
 
+    if not os.path.isdir(path_to_folder) and os.path.isdir(path_store):
+        store_results = StoreResults(
+            result_store.load_result_store(path_store), 'ed_fueltype_regs_yh')
+
+        if mmap_mode:
+            return store_results
+        else:
+            return dict(store_results.items())
+
     all_txt_files_in_folder = os.listdir(path_to_folder)
 
     # Iterate files in folder
@@ -336,20 +491,47 @@ def read_results_yh(path_to_folder):
             file_path_split = file_path.split("__")
             year = int(file_path_split[1])
 
-            results[year] = np.load(path_file_to_read)
+            results[year] = path_file_to_read
 
         except IndexError:
             pass #path is a folder and not a file
 
-    return results
+    return load_results(results, mmap_mode)
+
+def load_results(paths, mmap_mode=None):
+    """Load results from '.npy' files
+
+    Arguments
+    ---------
+    paths : dict
+        Path to file of every key
+    mmap_mode : str, default=None
+        If provided, files are memory-mapped when
+        accessed (see `LazyResults`)
 
-def read_max_results(path):
+    Returns
+    -------
+    results : dict or LazyResults
+        Results
+    """
+    if mmap_mode:
+        return LazyResults(paths, mmap_mode)
+    else:
+        results = {}
+        for key, path_file in paths.items():
+            results[key] = np.load(path_file)
+
+        return results
+
+def read_max_results(path, mmap_mode=None):
     """Read max results
 
     Arguments
     ---------
     path : str
         Path to folder
+    mmap_mode : str, default=None
+        If provided, files are memory-mapped when accessed
     """
     results = {}
     all_txt_files_in_folder = os.listdir(path)
@@ -361,17 +543,19 @@ def read_max_results(path):
         year = int(file_path_split[1])
 
         # Add year if not already exists
-        results[year] = np.load(path_file_to_read)
+        results[year] = path_file_to_read
 
-    return results
+    return load_results(results, mmap_mode)
 
-def read_enduse_specific_results(path_to_folder):
+def read_enduse_specific_results(path_to_folder, mmap_mode=None):
     """Read enduse specific results
 
     Arguments
     ---------
     path_to_folder : str
         Folder path
+    mmap_mode : str, default=None
+        If provided, files are memory-mapped when accessed
     """
     results = defaultdict(dict)
 
@@ -388,9 +572,13 @@ def read_enduse_specific_results(path_to_folder):
         enduse = file_path_split[1]
         year = int(file_path_split[2])
 
-        results[year][enduse] = np.load(path_file_to_read)
+        results[year][enduse] = path_file_to_read
+
+    results_enduses = {}
+    for year in sorted(results):
+        results_enduses[year] = load_results(results[year], mmap_mode)
 
-    return dict(results)
+    return results_enduses
 
 def load_script_data(data):
     """Load data generated by scripts
@@ -956,13 +1144,15 @@ def read_fuel_is(path_to_csv, fueltypes_nr, fueltypes):
 
     return fuels, list(sectors), list(enduses)
 
-def read_lf_y(result_path):
+def read_lf_y(result_path, mmap_mode=None):
     """Read load factors from .npy file
 
     Arguments
     ----------
     result_path : str
         Path
+    mmap_mode : str, default=None
+        If provided, files are memory-mapped when accessed
 
     Returns
     -------
@@ -978,17 +1168,19 @@ def read_lf_y(result_path):
         file_path_split = file_path.split("__")
         year = int(file_path_split[1])
 
-        results[year] = np.load(path_file_to_read)
+        results[year] = path_file_to_read
 
-    return results
+    return load_results(results, mmap_mode)
 
-def read_scenaric_population_data(result_path):
+def read_scenaric_population_data(result_path, mmap_mode=None):
     """Read population data
 
     Arguments
     ---------
     result_path : str
         Path
+    mmap_mode : str, default=None
+        If provided, files are memory-mapped when accessed
 
     Returns
     -------
@@ -1008,9 +1200,9 @@ def read_scenaric_population_data(result_path):
         year = int(file_path_split[1])
 
         # Add year if not already exists
-        results[year] = np.load(path_file_to_read)
+        results[year] = path_file_to_read
 
-    return results
+    return load_results(results, mmap_mode)
 
 def read_capacity_switch(path_to_csv, base_yr=2015):
     """This function reads in service assumptions
@@ -41,13 +41,17 @@ def read_weather_station_script_data(path_to_csv):
 
     return dict(temp_stations)
 
-def read_weather_data_script_data(path_to_csv):
-    """Read in weather data from script data
+def read_weather_data_script_data(path_to_csv, mmap_mode='c'):
+    """Read in weather data from script data. If the weather
+    data are stored as '.npy' file, the file is memory-mapped
 
     Arguments
     ----------
     path_to_csv : str
         Path
+    mmap_mode : str, default='c'
+        Memory-map mode of '.npy' file (None: load into memory).
+        With 'c' (copy-on-write), changes are not written to the file
 
     Returns
     -------
@@ -55,7 +59,19 @@ def read_weather_data_script_data(path_to_csv):
         Temperature yh per weater station
     """
     temp_data = {}
-    all_txt_files_in_folder = os.listdir(path_to_csv)
+
+    path_npy = os.path.join(path_to_csv, "temp_stations_yh.npy")
+    if os.path.isfile(path_npy):
+        temp_stations_yh = np.load(path_npy, mmap_mode=mmap_mode)
+        station_ids = np.load(os.path.join(path_to_csv, "temp_station_ids.npy"))
+
+        for station_nr, station_id in enumerate(station_ids):
+            temp_data[str(station_id)] = temp_stations_yh[station_nr]
+
+        return temp_data
+
+    all_txt_files_in_folder = [
+        file_name for file_name in os.listdir(path_to_csv) if file_name.startswith("tempdata__")]
 
     for file_path in all_txt_files_in_folder:
         path_file_to_read = os.path.join(path_to_csv, file_path)
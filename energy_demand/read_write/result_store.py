@@ -0,0 +1,350 @@
+"""Chunked and compressed storage of regional results
+
+Results are stored per simulation year, fueltype and block of regions
+as compressed numpy files (``.npz``)::
+
+    <name>__<sim_yr>__<fueltype>__<block_nr>.npz
+
+Results of single regions can be written as soon as a region is
+simulated. Only the regions of incomplete blocks are kept in memory.
+Single regions or fueltypes can be read without loading all results.
+"""
+import os
+import json
+import logging
+import numpy as np
+from energy_demand.basic import basic_functions
+
+class ResultStore(object):
+    """Chunked result store
+
+    Arguments
+    ----------
+    path : str
+        Folder of result store
+    reg_nrs : int
+        Number of regions
+    region_block_size : int, default=50
+        Number of regions stored in one file
+
+    Note
+    ----
+    The results of a region are provided as array with fueltypes
+    as first dimension (fueltypes, ...), e.g. (fueltypes, hours).
+    """
+    def __init__(self, path, reg_nrs, region_block_size=50):
+        self.path = path
+        self.reg_nrs = reg_nrs
+        self.region_block_size = region_block_size
+
+        # Regions which are not yet written {(name, sim_yr, block_nr): array}
+        self.buffers = {}
+        self.buffered_regions = {}
+
+        basic_functions.create_folder(path)
+
+        path_meta = os.path.join(path, "result_store.json")
+        if os.path.isfile(path_meta):
+            with open(path_meta, 'r') as file_handle:
+                self.meta = json.load(file_handle)
+            if self.meta['reg_nrs'] != reg_nrs or self.meta['region_block_size'] != region_block_size:
+                raise ValueError(
+                    "Result store {} was created with other regions or region blocks".format(path))
+        else:
+            self.meta = {
+                'reg_nrs': reg_nrs,
+                'region_block_size': region_block_size,
+                'results': {}}
+
+    def get_block_regions(self, block_nr):
+        """Get first region and number of regions of a block
+
+        Arguments
+        ----------
+        block_nr : int
+            Block number
+
+        Returns
+        -------
+        first_reg_nr : int
+            Region array number of first region in block
+        block_reg_nrs : int
+            Number of regions in block
+        """
+        first_reg_nr = block_nr * self.region_block_size
+        block_reg_nrs = min(self.region_block_size, self.reg_nrs - first_reg_nr)
+
+        return first_reg_nr, block_reg_nrs
+
+    def write_region(self, sim_yr, name, reg_array_nr, fuel_region):
+        """Add results of a single region. A block is written
+        to disk as soon as all regions of the block are added
+
+        Arguments
+        ----------
+        sim_yr : int
+            Simulation year
+        name : str
+            Name of result
+        reg_array_nr : int
+            Region array number
+        fuel_region : array
+            Results of region (fueltypes, ...)
+        """
+        block_nr = reg_array_nr // self.region_block_size
+        first_reg_nr, block_reg_nrs = self.get_block_regions(block_nr)
+        key = (name, sim_yr, block_nr)
+
+        try:
+            buffer_block = self.buffers[key]
+        except KeyError:
+            buffer_block = np.zeros(
+                (block_reg_nrs, ) + fuel_region.shape, dtype=fuel_region.dtype)
+            self.buffers[key] = buffer_block
+            self.buffered_regions[key] = set([])
+
+        buffer_block[reg_array_nr - first_reg_nr] = fuel_region
+        self.buffered_regions[key].add(reg_array_nr)
+
+        if len(self.buffered_regions[key]) == block_reg_nrs:
+            self._write_block(key)
+
+    def write_results(self, sim_yr, name, results):
+        """Add results of all regions
+
+        Arguments
+        ----------
+        sim_yr : int
+            Simulation year
+        name : str
+            Name of result
+        results : array
+            Results (fueltypes, regions, ...)
+        """
+        for reg_array_nr in range(self.reg_nrs):
+            self.write_region(sim_yr, name, reg_array_nr, results[:, reg_array_nr])
+
+    def _write_block(self, key):
+        """Write a block of regions to disk (one file per fueltype)
+
+        Arguments
+        ----------
+        key : tuple
+            Name, simulation year and block number
+        """
+        name, sim_yr, block_nr = key
+        buffer_block = self.buffers.pop(key)
+        del self.buffered_regions[key]
+
+        for fueltype_nr in range(buffer_block.shape[1]):
+            np.savez_compressed(
+                self.get_path_chunk(name, sim_yr, fueltype_nr, block_nr),
+                data=buffer_block[:, fueltype_nr])
+
+        # Update meta information
+        meta_result = self.meta['results'].setdefault(name, {})
+        meta_result['fueltypes_nr'] = buffer_block.shape[1]
+        meta_result['shape'] = list(buffer_block.shape[2:])
+        meta_result['dtype'] = str(buffer_block.dtype)
+        if sim_yr not in meta_result.setdefault('sim_yrs', []):
+            meta_result['sim_yrs'].append(sim_yr)
+            meta_result['sim_yrs'].sort()
+
+        self._write_meta()
+
+    def _write_meta(self):
+        """Write meta information of store
+        """
+        with open(os.path.join(self.path, "result_store.json"), 'w') as file_handle:
+            json.dump(self.meta, file_handle)
+
+    def flush(self):
+        """Write all incomplete blocks to disk. Regions which
+        were not added are stored as zeros
+        """
+        for key in list(self.buffers.keys()):
+            logging.info("... write incomplete result block %s", key)
+            self._write_block(key)
+
+    def get_path_chunk(self, name, sim_yr, fueltype_nr, block_nr):
+        """Get path of file of a chunk
+
+        Arguments
+        ----------
+        name : str
+            Name of result
+        sim_yr : int
+            Simulation year
+        fueltype_nr : int
+            Fueltype
+        block_nr : int
+            Block number
+
+        Returns
+        -------
+        path_chunk : str
+            Path to file
+        """
+        return os.path.join(
+            self.path,
+            "{}__{}__{}__{}.npz".format(name, sim_yr, fueltype_nr, block_nr))
+
+    def read(self, sim_yr, name, fueltype_nr=None, reg_array_nrs=None):
+        """Read results. Only the files containing the
+        selected fueltypes and regions are loaded
+
+        Arguments
+        ----------
+        sim_yr : int
+            Simulation year
+        name : str
+            Name of result
+        fueltype_nr : int, default=None
+            Fueltype to read. If None, all fueltypes are read
+        reg_array_nrs : list, default=None
+            Region array numbers to read. If None, all regions are read
+
+        Returns
+        -------
+        results : array
+            Results (fueltypes, regions, ...) or (regions, ...)
+            if a single fueltype is read
+        """
+        meta_result = self.meta['results'][name]
+
+        if reg_array_nrs is None:
+            reg_array_nrs = range(self.reg_nrs)
+        reg_array_nrs = np.asarray(reg_array_nrs, dtype=int)
+
+        if fueltype_nr is None:
+            fueltype_nrs = range(meta_result['fueltypes_nr'])
+        else:
+            fueltype_nrs = [fueltype_nr]
+
+        results = np.zeros(
+            (len(fueltype_nrs), len(reg_array_nrs)) + tuple(meta_result['shape']),
+            dtype=meta_result['dtype'])
+
+        block_nrs = reg_array_nrs // self.region_block_size
+
+        for block_nr in np.unique(block_nrs):
+            first_reg_nr, _ = self.get_block_regions(block_nr)
+            positions = np.where(block_nrs == block_nr)[0]
+
+            for position_fueltype, fueltype in enumerate(fueltype_nrs):
+                with np.load(self.get_path_chunk(name, sim_yr, fueltype, block_nr)) as chunk:
+                    block = chunk['data']
+                results[position_fueltype, positions] = block[reg_array_nrs[positions] - first_reg_nr]
+
+        if fueltype_nr is None:
+            return results
+        else:
+            return results[0]
+
+    def get_sim_yrs(self, name):
+        """Get simulation years of which results are stored
+
+        Arguments
+        ----------
+        name : str
+            Name of result
+
+        Returns
+        -------
+        sim_yrs : list
+            Simulation years (sorted)
+        """
+        try:
+            return list(self.meta['results'][name]['sim_yrs'])
+        except KeyError:
+            return []
+
+def load_result_store(path):
+    """Open an existing result store
+
+    Arguments
+    ----------
+    path : str
+        Folder of result store
+
+    Returns
+    -------
+    store : ResultStore
+        Result store with the regions and region blocks
+        it was created with
+    """
+    with open(os.path.join(path, "result_store.json"), 'r') as file_handle:
+        meta = json.load(file_handle)
+
+    return ResultStore(path, meta['reg_nrs'], meta['region_block_size'])
+
+class ScenarioResultStore(object):
+    """Result stores of several scenarios. The results of
+    every scenario and simulation year are stored in a separate
+    `ResultStore` (folder ``<scenario_name>/<sim_yr>``), so that
+    the results of a scenario and year can be written by any process
+
+    Arguments
+    ----------
+    path : str
+        Folder of scenario result store
+    reg_nrs : int
+        Number of regions
+    region_block_size : int, default=50
+        Number of regions stored in one file
+    """
+    def __init__(self, path, reg_nrs, region_block_size=50):
+        self.path = path
+        self.reg_nrs = reg_nrs
+        self.region_block_size = region_block_size
+
+        basic_functions.create_folder(path)
+
+    def get_store(self, scenario_name, sim_yr):
+        """Get result store of a scenario and simulation year
+
+        Arguments
+        ----------
+        scenario_name : str
+            Name of scenario
+        sim_yr : int
+            Simulation year
+
+        Returns
+        -------
+        store : ResultStore
+            Result store
+        """
+        # Folder may be created by several processes at the same time
+        path_scenario = os.path.join(self.path, str(scenario_name))
+        os.makedirs(path_scenario, exist_ok=True)
+
+        return ResultStore(
+            os.path.join(path_scenario, str(sim_yr)),
+            self.reg_nrs,
+            self.region_block_size)
+
+    def read(self, scenario_name, sim_yr, name, fueltype_nr=None, reg_array_nrs=None):
+        """Read results of a scenario (see `ResultStore.read`)
+
+        Arguments
+        ----------
+        scenario_name : str
+            Name of scenario
+        sim_yr : int
+            Simulation year
+        name : str
+            Name of result
+        fueltype_nr : int, default=None
+            Fueltype to read. If None, all fueltypes are read
+        reg_array_nrs : list, default=None
+            Region array numbers to read. If None, all regions are read
+
+        Returns
+        -------
+        results : array
+            Results (fueltypes, regions, ...) or (regions, ...)
+            if a single fueltype is read
+        """
+        return self.get_store(scenario_name, sim_yr).read(
+            sim_yr, name, fueltype_nr, reg_array_nrs)
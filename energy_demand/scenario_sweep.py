@@ -0,0 +1,294 @@
+"""Run many scenarios which only differ in their strategy variables
+
+The base data (fuels, load profiles, temperatures, script data and
+year invariant inputs) is loaded once. Every (scenario, simulation year)
+is a task which is simulated in a pool of worker processes. With the
+'fork' start method, the workers share the base data with the parent
+process (copy-on-write). The hourly regional results of every task are
+written to a `ScenarioResultStore`.
+
+Inputs which depend on the strategy variables (technologies and, with
+spatially explicit diffusion, regional strategy variables) are derived
+again for every task.
+"""
+import copy
+import logging
+import multiprocessing
+from energy_demand import model
+from energy_demand.assumptions import non_param_assumptions
+from energy_demand.geography import spatial_diffusion
+from energy_demand.read_write import result_store
+
+def get_scenario_strategy_variables(strategy_variables, scenario_values):
+    """Get strategy variables of a scenario
+
+    Arguments
+    ----------
+    strategy_variables : dict
+        Strategy variables of base scenario
+    scenario_values : dict
+        Scenario values of strategy variables which are changed
+        in scenario {strategy_variable: scenario_value}
+
+    Returns
+    -------
+    scenario_strategy_variables : dict
+        Strategy variables of scenario
+    """
+    scenario_strategy_variables = dict(strategy_variables)
+
+    for strategy_variable, scenario_value in scenario_values.items():
+        try:
+            scenario_strategy_variables[strategy_variable] = dict(
+                strategy_variables[strategy_variable])
+        except KeyError:
+            raise KeyError(
+                "Strategy variable {} is not defined".format(strategy_variable))
+
+        scenario_strategy_variables[strategy_variable]['scenario_value'] = scenario_value
+
+    return scenario_strategy_variables
+
+def get_sweep_tasks(scenarios, simulated_yrs):
+    """Get all tasks of a sweep
+
+    Arguments
+    ----------
+    scenarios : dict
+        Scenario values of every scenario {scenario_name: scenario_values}
+    simulated_yrs : list
+        Simulated years
+
+    Returns
+    -------
+    tasks : list
+        Scenario name and simulation year of every task
+    """
+    tasks = []
+    for scenario_name in scenarios:
+        for sim_yr in simulated_yrs:
+            tasks.append((scenario_name, sim_yr))
+
+    return tasks
+
+def get_scenario_regional_strategy_variables(data, strategy_variables, spatially_modelled_vars):
+    """Calculate regional strategy variables of a scenario
+
+    Arguments
+    ----------
+    data : dict
+        Base data container
+    strategy_variables : dict
+        Strategy variables of scenario
+    spatially_modelled_vars : list
+        Strategy variables which are spatially modelled
+
+    Returns
+    -------
+    regional_strategy_variables : RegionalStrategyVariables
+        Strategy variables of all regions
+    """
+    fuel_disagg = {
+        'rs_fuel_disagg': data['rs_fuel_disagg'],
+        'ss_fuel_disagg': data['ss_fuel_disagg'],
+        'is_fuel_disagg': data['is_fuel_disagg']}
+
+    f_reg, f_reg_norm, f_reg_norm_abs = spatial_diffusion.calc_spatially_diffusion_factors(
+        regions=data['regions'],
+        fuel_disagg=fuel_disagg,
+        real_values=data['pop_density'],
+        speed_con_max=1.0)
+
+    return spatial_diffusion.calc_regional_strategy_variables(
+        data['regions'],
+        strategy_variables,
+        spatially_modelled_vars,
+        fuel_disagg,
+        f_reg,
+        f_reg_norm,
+        f_reg_norm_abs)
+
+def simulate_scenario_year(
+        scenario_name,
+        sim_yr,
+        scenario_values,
+        data,
+        assumptions,
+        year_invariant,
+        scenario_store=None
+    ):
+    """Simulate a single scenario and simulation year
+
+    Arguments
+    ----------
+    scenario_name : str
+        Name of scenario
+    sim_yr : int
+        Simulation year
+    scenario_values : dict
+        Scenario values of strategy variables {strategy_variable: scenario_value}
+    data : dict
+        Base data container (not changed)
+    assumptions : obj
+        Base assumptions (not changed)
+    year_invariant : dict
+        Inputs which are the same for every simulation year
+    scenario_store : ScenarioResultStore, default=None
+        Store to which the hourly regional results are written
+
+    Returns
+    -------
+    scenario_name : str
+        Name of scenario
+    sim_yr : int
+        Simulation year
+    fuel_y : array
+        National annual fuel per fueltype
+    """
+    logging.info("... simulate scenario %s for year %s", scenario_name, sim_yr)
+
+    # Only the changed attributes are copied, all other inputs are shared
+    scenario_strategy_variables = get_scenario_strategy_variables(
+        assumptions.strategy_variables, scenario_values)
+
+    scenario_assumptions = copy.copy(assumptions)
+    scenario_assumptions.update('curr_yr', sim_yr)
+    scenario_assumptions.update('strategy_variables', scenario_strategy_variables)
+
+    # Technologies are changed in place and therefore copied
+    scenario_technologies = non_param_assumptions.update_technology_assumption(
+        copy.deepcopy(data['technologies']),
+        scenario_strategy_variables['f_eff_achieved']['scenario_value'],
+        scenario_strategy_variables['gshp_fraction_ey']['scenario_value'])
+    scenario_assumptions.update('technologies', scenario_technologies)
+
+    if data['criterias']['spatial_exliclit_diffusion']:
+        scenario_assumptions.update(
+            'regional_strategy_variables',
+            get_scenario_regional_strategy_variables(
+                data,
+                scenario_strategy_variables,
+                assumptions.spatially_modelled_vars))
+
+    scenario_data = dict(data)
+    scenario_data['technologies'] = scenario_technologies
+    scenario_data['criterias'] = dict(data['criterias'])
+    scenario_data['criterias']['nr_of_processes'] = 1
+
+    if scenario_store is not None:
+        scenario_data['result_store'] = scenario_store.get_store(scenario_name, sim_yr)
+    else:
+        scenario_data.pop('result_store', None)
+
+    modelrun_obj = model.EnergyDemandModel(
+        regions=data['regions'],
+        data=scenario_data,
+        assumptions=scenario_assumptions,
+        year_invariant=year_invariant)
+
+    return scenario_name, sim_yr, modelrun_obj.ed_fueltype_national_y
+
+# Inputs of worker processes set by `_init_sweep_worker`
+_SWEEP_WORKER_INPUTS = {}
+
+def _init_sweep_worker(scenarios, data, assumptions, year_invariant, scenario_store):
+    """Store base data in a worker process
+    """
+    _SWEEP_WORKER_INPUTS['scenarios'] = scenarios
+    _SWEEP_WORKER_INPUTS['data'] = data
+    _SWEEP_WORKER_INPUTS['assumptions'] = assumptions
+    _SWEEP_WORKER_INPUTS['year_invariant'] = year_invariant
+    _SWEEP_WORKER_INPUTS['scenario_store'] = scenario_store
+
+def _simulate_sweep_task(task):
+    """Simulate a task of a sweep in a worker process
+    """
+    scenario_name, sim_yr = task
+
+    return simulate_scenario_year(
+        scenario_name,
+        sim_yr,
+        _SWEEP_WORKER_INPUTS['scenarios'][scenario_name],
+        _SWEEP_WORKER_INPUTS['data'],
+        _SWEEP_WORKER_INPUTS['assumptions'],
+        _SWEEP_WORKER_INPUTS['year_invariant'],
+        _SWEEP_WORKER_INPUTS['scenario_store'])
+
+def run_scenario_sweep(
+        scenarios,
+        data,
+        assumptions,
+        simulated_yrs=None,
+        path_result_store=None,
+        nr_of_processes=1,
+        year_invariant=None
+    ):
+    """Simulate all scenarios and simulation years
+
+    Arguments
+    ----------
+    scenarios : dict
+        Scenario values of every scenario {scenario_name: {strategy_variable: scenario_value}}
+    data : dict
+        Base data container with all loaded data
+    assumptions : obj
+        Base assumptions
+    simulated_yrs : list, default=None
+        Simulated years. If None, ``assumptions.simulated_yrs`` are simulated
+    path_result_store : str, default=None
+        Folder of `ScenarioResultStore`. If None, no hourly results are written
+    nr_of_processes : int, default=1
+        Number of worker processes. If 1, all tasks are
+        simulated in the current process
+    year_invariant : dict, default=None
+        Inputs which are the same for every simulation year. If not
+        provided, these inputs are created once for all scenarios
+
+    Returns
+    -------
+    sweep_results : dict
+        National annual fuel per fueltype {scenario_name: {sim_yr: fuel_y}}
+    """
+    if simulated_yrs is None:
+        simulated_yrs = assumptions.simulated_yrs
+
+    if year_invariant is None:
+        year_invariant = model.create_year_invariant_inputs(
+            data['regions'], data, assumptions)
+
+    if path_result_store is not None:
+        scenario_store = result_store.ScenarioResultStore(
+            path_result_store, data['reg_nrs'])
+    else:
+        scenario_store = None
+
+    tasks = get_sweep_tasks(scenarios, simulated_yrs)
+    logging.info(
+        "... run sweep of %s scenarios (%s tasks)", len(scenarios), len(tasks))
+
+    sweep_results = {}
+    for scenario_name in scenarios:
+        sweep_results[scenario_name] = {}
+
+    if nr_of_processes <= 1:
+        for scenario_name, sim_yr in tasks:
+            _, _, fuel_y = simulate_scenario_year(
+                scenario_name,
+                sim_yr,
+                scenarios[scenario_name],
+                data,
+                assumptions,
+                year_invariant,
+                scenario_store)
+            sweep_results[scenario_name][sim_yr] = fuel_y
+    else:
+        with multiprocessing.Pool(
+                processes=nr_of_processes,
+                initializer=_init_sweep_worker,
+                initargs=(scenarios, data, assumptions, year_invariant, scenario_store)) as pool:
+
+            for scenario_name, sim_yr, fuel_y in pool.imap_unordered(_simulate_sweep_task, tasks):
+                logging.info("... finished scenario %s for year %s", scenario_name, sim_yr)
+                sweep_results[scenario_name][sim_yr] = fuel_y
+
+    return sweep_results
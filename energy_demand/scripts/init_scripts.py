@@ -2,6 +2,9 @@
 model installation and after each scenario definition
 """
 import os
+import zlib
+import pickle
+import hashlib
 import logging
 from collections import defaultdict
 import numpy as np
@@ -50,10 +53,127 @@ def global_to_reg_capacity_switch(regions, global_capactiy_switch, spatial_facto
                     installed_capacity=regional_capacity,
                     sector=switch.sector)
 
-            reg_capacity_switch[region].append(new_switch)
+                reg_capacity_switch[region].append(new_switch)
 
     return reg_capacity_switch
 
+# Version of cached scenario initialisation results. Increase
+# if the calculations of the scenario initialisation change
+SCENARIO_INIT_CACHE_VERSION = 5
+
+def get_scenario_init_key(data):
+    """Create key of the scenario initialisation from
+    all inputs of the initialisation (fuels, regions,
+    assumptions incl. switches and strategy variables)
+
+    Arguments
+    ----------
+    data : dict
+        Data container
+
+    Returns
+    -------
+    key : str
+        Key of the scenario initialisation
+    """
+    hash_obj = hashlib.sha1()
+    basic_functions.update_hash(hash_obj, SCENARIO_INIT_CACHE_VERSION)
+
+    for name in [
+            'regions',
+            'fuels',
+            'technologies',
+            'pop_density',
+            'scenario_data',
+            'reg_coord',
+            'weather_stations',
+            'temp_data',
+            'sectors',
+            'enduses',
+            'lookups',
+            'assumptions']:
+        hash_obj.update(name.encode())
+        basic_functions.update_hash(hash_obj, data[name])
+
+    basic_functions.update_hash(hash_obj, data['criterias']['spatial_exliclit_diffusion'])
+
+    return hash_obj.hexdigest()
+
+def get_path_scenario_init_cache(path_folder, key):
+    """Get path of cached scenario initialisation
+
+    Arguments
+    ----------
+    path_folder : str
+        Folder of cached scenario initialisations
+    key : str
+        Key of the scenario initialisation
+
+    Returns
+    -------
+    path : str
+        Path to file
+    """
+    return os.path.join(path_folder, "scenario_init_{}.pickle.zlib".format(key))
+
+def read_scenario_init_cache(path_folder, key):
+    """Read cached scenario initialisation
+
+    Arguments
+    ----------
+    path_folder : str
+        Folder of cached scenario initialisations
+    key : str
+        Key of the scenario initialisation
+
+    Returns
+    -------
+    init_cont : dict
+        Initialisation results or None if not cached
+    fuel_disagg : dict
+        Disaggregated fuel or None if not cached
+    """
+    path = get_path_scenario_init_cache(path_folder, key)
+
+    try:
+        with open(path, 'rb') as file_handle:
+            version, cached_key, init_cont, fuel_disagg = pickle.loads(
+                zlib.decompress(file_handle.read()))
+    except (IOError, OSError, EOFError, ValueError, zlib.error, pickle.UnpicklingError):
+        return None, None
+
+    if version != SCENARIO_INIT_CACHE_VERSION or cached_key != key:
+        logging.info("... cached scenario initialisation is outdated")
+        return None, None
+
+    return init_cont, fuel_disagg
+
+def write_scenario_init_cache(path_folder, key, init_cont, fuel_disagg):
+    """Write scenario initialisation to cache. The file
+    is first written to a temporary file and then renamed
+
+    Arguments
+    ----------
+    path_folder : str
+        Folder of cached scenario initialisations
+    key : str
+        Key of the scenario initialisation
+    init_cont : dict
+        Initialisation results
+    fuel_disagg : dict
+        Disaggregated fuel
+    """
+    basic_functions.create_folder(path_folder)
+    path = get_path_scenario_init_cache(path_folder, key)
+    path_tmp = "{}.{}.tmp".format(path, os.getpid())
+
+    with open(path_tmp, 'wb') as file_handle:
+        file_handle.write(zlib.compress(pickle.dumps(
+            (SCENARIO_INIT_CACHE_VERSION, key, init_cont, fuel_disagg),
+            protocol=pickle.HIGHEST_PROTOCOL)))
+
+    os.replace(path_tmp, path)
+
 def scenario_initalisation(path_data_ed, data=False):
     """Scripts which need to be run for every different scenario.
     Only needs to be executed once for each scenario (not for every
@@ -115,6 +235,23 @@ def scenario_initalisation(path_data_ed, data=False):
     data['scenario_data']['employment_stats'] = data_loader.read_employment_stats(
         data['paths']['path_employment_statistics'])
 
+    # --------------------------------------------
+    # Load cached initialisation if inputs are unchanged
+    # --------------------------------------------
+    try:
+        cache_init = data['criterias']['cache_scenario_initialisation']
+    except KeyError:
+        cache_init = False
+
+    if cache_init:
+        init_key = get_scenario_init_key(data)
+        cached_init_cont, cached_fuel_disagg = read_scenario_init_cache(
+            data['local_paths']['dir_scenario_init_cache'], init_key)
+
+        if cached_init_cont is not None:
+            logging.info("... loaded cached scenario initialisation %s", init_key)
+            return cached_init_cont, cached_fuel_disagg
+
     # Disaggregate fuel for all regions
     fuel_disagg['rs_fuel_disagg'], fuel_disagg['ss_fuel_disagg'], fuel_disagg['is_fuel_disagg'] = s_disaggregation.disaggregate_base_demand(
         data['regions'],
@@ -128,7 +265,8 @@ def scenario_initalisation(path_data_ed, data=False):
         data['temp_data'],
         data['sectors'],
         data['sectors']['all_sectors'],
-        data['enduses'])
+        data['enduses'],
+        data['weather_station_index'])
 
     # Sum demand across all sectors for every region
     fuel_disagg['ss_fuel_disagg_sum_all_sectors'] = sum_across_sectors_all_regs(
@@ -243,44 +381,36 @@ def scenario_initalisation(path_data_ed, data=False):
         # Select diffusion value
         f_diffusion = f_reg_norm_abs
 
-        # Convert globally defined switches to regional switches
-        reg_capacity_switches_rs = global_to_reg_capacity_switch(
-            data['regions'], data['assumptions'].rs_capacity_switches, f_diffusion)
-        reg_capacity_switches_ss = global_to_reg_capacity_switch(
-            data['regions'], data['assumptions'].ss_capacity_switches, f_diffusion)
-        reg_capacity_switches_is = global_to_reg_capacity_switch(
-            data['regions'], data['assumptions'].is_capacity_switches, f_diffusion)
-
-        rs_service_switches_incl_cap = {}
-        ss_service_switches_inlc_cap = {}
-        is_service_switches_incl_cap = {}
-
-        for region in data['regions']:
-
-            # Residential
-            rs_service_switches_incl_cap[region] = fuel_service_switch.capacity_switch(
-                reg_capacity_switches_rs[region],
-                data['technologies'],
-                data['assumptions'].enduse_overall_change['other_enduse_mode_info'],
-                data['fuels']['rs_fuel_raw'],
-                data['assumptions'].rs_fuel_tech_p_by,
-                data['assumptions'].base_yr)
+        # Convert globally defined switches to service switches of all regions
+        rs_service_switches_incl_cap = fuel_service_switch.capacity_switch_regions(
+            data['assumptions'].rs_capacity_switches,
+            data['regions'],
+            f_diffusion,
+            data['technologies'],
+            data['assumptions'].enduse_overall_change['other_enduse_mode_info'],
+            data['fuels']['rs_fuel_raw'],
+            data['assumptions'].rs_fuel_tech_p_by,
+            data['assumptions'].base_yr)
 
-            ss_service_switches_inlc_cap[region] = fuel_service_switch.capacity_switch(
-                reg_capacity_switches_ss[region],
-                data['technologies'],
-                data['assumptions'].enduse_overall_change['other_enduse_mode_info'],
-                ss_aggr_sector_fuels,
-                data['assumptions'].ss_fuel_tech_p_by,
-                data['assumptions'].base_yr)
+        ss_service_switches_inlc_cap = fuel_service_switch.capacity_switch_regions(
+            data['assumptions'].ss_capacity_switches,
+            data['regions'],
+            f_diffusion,
+            data['technologies'],
+            data['assumptions'].enduse_overall_change['other_enduse_mode_info'],
+            ss_aggr_sector_fuels,
+            data['assumptions'].ss_fuel_tech_p_by,
+            data['assumptions'].base_yr)
 
-            is_service_switches_incl_cap[region] = fuel_service_switch.capacity_switch(
-                reg_capacity_switches_is[region],
-                data['technologies'],
-                data['assumptions'].enduse_overall_change['other_enduse_mode_info'],
-                is_aggr_sector_fuels,
-                data['assumptions'].is_fuel_tech_p_by,
-                data['assumptions'].base_yr)
+        is_service_switches_incl_cap = fuel_service_switch.capacity_switch_regions(
+            data['assumptions'].is_capacity_switches,
+            data['regions'],
+            f_diffusion,
+            data['technologies'],
+            data['assumptions'].enduse_overall_change['other_enduse_mode_info'],
+            is_aggr_sector_fuels,
+            data['assumptions'].is_fuel_tech_p_by,
+            data['assumptions'].base_yr)
     else: #Not spatial explicit
 
         rs_service_switches_incl_cap = fuel_service_switch.capacity_switch(
@@ -442,58 +572,28 @@ def scenario_initalisation(path_data_ed, data=False):
     # Convert strategy variables to regional variables
     # ===========================================
     if data['criterias']['spatial_exliclit_diffusion']:
-        init_cont['regional_strategy_variables'] = defaultdict(dict)
-
-        # Iterate strategy variables and calculate regional variable
-        for var_name, strategy_var in data['assumptions'].strategy_variables.items():
-
-            logging.info("Spatially explicit diffusion modelling %s", var_name)
-            logging.info(data['assumptions'].spatially_modelled_vars)
-
-            # Check whether scenario varaible is regionally modelled
-            if var_name not in data['assumptions'].spatially_modelled_vars:
-
-                # Variable is not spatially modelled
-                for region in data['regions']:
-                    init_cont['regional_strategy_variables'][region][var_name] = {
-                        'scenario_value': float(strategy_var['scenario_value']),
-                        'affected_enduse': data['assumptions'].strategy_variables[var_name]['affected_enduse']}
-            else:
-
-                if strategy_var['affected_enduse'] == []:
-                    logging.info(
-                        "For scenario var %s no affected enduse is defined. Thus speed is used for diffusion",
-                            var_name)
-                else:
-                    pass
-
-                # Get enduse specific fuel for each region
-                fuels_reg = spatial_diffusion.get_enduse_regs(
-                    enduse=strategy_var['affected_enduse'],
-                    fuels_disagg=[
-                        fuel_disagg['rs_fuel_disagg'],
-                        fuel_disagg['ss_fuel_disagg'],
-                        fuel_disagg['is_fuel_disagg']])
-
-                # Calculate regional specific strategy variables values
-                reg_specific_variables = spatial_diffusion.factor_improvements_single(
-                    factor_uk=strategy_var['scenario_value'],
-                    regions=data['regions'],
-                    f_reg=f_reg,
-                    f_reg_norm=f_reg_norm,
-                    f_reg_norm_abs=f_reg_norm_abs,
-                    fuel_regs_enduse=fuels_reg)
-
-                # Add regional specific strategy variables values
-                for region in data['regions']:
-                    init_cont['regional_strategy_variables'][region][var_name] = {
-                        'scenario_value': float(reg_specific_variables[region]),
-                        'affected_enduse': strategy_var['affected_enduse']}
-
-        init_cont['regional_strategy_variables'] = dict(init_cont['regional_strategy_variables'])
+        regional_strategy_variables = spatial_diffusion.calc_regional_strategy_variables(
+            data['regions'],
+            data['assumptions'].strategy_variables,
+            data['assumptions'].spatially_modelled_vars,
+            fuel_disagg,
+            f_reg,
+            f_reg_norm,
+            f_reg_norm_abs)
+
+        init_cont['regional_strategy_variables'] = regional_strategy_variables
+
+    init_cont = dict(init_cont)
+
+    if cache_init:
+        write_scenario_init_cache(
+            data['local_paths']['dir_scenario_init_cache'],
+            init_key,
+            init_cont,
+            fuel_disagg)
 
     logging.info("... finished scenario initialisation")
-    return dict(init_cont), fuel_disagg
+    return init_cont, fuel_disagg
 
 def sum_across_sectors_all_regs(fuel_disagg_reg):
     """Sum fuel across all sectors for every region
@@ -784,15 +884,15 @@ def sig_param_calc_incl_fuel_switch(
                         break
                 break
 
-            for reg in regions:
-                logging.info("calculating sigmoid parameters %s %s", enduse, reg)
-                sig_param_tech[reg] = s_generate_sigmoid.tech_sigmoid_parameters(
-                    yr_until_switched,
-                    base_yr,
-                    technologies,
-                    l_values_sig[reg],
-                    s_tech_by_p,
-                    s_tech_switched_p[reg])
+            logging.info("calculating sigmoid parameters %s", enduse)
+            sig_param_tech = s_generate_sigmoid.regional_tech_sigmoid_parameters(
+                regions,
+                yr_until_switched,
+                base_yr,
+                technologies,
+                l_values_sig,
+                s_tech_by_p,
+                s_tech_switched_p)
         else:
 
             # Get year of switches
@@ -2,11 +2,68 @@
 """
 import os
 import logging
-import copy
-from collections import defaultdict
+import numpy as np
 from energy_demand.profiles import hdd_cdd
 from energy_demand.basic import testing_functions
 
+# Weights of enduses which are not disaggregated with population
+# for every disaggregation mode {mode: {enduse: weight_name}}
+RS_DISAGG_WEIGHTS = {
+    'population': {},
+    'population_dd': {}, # Degree days are not used for residential demand
+    'full': {
+        'rs_space_heating': 'floor_area_hdd',
+        'rs_lighting': 'floor_area'}}
+
+SS_DISAGG_WEIGHTS = {
+    'population': {},
+    'population_dd': {
+        'ss_cooling_humidification': 'population_cdd',
+        'ss_space_heating': 'population_hdd'},
+    'full': {
+        'ss_cooling_humidification': 'floor_area_cdd',
+        'ss_space_heating': 'floor_area_hdd',
+        'ss_lighting': 'floor_area'}}
+
+# The BEIS sectors are matched with census data sectors {ECUK industry sectors: 'Emplyoment sectors'}
+SECTORMATCH_ECUK_WITH_CENSUS = {
+
+    # Significant improvement
+    'mining': 'B',
+    'food_production': 'C10-12',
+    'pharmaceuticals': 'M',
+    'computer': 'C26-30',
+    'leather': 'C13-15',
+    'wearing_appeal': 'C13-15',
+
+    # Improvement
+    'basic_metals': 'C',
+    'non_metallic_mineral_products': 'C',
+    'electrical_equipment': 'C26-30',
+    'printing': 'C',
+    'rubber_plastics': 'C19-22',
+    'chemicals': 'C19-22',
+    'wood': 'C16,17',
+    'paper': 'C16,17',
+
+    # Worse and better
+    'fabricated_metal_products': 'C',   # Gas better, elec worse test C23-25  previous 'C'
+    'textiles': 'C13-15',               # Gas better, elec worse
+    'motor_vehicles': 'G',              # Gas better, elec worse
+
+    # Indifferent
+    'machinery': None,                  # 'C'
+    'tobacco': None,                    # 'C10-12'
+    'other_transport_equipment': None,  # 'H'
+    'other_manufacturing': None,        # 'C18,31,32'
+    'water_collection_treatment': None, # 'E'
+    'waste_collection': None,           # 'E'
+    'furniture': None,                  # C18,31,32'
+
+    # Worse
+    'beverages': None                   # 'C10-12'
+}
+
 def disaggregate_base_demand(
         regions,
         base_yr,
@@ -19,7 +76,8 @@ def disaggregate_base_demand(
         temp_data,
         sectors,
         all_sectors,
-        enduses
+        enduses,
+        station_index=None
     ):
     """This function disaggregates fuel demand based on
     region specific parameters for the base year. The residential,
@@ -43,6 +101,8 @@ def disaggregate_base_demand(
     sectors
     all_sectors
     enduses
+    station_index : WeatherStationIndex, default=None
+        Spatial index of `weather_stations`
 
     Returns
     -------
@@ -55,6 +115,27 @@ def disaggregate_base_demand(
     crit_limited_disagg_pop_hdd = False  # Only puplation and HDD
     crit_full_disagg = True              # Full disaggregation
 
+    # -------------------------------------
+    # Heating and cooling degree days of all regions
+    # -------------------------------------
+    hdd_regions, cdd_regions = hdd_cdd.get_reg_hdd_cdd(
+        base_yr,
+        curr_yr,
+        regions,
+        temp_data,
+        assumptions.base_temp_diff_params,
+        [
+            (assumptions.strategy_variables['rs_t_base_heating_future_yr']['scenario_value'],
+             assumptions.t_bases.rs_t_heating_by),
+            (assumptions.strategy_variables['ss_t_base_heating_future_yr']['scenario_value'],
+             assumptions.t_bases.ss_t_heating_by)],
+        [
+            (assumptions.strategy_variables['ss_t_base_cooling_future_yr']['scenario_value'],
+             assumptions.t_bases.ss_t_cooling_by)],
+        reg_coord,
+        weather_stations,
+        station_index)
+
     # Residential
     rs_fuel_disagg = rs_disaggregate(
         regions,
@@ -69,7 +150,9 @@ def disaggregate_base_demand(
         enduses['rs_enduses'],
         crit_limited_disagg_pop_hdd,
         crit_limited_disagg_pop,
-        crit_full_disagg)
+        crit_full_disagg,
+        reg_hdd=hdd_regions[0],
+        station_index=station_index)
 
     # Service
     ss_fuel_disagg = ss_disaggregate(
@@ -87,7 +170,10 @@ def disaggregate_base_demand(
         all_sectors,
         crit_limited_disagg_pop_hdd,
         crit_limited_disagg_pop,
-        crit_full_disagg)
+        crit_full_disagg,
+        reg_hdd=hdd_regions[1],
+        reg_cdd=cdd_regions[0],
+        station_index=station_index)
 
     # Industry
     is_fuel_disagg = is_disaggregate(
@@ -103,6 +189,199 @@ def disaggregate_base_demand(
 
     return dict(rs_fuel_disagg), dict(ss_fuel_disagg), dict(is_fuel_disagg)
 
+def get_disagg_mode(
+        crit_limited_disagg_pop,
+        crit_limited_disagg_pop_hdd,
+        crit_full_disagg
+    ):
+    """Get disaggregation mode from disaggregation criteria
+
+    Arguments
+    ---------
+    crit_limited_disagg_pop : bool
+        Criteria to disaggregate only with population
+    crit_limited_disagg_pop_hdd : bool
+        Criteria to disaggregate with population and degree days
+    crit_full_disagg : bool
+        Criteria to disaggregate with population, degree days and floor area
+
+    Returns
+    -------
+    mode : str
+        Disaggregation mode ('population', 'population_dd' or 'full')
+    """
+    if crit_limited_disagg_pop and not crit_limited_disagg_pop_hdd and not crit_full_disagg:
+        return 'population'
+    elif crit_limited_disagg_pop_hdd and not crit_full_disagg:
+        return 'population_dd'
+    elif crit_full_disagg:
+        return 'full'
+    else:
+        return 'population'
+
+def get_reg_values(regions, reg_data, keys=None):
+    """Get values of all regions as array
+
+    Arguments
+    ---------
+    regions : list
+        Regions
+    reg_data : dict
+        Data of every region {region: value} or {region: {key: value}}
+    keys : list, default=None
+        Keys of every region (e.g. sectors)
+
+    Returns
+    -------
+    reg_values : array
+        Values of all regions (regions,) or (regions, keys)
+    """
+    if keys is None:
+        return np.array([reg_data[region] for region in regions], dtype=float)
+    else:
+        return np.array(
+            [[reg_data[region][key] for key in keys] for region in regions], dtype=float)
+
+def get_enduse_weights(enduses, reg_weights, enduse_weight_names):
+    """Get disaggregation weights of all regions and enduses
+
+    Arguments
+    ---------
+    enduses : list
+        Enduses
+    reg_weights : dict
+        Weights of all regions {weight_name: array (regions,) or (regions, sectors)}
+    enduse_weight_names : dict
+        Weight of an enduse if not disaggregated with population {enduse: weight_name}
+
+    Returns
+    -------
+    weights : array
+        Weights (regions, enduses) or (regions, enduses, sectors)
+    """
+    return np.stack(
+        [reg_weights[enduse_weight_names.get(enduse, 'population')] for enduse in enduses],
+        axis=1)
+
+def calc_disagg_factors(weights, disagg_regions, total_regions):
+    """Calculate disaggregation factors of all regions. The weights
+    are normalised with the total weights of `total_regions`
+
+    Arguments
+    ---------
+    weights : array
+        Weights of all regions (regions, ...)
+    disagg_regions : array
+        Regions to which fuel is disaggregated (bool array (regions,))
+    total_regions : array
+        Regions used to calculate national totals (bool array (regions,))
+
+    Returns
+    -------
+    disagg_factors : array
+        Disaggregation factors (regions, ...). If the national
+        total is zero, the factors are zero
+    """
+    weights_tot = np.sum(weights[total_regions], axis=0)
+
+    disagg_factors = np.divide(
+        weights,
+        weights_tot,
+        out=np.zeros(weights.shape, dtype=float),
+        where=weights_tot != 0)
+    disagg_factors[~disagg_regions] = 0
+
+    return disagg_factors
+
+def disaggr_fuel(national_fuel, disagg_factors):
+    """Disaggregate national fuel with disaggregation factors
+
+    Arguments
+    ---------
+    national_fuel : array
+        National fuel (enduses, ...)
+    disagg_factors : array
+        Disaggregation factors (regions, enduses) or (regions, enduses, sectors)
+
+    Returns
+    -------
+    fuel_disagg : array
+        Disaggregated fuel (regions, enduses, ...)
+    """
+    missing_dims = national_fuel.ndim - disagg_factors.ndim + 1
+
+    return disagg_factors.reshape(
+        disagg_factors.shape + (1,) * missing_dims) * national_fuel
+
+def disaggr_regions(national_fuel, weights_missing_data, weights, missing_data):
+    """Disaggregate national fuel to all regions. The fuel of regions
+    with missing data is disaggregated first (with totals of all regions)
+    and the remaining national fuel is disaggregated to the
+    regions with data.
+
+    Arguments
+    ---------
+    national_fuel : array
+        National fuel (enduses, ...)
+    weights_missing_data : array
+        Weights used for regions with missing data (regions, enduses[, sectors])
+    weights : array
+        Weights used for regions with data (regions, enduses[, sectors])
+    missing_data : array
+        Criteria whether data of a region is missing (bool array (regions,))
+
+    Returns
+    -------
+    fuel_disagg : array
+        Disaggregated fuel (regions, enduses, ...)
+    """
+    all_regions = np.ones(missing_data.shape, dtype=bool)
+
+    fuel_disagg = disaggr_fuel(
+        national_fuel,
+        calc_disagg_factors(weights_missing_data, missing_data, all_regions))
+
+    # Substract from national fuel already disaggregated fuel
+    national_fuel_remaining = national_fuel - np.sum(fuel_disagg, axis=0)
+
+    fuel_disagg += disaggr_fuel(
+        national_fuel_remaining,
+        calc_disagg_factors(weights, ~missing_data, ~missing_data))
+
+    return fuel_disagg
+
+def fuel_array_to_dict(fuel_disagg, regions, enduses, sectors=None):
+    """Convert disaggregated fuel array to nested dict
+
+    Arguments
+    ---------
+    fuel_disagg : array
+        Disaggregated fuel (regions, enduses, ...) or (regions, enduses, sectors, ...)
+    regions : list
+        Regions
+    enduses : list
+        Enduses
+    sectors : list, default=None
+        Sectors
+
+    Returns
+    -------
+    fuel_disagg_dict : dict
+        Disaggregated fuel {region: {enduse: fuel}} or {region: {enduse: {sector: fuel}}}
+    """
+    fuel_disagg_dict = {}
+    for region_nr, region in enumerate(regions):
+        fuel_disagg_dict[region] = {}
+        for enduse_nr, enduse in enumerate(enduses):
+            if sectors is None:
+                fuel_disagg_dict[region][enduse] = fuel_disagg[region_nr, enduse_nr]
+            else:
+                fuel_disagg_dict[region][enduse] = dict(
+                    (sector, fuel_disagg[region_nr, enduse_nr, sector_nr])
+                    for sector_nr, sector in enumerate(sectors))
+
+    return fuel_disagg_dict
+
 def ss_disaggregate(
         ss_national_fuel,
         assumptions,
@@ -118,94 +397,71 @@ def ss_disaggregate(
         all_sectors,
         crit_limited_disagg_pop_hdd,
         crit_limited_disagg_pop,
-        crit_full_disagg
+        crit_full_disagg,
+        reg_hdd=None,
+        reg_cdd=None,
+        station_index=None
     ):
     """Disaggregate fuel for service submodel (per enduse and sector)
 
+    Arguments
+    ----------
+    reg_hdd : array, default=None
+        Heating degree days of all regions. Calculated if not provided
+    reg_cdd : array, default=None
+        Cooling degree days of all regions. Calculated if not provided
+    station_index : WeatherStationIndex, default=None
+        Spatial index of `weather_stations`
+
     Outputs
     -------
     ss_fuel_disagg : dict
         region, Enduse, Sectors
     """
     logging.debug("... disaggregate service demand")
-    ss_fuel_disagg = {}
 
     # ---------------------------------------
     # Calculate heating degree days for regions
     # ---------------------------------------
-    ss_hdd_individ_region = hdd_cdd.get_hdd_country(
-        base_yr,
-        curr_yr,
-        regions,
-        temp_data,
-        assumptions.base_temp_diff_params,
-        assumptions.strategy_variables['ss_t_base_heating_future_yr']['scenario_value'],
-        assumptions.t_bases.ss_t_heating_by,
-        reg_coord,
-        weather_stations)
-
-    ss_cdd_individ_region = hdd_cdd.get_cdd_country(
-        base_yr,
-        curr_yr,
-        regions,
-        temp_data,
-        assumptions.base_temp_diff_params,
-        assumptions.strategy_variables['ss_t_base_cooling_future_yr']['scenario_value'],
-        assumptions.t_bases.ss_t_cooling_by,
-        reg_coord,
-        weather_stations)
-
-    # ---------------------------------------------
-    # Get all regions with missing floor area data
-    # ---------------------------------------------
-    regions_without_floorarea = get_regions_missing_floor_area_sector(
-        regions, scenario_data['floor_area']['ss_floorarea'], base_yr)
-    regions_with_floorarea = list(regions)
-    for reg in regions_without_floorarea:
-        regions_with_floorarea.remove(reg)
-
-    # ---------------------------------------
-    # Overall disaggregation factors per enduse and sector
-    # ---------------------------------------
-    ss_fuel_disagg = ss_disaggr(
-        all_regions=regions,
-        regions=regions_without_floorarea,
-        sectors=sectors,
-        enduses=enduses,
-        all_sectors=all_sectors,
-        base_yr=base_yr,
-        scenario_data=scenario_data,
-        ss_hdd_individ_region=ss_hdd_individ_region,
-        ss_cdd_individ_region=ss_cdd_individ_region,
-        ss_fuel_disagg=ss_fuel_disagg,
-        ss_national_fuel=ss_national_fuel,
-        crit_limited_disagg_pop=False,
-        crit_limited_disagg_pop_hdd=True,
-        crit_full_disagg=False)
-
-    # Substract from national fuel already disaggregated fuel
-    ss_national_fuel_remaining = copy.deepcopy(ss_national_fuel)
-    for enduse in ss_national_fuel:
-        for sector in ss_national_fuel[enduse]:
-            for reg in ss_fuel_disagg:
-                ss_national_fuel_remaining[enduse][sector] -= ss_fuel_disagg[reg][enduse][sector]
-
-    # Disaggregate with floor area
-    ss_fuel_disagg = ss_disaggr(
-        all_regions=regions_with_floorarea,
-        regions=regions_with_floorarea,
-        sectors=sectors,
-        enduses=enduses,
-        all_sectors=all_sectors,
-        base_yr=base_yr,
-        scenario_data=scenario_data,
-        ss_hdd_individ_region=ss_hdd_individ_region,
-        ss_cdd_individ_region=ss_cdd_individ_region,
-        ss_fuel_disagg=ss_fuel_disagg,
-        ss_national_fuel=ss_national_fuel_remaining,
-        crit_limited_disagg_pop=crit_limited_disagg_pop,
-        crit_limited_disagg_pop_hdd=crit_limited_disagg_pop_hdd,
-        crit_full_disagg=crit_full_disagg)
+    if reg_hdd is None or reg_cdd is None:
+        hdd_regions, cdd_regions = hdd_cdd.get_reg_hdd_cdd(
+            base_yr,
+            curr_yr,
+            regions,
+            temp_data,
+            assumptions.base_temp_diff_params,
+            [(assumptions.strategy_variables['ss_t_base_heating_future_yr']['scenario_value'],
+              assumptions.t_bases.ss_t_heating_by)],
+            [(assumptions.strategy_variables['ss_t_base_cooling_future_yr']['scenario_value'],
+              assumptions.t_bases.ss_t_cooling_by)],
+            reg_coord,
+            weather_stations,
+            station_index)
+        reg_hdd = hdd_regions[0]
+        reg_cdd = cdd_regions[0]
+
+    reg_pop = get_reg_values(regions, scenario_data['population'][base_yr])
+    reg_floor_area = get_reg_values(
+        regions, scenario_data['floor_area']['ss_floorarea'][base_yr], sectors)
+
+    # Regions with missing floor area data (defined with 1 if 'null' in reading in)
+    missing_floor_area = np.any(reg_floor_area == 1, axis=1)
+
+    reg_weights = ss_reg_weights(reg_pop, reg_floor_area, reg_hdd, reg_cdd)
+
+    ss_fuel_disagg = disaggr_regions(
+        np.array(
+            [[ss_national_fuel[enduse][sector] for sector in sectors] for enduse in enduses],
+            dtype=float),
+        get_enduse_weights(enduses, reg_weights, SS_DISAGG_WEIGHTS['population_dd']),
+        get_enduse_weights(
+            enduses,
+            reg_weights,
+            SS_DISAGG_WEIGHTS[get_disagg_mode(
+                crit_limited_disagg_pop, crit_limited_disagg_pop_hdd, crit_full_disagg)]),
+        missing_floor_area)
+
+    ss_fuel_disagg = fuel_array_to_dict(ss_fuel_disagg, regions, enduses, sectors)
 
     # -----------------
     # Check if total fuel is the
@@ -214,126 +470,36 @@ def ss_disaggregate(
     testing_functions.control_disaggregation(
         ss_fuel_disagg, ss_national_fuel, enduses, sectors)
     logging.debug("... finished disaggregation ss")
-    return dict(ss_fuel_disagg)
-
-def ss_disaggr(
-        all_regions,
-        regions,
-        sectors,
-        enduses,
-        all_sectors,
-        base_yr,
-        scenario_data,
-        ss_hdd_individ_region,
-        ss_cdd_individ_region,
-        ss_fuel_disagg,
-        ss_national_fuel,
-        crit_limited_disagg_pop,
-        crit_limited_disagg_pop_hdd,
-        crit_full_disagg
-    ):
-    """Disaggregating 
-    """
-    # Total floor area for every enduse per sector
-    national_floorarea_by_sector = {}
-    for sector in sectors:
-        national_floorarea_by_sector[sector] = 0
-        for region in regions:
-            national_floorarea_by_sector[sector] += scenario_data['floor_area']['ss_floorarea'][base_yr][region][sector]
-
-    tot_pop = 0
-    tot_floor_area = {}
-    tot_floor_area_pop = {}
-    tot_pop_hdd = {}
-    tot_pop_cdd = {}
-    tot_floor_area_hdd = {}
-    tot_floor_area_cdd = {}
-
-    for sector in all_sectors:
-        tot_floor_area[sector] = 0
-        tot_floor_area_pop[sector] = 0
-        tot_pop_hdd[sector] = 0
-        tot_pop_cdd[sector] = 0
-        tot_floor_area_hdd[sector] = 0
-        tot_floor_area_cdd[sector] = 0
-
-    for region in all_regions:
-        reg_hdd = ss_hdd_individ_region[region]
-        reg_cdd = ss_cdd_individ_region[region]
-
-        # Population
-        reg_pop = scenario_data['population'][base_yr][region]
-        tot_pop += reg_pop
-
-        for sector in all_sectors:
-
-            # Floor Area of sector
-            reg_floor_area = scenario_data['floor_area']['ss_floorarea'][base_yr][region][sector]
-
-            # National disaggregation factors
-            tot_floor_area[sector] += reg_floor_area
-            tot_floor_area_pop[sector] += reg_floor_area * reg_pop
-            tot_floor_area_hdd[sector] += reg_floor_area * reg_hdd
-            tot_pop_hdd[sector] += reg_pop * reg_hdd
-            tot_pop_cdd[sector] += reg_pop * reg_cdd
-            tot_floor_area_cdd[sector] += reg_floor_area * reg_cdd
-
-    # ---------------------------------------
-    # Disaggregate according to enduse
-    # ---------------------------------------
-    for region in regions:
-        #ss_fuel_disagg[region] = {}
-        ss_fuel_disagg[region] = defaultdict(dict)
-
-        # Regional factors
-        reg_hdd = ss_hdd_individ_region[region]
-        reg_cdd = ss_cdd_individ_region[region]
-
-        reg_pop = scenario_data['population'][base_yr][region]
-
-        reg_diasg_factor = reg_pop / tot_pop
-
-        for enduse in enduses:
-
-            for sector in sectors:
-                #print("reg_diasg_factor: {} {} {}".format(sector, enduse, reg_diasg_factor))
-                reg_floor_area = scenario_data['floor_area']['ss_floorarea'][base_yr][region][sector]
-
-                if crit_limited_disagg_pop and not crit_limited_disagg_pop_hdd:
-
-                    # ----
-                    #logging.debug(" ... Disaggregation ss: populaton")
-                    # ----
-                    reg_diasg_factor = reg_pop / tot_pop
-
-                elif crit_limited_disagg_pop_hdd and not crit_full_disagg:
+    return ss_fuel_disagg
 
-                    # ----
-                    #logging.debug(" ... Disaggregation ss: populaton, HDD")
-                    # ----
-                    if enduse == 'ss_cooling_humidification':
-                        reg_diasg_factor = (reg_pop * reg_cdd) / tot_pop_cdd[sector]
-                    elif enduse == 'ss_space_heating':
-                        reg_diasg_factor = (reg_pop * reg_hdd) / tot_pop_hdd[sector]
-                    else:
-                        reg_diasg_factor = reg_pop / tot_pop
-                elif crit_full_disagg:
+def ss_reg_weights(reg_pop, reg_floor_area, reg_hdd, reg_cdd):
+    """Calculate service disaggregation weights of all regions
 
-                    # ----
-                    # logging.debug(" ... Disaggregation ss: populaton, HDD, floor_area")
-                    # ----
-                    if enduse == 'ss_cooling_humidification':
-                        reg_diasg_factor = (reg_floor_area * reg_cdd) / tot_floor_area_cdd[sector]
-                    elif enduse == 'ss_space_heating':
-                        reg_diasg_factor = (reg_floor_area * reg_hdd) / tot_floor_area_hdd[sector]
-                    elif enduse == 'ss_lighting':
-                        reg_diasg_factor = reg_floor_area / tot_floor_area[sector]
-                    else:
-                        reg_diasg_factor = reg_pop / tot_pop
+    Arguments
+    ---------
+    reg_pop : array
+        Population (regions,)
+    reg_floor_area : array
+        Floor area of every sector (regions, sectors)
+    reg_hdd : array
+        Heating degree days (regions,)
+    reg_cdd : array
+        Cooling degree days (regions,)
 
-                ss_fuel_disagg[region][enduse][sector] = ss_national_fuel[enduse][sector] * reg_diasg_factor
+    Returns
+    -------
+    reg_weights : dict
+        Weights of all regions and sectors {weight_name: array (regions, sectors)}
+    """
+    reg_pop = np.broadcast_to(reg_pop[:, np.newaxis], reg_floor_area.shape)
 
-    return ss_fuel_disagg
+    return {
+        'population': reg_pop,
+        'population_hdd': reg_pop * reg_hdd[:, np.newaxis],
+        'population_cdd': reg_pop * reg_cdd[:, np.newaxis],
+        'floor_area': reg_floor_area,
+        'floor_area_hdd': reg_floor_area * reg_hdd[:, np.newaxis],
+        'floor_area_cdd': reg_floor_area * reg_cdd[:, np.newaxis]}
 
 def is_disaggregate(
         base_yr,
@@ -375,124 +541,49 @@ def is_disaggregate(
     """
     logging.debug("... disaggregate industry demand")
 
-    is_fuel_disagg = {}
-    if crit_limited_disagg_pop and not crit_full_disagg:
+    reg_pop = get_reg_values(regions, scenario_data['population'][base_yr])
 
-        # ---
-        # Disaggregate only with population
-        # ---
-        tot_pop = 0
-        for reg in regions:
-            tot_pop += scenario_data['population'][base_yr][reg]
-
-        for region in regions:
-            is_fuel_disagg[region] = {}
-            reg_pop = scenario_data['population'][base_yr][region]
-
-            reg_disagg_f = reg_pop / tot_pop
-
-            for enduse in enduses:
-                is_fuel_disagg[region][enduse] = {}
-                for sector in sectors:
-                    is_fuel_disagg[region][enduse][sector] = is_national_fuel[enduse][sector] * reg_disagg_f
-
-        return is_fuel_disagg
+    # Population weights of every sector (regions, sectors)
+    weights = np.repeat(reg_pop[:, np.newaxis], len(sectors), axis=1)
 
     if crit_full_disagg:
         #logging.debug(" ... Disaggregation is: Employment statistics")
 
-        # Calculate total population of all regions
-        tot_pop = sum(scenario_data['population'][base_yr].values())
-
-        # -----
-        # Disaggregate with employment statistics
-        # The BEIS sectors are matched with census data sectors {ECUK industry sectors: 'Emplyoment sectors'}
-        sectormatch_ecuk_with_census = {
-
-            # Significant improvement
-            'mining': 'B',
-            'food_production': 'C10-12',
-            'pharmaceuticals': 'M',
-            'computer': 'C26-30',
-            'leather': 'C13-15',
-            'wearing_appeal': 'C13-15',
-
-            # Improvement
-            'basic_metals': 'C',
-            'non_metallic_mineral_products': 'C',
-            'electrical_equipment': 'C26-30',
-            'printing': 'C',
-            'rubber_plastics': 'C19-22',
-            'chemicals': 'C19-22',
-            'wood': 'C16,17',
-            'paper': 'C16,17',
-
-            # Worse and better
-            'fabricated_metal_products': 'C',   # Gas better, elec worse test C23-25  previous 'C'
-            'textiles': 'C13-15',               # Gas better, elec worse
-            'motor_vehicles': 'G',              # Gas better, elec worse
-
-            # Indifferent
-            'machinery': None,                  # 'C'
-            'tobacco': None,                    # 'C10-12'
-            'other_transport_equipment': None,  # 'H'
-            'other_manufacturing': None,        # 'C18,31,32'
-            'water_collection_treatment': None, # 'E'
-            'waste_collection': None,           # 'E'
-            'furniture': None,                  # C18,31,32'
-
-            # Worse
-            'beverages': None                   # 'C10-12'
-        }
-
         # ----------------------------------------
-        # Summarise national employment per sector
+        # Employment of every region per census sector
         # ----------------------------------------
-        # Initialise dict
-        tot_national_sector_employment = {}
-        for sectors_reg in employment_statistics.values():
-            for sector in sectors_reg:
-                tot_national_sector_employment[sector] = 0
-            continue
-        for reg in regions:
-            for employment_sector, employment in employment_statistics[reg].items():
-                tot_national_sector_employment[employment_sector] += employment
-
-        # --------------------------------------------------
-        # Disaggregate per region with employment statistics
-        # --------------------------------------------------
-        for region in regions:
-            is_fuel_disagg[region] = {}
-
-            # Iterate sector
-            for enduse in enduses:
-                is_fuel_disagg[region][enduse] = {}
-
-                for sector in sectors:
-
-                    # ---------------------------------
-                    # Try to match  with sector, otherwise disaggregate with population
-                    # ----------------------------------
-                    matched_sector = sectormatch_ecuk_with_census[sector]
-
-                    # Disaggregate with population
-                    if not matched_sector:
-                        reg_pop = scenario_data['population'][base_yr][region]
-                        reg_disag_factor = reg_pop / tot_pop
-
-                        is_fuel_disagg[region][enduse][sector] = is_national_fuel[enduse][sector] * reg_disag_factor
-                    else:
-                        #for enduse in enduses['is_enduses']:
-                        national_sector_employment = tot_national_sector_employment[matched_sector]
-                        reg_sector_employment = employment_statistics[region][matched_sector]
-
-                        try:
-                            reg_disag_factor = reg_sector_employment / national_sector_employment
-                        except ZeroDivisionError:
-                            reg_disag_factor = 0 #No employment for this sector for this region
-
-                        # Disaggregated national fuel
-                        is_fuel_disagg[region][enduse][sector] = is_national_fuel[enduse][sector] * reg_disag_factor
+        employment_sectors = sorted(set(
+            employment_sector for region in regions
+            for employment_sector in employment_statistics[region]))
+
+        reg_employment = np.array(
+            [[employment_statistics[region].get(employment_sector, 0)
+              for employment_sector in employment_sectors] for region in regions],
+            dtype=float)
+
+        # ---------------------------------
+        # Try to match  with sector, otherwise disaggregate with population
+        # ----------------------------------
+        for sector_nr, sector in enumerate(sectors):
+            matched_sector = SECTORMATCH_ECUK_WITH_CENSUS[sector]
+
+            if matched_sector:
+                if matched_sector in employment_sectors:
+                    weights[:, sector_nr] = reg_employment[
+                        :, employment_sectors.index(matched_sector)]
+                else:
+                    weights[:, sector_nr] = 0 # No employment for this sector
+
+    all_regions = np.ones((len(regions)), dtype=bool)
+    weights = np.repeat(weights[:, np.newaxis], len(enduses), axis=1)
+
+    is_fuel_disagg = disaggr_fuel(
+        np.array(
+            [[is_national_fuel[enduse][sector] for sector in sectors] for enduse in enduses],
+            dtype=float),
+        calc_disagg_factors(weights, all_regions, all_regions))
+
+    is_fuel_disagg = fuel_array_to_dict(is_fuel_disagg, regions, enduses, sectors)
 
     # TESTING Check if total fuel is the same before and after aggregation
     testing_functions.control_disaggregation(
@@ -517,7 +608,9 @@ def rs_disaggregate(
         enduses,
         crit_limited_disagg_pop_hdd,
         crit_limited_disagg_pop,
-        crit_full_disagg
+        crit_full_disagg,
+        reg_hdd=None,
+        station_index=None
     ):
     """Disaggregate residential fuel demand
 
@@ -527,6 +620,10 @@ def rs_disaggregate(
         Regions
     rs_national_fuel : dict
         Fuel per enduse for residential submodel
+    reg_hdd : array, default=None
+        Heating degree days of all regions. Calculated if not provided
+    station_index : WeatherStationIndex, default=None
+        Spatial index of `weather_stations`
 
     Returns
     -------
@@ -540,69 +637,52 @@ def rs_disaggregate(
     """
     logging.debug("... disagreggate residential demand")
 
-    rs_fuel_disagg = defaultdict(dict)
-
     # ---------------------------------------
     # Calculate heating degree days for regions
     # ---------------------------------------
-    rs_hdd_individ_region = hdd_cdd.get_hdd_country(
-        base_yr,
-        curr_yr,
-        regions,
-        temp_data,
-        assumptions.base_temp_diff_params,
-        assumptions.strategy_variables['rs_t_base_heating_future_yr']['scenario_value'],
-        assumptions.t_bases.rs_t_heating_by,
-        reg_coord,
-        weather_stations)
-
-    # ---------------------------------------
-    # Overall disaggregation factors per enduse
-    # ---------------------------------------
-    # Get all regions with missing floor area data
-    regions_without_floorarea = get_regions_missing_floor_area(
-        regions, scenario_data['floor_area']['rs_floorarea'], base_yr)
-    regions_with_floorarea = list(regions)
-    for reg in regions_without_floorarea:
-        regions_with_floorarea.remove(reg)
-
-    logging.info("Regions with no floor area: %s", regions_without_floorarea)
-
-    # ====================================
-    # Disaggregate for region without floor area with population
-    # ====================================
-    rs_fuel_disagg = rs_disaggr(
-        all_regions=regions,
-        regions=regions_without_floorarea,
-        base_yr=base_yr,
-        rs_hdd_individ_region=rs_hdd_individ_region,
-        scenario_data=scenario_data,
-        rs_fuel_disagg=rs_fuel_disagg,
-        rs_national_fuel=rs_national_fuel,
-        crit_limited_disagg_pop=False,
-        crit_limited_disagg_pop_hdd=True,
-        crit_full_disagg=False)
-
-    # Substract from national fuel already disaggregated fuel
-    rs_national_fuel_remaining = copy.deepcopy(rs_national_fuel)
-    for enduse in rs_national_fuel:
-        for reg in rs_fuel_disagg:
-            rs_national_fuel_remaining[enduse] = rs_national_fuel_remaining[enduse] - rs_fuel_disagg[reg][enduse]
-
-    # ====================================
-    # Disaggregate for region with floor area
-    # ====================================
-    rs_fuel_disagg = rs_disaggr(
-        all_regions=regions_with_floorarea,
-        regions=regions_with_floorarea,
-        base_yr=base_yr,
-        rs_hdd_individ_region=rs_hdd_individ_region,
-        scenario_data=scenario_data,
-        rs_fuel_disagg=rs_fuel_disagg,
-        rs_national_fuel=rs_national_fuel_remaining,
-        crit_limited_disagg_pop=crit_limited_disagg_pop,
-        crit_limited_disagg_pop_hdd=crit_limited_disagg_pop_hdd,
-        crit_full_disagg=crit_full_disagg)
+    if reg_hdd is None:
+        hdd_regions, _ = hdd_cdd.get_reg_hdd_cdd(
+            base_yr,
+            curr_yr,
+            regions,
+            temp_data,
+            assumptions.base_temp_diff_params,
+            [(assumptions.strategy_variables['rs_t_base_heating_future_yr']['scenario_value'],
+              assumptions.t_bases.rs_t_heating_by)],
+            [],
+            reg_coord,
+            weather_stations,
+            station_index)
+        reg_hdd = hdd_regions[0]
+
+    reg_pop = get_reg_values(regions, scenario_data['population'][base_yr])
+    reg_floor_area = get_reg_values(regions, scenario_data['floor_area']['rs_floorarea'][base_yr])
+
+    # Regions with missing floor area data (defined with 0.0001 if 'null' in reading in)
+    missing_floor_area = reg_floor_area == 0.0001
+
+    logging.info(
+        "Regions with no floor area: %s",
+        [region for region, missing in zip(regions, missing_floor_area) if missing])
+
+    reg_weights = {
+        'population': reg_pop,
+        'floor_area': reg_floor_area,
+        'floor_area_hdd': reg_floor_area * reg_hdd}
+
+    national_enduses = list(rs_national_fuel.keys())
+
+    rs_fuel_disagg = disaggr_regions(
+        np.array([rs_national_fuel[enduse] for enduse in national_enduses], dtype=float),
+        get_enduse_weights(national_enduses, reg_weights, RS_DISAGG_WEIGHTS['population_dd']),
+        get_enduse_weights(
+            national_enduses,
+            reg_weights,
+            RS_DISAGG_WEIGHTS[get_disagg_mode(
+                crit_limited_disagg_pop, crit_limited_disagg_pop_hdd, crit_full_disagg)]),
+        missing_floor_area)
+
+    rs_fuel_disagg = fuel_array_to_dict(rs_fuel_disagg, regions, national_enduses)
 
     # -----------------
     # Check if total fuel is the same before and after aggregation
@@ -612,83 +692,6 @@ def rs_disaggregate(
 
     return rs_fuel_disagg
 
-def rs_disaggr(
-        all_regions,
-        regions,
-        base_yr,
-        rs_hdd_individ_region,
-        scenario_data,
-        rs_fuel_disagg,
-        rs_national_fuel,
-        crit_limited_disagg_pop,
-        crit_limited_disagg_pop_hdd,
-        crit_full_disagg
-    ):
-    """Disaggregate
-    """
-    total_pop = 0
-    total_hdd_floorarea = 0
-    total_floor_area = 0
-
-    for region in all_regions:
-
-        # HDD
-        reg_hdd = rs_hdd_individ_region[region]
-
-        # Floor Area across all sectors
-        reg_floor_area = scenario_data['floor_area']['rs_floorarea'][base_yr][region]
-
-        # Population
-        reg_pop = scenario_data['population'][base_yr][region]
-
-        # National dissagregation factors
-        total_pop += reg_pop
-        total_hdd_floorarea += reg_hdd * reg_floor_area
-        total_floor_area += reg_floor_area
-
-    # ---------------------------------------
-    # Disaggregate according to enduse
-    # ---------------------------------------
-    for region in regions:
-        reg_pop = scenario_data['population'][base_yr][region]
-        reg_hdd = rs_hdd_individ_region[region]
-        reg_floor_area = scenario_data['floor_area']['rs_floorarea'][base_yr][region]
-
-        # Disaggregate fuel depending on end_use
-        for enduse in rs_national_fuel:
-            if crit_limited_disagg_pop and not crit_limited_disagg_pop_hdd and not crit_full_disagg:
-
-                # ----------------------------------
-                #logging.debug(" ... Disaggregation rss: populaton")
-                # ----------------------------------
-                reg_diasg_factor = reg_pop / total_pop
-
-            elif crit_limited_disagg_pop_hdd and not crit_full_disagg:
-
-                # -------------------
-                #logging.debug(" ... Disaggregation rss: populaton, hdd")
-                # -------------------
-                if enduse == 're_space_heating':
-                    reg_diasg_factor = (reg_hdd * reg_pop) / total_hdd_floorarea
-                else:
-                    reg_diasg_factor = reg_pop / total_pop
-            elif crit_full_disagg:
-
-                # -------------------
-                #logging.debug(" ... Disaggregation rss: populaton, hdd, floor_area")
-                # -------------------
-                if enduse == 'rs_space_heating':
-                    reg_diasg_factor = (reg_hdd * reg_floor_area) / total_hdd_floorarea
-                elif enduse == 'rs_lighting':
-                    reg_diasg_factor = reg_floor_area / total_floor_area
-                else:
-                    reg_diasg_factor = reg_pop / total_pop
-
-            # Disaggregate
-            rs_fuel_disagg[region][enduse] = rs_national_fuel[enduse] * reg_diasg_factor
-
-    return rs_fuel_disagg
-
 def write_disagg_fuel(path_to_txt, data):
     """Write out disaggregated fuel
 
@@ -787,7 +790,8 @@ def run(data):
         data['temp_data'],
         data['sectors'],
         data['sectors']['all_sectors'],
-        data['enduses'])
+        data['enduses'],
+        data['weather_station_index'])
 
     #Write to csv file disaggregated demand
     write_disagg_fuel(
@@ -11,6 +11,190 @@ from scipy.optimize import curve_fit
 from energy_demand.technologies import diffusion_technologies
 from energy_demand.plotting import plotting_program
 
+# Error in percent how close the fit of technology diffusion must be
+FIT_ERROR_RANGE = 0.0002
+
+# Fitted sigmoid parameters {(l_value, xdata, ydata, fit_assump_init, error_range): parameters}
+SIGMOID_PARAMETER_CACHE = {}
+
+def get_fit_key(l_value, xdata, ydata, fit_assump_init, error_range=FIT_ERROR_RANGE):
+    """Get key of a sigmoid fit in `SIGMOID_PARAMETER_CACHE`
+
+    Arguments
+    ----------
+    l_value : float
+        Maximum upper level
+    xdata, ydata : array
+        X and Y data of the two points
+    fit_assump_init : float
+        Small value added to L if start value is equal to L
+    error_range : float, default=FIT_ERROR_RANGE
+        Allowed fitting offset in percent
+
+    Returns
+    -------
+    key : tuple
+        Key of fit
+    """
+    return (
+        float(l_value),
+        tuple(float(i) for i in xdata),
+        tuple(float(i) for i in ydata),
+        fit_assump_init,
+        error_range)
+
+def get_fit_l_value(l_value, ydata, fit_assump_init):
+    """Get L value used for fitting. For a decreasing
+    sigmoid starting at L, a small value is added to L
+
+    Arguments
+    ----------
+    l_value : float
+        Maximum upper level
+    ydata : array
+        Y data
+    fit_assump_init : float
+        Small value added to L
+
+    Returns
+    -------
+    l_value : float
+        L value for fitting
+    """
+    if not ydata[0] < ydata[1] and l_value == ydata[0]:
+        l_value += fit_assump_init
+
+    return l_value
+
+def calc_sigmoid_parameters_closed_form(l_values, xdata, ydata, error_range=0.00002):
+    """Calculate sigmoid parameters going exactly through two
+    points for several sigmoids at once (without fitting)
+
+    Arguments
+    ----------
+    l_values : array
+        Maximum upper level of every sigmoid (sigmoids)
+    xdata : array
+        X data of two points of every sigmoid (sigmoids, 2)
+    ydata : array
+        Y data of two points of every sigmoid (sigmoids, 2)
+    error_range : float,default=0.00002
+        Allowed offset in percent
+
+    Returns
+    -------
+    fit_parameters : array
+        Midpoint and steepness of every sigmoid (sigmoids, 2)
+    solved : array
+        Whether the sigmoid could be calculated (sigmoids)
+
+    Note
+    ----
+    With y = L / (1 + exp(-k * ((x - 2000) - x0))) follows
+    ln(L / y - 1) = -k * ((x - 2000) - x0) which is solved for
+    k and x0 with the two points. Sigmoids with y <= 0, y >= L
+    or identical points cannot be calculated.
+    """
+    l_values = np.asarray(l_values, dtype=float)
+    xdata = np.asarray(xdata, dtype=float)
+    ydata = np.asarray(ydata, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        z_values = np.log(l_values[:, np.newaxis] / ydata - 1)
+
+        steepness = (z_values[:, 0] - z_values[:, 1]) / (xdata[:, 1] - xdata[:, 0])
+        midpoint = (xdata[:, 0] - 2000.0) + z_values[:, 0] / steepness
+
+        fit_parameters = np.column_stack((midpoint, steepness))
+
+        solved = np.isfinite(midpoint) & np.isfinite(steepness) & (steepness != 0)
+
+        # Check how good the fit is (as in `calc_sigmoid_parameters`)
+        y_calculated = diffusion_technologies.sigmoid_function(
+            x_value=xdata,
+            l_value=l_values[:, np.newaxis],
+            midpoint=midpoint[:, np.newaxis],
+            steepness=steepness[:, np.newaxis])
+        fit_measure_p = (100.0 / ydata) * y_calculated
+
+    solved &= np.all(
+        (fit_measure_p >= 100.0 - error_range) & (fit_measure_p <= 100.0 + error_range),
+        axis=1)
+
+    return fit_parameters, solved
+
+def calc_sigmoid_parameters_batch(
+        l_values,
+        xdata,
+        ydata,
+        fit_assump_init=0.001,
+        error_range=0.00002
+    ):
+    """Calculate sigmoid parameters of several sigmoids. All
+    sigmoids are first calculated at once in closed form. Only
+    sigmoids which cannot be calculated in closed form are fitted.
+    All parameters are stored in `SIGMOID_PARAMETER_CACHE`
+
+    Arguments
+    ----------
+    l_values : list
+        Maximum upper level of every sigmoid
+    xdata : list
+        X data of every sigmoid
+    ydata : list
+        Y data of every sigmoid
+    fit_assump_init : float
+        Small value for correct sigmoid diffusion in case start value is equal to L
+    error_range : float,default=0.00002
+        Allowed fitting offset in percent
+
+    Returns
+    -------
+    fit_parameters : list
+        Parameters of every sigmoid (None if the fitting failed)
+    """
+    keys = [
+        get_fit_key(l_value, xdata_sig, ydata_sig, fit_assump_init, error_range) for l_value, xdata_sig, ydata_sig in zip(
+            l_values, xdata, ydata)]
+
+    # Sigmoids not yet in cache
+    sigmoid_nrs = [sig_nr for sig_nr, key in enumerate(keys) if key not in SIGMOID_PARAMETER_CACHE]
+
+    if sigmoid_nrs:
+        fit_l_values = [
+            get_fit_l_value(l_values[sig_nr], ydata[sig_nr], fit_assump_init) for sig_nr in sigmoid_nrs]
+
+        fit_parameters, solved = calc_sigmoid_parameters_closed_form(
+            fit_l_values,
+            [xdata[sig_nr] for sig_nr in sigmoid_nrs],
+            [ydata[sig_nr] for sig_nr in sigmoid_nrs],
+            error_range)
+
+        for position, sig_nr in enumerate(sigmoid_nrs):
+            if solved[position]:
+                SIGMOID_PARAMETER_CACHE[keys[sig_nr]] = fit_parameters[position]
+            else:
+                try:
+                    calc_sigmoid_parameters(
+                        l_values[sig_nr],
+                        np.asarray(xdata[sig_nr]),
+                        np.asarray(ydata[sig_nr]),
+                        fit_assump_init=fit_assump_init,
+                        error_range=error_range)
+                except Exception:
+                    logging.warning(
+                        "Sigmoid fitting failed %s %s", xdata[sig_nr], ydata[sig_nr])
+                    SIGMOID_PARAMETER_CACHE[keys[sig_nr]] = None
+
+    results = []
+    for key in keys:
+        if SIGMOID_PARAMETER_CACHE[key] is None:
+            results.append(None)
+        else:
+            results.append(np.copy(SIGMOID_PARAMETER_CACHE[key]))
+
+    return results
+
 def calc_sigmoid_parameters(
         l_value,
         xdata,
@@ -42,11 +226,36 @@ def calc_sigmoid_parameters(
         `error_range` can be changed if the plotting is weird. If you increase
         chances are however hiigher that the fitting does not work anymore.
 
+        The parameters are first calculated in closed form
+        (`calc_sigmoid_parameters_closed_form`) and only fitted if this
+        is not possible. Results are stored in `SIGMOID_PARAMETER_CACHE`.
+
     Returns
     ------
     fit_parameter : array
         Parameters (first position: midpoint, second position: slope)
     """
+    key = get_fit_key(l_value, xdata, ydata, fit_assump_init, error_range)
+    try:
+        fit_parameter = SIGMOID_PARAMETER_CACHE[key]
+        if fit_parameter is None:
+            raise Exception("Error: Sigmoid curve fitting failed")
+        return np.copy(fit_parameter)
+    except KeyError:
+        pass
+
+    assert l_value >= ydata[0]
+
+    fit_parameters, solved = calc_sigmoid_parameters_closed_form(
+        [get_fit_l_value(l_value, ydata, fit_assump_init)],
+        [xdata],
+        [ydata],
+        error_range)
+
+    if solved[0]:
+        SIGMOID_PARAMETER_CACHE[key] = fit_parameters[0]
+        return np.copy(fit_parameters[0])
+
     # ---------------------------------------------
     # Generate possible starting parameters for fit
     # ---------------------------------------------
@@ -154,6 +363,8 @@ def calc_sigmoid_parameters(
                 raise Exception(
                     "Fitting did not work: Check whether start year is <= the year 2000")
 
+    SIGMOID_PARAMETER_CACHE[key] = np.copy(fit_parameter)
+
     return fit_parameter
 
 def fit_sigmoid_diffusion(
@@ -516,7 +727,6 @@ def tech_sigmoid_parameters(
     """
     rounding_accuracy = 4       # Criteria how much difference in % can be rounded
     linear_approx_crit = 0.001  # Criteria of difference in decimal from which on linear approximation is used
-    error_range = 0.0002        # Error how close the fit must be
 
     # Technologies to apply calculation
     installed_techs = s_tech_switched_p.keys()
@@ -529,36 +739,17 @@ def tech_sigmoid_parameters(
     else:
         for tech in installed_techs:
 
-            # --------
-            # Test whether technology has the market entry before or after base year,
-            # If afterwards, set very small number in market entry year
-            # --------
-            if technologies[tech].market_entry > base_yr:
-                point_x_by = technologies[tech].market_entry
-                point_y_by = fit_assump_init
-            else:
-                point_x_by = base_yr           # Base year
-                point_y_by = s_tech_by_p[tech] # Base year service share
-
-                # If the base year is the market entry year use a very small number
-                if point_y_by == 0:
-                    point_y_by = fit_assump_init
-
-            # Future energy service demand
-            point_x_ey = yr_until_switched
-            point_y_ey = s_tech_switched_p[tech]
-
-            # If future share is zero, entry small value
-            if point_y_ey == 0:
-                point_y_ey = fit_assump_init
-            elif point_y_ey == 1.0:
-                point_y_ey = 1 - fit_assump_init
-            else:
-                pass
-
             # Data of the two points
-            xdata = np.array([point_x_by, point_x_ey])
-            ydata = np.array([point_y_by, point_y_ey])
+            xdata, ydata = get_tech_sigmoid_points(
+                tech,
+                yr_until_switched,
+                base_yr,
+                technologies,
+                s_tech_by_p,
+                s_tech_switched_p,
+                fit_assump_init)
+            point_y_by = ydata[0]
+            point_y_ey = ydata[1]
 
             '''logging.info(
                 "... create sigmoid diffusion %s - %s - %s - %s - l_val: %s - %s - %s",
@@ -606,7 +797,7 @@ def tech_sigmoid_parameters(
                             xdata,
                             ydata,
                             fit_assump_init=fit_assump_init,
-                            error_range=error_range)
+                            error_range=FIT_ERROR_RANGE)
 
                         sig_params[tech]['midpoint'] = fit_parameter[0]  # midpoint (x0)
                         sig_params[tech]['steepness'] = fit_parameter[1] # Steepnes (k)
@@ -635,3 +826,148 @@ def tech_sigmoid_parameters(
                         sig_params[tech]['l_parameter'] = 'linear'
 
     return dict(sig_params)
+
+def get_tech_sigmoid_points(
+        tech,
+        yr_until_switched,
+        base_yr,
+        technologies,
+        s_tech_by_p,
+        s_tech_switched_p,
+        fit_assump_init
+    ):
+    """Get the two points through which the sigmoid
+    diffusion of a technology is fitted
+
+    Arguments
+    ----------
+    tech : str
+        Technology
+    yr_until_switched : int
+        Year until switch is fully realised
+    base_yr : int
+        base year
+    technologies : dict
+        technologies
+    s_tech_by_p : dict
+        Energy service demand for base year (1. sigmoid point)
+    s_tech_switched_p : dict
+        Service demand after fuelswitch
+    fit_assump_init : float
+        Approximation helping small number to allow fit
+
+    Returns
+    -------
+    xdata, ydata : array
+        X and Y data of the two points
+    """
+    # --------
+    # Test whether technology has the market entry before or after base year,
+    # If afterwards, set very small number in market entry year
+    # --------
+    if technologies[tech].market_entry > base_yr:
+        point_x_by = technologies[tech].market_entry
+        point_y_by = fit_assump_init
+    else:
+        point_x_by = base_yr           # Base year
+        point_y_by = s_tech_by_p[tech] # Base year service share
+
+        # If the base year is the market entry year use a very small number
+        if point_y_by == 0:
+            point_y_by = fit_assump_init
+
+    # Future energy service demand
+    point_x_ey = yr_until_switched
+    point_y_ey = s_tech_switched_p[tech]
+
+    # If future share is zero, entry small value
+    if point_y_ey == 0:
+        point_y_ey = fit_assump_init
+    elif point_y_ey == 1.0:
+        point_y_ey = 1 - fit_assump_init
+    else:
+        pass
+
+    xdata = np.array([point_x_by, point_x_ey])
+    ydata = np.array([point_y_by, point_y_ey])
+
+    return xdata, ydata
+
+def regional_tech_sigmoid_parameters(
+        regions,
+        yr_until_switched,
+        base_yr,
+        technologies,
+        l_values,
+        s_tech_by_p,
+        s_tech_switched_p,
+        fit_assump_init=0.001
+    ):
+    """Calculate sigmoid diffusion parameters for every region
+
+    The sigmoids of all regions and technologies are first
+    calculated at once (`calc_sigmoid_parameters_batch`). The
+    parameters of each region are then read from the cache of
+    fitted parameters by `tech_sigmoid_parameters`.
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    yr_until_switched : int
+        Year until switch is fully realised
+    base_yr : int
+        base year
+    technologies : dict
+        technologies
+    l_values : dict
+        L values of every region {region: {tech: l_value}}
+    s_tech_by_p : dict
+        Energy service demand for base year
+    s_tech_switched_p : dict
+        Service demand after fuelswitch of every region
+    fit_assump_init : float
+        Approximation helping small number to allow fit
+
+    Returns
+    -------
+    sig_param_tech : dict
+        Sigmoid diffusion parameters of every region
+    """
+    batch_l_values, batch_xdata, batch_ydata = [], [], []
+    for region in regions:
+        for tech in s_tech_switched_p[region]:
+            xdata, ydata = get_tech_sigmoid_points(
+                tech,
+                yr_until_switched,
+                base_yr,
+                technologies,
+                s_tech_by_p,
+                s_tech_switched_p[region],
+                fit_assump_init)
+
+            l_value = l_values[region][tech]
+            if l_value > 0 and ydata[0] != ydata[1] and l_value >= ydata[0]:
+                batch_l_values.append(l_value)
+                batch_xdata.append(xdata)
+                batch_ydata.append(ydata)
+
+    calc_sigmoid_parameters_batch(
+        batch_l_values,
+        batch_xdata,
+        batch_ydata,
+        fit_assump_init=fit_assump_init,
+        error_range=FIT_ERROR_RANGE)
+
+    sig_param_tech = {}
+    for region in regions:
+        sig_param_tech[region] = tech_sigmoid_parameters(
+            yr_until_switched,
+            base_yr,
+            technologies,
+            l_values[region],
+            s_tech_by_p,
+            s_tech_switched_p[region],
+            fit_assump_init=fit_assump_init)
+
+    return sig_param_tech
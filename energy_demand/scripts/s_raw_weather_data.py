@@ -5,8 +5,12 @@ import re
 import csv
 from datetime import date
 import collections
-import numpy as np
 import logging
+import numpy as np
+import pandas as pd
+
+# Columns of MIDAS hourly weather data (date, station id, air temperature)
+MIDAS_COLUMNS = {'date': 0, 'station_id': 5, 'air_temp': 35}
 
 def read_weather_data_raw(path_to_csv, placeholder_value=999):
     """Read in raw weather data
@@ -71,6 +75,117 @@ def read_weather_data_raw(path_to_csv, placeholder_value=999):
 
     return temp_stations
 
+def read_weather_data_raw_chunked(
+        path_to_csv,
+        placeholder_value=999,
+        chunksize=1000000,
+        year=None
+    ):
+    """Read in raw weather data in chunks. Only the date, station and
+    air temperature columns are read and all records of a chunk are
+    converted and added at once (same result as `read_weather_data_raw`)
+
+    Arguments
+    ----------
+    path_to_csv : string
+        Path to weather data csv
+    placeholder_value : int,default=999
+        Placeholder number which is used
+        in case no measurement exists for an hour
+    chunksize : int, default=1000000
+        Number of rows read at once
+    year : int, default=None
+        If provided, only measurements of this year are read
+
+    Returns
+    -------
+    station_ids : array
+        Weather station IDs (stations)
+    temp_stations_yh : array
+        Temperature data in Degree Celsius (stations, 365, 24)
+
+    Note
+    ----
+    Measurements on the 366th day of leap years are ignored
+    """
+    station_nrs = {}
+    temp_stations_yh = np.zeros((0, 365, 24), dtype=float)
+
+    chunks = pd.read_csv(
+        path_to_csv,
+        header=None,
+        usecols=list(MIDAS_COLUMNS.values()),
+        dtype={MIDAS_COLUMNS['date']: str, MIDAS_COLUMNS['air_temp']: str},
+        chunksize=chunksize)
+
+    for chunk in chunks:
+        date_hour = chunk[MIDAS_COLUMNS['date']].str.split(" ", n=1, expand=True)
+        dates = pd.to_datetime(date_hour[0], format="%Y-%m-%d")
+        yeardays = dates.dt.dayofyear.values - 1
+        hours = date_hour[1].str[:2].astype(int).values
+        station_ids_chunk = chunk[MIDAS_COLUMNS['station_id']].astype(int).values
+
+        # Air temperature in Degrees Celcius (placeholder if no data point)
+        air_temps = pd.to_numeric(
+            chunk[MIDAS_COLUMNS['air_temp']].str.strip(),
+            errors='coerce').fillna(placeholder_value).values
+
+        if year is None:
+            selection = np.ones((len(chunk)), dtype=bool)
+        else:
+            selection = dates.dt.year.values == year
+
+        if np.any(yeardays[selection] >= 365):
+            logging.info("... ignore measurements of 366th day of year")
+        selection &= yeardays < 365
+
+        # Add weather stations which are not already added
+        chunk_station_ids, chunk_station_positions = np.unique(
+            station_ids_chunk[selection], return_inverse=True)
+
+        for station_id in chunk_station_ids:
+            if station_id not in station_nrs:
+                station_nrs[station_id] = len(station_nrs)
+
+        if len(station_nrs) > temp_stations_yh.shape[0]:
+            temp_stations_yh = np.concatenate([
+                temp_stations_yh,
+                np.zeros((len(station_nrs) - temp_stations_yh.shape[0], 365, 24))])
+
+        station_nrs_chunk = np.array(
+            [station_nrs[station_id] for station_id in chunk_station_ids],
+            dtype=int)[chunk_station_positions]
+
+        temp_stations_yh[
+            station_nrs_chunk,
+            yeardays[selection],
+            hours[selection]] = air_temps[selection]
+
+    station_ids = np.array(list(station_nrs.keys()), dtype=int)
+
+    return station_ids, temp_stations_yh
+
+def temp_stations_to_dict(station_ids, temp_stations_yh):
+    """Convert stacked temperatures of weather stations to dict
+
+    Arguments
+    ----------
+    station_ids : array
+        Weather station IDs (stations)
+    temp_stations_yh : array
+        Temperature data (stations, 365, 24)
+
+    Returns
+    -------
+    temp_stations : dict
+        Temperature data (e.g. {'station_id: np.array((yeardays, 24))})
+    """
+    temp_stations = {}
+    for station_nr, station_id in enumerate(station_ids):
+        temp_stations[int(station_id)] = temp_stations_yh[station_nr]
+
+    return temp_stations
+
 def date_to_yearday(year, month, day):
     """Gets the yearday (julian year day) of a year minus one to correct because of python iteration
 
@@ -261,6 +376,31 @@ def write_weather_data(path_to_txt, weather_data):
     logging.info("... finished write_weather_data")
     return
 
+def write_weather_data_npy(path_to_folder, weather_data):
+    """Write wheather data of all stations as binary
+    '.npy' files which can be memory-mapped
+
+    Arguments
+    ----------
+    path_to_folder : str
+        Out path
+    weather_data : dict
+        Weather data
+
+    Note
+    ----
+    The temperatures are stored in 'temp_stations_yh.npy'
+    (stations, 365, 24) and the station IDs in 'temp_station_ids.npy'
+    """
+    station_ids = list(weather_data.keys())
+
+    np.save(
+        os.path.join(path_to_folder, "temp_stations_yh.npy"),
+        np.array([weather_data[station_id] for station_id in station_ids], dtype=float))
+    np.save(
+        os.path.join(path_to_folder, "temp_station_ids.npy"),
+        np.array(station_ids, dtype=int))
+
 def write_weather_stations(path_to_txt, weather_station):
     """Write wheather station data to csv file
 
@@ -288,8 +428,9 @@ def run(local_paths):
     logging.info("... start script %s", os.path.basename(__file__))
 
     # Read in raw temperature data
-    temp_data_raw = read_weather_data_raw(
+    station_ids, temp_stations_yh = read_weather_data_raw_chunked(
         local_paths['folder_path_weater_data'])
+    temp_data_raw = temp_stations_to_dict(station_ids, temp_stations_yh)
 
     stations_outside_UK = [
         1605, # St. Helena
@@ -316,6 +457,10 @@ def run(local_paths):
         local_paths['dir_raw_weather_data'],
         temp_data)
 
+    write_weather_data_npy(
+        local_paths['dir_raw_weather_data'],
+        temp_data)
+
     logging.info("... finished script %s", os.path.basename(__file__))
     print("... finished script %s", os.path.basename(__file__))
     return
@@ -2,6 +2,7 @@
 """
 import logging
 from collections import defaultdict
+import numpy as np
 from energy_demand.technologies import tech_related
 from energy_demand.read_write import read_data
 from energy_demand.basic import basic_functions
@@ -229,6 +230,9 @@ def autocomplete_switches(
         Specified technologies of an enduse
     s_tech_by_p : dict
         Share of service of technology in base year
+    service_switches_from_capacity : list, dict or RegionalServiceSwitches
+        Service switches calculated from capacity switches (of every region
+        if spatial explicit diffusion)
 
     Returns
     -------
@@ -236,7 +240,25 @@ def autocomplete_switches(
         Shares per technology in end year
     service_switches_out : list
         Added services switches which now in total sum up to 100%
+
+    Note
+    ----
+    If the service switches of capacity switches are provided as
+    `RegionalServiceSwitches`, the regional switches are calculated
+    for all regions at once (see `autocomplete_switches_regions`)
     """
+    if spatial_exliclit_diffusion and isinstance(
+            service_switches_from_capacity, RegionalServiceSwitches):
+        return autocomplete_switches_regions(
+            service_switches,
+            specified_tech_enduse_by,
+            s_tech_by_p,
+            regions,
+            f_diffusion,
+            techs_affected_spatial_f,
+            sector=sector,
+            service_switches_from_capacity=service_switches_from_capacity)
+
     # Get all enduses defined in switches
     enduses = set([])
     for switch in service_switches:
@@ -426,28 +448,8 @@ def capacity_switch(
             # Iterate capacity switches
             for switch in enduse_capacity_switches:
 
-                if switch.sector is None:
-
-                    # Check depth of dict
-                    depth_dict = basic_functions.dict_depth(
-                        fuel_shares_enduse_by)
-
-                    if depth_dict == 3:
-                        # Fuel share are only given per enduses
-                        fuel_shares = fuel_shares_enduse_by[enduse]
-                        fuel_to_use = fuels[enduse]
-                        sector = switch.sector
-                    elif depth_dict == 4:
-                        # Fuel shares are provide per enduse and sectors
-                        any_sector = list(fuel_shares_enduse_by[enduse].keys())[0]
-                        fuel_shares = fuel_shares_enduse_by[enduse][any_sector]
-                        fuel_to_use = sum_fuel_across_sectors(fuels[enduse])
-                        sector = None
-                else:
-                    # Get fuel share specifically for the enduse and sector
-                    fuel_shares = fuel_shares_enduse_by[enduse][switch.sector]
-                    fuel_to_use = fuels[enduse]
-                    sector = switch.sector
+                fuel_shares, fuel_to_use, sector = get_capacity_switch_fuels(
+                    enduse, switch, fuels, fuel_shares_enduse_by)
 
                 # Calculate service switches
                 enduse_service_switches = create_service_switch(
@@ -466,6 +468,55 @@ def capacity_switch(
 
     return service_switches
 
+def get_capacity_switch_fuels(enduse, switch, fuels, fuel_shares_enduse_by):
+    """Get fuel shares and fuel of the enduse (and sector)
+    of a capacity switch
+
+    Arguments
+    ---------
+    enduse : str
+        Enduse
+    switch : obj
+        Capacity switch
+    fuels : dict
+        Fuels
+    fuel_shares_enduse_by : dict
+        Fuel technology shares in base year
+
+    Returns
+    -------
+    fuel_shares : dict
+        Fuel shares of technologies per fueltype
+    fuel_to_use : array
+        Fuel of enduse
+    sector : str
+        Sector of service switches
+    """
+    if switch.sector is None:
+
+        # Check depth of dict
+        depth_dict = basic_functions.dict_depth(
+            fuel_shares_enduse_by)
+
+        if depth_dict == 3:
+            # Fuel share are only given per enduses
+            fuel_shares = fuel_shares_enduse_by[enduse]
+            fuel_to_use = fuels[enduse]
+            sector = switch.sector
+        elif depth_dict == 4:
+            # Fuel shares are provide per enduse and sectors
+            any_sector = list(fuel_shares_enduse_by[enduse].keys())[0]
+            fuel_shares = fuel_shares_enduse_by[enduse][any_sector]
+            fuel_to_use = sum_fuel_across_sectors(fuels[enduse])
+            sector = None
+    else:
+        # Get fuel share specifically for the enduse and sector
+        fuel_shares = fuel_shares_enduse_by[enduse][switch.sector]
+        fuel_to_use = fuels[enduse]
+        sector = switch.sector
+
+    return fuel_shares, fuel_to_use, sector
+
 def create_service_switch(
         enduse,
         sector,
@@ -524,25 +575,13 @@ def create_service_switch(
     # ---------------------------------------------
     # Calculate service per technology for end year
     # ---------------------------------------------
-    service_enduse_tech = {}
-
-    for fueltype, tech_fuel_shares in fuel_shares_enduse_by.items():
-        for tech, fuel_share_by in tech_fuel_shares.items():
-
-            # Efficiency of year when capacity is fully installed
-            eff_ey = tech_related.calc_eff_cy(
-                base_yr,
-                switch.switch_yr,
-                technologies[tech].eff_by,
-                technologies[tech].eff_ey,
-                technologies[tech].year_eff_ey,
-                other_enduse_mode_info,
-                technologies[tech].eff_achieved,
-                technologies[tech].diff_method)
-
-            # Convert to service (fuel * fuelshare * eff)
-            s_tech_ey_y = fuel_enduse_y[fueltype] * fuel_share_by * eff_ey
-            service_enduse_tech[tech] = s_tech_ey_y
+    service_enduse_tech = get_service_tech_ey(
+        switch.switch_yr,
+        technologies,
+        other_enduse_mode_info,
+        fuel_shares_enduse_by,
+        base_yr,
+        fuel_enduse_y)
 
     # -------------------------------------------
     # Calculate service of installed capacity of increased
@@ -550,15 +589,12 @@ def create_service_switch(
     # -------------------------------------------
     for switch in enduse_capacity_switches:
 
-        eff_ey = tech_related.calc_eff_cy(
-            base_yr,
+        eff_ey = get_eff_ey(
+            switch.technology_install,
             switch.switch_yr,
-            technologies[switch.technology_install].eff_by,
-            technologies[switch.technology_install].eff_ey,
-            technologies[switch.technology_install].year_eff_ey,
+            technologies,
             other_enduse_mode_info,
-            technologies[switch.technology_install].eff_achieved,
-            technologies[switch.technology_install].diff_method)
+            base_yr)
 
         # Convert installed capacity to service
         installed_capacity_ey = switch.installed_capacity * eff_ey
@@ -590,6 +626,83 @@ def create_service_switch(
 
     return service_switches_enduse
 
+def get_eff_ey(tech, switch_yr, technologies, other_enduse_mode_info, base_yr):
+    """Efficiency of a technology in the year when
+    the capacity is fully installed
+
+    Arguments
+    ---------
+    tech : str
+        Technology
+    switch_yr : int
+        Year until switch happens
+    technologies : dict
+        Technologies
+    other_enduse_mode_info : dict
+        OTher diffusion information
+    base_yr : int
+        base year
+
+    Returns
+    -------
+    eff_ey : float
+        Efficiency
+    """
+    return tech_related.calc_eff_cy(
+        base_yr,
+        switch_yr,
+        technologies[tech].eff_by,
+        technologies[tech].eff_ey,
+        technologies[tech].year_eff_ey,
+        other_enduse_mode_info,
+        technologies[tech].eff_achieved,
+        technologies[tech].diff_method)
+
+def get_service_tech_ey(
+        switch_yr,
+        technologies,
+        other_enduse_mode_info,
+        fuel_shares_enduse_by,
+        base_yr,
+        fuel_enduse_y
+    ):
+    """Calculate service per technology for end year
+    (fuel * fuelshare * eff)
+
+    Arguments
+    ---------
+    switch_yr : int
+        Year until switch happens
+    technologies : dict
+        Technologies
+    other_enduse_mode_info : dict
+        OTher diffusion information
+    fuel_shares_enduse_by : dict
+        Fuel shares per enduse for base year
+    base_yr : int
+        base year
+    fuel_enduse_y : dict
+        Fuels
+
+    Returns
+    -------
+    service_enduse_tech : dict
+        Service per technology
+    """
+    service_enduse_tech = {}
+
+    for fueltype, tech_fuel_shares in fuel_shares_enduse_by.items():
+        for tech, fuel_share_by in tech_fuel_shares.items():
+
+            # Efficiency of year when capacity is fully installed
+            eff_ey = get_eff_ey(
+                tech, switch_yr, technologies, other_enduse_mode_info, base_yr)
+
+            # Convert to service (fuel * fuelshare * eff)
+            service_enduse_tech[tech] = fuel_enduse_y[fueltype] * fuel_share_by * eff_ey
+
+    return service_enduse_tech
+
 def get_fuel_switches_enduse(switches, enduse, regional_specific=False):
     """Get all fuel switches of a specific enduse
 
@@ -654,3 +767,362 @@ def switches_to_dict(service_switches, regional_specific):
         assert round(sum(s_tech_by_p.values()), 3) == 1
 
     return dict(s_tech_by_p)
+
+class RegionalServiceSwitches(object):
+    """Service switches of all regions stored as service share
+    of every technology in end year in an array
+    (regions, enduses, technologies)
+
+    Arguments
+    ----------
+    regions : list
+        Regions
+    enduses : list
+        Enduses
+    technologies : list
+        Technologies
+
+    Note
+    ----
+    Shares of technologies without a switch in an enduse are `np.nan`.
+    The service switch objects of every region can be created
+    with `get_switches`.
+    """
+    def __init__(self, regions, enduses, technologies):
+        self.regions = list(regions)
+        self.enduses = dict((enduse, enduse_nr) for enduse_nr, enduse in enumerate(enduses))
+        self.technologies = dict((tech, tech_nr) for tech_nr, tech in enumerate(technologies))
+
+        self.shares = np.full(
+            (len(self.regions), len(self.enduses), len(self.technologies)), np.nan)
+        self.sectors = {}
+        self.switch_yrs = {}
+
+    def set_shares(self, enduse, tech, reg_shares, sector, switch_yr):
+        """Set service share of a technology in end year of all regions
+
+        Arguments
+        ----------
+        enduse : str
+            Enduse
+        tech : str
+            Technology
+        reg_shares : array or float
+            Service share of every region
+        sector : str
+            Sector
+        switch_yr : int
+            Year until switch is fully realised
+        """
+        self.shares[:, self.enduses[enduse], self.technologies[tech]] = reg_shares
+        self.sectors[enduse] = sector
+        self.switch_yrs[enduse] = switch_yr
+
+    def update(self, service_switches):
+        """Overwrite shares with all defined shares
+        of other regional service switches
+
+        Arguments
+        ----------
+        service_switches : RegionalServiceSwitches
+            Service switches of the same regions
+        """
+        for enduse, enduse_nr in service_switches.enduses.items():
+            for tech, tech_nr in service_switches.technologies.items():
+                reg_shares = service_switches.shares[:, enduse_nr, tech_nr]
+
+                if not np.all(np.isnan(reg_shares)):
+                    self.set_shares(
+                        enduse,
+                        tech,
+                        reg_shares,
+                        service_switches.sectors[enduse],
+                        service_switches.switch_yrs[enduse])
+
+    def get_share_s_tech_ey(self, specified_tech_enduse_by):
+        """Get fraction of service for each technology
+        defined in a switch for the future year
+        (see `get_share_s_tech_ey`)
+
+        Arguments
+        ---------
+        specified_tech_enduse_by : list
+            Technologies defined per enduse for base year
+
+        Return
+        ------
+        enduse_tech_ey_p : dict
+            Share per technology in ey {enduse: {region: {tech: share}}}
+        """
+        enduse_tech_ey_p = {}
+
+        for enduse, enduse_nr in self.enduses.items():
+            enduse_tech_ey_p[enduse] = {}
+
+            defined_techs = [
+                (tech, tech_nr) for tech, tech_nr in self.technologies.items()
+                if not np.all(np.isnan(self.shares[:, enduse_nr, tech_nr]))]
+
+            for reg_nr, region in enumerate(self.regions):
+                enduse_tech_ey_p[enduse][region] = dict(
+                    (tech, float(self.shares[reg_nr, enduse_nr, tech_nr]))
+                    for tech, tech_nr in defined_techs)
+
+        # Add all other enduses for which no switch is defined
+        for enduse in specified_tech_enduse_by:
+            if enduse not in enduse_tech_ey_p:
+                enduse_tech_ey_p[enduse] = dict((region, {}) for region in self.regions)
+
+        return enduse_tech_ey_p
+
+    def get_switches(self):
+        """Create service switches of every region
+
+        Returns
+        -------
+        service_switches : dict
+            Service switches of every region {region: [switch]}
+        """
+        service_switches = dict((region, []) for region in self.regions)
+
+        for enduse, enduse_nr in self.enduses.items():
+            for tech, tech_nr in self.technologies.items():
+                reg_shares = self.shares[:, enduse_nr, tech_nr]
+
+                if not np.all(np.isnan(reg_shares)):
+                    for region, service_share_ey in zip(self.regions, reg_shares):
+                        service_switches[region].append(
+                            read_data.ServiceSwitch(
+                                enduse=enduse,
+                                sector=self.sectors[enduse],
+                                technology_install=tech,
+                                service_share_ey=float(service_share_ey),
+                                switch_yr=self.switch_yrs[enduse]))
+
+        return service_switches
+
+def capacity_switch_regions(
+        capacity_switches,
+        regions,
+        spatial_factors,
+        technologies,
+        other_enduse_mode_info,
+        fuels,
+        fuel_shares_enduse_by,
+        base_yr
+    ):
+    """Create service switches of all regions based on
+    national capacity switches which are distributed to
+    the regions with spatial factors (see `capacity_switch`)
+
+    Arguments
+    ---------
+    capacity_switches : list
+        National capacity switches
+    regions : list
+        Regions
+    spatial_factors : dict
+        Spatial factor per enduse and region
+    technologies : dict
+        Technologies
+    other_enduse_mode_info : dict
+        Generic sigmoid diffusion information
+    fuels : dict
+        Fuels
+    fuel_shares_enduse_by : dict
+        Fuel technology shares in base year
+    base_yr : int
+        Base year
+
+    Returns
+    -------
+    service_switches : RegionalServiceSwitches
+        Service switches of all regions
+
+    Note
+    ----
+    The service of the technologies in the base year is the same
+    for all regions, only the installed capacity is regional.
+    """
+    # Get all capacity switches of every enduse
+    enduse_capacity_switches = defaultdict(list)
+    for switch in capacity_switches:
+        enduse_capacity_switches[switch.enduse].append(switch)
+
+    # Service per technology in end year without installed capacity
+    enduse_service_tech = {}
+    enduse_sectors = {}
+    switch_technologies = set([])
+    for enduse, switches in enduse_capacity_switches.items():
+
+        # As in `capacity_switch`, the last switch of an enduse defines fuels and year
+        fuel_shares, fuel_to_use, enduse_sectors[enduse] = get_capacity_switch_fuels(
+            enduse, switches[-1], fuels, fuel_shares_enduse_by)
+
+        enduse_service_tech[enduse] = get_service_tech_ey(
+            switches[-1].switch_yr,
+            technologies,
+            other_enduse_mode_info,
+            fuel_shares,
+            base_yr,
+            fuel_to_use)
+        switch_technologies.update(enduse_service_tech[enduse].keys())
+
+    service_switches = RegionalServiceSwitches(
+        regions, list(enduse_capacity_switches.keys()), sorted(switch_technologies))
+
+    for enduse, switches in enduse_capacity_switches.items():
+        enduse_techs = list(enduse_service_tech[enduse].keys())
+        reg_spatial_factors = np.array([spatial_factors[enduse][region] for region in regions])
+
+        service_tech = np.tile(
+            np.array([enduse_service_tech[enduse][tech] for tech in enduse_techs], dtype=float),
+            (len(regions), 1))
+
+        # Add service of regional installed capacity
+        for switch in switches:
+            eff_ey = get_eff_ey(
+                switch.technology_install,
+                switch.switch_yr,
+                technologies,
+                other_enduse_mode_info,
+                base_yr)
+
+            service_tech[:, enduse_techs.index(switch.technology_install)] += (
+                switch.installed_capacity * reg_spatial_factors * eff_ey)
+
+        # Calculate service in % per enduse
+        service_tech_p = service_tech / np.sum(service_tech, axis=1)[:, np.newaxis]
+
+        for tech_nr, tech in enumerate(enduse_techs):
+            service_switches.set_shares(
+                enduse,
+                tech,
+                service_tech_p[:, tech_nr],
+                enduse_sectors[enduse],
+                switches[-1].switch_yr)
+
+    return service_switches
+
+def autocomplete_switches_regions(
+        service_switches,
+        specified_tech_enduse_by,
+        s_tech_by_p,
+        regions,
+        f_diffusion,
+        techs_affected_spatial_f,
+        sector=False,
+        service_switches_from_capacity=None
+    ):
+    """Add not defined technologies in switches and set
+    correct future service share of all regions
+    (see `autocomplete_switches`)
+
+    Arguments
+    ---------
+    service_switches : list
+        Defined national service switches
+    specified_tech_enduse_by : dict
+        Specified technologies of an enduse
+    s_tech_by_p : dict
+        Share of service of technology in base year
+    regions : list
+        Regions
+    f_diffusion : dict
+        Spatial diffusion factor per enduse and region
+    techs_affected_spatial_f : list
+        Technologies which are affected by spatially heterogeneous diffusion
+    sector : str, default=False
+        Sector
+    service_switches_from_capacity : RegionalServiceSwitches, default=None
+        Service switches of all regions calculated from capacity switches
+
+    Returns
+    -------
+    reg_share_s_tech_ey_p : dict
+        Shares per technology in end year {enduse: {region: {tech: share}}}
+    service_switches_out : dict
+        Service switches of every region which now in total sum up to 100%
+    """
+    # Get all switches of every enduse
+    enduse_switches = defaultdict(list)
+    for switch in service_switches:
+        enduse_switches[switch.enduse].append(switch)
+
+    enduses = list(enduse_switches.keys())
+    all_technologies = set([switch.technology_install for switch in service_switches])
+    for enduse in enduses:
+        all_technologies.update(specified_tech_enduse_by[enduse])
+
+    if service_switches_from_capacity is not None:
+        for enduse in service_switches_from_capacity.enduses:
+            if enduse not in enduse_switches:
+                enduses.append(enduse)
+        all_technologies.update(service_switches_from_capacity.technologies.keys())
+
+    regional_switches = RegionalServiceSwitches(regions, enduses, sorted(all_technologies))
+
+    # Defined service switches overwrite service switches of capacity switches
+    if service_switches_from_capacity is not None:
+        regional_switches.update(service_switches_from_capacity)
+
+    for enduse, switches in enduse_switches.items():
+        s_tot_defined = np.zeros((len(regions)), dtype=float)
+        switch_technologies = []
+
+        for switch in switches:
+
+            # IF technology is affected by spatial exlicit diffusion
+            if switch.technology_install in techs_affected_spatial_f:
+
+                # Regional diffusion calculation (capped to one)
+                max_crit = 1
+                s_share_ey_regional = np.minimum(
+                    switch.service_share_ey * np.array(
+                        [f_diffusion[enduse][region] for region in regions]),
+                    max_crit)
+
+                s_tot_regional = s_tot_defined + s_share_ey_regional
+                larger_than_one = s_tot_regional > 1.0
+
+                if np.any(np.round(s_tot_regional[larger_than_one]) > 1):
+                    raise Exception(
+                        "More than one technology switched with larger share {} {}".format(
+                            enduse, switch.technology_install))
+
+                s_share_ey_regional = np.where(
+                    larger_than_one, max_crit - s_share_ey_regional, s_share_ey_regional)
+            else:
+                s_share_ey_regional = np.full(
+                    (len(regions)), switch.service_share_ey, dtype=float)
+
+            regional_switches.set_shares(
+                enduse,
+                switch.technology_install,
+                s_share_ey_regional,
+                switch.sector,
+                switch.switch_yr)
+
+            s_tot_defined += s_share_ey_regional
+            switch_technologies.append(switch.technology_install)
+
+        # Reduce service of not switched technologies proportionally
+        tech_not_assigned = [
+            tech for tech in specified_tech_enduse_by[enduse] if tech not in switch_technologies]
+
+        if tech_not_assigned:
+            tech_not_assigned_by_p = np.array(
+                [s_tech_by_p[enduse][tech] for tech in tech_not_assigned], dtype=float)
+            tech_not_assigned_by_p = tech_not_assigned_by_p / np.sum(tech_not_assigned_by_p)
+
+            for tech, tech_by_p in zip(tech_not_assigned, tech_not_assigned_by_p):
+                regional_switches.set_shares(
+                    enduse,
+                    tech,
+                    np.where(s_tot_defined == 1.0, 0, tech_by_p * (1 - s_tot_defined)),
+                    sector,
+                    switches[-1].switch_yr)
+
+    return (
+        regional_switches.get_share_s_tech_ey(specified_tech_enduse_by),
+        regional_switches.get_switches())
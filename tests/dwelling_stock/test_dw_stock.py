@@ -1,5 +1,6 @@
 """Testing functions ``dwelling_stock`` ``dw_stock``
 """
+import numpy as np
 from energy_demand.dwelling_stock import dw_stock
 
 def test_get_tot_pop():
@@ -83,3 +84,64 @@ def test_dwelling():
     out_value = classobject.heating
 
     assert out_value == expected
+
+def test_dwelling_stock_array():
+    """Compare array based dwelling stock with dwelling objects
+    """
+    scenario_drivers = {
+        'heating': ['floorarea', 'hlc'],
+        'cooking': ['population', 'gva'],
+        'lighting': ['gva', 'population', 'floorarea']}
+    enduses = ['heating', 'cooking', 'lighting', 'other']
+
+    dwelling_objects = [
+        dw_stock.Dwelling(
+            2015,
+            {'longitude': 10, 'latitude': 10},
+            floorarea,
+            enduses,
+            scenario_drivers,
+            population=population,
+            age=age,
+            dwtype=dwtype,
+            gva=3.0)
+        for floorarea, population, age, dwtype in [
+            (100.0, 2.2, 1950.0, 'detached'),
+            (80.0, None, 1990.0, 'flat'),
+            (50.0, 1.5, None, None)]]
+
+    dwellings = dw_stock.create_dwellings(
+        floorarea=[100.0, 80.0, 50.0],
+        population=[2.2, np.nan, 1.5],
+        age=[1950.0, 1990.0, np.nan],
+        dwtype=['detached', 'flat', ''],
+        gva=3.0)
+
+    stock_objects = dw_stock.DwellingStock('bern', dwelling_objects, enduses)
+    stock_array = dw_stock.DwellingStock('bern', dwellings, enduses, scenario_drivers)
+
+    np.testing.assert_allclose(stock_array.dwellings['hlc'][:2], [
+        dw_stock.get_hlc('detached', 1950.0), dw_stock.get_hlc('flat', 1990.0)])
+    assert np.isnan(stock_array.dwellings['hlc'][2])
+
+    for enduse in enduses:
+        np.testing.assert_almost_equal(
+            getattr(stock_array, enduse), getattr(stock_objects, enduse))
+    assert stock_array.population is None
+    assert not hasattr(stock_array, 'not_an_enduse')
+
+def test_calc_reg_scenario_drivers():
+    """Testing
+    """
+    dwellings = dw_stock.create_dwellings(
+        floorarea=[100.0, 80.0, 50.0, 20.0],
+        population=[2.0, 3.0, 1.0, 4.0])
+
+    out_value = dw_stock.calc_reg_scenario_drivers(
+        dwellings,
+        np.array([0, 2, 0, 2]),
+        3,
+        ['heating', 'other'],
+        {'heating': ['population', 'floorarea']})
+
+    np.testing.assert_allclose(out_value, [[250.0, 2.0], [0.0, 0.0], [320.0, 2.0]])
@@ -1,3 +1,4 @@
+import numpy as np
 from energy_demand.geography import spatial_diffusion
 
 '''def test_calc_regional_services():
@@ -31,4 +32,119 @@ from energy_demand.geography import spatial_diffusion
         print(_scrap * switches_cont['rs_share_s_tech_ey_p']['rs_space_heating']['heat_pumps_electricity'])
 
 
-'''
\ No newline at end of file
+'''
+def test_regional_strategy_variables():
+    """Testing
+    """
+    strategy_variables = {
+        'var_a': {'scenario_value': 0.5, 'affected_enduse': ['rs_space_heating']},
+        'var_b': {'scenario_value': 2015, 'affected_enduse': []}}
+
+    regional_strategy_variables = spatial_diffusion.RegionalStrategyVariables(
+        ['regA', 'regB'], strategy_variables)
+    regional_strategy_variables.set_values('var_a', {'regA': 0.2, 'regB': 0.8})
+
+    assert regional_strategy_variables.values.shape == (2, 2)
+    assert list(regional_strategy_variables.get_values('var_a')) == [0.2, 0.8]
+
+    reg_strategy_variables = regional_strategy_variables['regB']
+    assert reg_strategy_variables['var_a'] == {
+        'scenario_value': 0.8, 'affected_enduse': ['rs_space_heating']}
+    assert reg_strategy_variables['var_b']['scenario_value'] == 2015
+    assert sorted(reg_strategy_variables) == ['var_a', 'var_b']
+    assert 'var_c' not in reg_strategy_variables
+
+    regions_strategy_variables = regional_strategy_variables.get_regions_strategy_variables(
+        ['regB', 'regA'])
+    assert list(regions_strategy_variables['var_a']['scenario_value']) == [0.8, 0.2]
+    assert regions_strategy_variables['var_a']['affected_enduse'] == ['rs_space_heating']
+
+def test_regional_strategy_variables_no_affected_enduse():
+    """Testing
+    """
+    regional_strategy_variables = spatial_diffusion.RegionalStrategyVariables(
+        ['regA', 'regB'], {'var_a': {'scenario_value': 0.5, 'units': 'decimal'}})
+
+    assert regional_strategy_variables['regA']['var_a'] == {
+        'scenario_value': 0.5, 'affected_enduse': []}
+
+def test_cap_outliers():
+    """Testing
+    """
+    out_value = spatial_diffusion.cap_outliers(np.array([5.0, 1.0, 9.0, 3.0, 7.0]), 2)
+
+    np.testing.assert_array_equal(out_value, [5.0, 1.0, 7.0, 3.0, 7.0])
+
+def test_realdata_to_spatialdiffval():
+    """Testing
+    """
+    real_values = {'regA': 1.0, 'regB': 3.0, 'regC': 2.0}
+
+    out_value = spatial_diffusion.realdata_to_spatialdiffval(
+        ['regA', 'regB', 'regC', 'regD'], real_values, speed_con_max=3.0)
+
+    # Fewer values than outliers, i.e. no values are capped
+    assert real_values == {'regA': 1.0, 'regB': 3.0, 'regC': 2.0}
+    np.testing.assert_almost_equal(out_value['regA'], 2 / 3.0 + 1)
+    np.testing.assert_almost_equal(out_value['regB'], 3.0)
+    np.testing.assert_almost_equal(out_value['regD'], out_value['regC'])
+
+def test_calc_diffusion_f():
+    """Testing
+    """
+    regions = ['regA', 'regB']
+    rs_fuels = {
+        'regA': {'rs_space_heating': np.array([10.0, 10.0])},
+        'regB': {'rs_space_heating': np.array([30.0, 50.0])}}
+    ss_fuels = {
+        'regA': {'ss_lighting': {'offices': np.array([5.0]), 'retail': np.array([5.0])}},
+        'regB': {'ss_lighting': {'offices': np.array([10.0]), 'retail': np.array([20.0])}}}
+
+    f_reg_norm_abs, f_reg_norm = spatial_diffusion.calc_diffusion_f(
+        regions,
+        {'regA': 1.0, 'regB': 0.5},
+        {'regA': 2.0, 'regB': 1.0},
+        [rs_fuels, ss_fuels])
+
+    np.testing.assert_almost_equal(f_reg_norm_abs['rs_space_heating']['regA'], 40 / 120.0)
+    np.testing.assert_almost_equal(f_reg_norm_abs['ss_lighting']['regB'], 30 / 50.0)
+    np.testing.assert_almost_equal(f_reg_norm['rs_space_heating']['regA'], 1.0 / 0.6)
+    np.testing.assert_almost_equal(f_reg_norm['ss_lighting']['regB'], 0.5 / 0.625)
+
+def test_calc_regional_services():
+    """Testing
+    """
+    out_value = spatial_diffusion.calc_regional_services(
+        'rs_space_heating',
+        {'heat_pumps_electricity': 0.6, 'boiler_gas': 0.4},
+        ['regA', 'regB'],
+        {'rs_space_heating': {'regA': 0.5, 'regB': 2.0}},
+        {},
+        ['heat_pumps_electricity'])
+
+    assert out_value == {
+        'regA': {'heat_pumps_electricity': 0.3, 'boiler_gas': 0.4},
+        'regB': {'heat_pumps_electricity': 1.0, 'boiler_gas': 0.4}}
+
+def test_factor_improvements_single():
+    """Testing
+    """
+    out_value = spatial_diffusion.factor_improvements_single(
+        factor_uk=0.5,
+        regions=['regA', 'regB'],
+        f_reg={'regA': 1.0, 'regB': 0.5},
+        f_reg_norm={},
+        f_reg_norm_abs={'regA': 3.0, 'regB': 1.0},
+        fuel_regs_enduse={'regA': np.array([1.0]), 'regB': np.array([3.0])})
+
+    assert out_value == {'regA': 1.0, 'regB': 0.5}
+
+    out_value = spatial_diffusion.factor_improvements_single(
+        factor_uk=0.5,
+        regions=['regA', 'regB'],
+        f_reg={'regA': 1.0, 'regB': 0.5},
+        f_reg_norm={},
+        f_reg_norm_abs={},
+        fuel_regs_enduse={})
+
+    assert out_value == {'regA': 0.5, 'regB': 0.25}
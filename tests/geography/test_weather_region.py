@@ -99,3 +99,109 @@ def test_change_temp_climate():
 
     assert result[30][0] == 5 + 2
     assert result[40][0] == 10 + 3
+
+def test_get_weather_region_key():
+    """Testing
+    """
+    temp_by = np.zeros((365, 24))
+    strategy_variables = {
+        'climate_change_temp_d__Jan': {'scenario_value': 1.0},
+        'rs_t_base_heating_future_yr': {'scenario_value': 15.5},
+        'smart_meter_improvement_p': {'scenario_value': 0.5}}
+
+    key = weather_region.get_weather_region_key(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by)
+
+    # Strategy variable not used for weather regions
+    strategy_variables['smart_meter_improvement_p']['scenario_value'] = 0.1
+    assert key == weather_region.get_weather_region_key(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by)
+
+    strategy_variables['climate_change_temp_d__Jan']['scenario_value'] = 2.0
+    assert key != weather_region.get_weather_region_key(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by)
+
+    temp_by[0][0] = 1
+    assert weather_region.get_weather_region_key(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by) != weather_region.get_weather_region_key(
+            'context', 'station_A', 2015, 2020, strategy_variables, np.zeros((365, 24)))
+
+def test_get_weather_region_context_key():
+    """Testing
+    """
+    class DummyAssumptions(object):
+        """Assumptions used for testing"""
+        def __init__(self):
+            self.enduse_overall_change = {'other_enduse_mode_info': {}}
+            self.rs_specified_tech_enduse_by = {}
+            self.ss_specified_tech_enduse_by = {}
+            self.is_specified_tech_enduse_by = {}
+            self.enduse_rs_space_cooling = []
+            self.ss_enduse_space_cooling = ['ss_space_cooling']
+            self.ss_weekend_f = 0.8
+            self.is_weekend_f = 0.4
+            self.cdd_weekend_cfactors = np.ones((365))
+            self.model_yeardays_nrs = 365
+
+    assumptions = DummyAssumptions()
+    inputs = {
+        't_bases': {},
+        't_diff_param': {},
+        'tech_lists': {},
+        'technologies': {},
+        'assumptions': assumptions,
+        'fueltypes': {'gas': 0},
+        'model_yeardays_nrs': 365,
+        'model_yeardays': list(range(365)),
+        'yeardays_month_days': {},
+        'all_enduses': {},
+        'tech_lp': {},
+        'sectors': {}}
+
+    context_key = weather_region.get_weather_region_context_key(**inputs)
+    assert context_key == weather_region.get_weather_region_context_key(**inputs)
+
+    # Residential cooling enduses are used to create weather regions
+    assumptions.enduse_rs_space_cooling = ['rs_cold']
+    assert context_key != weather_region.get_weather_region_context_key(**inputs)
+
+def test_WeatherRegionCache(tmpdir):
+    """Testing
+    """
+    import os
+    import pickle
+
+    temp_by = np.zeros((365, 24))
+    strategy_variables = {'rs_t_base_heating_future_yr': {'scenario_value': 15.5}}
+
+    key = weather_region.get_weather_region_key(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by)
+
+    # Read from memory
+    cache = weather_region.WeatherRegionCache()
+    cache.weather_regions[key] = 'cached_weather_region'
+
+    result = cache.get_weather_region(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by)
+    assert result == 'cached_weather_region'
+
+    # Cached weather regions are not pickled
+    assert pickle.loads(pickle.dumps(cache)).weather_regions == {}
+
+    # Read from disk
+    with open(os.path.join(str(tmpdir), "weather_region_{}.pickle".format(key)), 'wb') as file_handle:
+        pickle.dump('stored_weather_region', file_handle)
+
+    cache = weather_region.WeatherRegionCache(path=str(tmpdir))
+    result = cache.get_weather_region(
+        'context', 'station_A', 2015, 2020, strategy_variables, temp_by)
+    assert result == 'stored_weather_region'
+    assert cache.weather_regions[key] == 'stored_weather_region'
+
+    # Least recently used weather regions are removed
+    cache = weather_region.WeatherRegionCache(max_weather_regions=2)
+    cache.add_weather_region('key_a', 'weather_region_a')
+    cache.add_weather_region('key_b', 'weather_region_b')
+    cache.weather_regions.move_to_end('key_a')
+    cache.add_weather_region('key_c', 'weather_region_c')
+    assert list(cache.weather_regions) == ['key_a', 'key_c']
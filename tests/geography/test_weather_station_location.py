@@ -1 +1,51 @@
-from energy_demand.geography import weather_station_location
\ No newline at end of file
+import pickle
+import numpy as np
+from energy_demand.geography import weather_station_location
+
+def test_WeatherStationIndex():
+    """Testing closest stations of spatial index
+    """
+    weather_stations = {
+        'station_A': {'station_longitude': -4.4, 'station_latitude': 55.9},
+        'station_B': {'station_longitude': -0.1, 'station_latitude': 51.5},
+        'station_C': {'station_longitude': -2.2, 'station_latitude': 53.5},
+        'station_D': {'station_longitude': -2.2, 'station_latitude': 53.5}}
+
+    station_index = weather_station_location.WeatherStationIndex(weather_stations)
+
+    # Index can be pickled
+    station_index = pickle.loads(pickle.dumps(station_index))
+
+    assert station_index.get_closest_station(-4.0, 56.0) == 'station_A'
+    assert station_index.get_closest_station(0.1, 51.0) == 'station_B'
+
+    # First listed station if same distance
+    assert station_index.get_closest_station(-2.0, 53.0) == 'station_C'
+
+    assert station_index.assign_regions(
+        ['regA', 'regB'],
+        {'regA': {'longitude': -4.0, 'latitude': 56.0},
+         'regB': {'longitude': 0.1, 'latitude': 51.0}}) == {'regA': 'station_A', 'regB': 'station_B'}
+
+    station_ids, distances = station_index.get_closest_stations(-4.4, 55.9, k=2)
+    assert station_ids[0] == 'station_A'
+    assert distances[0] == 0
+    assert station_ids[1] in ['station_C', 'station_D']
+    assert distances[1] > 0
+
+    weights = station_index.get_idw_weights(-4.4, 55.9, k=2)
+    assert weights == {'station_A': 1.0}
+
+    weights = station_index.get_idw_weights(-1.0, 52.5, k=4)
+    assert round(sum(weights.values()), 6) == 1
+    assert weights['station_B'] > weights['station_A']
+
+def test_coord_to_unit_vector():
+    """Testing
+    """
+    unit_vectors = weather_station_location.coord_to_unit_vector(
+        [0, 90, -2.2], [0, 0, 53.5])
+
+    np.testing.assert_array_almost_equal(unit_vectors[0], [1, 0, 0])
+    np.testing.assert_array_almost_equal(unit_vectors[1], [0, 0, 1])
+    np.testing.assert_almost_equal(np.linalg.norm(unit_vectors[2]), 1)
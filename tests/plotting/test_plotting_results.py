@@ -1,3 +1,40 @@
 """testing
 """
-from energy_demand.plotting import plotting_results
\ No newline at end of file
+import numpy as np
+from energy_demand.plotting import plotting_results
+
+def test_get_plot_tasks():
+    """testing
+    """
+    results_container = {'results_every_year': {2015: np.ones((2, 1, 8760))}}
+    lookups = {'fueltypes': {'electricity': 0}}
+
+    plot_tasks = plotting_results.get_plot_tasks(
+        results_container,
+        reg_nrs=1,
+        regions=['regA'],
+        lookups=lookups,
+        result_paths={'data_results_PDF': 'folder'},
+        assumptions={},
+        enduses={},
+        plots=['fuels_enduses_y', 'h_peak_fueltypes'])
+
+    assert [plot_task.name for plot_task in plot_tasks] == ['fuels_enduses_y', 'h_peak_fueltypes']
+    assert plot_tasks[0].kwargs['results'] is results_container['results_every_year']
+
+def test_plot_task_inputs_hash():
+    """testing
+    """
+    def plot_function(values, fig_name):
+        pass
+
+    plot_task = plotting_results.PlotTask(
+        'name', 'fig.pdf', plot_function, {'values': np.ones((3)), 'fig_name': 'fig.pdf'})
+    same_plot_task = plotting_results.PlotTask(
+        'name', 'fig.pdf', plot_function, {'values': np.ones((3)), 'fig_name': 'fig.pdf'})
+    changed_plot_task = plotting_results.PlotTask(
+        'name', 'fig.pdf', plot_function, {'values': np.zeros((3)), 'fig_name': 'fig.pdf'})
+
+    assert plot_task.get_inputs_hash() == same_plot_task.get_inputs_hash()
+    assert plot_task.get_inputs_hash() != changed_plot_task.get_inputs_hash()
+    assert plot_task.plot()
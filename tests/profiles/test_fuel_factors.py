@@ -0,0 +1,55 @@
+"""Testing
+"""
+import numpy as np
+from energy_demand.profiles import load_profile, fuel_factors
+
+def get_lp_stock(name, shapes_yh):
+    """Create load profile stock with a profile per enduse"""
+    lp_stock = load_profile.LoadProfileStock(name)
+    for profile_nr, shape_yh in enumerate(shapes_yh):
+        lp_stock.add_lp(
+            unique_identifier="{}_{}".format(name, profile_nr),
+            technologies=['placeholder_tech'],
+            enduses=['enduse_{}'.format(profile_nr)],
+            shape_yd=np.full((365), 1 / 365),
+            shape_yh=shape_yh)
+
+    return lp_stock
+
+def test_register_profile_stocks():
+    """Testing
+    """
+    stock_a = get_lp_stock("A", np.random.rand(2, 365, 24))
+    stock_b = get_lp_stock("B", np.random.rand(3, 365, 24))
+
+    registered_stocks = fuel_factors.register_profile_stocks([stock_a, stock_b, stock_a])
+
+    assert registered_stocks == [stock_a, stock_b]
+    assert stock_b.profile_offset == 2
+    assert stock_b.get_profile_id('enduse_1', False, 'placeholder_tech') == 3
+
+def test_calc_fuel_yh():
+    """Compare factorised fuel with fuel multiplied with profiles
+    """
+    shapes_a = np.random.rand(2, 365, 24)
+    shapes_b = np.random.rand(3, 365, 24)
+    lp_stocks = fuel_factors.register_profile_stocks([
+        get_lp_stock("A", shapes_a), get_lp_stock("B", shapes_b)])
+    shapes = np.concatenate([shapes_a, shapes_b])
+
+    rows = np.array([0, 0, 2, 2, 0])
+    profile_ids = np.array([1, 3, 4, 4, 1])
+    fuels = np.array([10.0, 5.0, 2.0, 3.0, 1.0])
+
+    fuel_yh = fuel_factors.calc_fuel_yh(rows, profile_ids, fuels, 3, lp_stocks, 365)
+
+    expected = np.zeros((3, 365, 24))
+    for row, profile_id, fuel in zip(rows, profile_ids, fuels):
+        expected[row] += fuel * shapes[profile_id]
+
+    assert fuel_yh.shape == (3, 365, 24)
+    np.testing.assert_allclose(fuel_yh, expected, rtol=1e-12)
+    assert np.sum(fuel_yh[1]) == 0
+
+    # No fuel factors
+    assert np.sum(fuel_factors.calc_fuel_yh([], [], [], 2, lp_stocks, 365)) == 0
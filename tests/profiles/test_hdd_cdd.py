@@ -1,6 +1,7 @@
 """testing
 """
 from energy_demand.profiles import hdd_cdd
+from energy_demand.geography import weather_station_location
 import numpy as np
 
 def calc_weekend_corr_f():
@@ -200,6 +201,58 @@ def test_get_cdd_country():
     assert result['reg_A'] == expected['reg_A']
     assert result['reg_B'] == expected['reg_B']
 
+def test_get_reg_hdd_cdd():
+    """testing
+    """
+    weather_stations = {
+        "station_A": {'station_latitude': 55.0, 'station_longitude': -4.0},
+        "station_B": {'station_latitude': 51.0, 'station_longitude': 0.0}}
+
+    temp_data = {
+        "station_A": np.zeros((365, 24)) + 12,
+        "station_B": np.zeros((365, 24)) + 20}
+
+    reg_coord = {
+        "reg_A": {'latitude': 55.1, 'longitude': -4.1},
+        "reg_B": {'latitude': 51.1, 'longitude': 0.1},
+        "reg_C": {'latitude': 55.2, 'longitude': -3.9}}
+
+    diff_params = {'sig_midpoint': 0, 'sig_steepness': 1, 'yr_until_changed': 2020}
+
+    hdd_regions, cdd_regions = hdd_cdd.get_reg_hdd_cdd(
+        2015,
+        2020,
+        ['reg_A', 'reg_B', 'reg_C'],
+        temp_data,
+        diff_params,
+        [(15.5, 15.5), (14.0, 14.0)],
+        [(15.5, 15.5)],
+        reg_coord,
+        weather_stations)
+
+    assert hdd_regions.shape == (2, 3)
+    assert cdd_regions.shape == (1, 3)
+    np.testing.assert_almost_equal(hdd_regions[0], [3.5 * 365, 0, 3.5 * 365])
+    np.testing.assert_almost_equal(hdd_regions[1], [2.0 * 365, 0, 2.0 * 365])
+    np.testing.assert_almost_equal(cdd_regions[0], [0, 4.5 * 365, 0])
+
+    # Prebuilt spatial index of weather stations
+    station_index = weather_station_location.WeatherStationIndex(weather_stations)
+    hdd_regions_index, cdd_regions_index = hdd_cdd.get_reg_hdd_cdd(
+        2015,
+        2020,
+        ['reg_A', 'reg_B', 'reg_C'],
+        temp_data,
+        diff_params,
+        [(15.5, 15.5), (14.0, 14.0)],
+        [(15.5, 15.5)],
+        reg_coord,
+        weather_stations,
+        station_index)
+
+    np.testing.assert_array_equal(hdd_regions_index, hdd_regions)
+    np.testing.assert_array_equal(cdd_regions_index, cdd_regions)
+
 def test_calc_reg_hdd():
     """testing
     """
@@ -227,3 +280,39 @@ def test_calc_reg_cdd():
 
     assert np.sum(result_hdd_d) == (20 - 15.5) * 8760 / 24
     assert round(np.sum(result_shape), 3) == round(1.0, 3)
+
+def test_calc_hdd_cdd_stations():
+    """Testing HDD and CDD of several stations
+    """
+    temp_stations_yh = np.zeros((2, 365, 24))
+    temp_stations_yh[0] = 10
+    temp_stations_yh[1, :, :12] = 18
+    temp_stations_yh[1, :, 12:] = 24
+    model_yeardays = range(0, 365, 2)
+
+    hdd_d, shape_hdd_d, cdd_d, shape_cdd_d = hdd_cdd.calc_hdd_cdd_stations(
+        temp_stations_yh, [15.5, 12], [20, 30], model_yeardays)
+
+    assert hdd_d.shape == (2, 2, 365)
+    assert shape_hdd_d.shape == (2, 2, len(model_yeardays))
+    assert cdd_d.shape == (2, 2, len(model_yeardays))
+
+    for station_nr in range(2):
+        for t_base_nr, t_base in enumerate([15.5, 12]):
+            expected_hdd_d, expected_shape = hdd_cdd.calc_reg_hdd(
+                temp_stations_yh[station_nr], t_base, model_yeardays)
+            np.testing.assert_array_almost_equal(hdd_d[station_nr, t_base_nr], expected_hdd_d)
+            np.testing.assert_array_almost_equal(
+                shape_hdd_d[station_nr, t_base_nr], np.ravel(expected_shape))
+
+        for t_base_nr, t_base in enumerate([20, 30]):
+            expected_cdd_d, expected_shape = hdd_cdd.calc_reg_cdd(
+                temp_stations_yh[station_nr], t_base, model_yeardays)
+            np.testing.assert_array_almost_equal(
+                cdd_d[station_nr, t_base_nr], np.ravel(expected_cdd_d))
+            np.testing.assert_array_almost_equal(
+                shape_cdd_d[station_nr, t_base_nr], np.ravel(expected_shape))
+
+    # No cooling degree days result in flat shape
+    assert np.sum(cdd_d[0, 1]) == 0
+    assert shape_cdd_d[0, 1, 0] == 1 / len(model_yeardays)
@@ -79,6 +79,13 @@ def test_calc_lf_y():
     assert expected[0] == result[0]
     assert expected[2] == result[2]
 
+    # Second day represents three days
+    result_weighted = load_factors.calc_lf_y(fuel_yh, average_per_day, np.array([1.0, 3.0]))
+
+    expected_weighted = np.average(average_per_day[2], weights=[1, 3]) / np.max(fuel_yh[2]) * 100
+    assert round(result_weighted[2], 10) == round(expected_weighted, 10)
+    assert result_weighted[0] == 100
+
 def test_calc_lf_season():
     """Test
     """
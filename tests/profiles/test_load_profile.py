@@ -21,6 +21,17 @@ def test_calc_yh():
     assert out[0][0] == 2 * 2
     assert out[0][1] == 2 * 1
 
+def test_abs_to_rel_weighted():
+    """Test
+    """
+    absolute_array = np.ones((2, 24))
+    absolute_array[1] = 2
+
+    relative_array = load_profile.abs_to_rel_weighted(absolute_array, np.array([3.0, 1.0]))
+
+    assert np.sum(np.sum(relative_array, axis=1) * [3, 1]) == 1
+    assert relative_array[1][0] == 2 * relative_array[0][0]
+
 def test_abs_to_rel():
     """Test
     """
@@ -193,3 +204,85 @@ def test_calc_av_lp():
     np.testing.assert_array_equal(expected['winter']['holiday'], result_av['winter']['holiday'])
     np.testing.assert_array_equal(expected['spring']['workday'], result_av['spring']['workday'])
     np.testing.assert_array_equal(expected['spring']['holiday'], result_av['spring']['holiday'])
+
+def test_LoadProfileStock_block(tmpdir):
+    """Testing array of all shapes and export to shared memory / file
+    """
+    import pickle
+
+    lp_stock = load_profile.LoadProfileStock("test_stock")
+
+    shapes_yh = []
+    for profile_nr in range(6):
+        shape_yh = np.full((365, 24), float(profile_nr))
+        shapes_yh.append(shape_yh)
+        lp_stock.add_lp(
+            unique_identifier=str(profile_nr),
+            technologies=['tech_{}'.format(profile_nr)],
+            enduses=['cooking'],
+            shape_yd=np.full((365), 1.0 / 365),
+            shape_yh=shape_yh)
+
+    assert lp_stock.lp_index[('cooking', False, 'tech_5')] == 5
+    assert lp_stock.shapes_yh.shape[0] >= 6
+    np.testing.assert_array_equal(
+        lp_stock.get_lp('cooking', False, 'tech_3', 'shape_yh'), shapes_yh[3])
+    np.testing.assert_array_equal(
+        lp_stock.load_profiles['3'].shape_yh, shapes_yh[3])
+
+    # Export to shared memory
+    lp_stock.export_shared_memory()
+    try:
+        assert lp_stock.shapes_yh.shape == (6, 365, 24)
+        unpickled_stock = pickle.loads(pickle.dumps(lp_stock))
+        np.testing.assert_array_equal(
+            unpickled_stock.get_lp('cooking', False, 'tech_4', 'shape_yh'), shapes_yh[4])
+        unpickled_stock.release_shared_memory(unlink=False)
+    finally:
+        lp_stock.release_shared_memory()
+
+    np.testing.assert_array_equal(
+        lp_stock.get_lp('cooking', False, 'tech_4', 'shape_yh'), shapes_yh[4])
+
+    # Export to memory-mapped file
+    path = str(tmpdir.join('shapes_yh.npy'))
+    lp_stock.export_memmap(path)
+    unpickled_stock = pickle.loads(pickle.dumps(lp_stock))
+    np.testing.assert_array_equal(
+        unpickled_stock.get_lp('cooking', False, 'tech_2', 'shape_yh'), shapes_yh[2])
+
+    # Adding a profile detaches the array from the file
+    unpickled_stock.add_lp(
+        unique_identifier='6',
+        technologies=['tech_6'],
+        enduses=['cooking'],
+        shape_yd=np.full((365), 1.0 / 365),
+        shape_yh=np.full((365, 24), 6.0))
+    assert unpickled_stock.get_lp('cooking', False, 'tech_6', 'shape_yh')[0][0] == 6.0
+    assert unpickled_stock.get_lp('cooking', False, 'tech_1', 'shape_yh')[0][0] == 1.0
+
+def test_LoadProfileStock_copy():
+    """Testing copy of stock and replacing a shape of the copy
+    """
+    lp_stock = load_profile.LoadProfileStock("test_stock")
+
+    for profile_nr in range(3):
+        lp_stock.add_lp(
+            unique_identifier=str(profile_nr),
+            technologies=['tech_{}'.format(profile_nr)],
+            enduses=['cooking'],
+            shape_yd=np.full((365), 1.0 / 365),
+            shape_yh=np.full((365, 24), float(profile_nr)))
+
+    copied_stock = lp_stock.copy()
+    copied_stock.update_shape_yh('1', np.full((365, 24), 5.0))
+
+    # Only the shape of the copy is replaced
+    assert copied_stock.get_lp('cooking', False, 'tech_1', 'shape_yh')[0][0] == 5.0
+    assert copied_stock.load_profiles['1'].shape_yh[0][0] == 5.0
+    assert lp_stock.get_lp('cooking', False, 'tech_1', 'shape_yh')[0][0] == 1.0
+    assert lp_stock.load_profiles['1'].shape_yh[0][0] == 1.0
+
+    assert copied_stock.get_lp('cooking', False, 'tech_2', 'shape_yh')[0][0] == 2.0
+    assert copied_stock.lp_index == lp_stock.lp_index
+    assert copied_stock.stock_enduses == ['cooking']
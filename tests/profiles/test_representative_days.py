@@ -0,0 +1,77 @@
+"""Testing
+"""
+import numpy as np
+from energy_demand.profiles import representative_days
+
+def get_temp_data():
+    """Temperatures with a seasonal cycle"""
+    yeardays = np.arange(365)
+    temp_yd = 10 - 8 * np.cos(2 * np.pi * (yeardays - 15) / 365.0)
+    temp_yd[20] = -10 # Cold day
+    temp_yh = temp_yd[:, np.newaxis] + 3 * np.sin(np.arange(24) * np.pi / 12.0)
+
+    return {'station_A': temp_yh, 'station_B': temp_yh + 1}
+
+def test_k_medoids():
+    """Testing
+    """
+    features = np.array([[0.0], [0.1], [0.2], [10.0], [10.1], [10.2]])
+
+    medoids, labels = representative_days.k_medoids(features, 2)
+
+    assert sorted(medoids.tolist()) == [1, 4]
+    assert labels[0] == labels[2]
+    assert labels[3] == labels[4]
+    assert labels[0] != labels[3]
+
+def test_select_representative_days():
+    """Testing
+    """
+    temp_data = get_temp_data()
+    features = representative_days.get_day_features(temp_data)
+
+    assert features.shape == (365, 3)
+
+    model_yeardays, yearday_weights, yearday_positions = representative_days.select_representative_days(
+        features, 24)
+
+    assert len(model_yeardays) == 24
+    assert model_yeardays == sorted(model_yeardays)
+    assert np.sum(yearday_weights) == 365
+    assert 20 in model_yeardays
+    assert model_yeardays[yearday_positions[20]] == 20
+    assert np.all(np.bincount(yearday_positions) == yearday_weights)
+
+    annual_error, peak_error = representative_days.log_selection_error(
+        temp_data, model_yeardays, yearday_weights)
+
+    assert abs(annual_error) < 0.02
+    assert peak_error == 0
+
+def test_calc_selection_error():
+    """Testing
+    """
+    annual_error, peak_error = representative_days.calc_selection_error(
+        np.array([1.0, 2.0, 4.0, 1.0]), [1, 2], np.array([3.0, 1.0]))
+
+    assert annual_error == (10.0 - 8.0) / 8.0
+    assert peak_error == 0
+
+def test_get_seasons_model_yeardays():
+    """Testing
+    """
+    seasons = {'winter': [0, 1, 2, 360], 'summer': [180, 181]}
+
+    out = representative_days.get_seasons_model_yeardays(seasons, [1, 100, 181, 360])
+
+    assert out == {'winter': [0, 3], 'summer': [2]}
+
+def test_calc_annual_fuel():
+    """Testing
+    """
+    fuel_yh = np.ones((2, 3, 24))
+    fuel_yh[1] = 2
+
+    assert np.all(representative_days.calc_annual_fuel(fuel_yh) == [72, 144])
+    assert np.all(representative_days.calc_annual_fuel(
+        fuel_yh, np.array([100.0, 200.0, 65.0])) == [8760, 2 * 8760])
@@ -0,0 +1,75 @@
+"""Testing
+"""
+import os
+import numpy as np
+from energy_demand.read_write import read_data
+from energy_demand.read_write import result_store
+
+def test_read_results_yh_mmap(tmpdir):
+    """Testing
+    """
+    path_folder = os.path.join(str(tmpdir), 'result_tot_yh')
+    os.makedirs(path_folder)
+
+    results = {}
+    for year in [2020, 2015]:
+        results[year] = np.random.rand(2, 7, 8760)
+        np.save(
+            os.path.join(path_folder, "result_tot_submodels_fueltypes__{}__.npy".format(year)),
+            results[year])
+
+    results_lazy = read_data.read_results_yh(str(tmpdir), mmap_mode='r')
+
+    assert list(results_lazy.keys()) == [2015, 2020]
+    np.testing.assert_array_equal(results_lazy[2020], results[2020])
+    np.testing.assert_array_equal(results_lazy.get_fueltype(2015, 1), results[2015][1])
+
+    # Seasonal averages calculated by summing blocks of regions
+    seasons = {
+        'winter': list(range(0, 90)),
+        'spring': list(range(90, 180)),
+        'summer': list(range(180, 270)),
+        'autumn': list(range(270, 365))}
+    model_yeardays_daytype = ['workday'] * 260 + ['holiday'] * 105
+
+    av_season, _ = read_data.calc_av_per_season_fueltype(
+        results, seasons, model_yeardays_daytype)
+    av_season_lazy, _ = read_data.calc_av_per_season_fueltype(
+        results_lazy, seasons, model_yeardays_daytype, region_block_size=3)
+
+    np.testing.assert_array_almost_equal(
+        av_season_lazy[2020][1]['winter']['workday'],
+        av_season[2020][1]['winter']['workday'])
+
+def test_read_results_yh_result_store(tmpdir):
+    """Testing
+    """
+    store = result_store.ResultStore(
+        os.path.join(str(tmpdir), 'result_store'), reg_nrs=7, region_block_size=3)
+
+    results = {}
+    for year in [2020, 2015]:
+        results[year] = np.random.rand(2, 7, 8760)
+        for reg_array_nr in range(7):
+            store.write_region(year, 'ed_fueltype_regs_yh', reg_array_nr, results[year][:, reg_array_nr])
+
+    results_store = read_data.read_results_yh(str(tmpdir))
+    assert sorted(results_store.keys()) == [2015, 2020]
+    np.testing.assert_array_equal(results_store[2015], results[2015])
+
+    results_lazy = read_data.read_results_yh(str(tmpdir), mmap_mode='r')
+    assert list(results_lazy.keys()) == [2015, 2020]
+    np.testing.assert_array_equal(results_lazy[2020], results[2020])
+    np.testing.assert_array_equal(results_lazy.get_fueltype(2015, 1), results[2015][1])
+
+def test_read_scenaric_population_data(tmpdir):
+    """Testing
+    """
+    population = np.array([[10.0, 20.0, 30.0]])
+    np.save(os.path.join(str(tmpdir), "pop__2015__.npy"), population)
+
+    results = read_data.read_scenaric_population_data(str(tmpdir))
+    np.testing.assert_array_equal(results[2015], population)
+
+    results_lazy = read_data.read_scenaric_population_data(str(tmpdir), mmap_mode='r')
+    np.testing.assert_array_equal(results_lazy[2015], population)
@@ -0,0 +1,60 @@
+"""Testing
+"""
+import numpy as np
+from energy_demand.read_write import result_store
+
+def test_result_store(tmpdir):
+    """Testing
+    """
+    results = np.random.rand(3, 5, 48)
+
+    store = result_store.ResultStore(str(tmpdir), reg_nrs=5, region_block_size=2)
+
+    # Regions finish in arbitrary order
+    for reg_array_nr in [4, 1, 0, 3]:
+        store.write_region(2015, 'fuel_yh', reg_array_nr, results[:, reg_array_nr])
+
+    # Only the block with the missing region is kept in memory
+    assert list(store.buffers.keys()) == [('fuel_yh', 2015, 1)]
+
+    store.write_region(2015, 'fuel_yh', 2, results[:, 2])
+    assert store.buffers == {}
+
+    np.testing.assert_array_equal(store.read(2015, 'fuel_yh'), results)
+    np.testing.assert_array_equal(
+        store.read(2015, 'fuel_yh', fueltype_nr=1, reg_array_nrs=[3, 0]),
+        results[1][[3, 0]])
+
+    # Reopen store
+    store = result_store.ResultStore(str(tmpdir), reg_nrs=5, region_block_size=2)
+    store.write_results(2020, 'fuel_yh', results * 2)
+    assert store.meta['results']['fuel_yh']['sim_yrs'] == [2015, 2020]
+    np.testing.assert_array_equal(
+        store.read(2020, 'fuel_yh', reg_array_nrs=[4]), results[:, [4]] * 2)
+
+def test_result_store_flush(tmpdir):
+    """Testing
+    """
+    store = result_store.ResultStore(str(tmpdir), reg_nrs=3, region_block_size=2)
+    store.write_region(2015, 'fuel_yh', 2, np.ones((2, 24)))
+    store.write_region(2015, 'fuel_yh', 0, np.ones((2, 24)))
+    store.flush()
+
+    result = store.read(2015, 'fuel_yh')
+    assert np.sum(result[:, 1]) == 0
+    assert np.sum(result) == 2 * 2 * 24
+
+def test_load_result_store(tmpdir):
+    """Testing
+    """
+    results = np.random.rand(2, 3, 24)
+
+    store = result_store.ResultStore(str(tmpdir), reg_nrs=3, region_block_size=2)
+    store.write_results(2015, 'fuel_yh', results)
+
+    store = result_store.load_result_store(str(tmpdir))
+    assert store.reg_nrs == 3
+    assert store.region_block_size == 2
+    assert store.get_sim_yrs('fuel_yh') == [2015]
+    assert store.get_sim_yrs('other_results') == []
+    np.testing.assert_array_equal(store.read(2015, 'fuel_yh'), results)
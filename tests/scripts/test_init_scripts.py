@@ -1,5 +1,6 @@
 """testing
 """
+import numpy as np
 from energy_demand.scripts import init_scripts
 
 def test_convert_sharesdict_to_service_switches():
@@ -30,3 +31,42 @@ def test_sum_across_sectors_all_regs():
     out = init_scripts.sum_across_sectors_all_regs(fuel_disagg_reg)
 
     assert out['regA'] == {'enduse': 200}
+
+def test_scenario_init_cache(tmpdir):
+    """Testing writing and reading of cached scenario initialisation
+    """
+    class DummyAssumptions(object):
+        def __init__(self, value):
+            self.strategy_variables = {'var': {'scenario_value': value}}
+
+    data = {
+        'regions': ['regA', 'regB'],
+        'fuels': {'rs_fuel_raw': {'rs_cooking': np.ones((3))}},
+        'technologies': {},
+        'pop_density': {'regA': 1, 'regB': 2},
+        'scenario_data': {},
+        'reg_coord': {},
+        'weather_stations': {},
+        'temp_data': {},
+        'sectors': {},
+        'enduses': {},
+        'lookups': {},
+        'assumptions': DummyAssumptions(0.5),
+        'criterias': {'spatial_exliclit_diffusion': True}}
+
+    key = init_scripts.get_scenario_init_key(data)
+    path = str(tmpdir)
+
+    init_cont, fuel_disagg = init_scripts.read_scenario_init_cache(path, key)
+    assert init_cont is None and fuel_disagg is None
+
+    init_scripts.write_scenario_init_cache(
+        path, key, {'sig_param': {'techA': 1}}, {'rs_fuel_disagg': {'regA': np.ones((2))}})
+
+    init_cont, fuel_disagg = init_scripts.read_scenario_init_cache(path, key)
+    assert init_cont == {'sig_param': {'techA': 1}}
+    assert np.all(fuel_disagg['rs_fuel_disagg']['regA'] == 1)
+
+    # Changed strategy variable results in other key
+    data['assumptions'] = DummyAssumptions(0.6)
+    assert init_scripts.get_scenario_init_key(data) != key
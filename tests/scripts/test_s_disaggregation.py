@@ -185,3 +185,41 @@ def test_is_ss_disaggregate():
     assert round(result['regA']['is_space_heating']['pharmaceuticals'], 3) == round(10.0/15.0 * 100,3) 
     assert result['regB']['is_space_heating']['mining'] == 100
     assert round(result['regB']['is_space_heating']['pharmaceuticals'], 3)  == round(5.0/15.0 * 100, 3)
+
+def test_disaggr_regions():
+    """testing
+    """
+    national_fuel = np.array([[100.0, 10.0]])
+    weights_missing_data = np.array([[1.0], [1.0], [2.0]])
+    weights = np.array([[0.0001], [3.0], [1.0]])
+    missing_data = np.array([True, False, False])
+
+    result = s_disaggregation.disaggr_regions(
+        national_fuel, weights_missing_data, weights, missing_data)
+
+    assert result.shape == (3, 1, 2)
+    np.testing.assert_almost_equal(result[0, 0], [25.0, 2.5])
+    np.testing.assert_almost_equal(result[1, 0], [56.25, 5.625])
+    np.testing.assert_almost_equal(result[2, 0], [18.75, 1.875])
+    np.testing.assert_almost_equal(np.sum(result, axis=0), national_fuel)
+
+def test_calc_disagg_factors():
+    """testing
+    """
+    weights = np.array([[2.0, 0.0], [6.0, 0.0]])
+    all_regions = np.array([True, True])
+
+    result = s_disaggregation.calc_disagg_factors(weights, all_regions, all_regions)
+
+    np.testing.assert_almost_equal(result, [[0.25, 0.0], [0.75, 0.0]])
+
+def test_fuel_array_to_dict():
+    """testing
+    """
+    fuel_disagg = np.arange(8, dtype=float).reshape(2, 1, 2, 2)
+
+    result = s_disaggregation.fuel_array_to_dict(
+        fuel_disagg, ['regA', 'regB'], ['enduseA'], ['sectorA', 'sectorB'])
+
+    np.testing.assert_array_equal(result['regB']['enduseA']['sectorA'], [4.0, 5.0])
+    np.testing.assert_array_equal(result['regA']['enduseA']['sectorB'], [2.0, 3.0])
@@ -465,3 +465,55 @@ def test_get_sig_diffusion():
         regional_specific=True)
 
     assert sig_param['regA']['boilerC'] == 0.999
+
+def test_calc_sigmoid_parameters_closed_form():
+    """Testing
+    """
+    l_values = [0.5, 1.0, 1.0]
+    xdata = [[2015.0, 2050.0], [2015.0, 2030.0], [2015.0, 2030.0]]
+    ydata = [[0.1, 0.2], [0.8, 0.3], [0.5, 0.5]]
+
+    fit_parameters, solved = s_generate_sigmoid.calc_sigmoid_parameters_closed_form(
+        l_values, xdata, ydata)
+
+    assert list(solved) == [True, True, False]
+
+    for sig_nr in range(2):
+        y_calculated = diffusion_technologies.sigmoid_function(
+            np.array(xdata[sig_nr]),
+            l_values[sig_nr],
+            fit_parameters[sig_nr][0],
+            fit_parameters[sig_nr][1])
+        np.testing.assert_array_almost_equal(y_calculated, ydata[sig_nr])
+
+def test_regional_tech_sigmoid_parameters():
+    """Testing
+    """
+    technologies = {
+        'boilerA': read_data.TechnologyData(market_entry=1990),
+        'boilerB': read_data.TechnologyData(market_entry=1990)}
+
+    result = s_generate_sigmoid.regional_tech_sigmoid_parameters(
+        regions=['regA', 'regB'],
+        yr_until_switched=2050,
+        base_yr=2015,
+        technologies=technologies,
+        l_values={
+            'regA': {'boilerA': 1.0, 'boilerB': 1.0},
+            'regB': {'boilerA': 1.0, 'boilerB': 1.0}},
+        s_tech_by_p={'boilerA': 0.5, 'boilerB': 0.5},
+        s_tech_switched_p={
+            'regA': {'boilerA': 0.8, 'boilerB': 0.2},
+            'regB': {'boilerA': 0.6, 'boilerB': 0.4}})
+
+    for region, share_ey in [('regA', 0.8), ('regB', 0.6)]:
+        y_calculated = diffusion_technologies.sigmoid_function(
+            2050,
+            1.0,
+            result[region]['boilerA']['midpoint'],
+            result[region]['boilerA']['steepness'])
+        assert round(y_calculated, 6) == share_ey
+
+        key = s_generate_sigmoid.get_fit_key(
+            1.0, [2015, 2050], [0.5, share_ey], 0.001, 0.0002)
+        assert key in s_generate_sigmoid.SIGMOID_PARAMETER_CACHE
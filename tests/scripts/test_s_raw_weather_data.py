@@ -1,3 +1,42 @@
 """Testing
 """
-from energy_demand.scripts import s_raw_weather_data
\ No newline at end of file
+import os
+import numpy as np
+from energy_demand.scripts import s_raw_weather_data
+from energy_demand.read_write import read_weather_data
+
+def test_read_weather_data_raw_chunked(tmpdir):
+    """Compare chunked reading with reading row by row
+    """
+    path_to_csv = os.path.join(str(tmpdir), "weather_data.csv")
+
+    with open(path_to_csv, 'w') as csv_file:
+        for station_id, day, month, air_temp in [
+                (10, 1, 1, '4.5'),
+                (10, 2, 1, ' '),
+                (20, 31, 12, '-1.5'),
+                (10, 1, 1, '5.0')]:
+            row = [' '] * 40
+            row[0] = "2015-{}-{} 03:00".format(month, day)
+            row[5] = str(station_id)
+            row[35] = air_temp
+            csv_file.write(",".join(row) + "\n")
+
+    expected = s_raw_weather_data.read_weather_data_raw(path_to_csv)
+    station_ids, temp_stations_yh = s_raw_weather_data.read_weather_data_raw_chunked(
+        path_to_csv, chunksize=3)
+
+    assert list(station_ids) == [10, 20]
+    assert temp_stations_yh.shape == (2, 365, 24)
+    assert temp_stations_yh[0, 0, 3] == 5.0
+    assert temp_stations_yh[0, 1, 3] == 999
+
+    result = s_raw_weather_data.temp_stations_to_dict(station_ids, temp_stations_yh)
+    for station_id in expected:
+        np.testing.assert_array_equal(result[station_id], expected[station_id])
+
+    # Binary files are read instead of text files
+    s_raw_weather_data.write_weather_data_npy(str(tmpdir), result)
+    temp_data = read_weather_data.read_weather_data_script_data(str(tmpdir))
+
+    np.testing.assert_array_equal(temp_data['20'], expected[20])
@@ -427,3 +427,121 @@ def test_get_share_s_tech_ey():
         spatial_exliclit_diffusion=True)
 
     assert result['heating']['regA']['techA'] == 0.3
+
+def test_autocomplete_switches_regions():
+    """Compare regional switches calculated for all
+    regions at once with switches of every region
+    """
+    regions = ['regA', 'regB', 'regC']
+    base_yr = 2015
+
+    other_enduse_mode_info = {
+        'diff_method': 'linear',
+        'sigmoid': {
+            'sig_midpoint': 0,
+            'sig_steepness': 1}}
+
+    technologies = {}
+    for tech, eff_ey in [('techA', 1.0), ('techB', 0.8), ('techC', 2.0)]:
+        technologies[tech] = read_data.TechnologyData(
+            fueltype='oil',
+            eff_by=1.0,
+            eff_ey=eff_ey,
+            year_eff_ey=2050,
+            eff_achieved=1.0,
+            diff_method='linear',
+            market_entry=2010,
+            tech_list='tech_heating',
+            tech_max_share=1.0)
+
+    fuels = {'water': {0: 100}}
+    fuel_shares_enduse_by = {'water': {0: {'techA': 0.5, 'techB': 0.5}}}
+    capacity_spatial_factors = {'water': {'regA': 0.2, 'regB': 0.3, 'regC': 0.5}}
+
+    capacity_switches = [
+        read_data.CapacitySwitch(
+            enduse='water',
+            technology_install='techA',
+            switch_yr=2040,
+            installed_capacity=200)]
+
+    service_switches = [
+        read_data.ServiceSwitch(
+            enduse='heating',
+            technology_install='techC',
+            service_share_ey=0.3,
+            switch_yr=2050),
+        read_data.ServiceSwitch(
+            enduse='heating',
+            technology_install='techB',
+            service_share_ey=0.2,
+            switch_yr=2050)]
+
+    specified_tech_enduse_by = {
+        'heating': ['techA', 'techB', 'techC'],
+        'water': ['techA', 'techB']}
+    s_tech_by_p = {
+        'heating': {'techA': 0.5, 'techB': 0.3, 'techC': 0.2},
+        'water': {'techA': 0.5, 'techB': 0.5}}
+    f_diffusion = {'heating': {'regA': 0.5, 'regB': 1.0, 'regC': 2.0}}
+
+    # Service switches of every region
+    reg_service_switches_from_capacity = {}
+    for region in regions:
+        reg_capacity_switches = [
+            read_data.CapacitySwitch(
+                enduse=switch.enduse,
+                technology_install=switch.technology_install,
+                switch_yr=switch.switch_yr,
+                installed_capacity=switch.installed_capacity * capacity_spatial_factors[switch.enduse][region])
+            for switch in capacity_switches]
+
+        reg_service_switches_from_capacity[region] = fuel_service_switch.capacity_switch(
+            reg_capacity_switches,
+            technologies,
+            other_enduse_mode_info,
+            fuels,
+            fuel_shares_enduse_by,
+            base_yr)
+
+    expected, _ = fuel_service_switch.autocomplete_switches(
+        service_switches,
+        specified_tech_enduse_by,
+        s_tech_by_p,
+        spatial_exliclit_diffusion=True,
+        regions=regions,
+        f_diffusion=f_diffusion,
+        techs_affected_spatial_f=['techC'],
+        service_switches_from_capacity=reg_service_switches_from_capacity)
+
+    # Service switches of all regions at once
+    service_switches_from_capacity = fuel_service_switch.capacity_switch_regions(
+        capacity_switches,
+        regions,
+        capacity_spatial_factors,
+        technologies,
+        other_enduse_mode_info,
+        fuels,
+        fuel_shares_enduse_by,
+        base_yr)
+
+    assert service_switches_from_capacity.shares.shape == (3, 1, 2)
+
+    result, result_switches = fuel_service_switch.autocomplete_switches(
+        service_switches,
+        specified_tech_enduse_by,
+        s_tech_by_p,
+        spatial_exliclit_diffusion=True,
+        regions=regions,
+        f_diffusion=f_diffusion,
+        techs_affected_spatial_f=['techC'],
+        service_switches_from_capacity=service_switches_from_capacity)
+
+    assert sorted(result.keys()) == sorted(expected.keys())
+    for enduse in expected:
+        for region in regions:
+            assert sorted(result[enduse][region].keys()) == sorted(expected[enduse][region].keys())
+            for tech, share in expected[enduse][region].items():
+                np.testing.assert_almost_equal(result[enduse][region][tech], share)
+
+    assert len(result_switches['regA']) == 5
@@ -0,0 +1,255 @@
+"""Tests for batched enduse calculations
+"""
+import numpy as np
+from energy_demand import enduse_func
+from energy_demand import enduse_batch
+from energy_demand.geography import spatial_diffusion
+from energy_demand.read_write import read_data
+from energy_demand.technologies import technological_stock
+from energy_demand.profiles import load_profile
+
+class DummyAssumptions(object):
+    """Assumptions used for testing"""
+    def __init__(self):
+        self.enduse_space_heating = ['rs_space_heating']
+        self.ss_enduse_space_cooling = []
+        self.cooled_ss_floorarea_by = 0.35
+        self.crit_switch_happening = {'rs_space_heating': []}
+        self.smart_meter_assump = {
+            'smart_meter_p_by': 0.1,
+            'smart_meter_diff_params': {'sig_midpoint': 0, 'sig_steepness': 1}}
+        self.enduse_overall_change = {
+            'other_enduse_mode_info': {
+                'diff_method': 'linear',
+                'sigmoid': {'sig_midpoint': 0, 'sig_steepness': 1}}}
+
+def get_tech_stock(fueltypes, temp):
+    """Create technology stock"""
+    technologies = {}
+    for tech, fueltype_str, eff_by, eff_ey in [
+            ('boiler_gas', 'gas', 0.8, 0.9),
+            ('boiler_electricity', 'electricity', 1.0, 1.0)]:
+        technologies[tech] = read_data.TechnologyData()
+        technologies[tech].fueltype_str = fueltype_str
+        technologies[tech].eff_achieved = 1.0
+        technologies[tech].diff_method = 'linear'
+        technologies[tech].eff_by = eff_by
+        technologies[tech].eff_ey = eff_ey
+        technologies[tech].year_eff_ey = 2050
+
+    return technological_stock.TechStock(
+        name="name",
+        technologies=technologies,
+        tech_list={'heating_non_const': [], 'heating_const': ['boiler_gas', 'boiler_electricity']},
+        other_enduse_mode_info='linear',
+        base_yr=2015,
+        curr_yr=2030,
+        fueltypes=fueltypes,
+        temp_by=temp,
+        temp_cy=temp,
+        t_base_heating_by=15.5,
+        potential_enduses=['rs_space_heating'],
+        t_base_heating_cy=15.5,
+        enduse_technologies={'rs_space_heating': ['boiler_gas', 'boiler_electricity']})
+
+def get_lp_stock(factor):
+    """Create load profile stock"""
+    shape_yh = np.ones((365, 24))
+    shape_yh[:, 12] = factor
+    shape_yh = shape_yh / np.sum(shape_yh)
+
+    lp_stock = load_profile.LoadProfileStock("test_stock")
+    lp_stock.add_lp(
+        unique_identifier="A123",
+        technologies=['boiler_gas', 'boiler_electricity'],
+        enduses=['rs_space_heating'],
+        shape_yd=np.full((365), 1 / 365),
+        shape_yh=shape_yh)
+
+    return lp_stock
+
+def get_inputs():
+    """Create inputs of four regions in two weather regions"""
+    fueltypes = {'gas': 0, 'electricity': 1, 'heat': 2}
+
+    return {
+        'regions': ['regA', 'regB', 'regC', 'regD'],
+        'fueltypes': fueltypes,
+        'tech_stocks': [
+            get_tech_stock(fueltypes, np.full((365, 24), 5.0)),
+            get_tech_stock(fueltypes, np.full((365, 24), 8.0))],
+        'lp_stocks': [get_lp_stock(3.0), get_lp_stock(7.0)],
+        'non_regional_lp_stock': load_profile.LoadProfileStock("non_regional"),
+        'reg_weather_region_nrs': np.array([0, 1, 1, 0]),
+        'heating_factor_y': np.array([0.9, 1.1]),
+        'cooling_factor_y': np.array([1.0, 1.0]),
+        'fuels': np.array([
+            [100.0, 20.0, 0.0],
+            [50.0, 30.0, 0.0],
+            [0.0, 0.0, 0.0],
+            [10.0, 5.0, 0.0]]),
+        'scenario_data': {
+            'gva': {2015: {}, 2030: {}},
+            'industry_gva': None,
+            'population': {
+                2015: {'regA': 10, 'regB': 20, 'regC': 30, 'regD': 40},
+                2030: {'regA': 12, 'regB': 19, 'regC': 33, 'regD': 50}}},
+        'strategy_variables': {
+            'smart_meter_improvement_rs_space_heating': {'scenario_value': 0.1},
+            'smart_meter_yr_until_changed': {'scenario_value': 2050},
+            'smart_meter_improvement_p': {'scenario_value': 0.5},
+            'enduse_change__rs_space_heating': {'scenario_value': -0.2},
+            'enduse_specific_change_yr_until_changed': {'scenario_value': 2050},
+            'heat_recoved__rs_space_heating': {'scenario_value': 0.1},
+            'heat_recovered_yr_until_changed': {'scenario_value': 2050},
+            'air_leakage__rs_space_heating': {'scenario_value': 0.0},
+            'air_leakage_yr_until_changed': {'scenario_value': 2050}},
+        'sig_param_tech': {
+            'boiler_gas': {'l_parameter': 'linear'},
+            'boiler_electricity': {'l_parameter': 0.5, 'midpoint': 30, 'steepness': 0.2}},
+        'fuel_fueltype_tech_p_by': {
+            0: {'boiler_gas': 1.0},
+            1: {'boiler_electricity': 1.0},
+            2: {}},
+        'reg_scen_drivers': {'rs_space_heating': ['population']}}
+
+def compare_enduse_batch(inputs, batch_strategy_variables, reg_strategy_variables, mode_constrained):
+    """Compare batched calculation with calculation per region
+
+    Arguments
+    ----------
+    inputs : dict
+        Inputs (see `get_inputs`)
+    batch_strategy_variables : dict
+        Strategy variables of batch
+    reg_strategy_variables : dict
+        Strategy variables of every region
+    mode_constrained : bool
+        Mode criteria
+    """
+    assumptions = DummyAssumptions()
+    criterias = {'mode_constrained': mode_constrained}
+    reg_weather_region_nrs = inputs['reg_weather_region_nrs']
+
+    batch = enduse_batch.EnduseBatch(
+        submodel='rs_submodel',
+        regions=inputs['regions'],
+        scenario_data=inputs['scenario_data'],
+        assumptions=assumptions,
+        regional_lp_stocks=inputs['lp_stocks'],
+        non_regional_lp_stock=inputs['non_regional_lp_stock'],
+        base_yr=2015,
+        curr_yr=2030,
+        enduse='rs_space_heating',
+        sector=False,
+        fuels=inputs['fuels'],
+        tech_stocks=inputs['tech_stocks'],
+        reg_weather_region_nrs=reg_weather_region_nrs,
+        heating_factor_y=inputs['heating_factor_y'],
+        cooling_factor_y=inputs['cooling_factor_y'],
+        fuel_fueltype_tech_p_by=inputs['fuel_fueltype_tech_p_by'],
+        sig_param_tech=inputs['sig_param_tech'],
+        enduse_overall_change=assumptions.enduse_overall_change,
+        criterias=criterias,
+        strategy_variables=batch_strategy_variables,
+        fueltypes_nr=3,
+        fueltypes=inputs['fueltypes'],
+        model_yeardays_nrs=365,
+        reg_scen_drivers=inputs['reg_scen_drivers'])
+
+    for reg_array_nr, region in enumerate(inputs['regions']):
+        weather_region_nr = reg_weather_region_nrs[reg_array_nr]
+
+        enduse_obj = enduse_func.Enduse(
+            submodel='rs_submodel',
+            region=region,
+            scenario_data=inputs['scenario_data'],
+            assumptions=assumptions,
+            regional_lp_stock=inputs['lp_stocks'][weather_region_nr],
+            non_regional_lp_stock=inputs['non_regional_lp_stock'],
+            base_yr=2015,
+            curr_yr=2030,
+            enduse='rs_space_heating',
+            sector=False,
+            fuel=inputs['fuels'][reg_array_nr],
+            tech_stock=inputs['tech_stocks'][weather_region_nr],
+            heating_factor_y=inputs['heating_factor_y'][weather_region_nr],
+            cooling_factor_y=inputs['cooling_factor_y'][weather_region_nr],
+            fuel_fueltype_tech_p_by=inputs['fuel_fueltype_tech_p_by'],
+            sig_param_tech=inputs['sig_param_tech'],
+            enduse_overall_change=assumptions.enduse_overall_change,
+            criterias=criterias,
+            strategy_variables=reg_strategy_variables[region],
+            fueltypes_nr=3,
+            fueltypes=inputs['fueltypes'],
+            model_yeardays_nrs=365,
+            reg_scen_drivers=inputs['reg_scen_drivers'])
+
+        batch_region = enduse_batch.EnduseBatchRegion(batch, reg_array_nr)
+
+        np.testing.assert_allclose(batch_region.fuel_y, enduse_obj.fuel_y)
+
+        if enduse_obj.flat_profile_crit:
+            assert np.sum(inputs['fuels'][reg_array_nr]) == 0
+        elif mode_constrained:
+            for tech, fuel_tech_yh in enduse_obj.techs_fuel_yh.items():
+                np.testing.assert_allclose(
+                    batch_region.techs_fuel_yh[tech], fuel_tech_yh)
+        else:
+            np.testing.assert_allclose(batch_region.fuel_yh, enduse_obj.fuel_yh)
+
+def test_enduse_batch():
+    """Compare batched calculation with calculation per region
+    """
+    inputs = get_inputs()
+    strategy_variables = inputs['strategy_variables']
+    reg_strategy_variables = dict(
+        (region, strategy_variables) for region in inputs['regions'])
+
+    for mode_constrained in [True, False]:
+        compare_enduse_batch(
+            inputs, strategy_variables, reg_strategy_variables, mode_constrained)
+
+def test_enduse_batch_regional_strategy_variables():
+    """Compare batched calculation with regionally specific strategy
+    variables with calculation per region
+    """
+    inputs = get_inputs()
+
+    strategy_variables = {}
+    for var_name, var in inputs['strategy_variables'].items():
+        strategy_variables[var_name] = {
+            'scenario_value': var['scenario_value'],
+            'affected_enduse': ['rs_space_heating']}
+
+    regional_strategy_variables = spatial_diffusion.RegionalStrategyVariables(
+        inputs['regions'], strategy_variables)
+    regional_strategy_variables.set_values(
+        'enduse_change__rs_space_heating',
+        {'regA': -0.3, 'regB': 0.1, 'regC': 0.0, 'regD': -0.1})
+    regional_strategy_variables.set_values(
+        'air_leakage__rs_space_heating',
+        {'regA': 0.0, 'regB': 0.2, 'regC': 0.0, 'regD': 0.4})
+
+    for mode_constrained in [True, False]:
+        compare_enduse_batch(
+            inputs,
+            regional_strategy_variables.get_regions_strategy_variables(inputs['regions']),
+            regional_strategy_variables,
+            mode_constrained)
+
+def test_get_service_diffusion():
+    """Testing
+    """
+    sig_param_tech = [
+        {'techA': {'l_parameter': None}},
+        {'techA': {'l_parameter': 'linear'}},
+        {'techA': {'l_parameter': 1.0, 'midpoint': 30, 'steepness': 1}}]
+
+    s_tech_p, identical_crit = enduse_batch.get_service_diffusion(
+        sig_param_tech, 'techA', 2030, 3)
+
+    assert s_tech_p[0] == 0
+    assert identical_crit[1] == True
+    assert s_tech_p[2] == 0.5
+    assert identical_crit[2] == False
@@ -0,0 +1,168 @@
+"""Tests for ensemble enduse calculations
+"""
+import numpy as np
+from energy_demand import enduse_func
+from energy_demand import enduse_ensemble
+from energy_demand import scenario_sweep
+from energy_demand.read_write import read_data
+from energy_demand.technologies import technological_stock
+from energy_demand.profiles import load_profile
+
+class DummyAssumptions(object):
+    """Assumptions used for testing"""
+    def __init__(self):
+        self.enduse_space_heating = ['rs_space_heating']
+        self.ss_enduse_space_cooling = []
+        self.cooled_ss_floorarea_by = 0.35
+        self.crit_switch_happening = {'rs_space_heating': []}
+        self.smart_meter_assump = {
+            'smart_meter_p_by': 0.1,
+            'smart_meter_diff_params': {'sig_midpoint': 0, 'sig_steepness': 1}}
+        self.enduse_overall_change = {
+            'other_enduse_mode_info': {
+                'diff_method': 'linear',
+                'sigmoid': {'sig_midpoint': 0, 'sig_steepness': 1}}}
+
+def get_tech_stock(fueltypes):
+    """Create technology stock"""
+    technologies = {}
+    for tech, fueltype_str, eff_by, eff_ey in [
+            ('boiler_gas', 'gas', 0.8, 0.9),
+            ('boiler_electricity', 'electricity', 1.0, 1.0)]:
+        technologies[tech] = read_data.TechnologyData()
+        technologies[tech].fueltype_str = fueltype_str
+        technologies[tech].eff_achieved = 1.0
+        technologies[tech].diff_method = 'linear'
+        technologies[tech].eff_by = eff_by
+        technologies[tech].eff_ey = eff_ey
+        technologies[tech].year_eff_ey = 2050
+
+    return technological_stock.TechStock(
+        name="name",
+        technologies=technologies,
+        tech_list={'heating_non_const': [], 'heating_const': ['boiler_gas', 'boiler_electricity']},
+        other_enduse_mode_info='linear',
+        base_yr=2015,
+        curr_yr=2030,
+        fueltypes=fueltypes,
+        temp_by=np.full((365, 24), 5.0),
+        temp_cy=np.full((365, 24), 5.0),
+        t_base_heating_by=15.5,
+        potential_enduses=['rs_space_heating'],
+        t_base_heating_cy=15.5,
+        enduse_technologies={'rs_space_heating': ['boiler_gas', 'boiler_electricity']})
+
+def test_enduse_ensemble():
+    """Compare ensemble calculation with calculation of every sample
+    """
+    fueltypes = {'gas': 0, 'electricity': 1, 'heat': 2}
+    tech_stock = get_tech_stock(fueltypes)
+
+    lp_stock = load_profile.LoadProfileStock("test_stock")
+    lp_stock.add_lp(
+        unique_identifier="A123",
+        technologies=['boiler_gas', 'boiler_electricity'],
+        enduses=['rs_space_heating'],
+        shape_yd=np.full((365), 1 / 365),
+        shape_yh=np.full((365, 24), 1 / 8760))
+    non_regional_lp_stock = load_profile.LoadProfileStock("non_regional")
+
+    scenario_data = {
+        'gva': {2015: {}, 2030: {}},
+        'industry_gva': None,
+        'population': {2015: {'regA': 10}, 2030: {'regA': 12}}}
+
+    base_strategy_variables = {
+        'smart_meter_improvement_rs_space_heating': {'scenario_value': 0.1},
+        'smart_meter_yr_until_changed': {'scenario_value': 2050},
+        'smart_meter_improvement_p': {'scenario_value': 0.5},
+        'enduse_change__rs_space_heating': {'scenario_value': -0.2},
+        'enduse_specific_change_yr_until_changed': {'scenario_value': 2050},
+        'heat_recoved__rs_space_heating': {'scenario_value': 0.1},
+        'heat_recovered_yr_until_changed': {'scenario_value': 2050},
+        'air_leakage__rs_space_heating': {'scenario_value': 0.0},
+        'air_leakage_yr_until_changed': {'scenario_value': 2050}}
+
+    samples = {
+        'smart_meter_improvement_p': np.array([0.0, 0.2, 0.5, 0.8]),
+        'enduse_change__rs_space_heating': np.array([-0.3, 0.0, 0.1, -0.2]),
+        'enduse_specific_change_yr_until_changed': np.array([2040, 2050, 2050, 2030]),
+        'heat_recoved__rs_space_heating': np.array([0.0, 0.1, 0.2, 0.3]),
+        'air_leakage__rs_space_heating': np.array([0.2, 0.0, 0.1, 0.05])}
+
+    strategy_variables = scenario_sweep.get_scenario_strategy_variables(
+        base_strategy_variables, samples)
+
+    assert enduse_ensemble.get_nr_of_samples(strategy_variables) == 4
+
+    sig_param_tech = {
+        'boiler_gas': {'l_parameter': 'linear'},
+        'boiler_electricity': {'l_parameter': 0.5, 'midpoint': 30, 'steepness': 0.2}}
+
+    fuel_fueltype_tech_p_by = {
+        0: {'boiler_gas': 1.0},
+        1: {'boiler_electricity': 1.0},
+        2: {}}
+
+    assumptions = DummyAssumptions()
+    reg_scen_drivers = {'rs_space_heating': ['population']}
+    fuel = np.array([100.0, 20.0, 0.0])
+
+    for mode_constrained in [True, False]:
+        criterias = {'mode_constrained': mode_constrained}
+
+        ensemble = enduse_ensemble.EnduseEnsemble(
+            submodel='rs_submodel',
+            region='regA',
+            scenario_data=scenario_data,
+            assumptions=assumptions,
+            base_yr=2015,
+            curr_yr=2030,
+            enduse='rs_space_heating',
+            sector=False,
+            fuel=fuel,
+            tech_stock=tech_stock,
+            heating_factor_y=0.9,
+            cooling_factor_y=1.0,
+            fuel_fueltype_tech_p_by=fuel_fueltype_tech_p_by,
+            sig_param_tech=sig_param_tech,
+            enduse_overall_change=assumptions.enduse_overall_change,
+            criterias=criterias,
+            strategy_variables=strategy_variables,
+            fueltypes_nr=3,
+            fueltypes=fueltypes,
+            reg_scen_drivers=reg_scen_drivers)
+
+        assert ensemble.fuel_y.shape == (4, 3)
+
+        for sample in range(4):
+            sample_strategy_variables = scenario_sweep.get_scenario_strategy_variables(
+                base_strategy_variables,
+                {name: values[sample] for name, values in samples.items()})
+
+            enduse_obj = enduse_func.Enduse(
+                submodel='rs_submodel',
+                region='regA',
+                scenario_data=scenario_data,
+                assumptions=assumptions,
+                regional_lp_stock=lp_stock,
+                non_regional_lp_stock=non_regional_lp_stock,
+                base_yr=2015,
+                curr_yr=2030,
+                enduse='rs_space_heating',
+                sector=False,
+                fuel=fuel,
+                tech_stock=tech_stock,
+                heating_factor_y=0.9,
+                cooling_factor_y=1.0,
+                fuel_fueltype_tech_p_by=fuel_fueltype_tech_p_by,
+                sig_param_tech=sig_param_tech,
+                enduse_overall_change=assumptions.enduse_overall_change,
+                criterias=criterias,
+                strategy_variables=sample_strategy_variables,
+                fueltypes_nr=3,
+                fueltypes=fueltypes,
+                model_yeardays_nrs=365,
+                reg_scen_drivers=reg_scen_drivers)
+
+            np.testing.assert_allclose(ensemble.fuel_y[sample], enduse_obj.fuel_y, rtol=1e-12)
@@ -0,0 +1,16 @@
+"""Tests for factors of strategy variables
+"""
+import numpy as np
+from energy_demand import enduse_factors
+
+def test_linear_diff_samples():
+    """Testing
+    """
+    values_cy = enduse_factors.linear_diff_samples(
+        2015,
+        2020,
+        1.0,
+        np.array([1.0, 0.5, 2.0, 0.5]),
+        np.array([2025, 2025, 2020, 2030]))
+
+    np.testing.assert_allclose(values_cy, [1.0, 0.75, 2.0, 1.0 + (0.5 - 1.0) / 15 * 5])
@@ -66,6 +66,27 @@ def test_assign_lp_no_techs():
 
     assert np.sum(fuel_yh) == 100
 
+def test_get_fuel_factors_no_techs():
+    """Testing
+    """
+    lp_stock_obj = load_profile.LoadProfileStock("test_stock")
+    lp_stock_obj.add_lp(
+        unique_identifier="A123",
+        technologies=['placeholder_tech'],
+        enduses=['test_enduse'],
+        shape_yd=np.full((365), 1 / 365),
+        shape_yh=np.full((365, 24), 1 / 8760),
+        sectors=['test_sector'])
+    lp_stock_obj.profile_offset = 4
+
+    fuel_factors = enduse_func.get_fuel_factors_no_techs(
+        enduse="test_enduse",
+        sector="test_sector",
+        load_profiles=lp_stock_obj,
+        fuel_y=np.array([0, 10.0, 100.0]))
+
+    assert fuel_factors == [(1, 4, 10.0), (2, 4, 100.0)]
+
 '''def test_get_crit_switch():
     """
     """
@@ -840,3 +861,58 @@ def test_calc_service_switch():
 
     summe = 0.70627648300491375 * 3724.1471455
     assert result['heat_pumps_electricity'] == summe
+
+def test_ScenarioDriverTensor():
+    """Testing
+    """
+    regions = ['regA', 'regB', 'regC']
+    scenario_data = {
+        'gva': {
+            2015: {'regA': 10, 'regB': 0, 'regC': 3},
+            2020: {'regA': 12, 'regB': 4, 'regC': float('nan')}},
+        'population': {
+            2015: {'regA': 100, 'regB': 200, 'regC': 300},
+            2020: {'regA': 110, 'regB': 190, 'regC': 330}}}
+
+    driver_tensor = enduse_func.ScenarioDriverTensor(regions, scenario_data)
+
+    driver_factors = driver_tensor.get_driver_factors(
+        ['gva', 'population'], 2015, 2020)
+
+    for reg_nr, region in enumerate(regions):
+        expected = enduse_func.apply_scenario_drivers(
+            submodel='is_submodel',
+            enduse='is_enduse',
+            sector='sectorA',
+            fuel_y=np.array([2.0, 1.0]),
+            dw_stock=False,
+            region=region,
+            gva=scenario_data['gva'],
+            population=scenario_data['population'],
+            industry_gva=None,
+            reg_scen_drivers={'is_enduse': ['gva', 'population']},
+            base_yr=2015,
+            curr_yr=2020)
+
+        np.testing.assert_array_almost_equal(
+            np.array([2.0, 1.0]) * driver_factors[reg_nr], expected)
+
+        assert driver_tensor.get_driver_factor(
+            ['gva', 'population'], region, 2015, 2020) == driver_factors[reg_nr]
+
+    # Precalculated factor
+    result = enduse_func.apply_scenario_drivers(
+        submodel='is_submodel',
+        enduse='is_enduse',
+        sector='sectorA',
+        fuel_y=np.array([2.0, 1.0]),
+        dw_stock=False,
+        region='regA',
+        gva=None,
+        population=None,
+        industry_gva=None,
+        reg_scen_drivers={'is_enduse': ['gva', 'population']},
+        base_yr=2015,
+        curr_yr=2020,
+        driver_factor=0.5)
+    np.testing.assert_array_equal(result, np.array([1.0, 0.5]))
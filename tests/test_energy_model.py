@@ -1 +1,387 @@
-from energy_demand import model
\ No newline at end of file
+"""Testing
+"""
+import numpy as np
+from energy_demand import model
+from energy_demand import enduse_func
+from energy_demand.profiles import load_profile, fuel_factors, representative_days
+from energy_demand.read_write import result_store
+
+class DummyTechnology(object):
+    """Technology used for testing"""
+    def __init__(self, fueltype_int):
+        self.fueltype_int = fueltype_int
+
+def test_add_region_results():
+    """Testing
+    """
+    sectors = {'rs_sectors': [], 'ss_sectors': [], 'is_sectors': []}
+    technologies = {'boiler_gas': DummyTechnology(1)}
+
+    aggr_results = model.initialise_result_container(
+        fueltypes_nr=2,
+        sectors=sectors,
+        reg_nrs=3,
+        model_yearhours_nrs=48,
+        model_yeardays_nrs=2,
+        heating_technologies=['boiler_gas'],
+        technologies=technologies)
+
+    region_results = model.initialise_result_container(
+        fueltypes_nr=2,
+        sectors=sectors,
+        reg_nrs=1,
+        model_yearhours_nrs=48,
+        model_yeardays_nrs=2,
+        heating_technologies=['boiler_gas'],
+        technologies=technologies)
+
+    region_results['ed_submodel_fueltype_regs_yh'][1][0][1] = 2.0
+    region_results['ed_techs_submodel_fueltype_regs_yh'].add_fuel('boiler_gas', 0, 0, 3.0)
+    region_results['ed_fueltype_regs_yh'][1][0] = 4.0
+    region_results['ed_fueltype_national_yh'][1] = 5.0
+    region_results['tot_fuel_y_enduse_specific_yh']['rs_cooking'] = np.ones((2, 2, 24))
+    region_results['reg_load_factor_y'][1][0] = 0.5
+    region_results['reg_seasons_lf']['winter'][1][0] = 0.6
+    region_results['averaged_h']['summer'][1][0] = 7.0
+
+    for reg_array_nr in [0, 2]:
+        aggr_results = model.add_region_results(
+            aggr_results, reg_array_nr, region_results)
+
+    assert np.sum(aggr_results['ed_submodel_fueltype_regs_yh'][1][2][1]) == 2.0 * 48
+    assert np.sum(aggr_results['ed_submodel_fueltype_regs_yh'][1][1]) == 0
+    assert np.sum(aggr_results['ed_techs_submodel_fueltype_regs_yh']['boiler_gas'][0][2][1]) == 3.0 * 48
+    assert np.sum(aggr_results['ed_fueltype_regs_yh'][1]) == 4.0 * 48 * 2
+    assert np.sum(aggr_results['ed_fueltype_national_yh']) == 5.0 * 48 * 2
+    assert np.sum(aggr_results['tot_fuel_y_enduse_specific_yh']['rs_cooking']) == 2 * 2 * 48
+    assert aggr_results['reg_load_factor_y'][1][2] == 0.5
+    assert aggr_results['reg_seasons_lf']['winter'][1][0] == 0.6
+    assert np.all(aggr_results['averaged_h']['summer'][1][2] == 7.0)
+
+    # Region container is not changed
+    assert np.sum(region_results['tot_fuel_y_enduse_specific_yh']['rs_cooking']) == 2 * 48
+
+def test_add_region_results_result_store(tmpdir):
+    """Testing that regional hourly results are only
+    written to the result store and not kept
+    """
+    sectors = {'rs_sectors': [], 'ss_sectors': [], 'is_sectors': []}
+    technologies = {'boiler_gas': DummyTechnology(1)}
+
+    aggr_results = model.initialise_result_container(
+        fueltypes_nr=2,
+        sectors=sectors,
+        reg_nrs=3,
+        model_yearhours_nrs=48,
+        model_yeardays_nrs=2,
+        heating_technologies=['boiler_gas'],
+        technologies=technologies,
+        regional_yh=False)
+
+    assert aggr_results['ed_submodel_fueltype_regs_yh'] is None
+    assert aggr_results['ed_techs_submodel_fueltype_regs_yh'] is None
+    assert aggr_results['ed_fueltype_regs_yh'] is None
+
+    store = result_store.ResultStore(str(tmpdir), reg_nrs=3, region_block_size=2)
+
+    for reg_array_nr in range(3):
+        region_results = model.initialise_result_container(
+            fueltypes_nr=2,
+            sectors=sectors,
+            reg_nrs=1,
+            model_yearhours_nrs=48,
+            model_yeardays_nrs=2,
+            heating_technologies=['boiler_gas'],
+            technologies=technologies)
+        region_results['ed_fueltype_regs_yh'][1][0] = reg_array_nr
+        region_results['ed_fueltype_national_yh'][1] = 1.0
+        region_results['reg_load_factor_y'][1][0] = 0.5
+
+        aggr_results = model.add_region_results(aggr_results, reg_array_nr, region_results)
+        model.write_region_results(store, 2015, reg_array_nr, region_results)
+
+    assert aggr_results['ed_fueltype_regs_yh'] is None
+    assert np.sum(aggr_results['ed_fueltype_national_yh']) == 3 * 48
+    assert np.all(aggr_results['reg_load_factor_y'][1] == 0.5)
+
+    results = store.read(2015, 'ed_fueltype_regs_yh')
+    assert results.shape == (2, 3, 48)
+    np.testing.assert_array_equal(np.sum(results[1], axis=1), [0, 48, 2 * 48])
+
+def test_create_virtual_dwelling_stocks():
+    """Testing that base year dwelling stocks are reused
+    """
+    class DummyAssumptions(object):
+        base_yr = 2015
+
+    data = {'assumptions': DummyAssumptions()}
+
+    rs_dw_stock, ss_dw_stock = model.create_virtual_dwelling_stocks(
+        ['regA', 'regB'],
+        2015,
+        data,
+        rs_dw_stock_by={'regA': 'rs_A', 'regB': 'rs_B'},
+        ss_dw_stock_by={'regA': 'ss_A', 'regB': 'ss_B'})
+
+    assert rs_dw_stock['regB'][2015] == 'rs_B'
+    assert ss_dw_stock['regA'][2015] == 'ss_A'
+
+def get_expected_fuel_yh(enduse_object, technologies, fueltypes_nr, model_yeardays_nrs):
+    """Reference aggregation of the hourly fuel of an enduse object
+
+    Arguments
+    ----------
+    enduse_object : object
+        Enduse
+    technologies : dict
+        Technologies
+    fueltypes_nr : int
+        Number of fueltypes
+    model_yeardays_nrs : int
+        Number of modelled yeardays
+
+    Returns
+    -------
+    fuel_yh : array
+        Fuel (fueltypes, model_yeardays_nrs, 24)
+    """
+    fuel_yh = np.zeros((fueltypes_nr, model_yeardays_nrs, 24))
+
+    if enduse_object.flat_profile_crit:
+        for fueltype_nr in range(fueltypes_nr):
+            fuel_yh[fueltype_nr] = enduse_object.fuel_y[fueltype_nr] / (model_yeardays_nrs * 24)
+    elif enduse_object.techs_fuel_yh is not None:
+        for tech, fuel_tech_yh in enduse_object.techs_fuel_yh.items():
+            fuel_yh[technologies[tech].fueltype_int] += fuel_tech_yh
+    else:
+        fuel_yh += enduse_object.fuel_yh
+
+    return fuel_yh
+
+def test_aggregate_enduse_fuels():
+    """Compare aggregation with reference aggregation of every enduse
+    """
+    class DummyEnduse(object):
+        def __init__(self, enduse, fuel_y, fuel_yh, techs_fuel_yh, flat_profile_crit=False):
+            self.enduse = enduse
+            self.fuel_y = fuel_y
+            self.fuel_yh = fuel_yh
+            self.techs_fuel_yh = techs_fuel_yh
+            self.enduse_techs = list(techs_fuel_yh.keys()) if techs_fuel_yh else []
+            self.flat_profile_crit = flat_profile_crit
+
+    technologies = {'boiler_gas': DummyTechnology(0), 'heat_pump': DummyTechnology(1)}
+    sectors = {'rs_sectors': [], 'ss_sectors': []}
+
+    for mode_constrained in [True, False]:
+        if mode_constrained:
+            heating = DummyEnduse('rs_space_heating', None, None, {
+                'boiler_gas': np.random.rand(2, 24),
+                'heat_pump': np.random.rand(2, 24)})
+        else:
+            heating = DummyEnduse('rs_space_heating', None, np.random.rand(2, 2, 24), None)
+
+        submodels = [
+            [heating, DummyEnduse('rs_cooking', None, np.random.rand(2, 2, 24), None)],
+            [DummyEnduse('ss_other', np.array([10.0, 2.0]), None, None, flat_profile_crit=True),
+             DummyEnduse('rs_cooking', None, np.random.rand(2, 2, 24), None)]]
+
+        aggr_results = model.initialise_result_container(
+            2, sectors, 3, 48, 2, ['boiler_gas', 'heat_pump'], technologies)
+
+        fuel_region_yh = model.aggregate_enduse_fuels(
+            aggr_results, 1, submodels, mode_constrained, 2, 48, 2,
+            ['rs_space_heating'], technologies)
+
+        expected_region_yh = sum([
+            get_expected_fuel_yh(enduse_object, technologies, 2, 2)
+            for submodel in submodels for enduse_object in submodel])
+        np.testing.assert_allclose(fuel_region_yh, expected_region_yh)
+
+        for submodel_nr, submodel in enumerate(submodels):
+            np.testing.assert_allclose(
+                aggr_results['ed_submodel_fueltype_regs_yh'][submodel_nr][1],
+                sum([
+                    get_expected_fuel_yh(enduse_object, technologies, 2, 2)
+                    for enduse_object in submodel]))
+
+        for enduse in ['rs_space_heating', 'rs_cooking', 'ss_other']:
+            np.testing.assert_allclose(
+                aggr_results['tot_fuel_y_enduse_specific_yh'][enduse],
+                sum([
+                    get_expected_fuel_yh(enduse_object, technologies, 2, 2)
+                    for submodel in submodels for enduse_object in submodel
+                    if enduse_object.enduse == enduse]))
+
+        if mode_constrained:
+            expected_tech = heating.techs_fuel_yh['heat_pump'][1]
+            assert np.all(aggr_results['ed_techs_submodel_fueltype_regs_yh']['heat_pump'][0][1][1] == expected_tech)
+        assert np.sum(aggr_results['ed_submodel_fueltype_regs_yh'][:, [0, 2]]) == 0
+
+def test_get_fuels_yh_representative_days():
+    """Annual fuel of a flat enduse is the same if all days
+    or representative days are modelled
+    """
+    class DummyAssumptions(object):
+        """Assumptions used for testing"""
+        def __init__(self, yearday_weights):
+            self.enduse_space_heating = []
+            self.ss_enduse_space_cooling = []
+            self.cooled_ss_floorarea_by = 0.35
+            self.smart_meter_assump = {
+                'smart_meter_p_by': 0.1,
+                'smart_meter_diff_params': {'sig_midpoint': 0, 'sig_steepness': 1}}
+            self.enduse_overall_change = {
+                'other_enduse_mode_info': {
+                    'diff_method': 'linear',
+                    'sigmoid': {'sig_midpoint': 0, 'sig_steepness': 1}}}
+            self.yearday_weights = yearday_weights
+
+    lp_stock = load_profile.LoadProfileStock("test_stock")
+
+    annual_fuels = []
+    for model_yeardays_nrs, yearday_weights in [
+            (365, None),
+            (4, np.array([100.0, 120.0, 80.0, 65.0]))]:
+
+        assumptions = DummyAssumptions(yearday_weights)
+
+        enduse_obj = enduse_func.Enduse(
+            submodel='rs_submodel',
+            region='regA',
+            scenario_data={},
+            assumptions=assumptions,
+            regional_lp_stock=lp_stock,
+            non_regional_lp_stock=lp_stock,
+            base_yr=2015,
+            curr_yr=2030,
+            enduse='rs_cooking',
+            sector=False,
+            fuel=np.array([100.0, 20.0]),
+            tech_stock=None,
+            heating_factor_y=1.0,
+            cooling_factor_y=1.0,
+            fuel_fueltype_tech_p_by={
+                0: {'placeholder_tech': 1.0},
+                1: {'placeholder_tech': 1.0}},
+            sig_param_tech={},
+            enduse_overall_change=assumptions.enduse_overall_change,
+            criterias={'mode_constrained': False},
+            strategy_variables={'enduse_change__rs_cooking': {'scenario_value': 0}},
+            fueltypes_nr=2,
+            fueltypes={'gas': 0, 'electricity': 1},
+            model_yeardays_nrs=model_yeardays_nrs,
+            flat_profile_crit=True,
+            driver_factor=1.0)
+
+        fuel_yh = model.get_fuels_yh(
+            enduse_obj,
+            'fuel_yh',
+            model_yeardays_nrs * 24,
+            model_yeardays_nrs,
+            yearday_weights)
+
+        annual_fuels.append(
+            representative_days.calc_annual_fuel(fuel_yh, yearday_weights))
+
+    np.testing.assert_allclose(annual_fuels[0], [100.0, 20.0])
+    np.testing.assert_allclose(annual_fuels[1], annual_fuels[0])
+
+def test_HeatingTechResults():
+    """Testing compact storage of heating technology results
+    """
+    tech_results = model.HeatingTechResults(
+        ['boiler_gas', 'heat_pump', 'boiler_gas'], [0, 1, 0], 2, 3, 4, 2)
+
+    assert tech_results.values.shape == (2, 2, 3, 2, 24)
+    assert list(tech_results.keys()) == ['boiler_gas', 'heat_pump']
+
+    tech_results.add_fuel('heat_pump', 1, 2, np.ones((2, 24)))
+
+    fuel_heat_pump = tech_results['heat_pump']
+    assert fuel_heat_pump.shape == (2, 3, 4, 2, 24)
+    assert np.sum(fuel_heat_pump) == 48
+    assert np.sum(fuel_heat_pump[1, 2, 1]) == 48
+    assert tech_results.get_techs_with_fuel() == ['heat_pump']
+
+def test_distribute_fuel_factors():
+    """Compare factorised fuel of enduses with hourly fuel of enduses
+    """
+    class DummyEnduse(object):
+        def __init__(self, enduse, fuel_yh=None, fuel_factors=None):
+            self.enduse = enduse
+            self.fuel_y = None
+            self.fuel_yh = fuel_yh
+            self.fuel_factors = fuel_factors
+            self.techs_fuel_yh = None
+            self.enduse_techs = []
+            self.flat_profile_crit = False
+
+    lp_stock = load_profile.LoadProfileStock("test_stock")
+    for profile_nr in range(3):
+        lp_stock.add_lp(
+            unique_identifier=profile_nr,
+            technologies=['placeholder_tech'],
+            enduses=['enduse_{}'.format(profile_nr)],
+            shape_yd=np.full((365), 1 / 365),
+            shape_yh=np.random.rand(365, 24))
+    lp_stocks = fuel_factors.register_profile_stocks([lp_stock])
+
+    fueltypes = {'gas': 0, 'electricity': 1}
+    sectors = {'rs_sectors': [], 'ss_sectors': []}
+    seasons = {
+        'winter': range(0, 90), 'spring': range(90, 180),
+        'summer': range(180, 270), 'autumn': range(270, 365)}
+
+    # Enduses of regions (enduse, fuel per fueltype) of every submodel
+    regions = [
+        [[('enduse_0', [10.0, 2.0]), ('enduse_1', [0, 4.0])], [('enduse_2', [3.0, 0])]],
+        [[('enduse_1', [1.0, 1.0])], [('enduse_2', [0, 7.0]), ('enduse_0', [5.0, 0])]]]
+
+    results = {}
+    for factorised_fuel in [True, False]:
+        aggr_results = model.initialise_result_container(
+            2, sectors, 2, 8760, 365, [], {})
+
+        for reg_array_nr, region in enumerate(regions):
+            submodels = []
+            for submodel in region:
+                enduses = []
+                for enduse, fuel_y in submodel:
+                    profile_id = lp_stock.get_profile_id(enduse, False, 'placeholder_tech')
+                    if factorised_fuel:
+                        enduses.append(DummyEnduse(enduse, fuel_factors=[
+                            (fueltype, profile_id, fuel) for fueltype, fuel in enumerate(fuel_y) if fuel]))
+                    else:
+                        enduses.append(DummyEnduse(enduse, fuel_yh=np.array(
+                            fuel_y)[:, np.newaxis, np.newaxis] * lp_stock.shapes_yh[profile_id]))
+                submodels.append(enduses)
+
+            region_results = model.initialise_result_container(
+                2, sectors, 1, 8760, 365, [], {})
+            region_results = model.aggregate_final_results(
+                region_results, 0, submodels, False, fueltypes, 2, 8760, 365,
+                seasons, [], {}, True, factorised_fuel)
+            aggr_results = model.add_region_results(aggr_results, reg_array_nr, region_results)
+
+        if factorised_fuel:
+            assert len(aggr_results['fuel_factors']) == 8
+            aggr_results = model.distribute_fuel_factors(
+                aggr_results, lp_stocks, fueltypes, 8760, 365, seasons)
+
+        results[factorised_fuel] = aggr_results
+
+    for key in [
+            'ed_submodel_fueltype_regs_yh', 'ed_fueltype_regs_yh',
+            'ed_fueltype_national_yh', 'reg_load_factor_y', 'reg_load_factor_yd']:
+        np.testing.assert_allclose(results[True][key], results[False][key], rtol=1e-10)
+
+    for enduse, fuel_enduse in results[False]['tot_fuel_y_enduse_specific_yh'].items():
+        np.testing.assert_allclose(
+            results[True]['tot_fuel_y_enduse_specific_yh'][enduse], fuel_enduse, rtol=1e-10)
+
+    for season in seasons:
+        np.testing.assert_allclose(
+            results[True]['averaged_h'][season], results[False]['averaged_h'][season], rtol=1e-10)
+        np.testing.assert_allclose(
+            results[True]['reg_seasons_lf'][season], results[False]['reg_seasons_lf'][season], rtol=1e-10)
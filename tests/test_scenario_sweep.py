@@ -0,0 +1,174 @@
+"""Testing
+"""
+import numpy as np
+from energy_demand import model
+from energy_demand import scenario_sweep
+from energy_demand.read_write import read_data
+from energy_demand.technologies import tech_related
+
+class DummyAssumptions(object):
+    """Assumptions used for testing"""
+    def __init__(self):
+        self.base_yr = 2015
+        self.curr_yr = 2015
+        self.simulated_yrs = [2015, 2020]
+        self.strategy_variables = {
+            'f_eff_achieved': {'scenario_value': 1.0, 'units': 'decimal'},
+            'gshp_fraction_ey': {'scenario_value': 0.0, 'affected_enduse': []},
+            'smart_meter_improvement_p': {'scenario_value': 0.1, 'affected_enduse': []}}
+        self.spatially_modelled_vars = ['smart_meter_improvement_p']
+        self.regional_strategy_variables = None
+
+    def update(self, name, value):
+        setattr(self, name, value)
+
+class HeatPumpModel(object):
+    """Model which calculates the fuel of heat pumps providing
+    one unit of service in every region and hour"""
+    def __init__(self, regions, data, assumptions, year_invariant=None):
+        assert year_invariant == 'year_invariant'
+        assert data['criterias']['nr_of_processes'] == 1
+        heat_pumps = data['technologies']['heat_pumps_electricity']
+
+        eff_cy = tech_related.calc_eff_cy(
+            assumptions.base_yr,
+            assumptions.curr_yr,
+            heat_pumps.eff_by,
+            heat_pumps.eff_ey,
+            heat_pumps.year_eff_ey,
+            {},
+            heat_pumps.eff_achieved,
+            heat_pumps.diff_method)
+
+        results = np.zeros((2, len(regions), 24))
+        results[1] = 1.0 / eff_cy
+        data['result_store'].write_results(assumptions.curr_yr, 'ed_fueltype_regs_yh', results)
+        data['result_store'].flush()
+
+        self.ed_fueltype_national_y = np.sum(results, axis=(1, 2))
+
+def get_technologies():
+    """Heat pump technologies used for testing
+    """
+    technologies = {}
+    for fueltype in ['electricity', 'hydrogen']:
+        for tech, eff_ey in [
+                ('heat_pump_ASHP_{}'.format(fueltype), 2.0),
+                ('heat_pump_GSHP_{}'.format(fueltype), 4.0),
+                ('heat_pumps_{}'.format(fueltype), 1.0)]:
+            technologies[tech] = read_data.TechnologyData(
+                fueltype=fueltype,
+                eff_by=1.0,
+                eff_ey=eff_ey,
+                year_eff_ey=2020,
+                eff_achieved=1.0,
+                diff_method='linear')
+
+    return technologies
+
+def get_data():
+    """Base data used for testing
+    """
+    return {
+        'regions': ['regA', 'regB', 'regC'],
+        'reg_nrs': 3,
+        'technologies': get_technologies(),
+        'criterias': {
+            'nr_of_processes': 4,
+            'spatial_exliclit_diffusion': False}}
+
+def test_get_scenario_strategy_variables():
+    """Testing
+    """
+    assumptions = DummyAssumptions()
+
+    out = scenario_sweep.get_scenario_strategy_variables(
+        assumptions.strategy_variables, {'f_eff_achieved': 0.5})
+
+    assert out['f_eff_achieved'] == {'scenario_value': 0.5, 'units': 'decimal'}
+    assert out['smart_meter_improvement_p'] is assumptions.strategy_variables['smart_meter_improvement_p']
+    assert assumptions.strategy_variables['f_eff_achieved']['scenario_value'] == 1.0
+
+def test_get_sweep_tasks():
+    """Testing
+    """
+    tasks = scenario_sweep.get_sweep_tasks({'low': {}, 'high': {}}, [2015, 2020])
+
+    assert tasks == [('low', 2015), ('low', 2020), ('high', 2015), ('high', 2020)]
+
+def test_simulate_scenario_year_spatial_diffusion(tmpdir, monkeypatch):
+    """Testing
+    """
+    simulated_assumptions = []
+
+    class RecordingModel(HeatPumpModel):
+        def __init__(self, regions, data, assumptions, year_invariant=None):
+            HeatPumpModel.__init__(self, regions, data, assumptions, year_invariant)
+            simulated_assumptions.append(assumptions)
+
+    monkeypatch.setattr(model, 'EnergyDemandModel', RecordingModel)
+
+    assumptions = DummyAssumptions()
+    data = get_data()
+    data['criterias']['spatial_exliclit_diffusion'] = True
+    data['pop_density'] = {'regA': 1.0, 'regB': 2.0, 'regC': 3.0}
+    for fuel_disagg in ['rs_fuel_disagg', 'ss_fuel_disagg', 'is_fuel_disagg']:
+        data[fuel_disagg] = {region: {} for region in data['regions']}
+
+    scenario_sweep.simulate_scenario_year(
+        'high',
+        2020,
+        {'smart_meter_improvement_p': 0.3},
+        data,
+        assumptions,
+        'year_invariant',
+        scenario_sweep.result_store.ScenarioResultStore(str(tmpdir), 3))
+
+    # Identical diffusion speed in all regions (speed_con_max=1.0)
+    regional_strategy_variables = simulated_assumptions[0].regional_strategy_variables
+    np.testing.assert_array_almost_equal(
+        regional_strategy_variables.get_values('smart_meter_improvement_p'), [0.3, 0.3, 0.3])
+    assert regional_strategy_variables['regA']['f_eff_achieved']['scenario_value'] == 1.0
+    assert assumptions.regional_strategy_variables is None
+
+def test_run_scenario_sweep(tmpdir, monkeypatch):
+    """Testing
+    """
+    monkeypatch.setattr(model, 'EnergyDemandModel', HeatPumpModel)
+
+    assumptions = DummyAssumptions()
+    data = get_data()
+    scenarios = {
+        'low': {'f_eff_achieved': 0.5, 'gshp_fraction_ey': 0.0},
+        'high': {'f_eff_achieved': 1.0, 'gshp_fraction_ey': 0.5}}
+
+    for nr_of_processes in [1, 2]:
+        path = str(tmpdir.join(str(nr_of_processes)))
+
+        sweep_results = scenario_sweep.run_scenario_sweep(
+            scenarios,
+            data,
+            assumptions,
+            path_result_store=path,
+            nr_of_processes=nr_of_processes,
+            year_invariant='year_invariant')
+
+        # No efficiency improvement in base year
+        assert sweep_results['low'][2015][1] == 3 * 24
+        assert sweep_results['high'][2015][1] == 3 * 24
+
+        # Heat pump efficiency: 1 + (2 - 1) * 0.5 (low), 1 + (3 - 1) * 1.0 (high)
+        np.testing.assert_almost_equal(sweep_results['low'][2020][1], 3 * 24 / 1.5)
+        np.testing.assert_almost_equal(sweep_results['high'][2020][1], 3 * 24 / 3.0)
+
+        store = scenario_sweep.result_store.ScenarioResultStore(path, 3)
+        result = store.read('high', 2020, 'ed_fueltype_regs_yh', fueltype_nr=1, reg_array_nrs=[2])
+        np.testing.assert_array_almost_equal(result, 1 / 3.0)
+
+    # Base inputs are not changed
+    assert assumptions.curr_yr == 2015
+    assert assumptions.strategy_variables['f_eff_achieved']['scenario_value'] == 1.0
+    assert data['technologies']['heat_pumps_electricity'].eff_ey == 1.0
+    assert data['technologies']['heat_pumps_electricity'].eff_achieved == 1.0
+    assert data['criterias']['nr_of_processes'] == 4
+    assert 'result_store' not in data